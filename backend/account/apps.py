@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class AccountConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "account"
+
+    def ready(self) -> None:
+        """Import signals and load password validators when the app is ready."""
+        import account.signals  # noqa: F401
+
+        # Instantiate the validators at boot so the first registration or
+        # password change in each worker doesn't pay for loading them.
+        from django.contrib.auth import password_validation
+
+        password_validation.get_default_password_validators()
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import copy
+import hashlib
+import time
 from typing import TYPE_CHECKING
 
 from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from account.caches import token_cache, user_cache
+from account.tokens import is_token_current, published_token_generation
 
 if TYPE_CHECKING:
     from rest_framework.request import Request
@@ -44,7 +52,78 @@ class CookieJWTAuthentication(JWTAuthentication):
             # Token is invalid - raise the exception to return 401
             raise
 
-        # Get the user from the token
-        user = self.get_user(validated_token)
+        # Get the user from the token. Writes always start from a fresh row
+        # so a stale snapshot is never saved back over newer data.
+        user = self.get_user(
+            validated_token,
+            use_cache=request.method in SAFE_METHODS,
+        )
 
         return user, validated_token
+
+    def get_validated_token(self, raw_token: bytes | str) -> Token:
+        """
+        Return the validated token, skipping decode and signature checks for
+        tokens that were already verified by this process.
+        """
+        if not settings.AUTH_TOKEN_CACHE["ENABLED"]:
+            return super().get_validated_token(raw_token)
+
+        if isinstance(raw_token, str):
+            raw_token = raw_token.encode()
+        key = hashlib.sha256(raw_token).digest()
+
+        validated_token = token_cache.get(key)
+        if validated_token is not None:
+            return validated_token
+
+        validated_token = super().get_validated_token(raw_token)
+        ttl = validated_token["exp"] - time.time()
+        if ttl > 0:
+            token_cache.set(key, validated_token, ttl=ttl)
+        return validated_token
+
+    def get_user(self, validated_token: Token, use_cache: bool = True) -> User:
+        """
+        Return the token's user, rejecting tokens from a revoked generation.
+        """
+        if use_cache:
+            user = self._get_cached_user(validated_token)
+        else:
+            user = super().get_user(validated_token)
+
+        if not is_token_current(validated_token, user):
+            raise AuthenticationFailed("Token has been revoked.", code="token_revoked")
+
+        return user
+
+    def _get_cached_user(self, validated_token: Token) -> User:
+        """
+        Return the token's user, served from the per-process snapshot cache.
+
+        Only users that pass the parent class checks (exists, is active) are
+        cached. Snapshots behind the token generation published by
+        revoke_all_sessions or a password change are read again, so
+        revocations on other workers apply without waiting for the TTL. Each request receives its own copy of the snapshot, so views
+        that mutate request.user never touch the cached instance.
+        """
+        if not settings.AUTH_USER_CACHE["ENABLED"]:
+            return super().get_user(validated_token)
+
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            # Let the parent class raise the appropriate error
+            return super().get_user(validated_token)
+
+        key = str(user_id)
+        snapshot = user_cache.get(key)
+        if snapshot is not None:
+            # Another worker may have revoked the user's sessions since the
+            # snapshot was taken
+            published = published_token_generation(user_id)
+            if published is None or published <= snapshot.token_generation:
+                return copy.copy(snapshot)
+
+        user = super().get_user(validated_token)
+        user_cache.set(key, copy.copy(user))
+        return user
@@ -0,0 +1,220 @@
+"""
+Per-process filter of blacklisted refresh-token JTIs.
+
+simplejwt's BlacklistMixin.check_blacklist() queries the blacklist table every
+time a refresh token is parsed. The index keeps Bloom filters of the JTIs of
+unexpired blacklisted tokens, so the common case, a token that isn't
+blacklisted, is answered without a query. A filter hit may be a false
+positive and is confirmed with the exact query.
+
+Memory is bounded by the refresh-token lifetime rather than the size of the
+table: each filter has a fixed size and covers the tokens expiring within one
+BUCKET_SECONDS window. A lookup only checks the bucket of the token's own
+"exp" claim, and buckets are dropped once their tokens have expired, so the
+index never has to be rebuilt to forget old tokens.
+
+Which paths save a query: LogoutView, ChangePasswordView and refreshes
+without rotation parse a token that usually isn't blacklisted, and no longer
+query the table. rotate_refresh_token still locks the outstanding token row,
+joining its blacklist row, so rotation goes from two queries to one.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+# Width of the expiry window covered by each filter
+BUCKET_SECONDS = 86_400
+# Rows read per refresh, so no request pays for loading the whole table
+LOAD_CHUNK = 10_000
+# How long an id skipped by the sequence is re-read, in case it belongs to a
+# blacklist insert that hadn't committed yet; longer than any transaction
+# that blacklists a token
+GAP_SECONDS = 300
+# Most skipped ids watched at once
+MAX_GAPS = 1_000
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter of byte strings, using double hashing."""
+
+    def __init__(self, bits: int, hashes: int) -> None:
+        self.bits = bits
+        self.hashes = hashes
+        self.count = 0
+        self._array = bytearray((bits + 7) // 8)
+
+    def _positions(self, key: bytes) -> list[int]:
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        return [(first + n * step) % self.bits for n in range(self.hashes)]
+
+    def add(self, key: bytes) -> None:
+        for position in self._positions(key):
+            self._array[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(
+            self._array[position >> 3] >> (position & 7) & 1
+            for position in self._positions(key)
+        )
+
+
+def _compact(jti: str) -> bytes:
+    """Pack a hex uuid JTI into 16 bytes; fall back to UTF-8 for other ids."""
+    try:
+        return bytes.fromhex(jti)
+    except ValueError:
+        return jti.encode()
+
+
+def _bucket(expires: float) -> int:
+    return int(expires) // BUCKET_SECONDS
+
+
+class BlacklistIndex:
+    """
+    Bloom filters of blacklisted JTIs, kept up to date by primary key.
+
+    Lookups refresh the index at most once every `refresh_interval` seconds.
+    A refresh reads at most LOAD_CHUNK rows above the highest id seen, so the
+    initial load is spread over several refreshes; until it has caught up,
+    every lookup is answered "maybe". Ids the sequence skipped next to recent
+    rows may belong to inserts that commit later, and are read again until
+    they appear or GAP_SECONDS have passed. A refresh that finds another
+    thread refreshing doesn't wait for it.
+
+    Every change to the filters, whether a request thread's add() or a
+    refresh's, holds a separate mutation lock: setting a bit is a
+    read-modify-write of its byte, and a lost bit would answer "certainly
+    not blacklisted" for a revoked token for as long as it is unexpired.
+    """
+
+    def __init__(self, refresh_interval: float, bits: int, hashes: int) -> None:
+        self.refresh_interval = refresh_interval
+        self.bits = bits
+        self.hashes = hashes
+        self._lock = threading.Lock()
+        self._mutation_lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        with self._mutation_lock:
+            self._buckets: dict[int, BloomFilter] = {}
+        self._max_id = 0
+        # Skipped id -> monotonic time after which it is given up on
+        self._gaps: dict[int, float] = {}
+        self._loaded = False
+        self._next_refresh = 0.0
+
+    def may_contain(self, jti: str, expires: float) -> bool:
+        """
+        Return False if the JTI of a token expiring at `expires` (a POSIX
+        timestamp) is certainly not blacklisted.
+        """
+        if time.monotonic() >= self._next_refresh:
+            self.refresh()
+        if not self._loaded:
+            return True
+        bucket = self._buckets.get(_bucket(expires))
+        return bucket is not None and _compact(jti) in bucket
+
+    def __len__(self) -> int:
+        """Return the number of JTIs added to the live filters."""
+        return sum(bucket.count for bucket in self._buckets.values())
+
+    def add(self, jti: str, expires: float) -> None:
+        """Record a JTI blacklisted by this process without waiting for refresh."""
+        key = _bucket(expires)
+        with self._mutation_lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = BloomFilter(self.bits, self.hashes)
+            bucket.add(_compact(jti))
+
+    def refresh(self, full: bool = False) -> None:
+        """
+        Read the next chunk of newly blacklisted JTIs and drop expired buckets.
+
+        With `full`, the filters are rebuilt and loaded completely before
+        returning, waiting for any refresh in progress.
+        """
+        if not self._lock.acquire(blocking=full):
+            return
+        try:
+            if full:
+                self._reset()
+            while not self._refresh_chunk() and full:
+                pass
+            # Keep loading on the next lookup until caught up with the table
+            interval = self.refresh_interval if self._loaded else 0.0
+            self._next_refresh = time.monotonic() + interval
+        finally:
+            self._lock.release()
+
+    def _refresh_chunk(self) -> bool:
+        """Read one chunk of rows; return True once caught up with the table."""
+        now = timezone.now()
+        self._drop_expired(now.timestamp())
+        monotonic = time.monotonic()
+        self._gaps = {
+            row_id: deadline
+            for row_id, deadline in self._gaps.items()
+            if deadline > monotonic
+        }
+
+        rows = list(
+            BlacklistedToken.objects.filter(
+                Q(id__gt=self._max_id) | Q(id__in=list(self._gaps))
+            )
+            .order_by("id")
+            .values_list("id", "token__jti", "token__expires_at", "blacklisted_at")[
+                :LOAD_CHUNK
+            ]
+        )
+        recent = now - timedelta(seconds=GAP_SECONDS)
+        for row_id, jti, expires_at, blacklisted_at in rows:
+            if row_id > self._max_id:
+                if row_id > self._max_id + 1 and blacklisted_at >= recent:
+                    self._watch_gap(row_id, monotonic + GAP_SECONDS)
+                self._max_id = row_id
+            else:
+                self._gaps.pop(row_id, None)
+            if expires_at > now:
+                self.add(jti, expires_at.timestamp())
+
+        caught_up = len(rows) < LOAD_CHUNK
+        self._loaded = self._loaded or caught_up
+        return caught_up
+
+    def _drop_expired(self, now: float) -> None:
+        current = _bucket(now)
+        with self._mutation_lock:
+            if any(key < current for key in self._buckets):
+                self._buckets = {
+                    key: bucket
+                    for key, bucket in self._buckets.items()
+                    if key >= current
+                }
+
+    def _watch_gap(self, row_id: int, deadline: float) -> None:
+        start = max(self._max_id + 1, row_id - MAX_GAPS)
+        for skipped in range(start, row_id):
+            self._gaps[skipped] = deadline
+        while len(self._gaps) > MAX_GAPS:
+            del self._gaps[min(self._gaps)]
+
+    def clear(self) -> None:
+        """Forget every JTI; lookups answer "maybe" until the index reloads."""
+        with self._lock:
+            self._reset()
+
@@ -0,0 +1,32 @@
+"""Per-process caches used on the authentication hot path."""
+
+from __future__ import annotations
+
+from django.conf import settings
+
+from account.blacklist import BlacklistIndex
+from core.caches import LRUCache
+
+# Snapshots of authenticated users, keyed by the token's user id. Entries are
+# dropped by account.signals whenever a User is saved or deleted.
+user_cache = LRUCache(
+    max_entries=settings.AUTH_USER_CACHE["MAX_ENTRIES"],
+    ttl_seconds=settings.AUTH_USER_CACHE["TTL_SECONDS"],
+)
+
+# Validated access tokens keyed by a SHA-256 digest of the raw token. Each
+# entry expires at the token's own "exp" claim, so it never outlives it.
+token_cache = LRUCache(max_entries=settings.AUTH_TOKEN_CACHE["MAX_ENTRIES"])
+
+# Bloom filters of blacklisted refresh-token JTIs, refreshed incrementally
+# from the table.
+blacklist_index = BlacklistIndex(
+    refresh_interval=settings.TOKEN_BLACKLIST_INDEX["REFRESH_INTERVAL_SECONDS"],
+    bits=settings.TOKEN_BLACKLIST_INDEX["FILTER_BITS"],
+    hashes=settings.TOKEN_BLACKLIST_INDEX["FILTER_HASHES"],
+)
+
+
+def invalidate_cached_user(user_id: int | str) -> None:
+    """Drop the cached snapshot for the given user id."""
+    user_cache.delete(str(user_id))
@@ -0,0 +1,169 @@
+"""
+Password hashing that runs on a bounded, shared pool.
+
+PBKDF2 is deliberately slow. When every login, registration and password check
+hashes on its own request thread, a burst of logins occupies every worker
+thread and every CPU, and unrelated endpoints queue behind them. The hasher
+below sends the key derivation to a small thread pool instead (hashlib releases
+the GIL while hashing), so at most MAX_WORKERS hashes run per process and
+the remaining request threads stay free to serve other endpoints. Once
+MAX_QUEUE hashes are already waiting, new hashing requests are rejected with
+a 503 instead of queueing without bound.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TypeVar
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+T = TypeVar("T")
+
+
+class PasswordHashingBusy(APIException):
+    """Raised when the hashing queue is full."""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many sign-in attempts in progress. Please try again shortly."
+    default_code = "password_hashing_busy"
+
+
+@dataclass(frozen=True)
+class HashingMetrics:
+    """Point-in-time counters for a HashingExecutor."""
+
+    submitted: int
+    rejected: int
+    completed: int
+    in_flight: int
+    max_in_flight: int
+    total_wait_seconds: float
+    max_wait_seconds: float
+    total_run_seconds: float
+
+    @property
+    def mean_wait_seconds(self) -> float:
+        """Mean time a hash spent queued before it started (0.0 when unused)."""
+        return self.total_wait_seconds / self.completed if self.completed else 0.0
+
+    @property
+    def mean_run_seconds(self) -> float:
+        """Mean time spent hashing (0.0 when unused)."""
+        return self.total_run_seconds / self.completed if self.completed else 0.0
+
+
+class HashingExecutor:
+    """
+    Thread pool for CPU-bound hashing with a cap on queued work.
+
+    `max_workers` hashes run at once; up to `max_queue` more wait for a free
+    worker. Calls beyond that raise PasswordHashingBusy immediately. The
+    calling thread blocks until its own hash is done.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int) -> None:
+        if max_workers <= 0:
+            raise ValueError("max_workers must be a positive number.")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative.")
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hashing"
+        )
+        self._lock = threading.Lock()
+        self._reset_counters()
+
+    def _reset_counters(self) -> None:
+        self._submitted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_run = 0.0
+
+    def run(self, func: Callable[..., T], *args: object) -> T:
+        """Run `func(*args)` on the pool and return its result."""
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise PasswordHashingBusy()
+            self._submitted += 1
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+
+        queued_at = time.perf_counter()
+        timings = {}
+
+        def task() -> T:
+            started_at = time.perf_counter()
+            timings["wait"] = started_at - queued_at
+            try:
+                return func(*args)
+            finally:
+                timings["run"] = time.perf_counter() - started_at
+
+        try:
+            return self._executor.submit(task).result()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                if timings:
+                    self._completed += 1
+                    self._total_wait += timings["wait"]
+                    self._max_wait = max(self._max_wait, timings["wait"])
+                    self._total_run += timings["run"]
+
+    def reset_metrics(self) -> None:
+        """Reset the counters (in-flight work is still tracked)."""
+        with self._lock:
+            in_flight = self._in_flight
+            self._reset_counters()
+            self._in_flight = in_flight
+
+    @property
+    def metrics(self) -> HashingMetrics:
+        """Return a snapshot of the executor counters."""
+        with self._lock:
+            return HashingMetrics(
+                submitted=self._submitted,
+                rejected=self._rejected,
+                completed=self._completed,
+                in_flight=self._in_flight,
+                max_in_flight=self._max_in_flight,
+                total_wait_seconds=self._total_wait,
+                max_wait_seconds=self._max_wait,
+                total_run_seconds=self._total_run,
+            )
+
+
+hashing_executor = HashingExecutor(
+    max_workers=settings.PASSWORD_HASHING_POOL["MAX_WORKERS"],
+    max_queue=settings.PASSWORD_HASHING_POOL["MAX_QUEUE"],
+)
+
+
+class PooledPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 hasher that derives keys on the shared hashing pool.
+
+    The algorithm name is unchanged, so existing password hashes verify
+    without being rehashed. It must replace Django's PBKDF2PasswordHasher in
+    PASSWORD_HASHERS rather than sit alongside it: hashers are looked up by
+    algorithm name and the last one listed wins.
+    """
+
+    def encode(self, password: str, salt: str, iterations: int | None = None) -> str:
+        if not settings.PASSWORD_HASHING_POOL["ENABLED"]:
+            return super().encode(password, salt, iterations)
+        return hashing_executor.run(super().encode, password, salt, iterations)
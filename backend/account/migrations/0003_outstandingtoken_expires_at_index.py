@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Index simplejwt's outstanding token table on (expires_at, id).
+
+    The prune_tokens command walks expired rows in expires_at order; without
+    this index each batch scans the whole table. Built CONCURRENTLY so it can
+    be applied while refresh traffic is live.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ("account", "0002_user_token_generation"),
+        ("token_blacklist", "0012_alter_outstandingtoken_user"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+                "token_blacklist_outstandingtoken_expires_at_idx "
+                "ON token_blacklist_outstandingtoken (expires_at, id);"
+            ),
+            reverse_sql=(
+                "DROP INDEX CONCURRENTLY IF EXISTS "
+                "token_blacklist_outstandingtoken_expires_at_idx;"
+            ),
+        ),
+    ]
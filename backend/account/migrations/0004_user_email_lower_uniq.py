@@ -0,0 +1,49 @@
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Enforce case-insensitive email uniqueness with a unique index on lower(email).
+
+    Registration and profile updates rely on this index to reject duplicate
+    emails on insert, and case-insensitive lookups use it instead of scanning
+    the users table. Built CONCURRENTLY so it can be applied while traffic is
+    live; it fails if existing emails already differ only by case.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ("account", "0003_outstandingtoken_expires_at_index"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name="user",
+                    constraint=models.UniqueConstraint(
+                        django.db.models.functions.text.Lower("email"),
+                        name="account_user_email_lower_uniq",
+                        violation_error_message=(
+                            "A user with this email already exists."
+                        ),
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    sql=(
+                        "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "
+                        "account_user_email_lower_uniq "
+                        'ON account_user (lower("email"));'
+                    ),
+                    reverse_sql=(
+                        "DROP INDEX CONCURRENTLY IF EXISTS "
+                        "account_user_email_lower_uniq;"
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -8,9 +8,11 @@ from django.contrib.auth.models import (
     PermissionsMixin,
 )
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils import timezone
 
 if TYPE_CHECKING:
+    from django.db.models import QuerySet
     from django.db.models.manager import Manager
 
 
@@ -49,6 +51,15 @@ class UserManager(BaseUserManager["User"]):
 
         return self.create_user(email, password, **extra_fields)
 
+    def with_email(self, email: str) -> QuerySet[User]:
+        """
+        Return users whose email matches `email`, ignoring case.
+
+        Filters on lower(email) so the lookup uses the unique functional index
+        instead of scanning the table as email__iexact would.
+        """
+        return self.alias(email_lower=Lower("email")).filter(email_lower=email.lower())
+
 
 class User(AbstractBaseUser, PermissionsMixin):
     """Custom user model that uses email as the unique identifier."""
@@ -67,6 +78,9 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
 
+    # Embedded in issued JWTs; bumping it revokes every outstanding session
+    token_generation = models.PositiveIntegerField(default=0)
+
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -77,6 +91,13 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     class Meta:
         ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                Lower("email"),
+                name="account_user_email_lower_uniq",
+                violation_error_message="A user with this email already exists.",
+            ),
+        ]
 
     @property
     def first_name(self) -> str:
@@ -0,0 +1,301 @@
+"""
+Password validators that are cheap to load and cheap to run.
+
+Django's CommonPasswordValidator decompresses its 20,000-entry list into a set
+in every worker process, on the first registration or password change.
+CompiledCommonPasswordValidator instead reads a compiled file of sorted,
+fixed-width password digests through a read-only memory map. Opening the file
+costs nothing, and every worker shares the same pages through the OS page
+cache. Membership checks read a single bucket of the mapped digests.
+
+Build the compiled file with `python manage.py compile_common_passwords`. The
+file records a fingerprint of the list it was compiled from; if it is missing
+or was compiled from another list, or another version of it, the validator
+compiles it again on first load.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import mmap
+import os
+import re
+import struct
+import tempfile
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.contrib.auth import password_validation
+from django.contrib.auth.password_validation import (
+    CommonPasswordValidator,
+    UserAttributeSimilarityValidator,
+    exceeds_maximum_length_ratio,
+)
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+
+if TYPE_CHECKING:
+    from account.models import User
+
+logger = logging.getLogger(__name__)
+
+# The gzipped list Django's CommonPasswordValidator loads by default
+DJANGO_PASSWORD_LIST_PATH = (
+    Path(password_validation.__file__).resolve().parent / "common-passwords.txt.gz"
+)
+
+# Bytes kept from each password's BLAKE2b digest. A false positive needs a
+# 64-bit collision with one of ~20,000 entries.
+DIGEST_SIZE = 8
+
+# Digests are grouped by their leading BUCKET_BITS bits. The compiled file
+# starts with the source list's fingerprint and a table of 2**BUCKET_BITS + 1
+# little-endian uint32 entry offsets, followed by the sorted digests, so a
+# lookup reads one bucket of a handful of entries instead of binary searching
+# the whole list.
+BUCKET_BITS = 12
+FINGERPRINT_SIZE = 16
+_OFFSET = struct.Struct("<I")
+_BOUNDS = struct.Struct("<II")
+TABLE_OFFSET = FINGERPRINT_SIZE
+HEADER_SIZE = TABLE_OFFSET + ((1 << BUCKET_BITS) + 1) * _OFFSET.size
+
+
+def password_digest(password: str) -> bytes:
+    """Return the fixed-width digest stored for a normalized password."""
+    return hashlib.blake2b(password.encode(), digest_size=DIGEST_SIZE).digest()
+
+
+def _bucket(digest: bytes) -> int:
+    return int.from_bytes(digest[:2], "big") >> (16 - BUCKET_BITS)
+
+
+def source_fingerprint(source: Path | str) -> bytes:
+    """
+    Identify a password list by its path, size and modification time.
+
+    Only the file is stat'ed, so checking a compiled file is up to date
+    doesn't read the list.
+    """
+    path = Path(source).resolve()
+    stat = path.stat()
+    identity = f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}"
+    return hashlib.blake2b(identity.encode(), digest_size=FINGERPRINT_SIZE).digest()
+
+
+def default_compiled_path(source: Path | str) -> Path:
+    """
+    Return where the list at `source` is compiled when no path is given.
+
+    Django's list is compiled to settings.COMMON_PASSWORDS_PATH; other lists
+    get a file next to it named after their path, so validators with
+    different lists don't overwrite each other's file.
+    """
+    default = Path(settings.COMMON_PASSWORDS_PATH)
+    if Path(source).resolve() == DJANGO_PASSWORD_LIST_PATH:
+        return default
+    name = hashlib.blake2b(str(Path(source).resolve()).encode(), digest_size=6)
+    return default.with_name(f"{default.stem}-{name.hexdigest()}{default.suffix}")
+
+
+def compile_password_list(source: Path | str, destination: Path | str) -> int:
+    """
+    Compile a (possibly gzipped) password list into bucketed, sorted digests.
+
+    Entries are stripped, matching CommonPasswordValidator. The source's
+    fingerprint is recorded in the header. The destination is replaced
+    atomically, so workers that already mapped the old file are not
+    affected. Returns the number of distinct entries written.
+    """
+    fingerprint = source_fingerprint(source)
+    try:
+        with gzip.open(source, "rt", encoding="utf-8") as f:
+            passwords = {line.strip() for line in f}
+    except OSError:
+        with open(source, encoding="utf-8") as f:
+            passwords = {line.strip() for line in f}
+
+    digests = sorted({password_digest(password) for password in passwords})
+
+    offsets = []
+    index = 0
+    for bucket in range(1 << BUCKET_BITS):
+        offsets.append(index)
+        while index < len(digests) and _bucket(digests[index]) == bucket:
+            index += 1
+    offsets.append(index)
+
+    destination = Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=destination.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(fingerprint)
+            f.write(b"".join(_OFFSET.pack(offset) for offset in offsets))
+            f.write(b"".join(digests))
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, destination)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(digests)
+
+
+class CompiledPasswordList:
+    """Read-only, memory-mapped set of password digests."""
+
+    def __init__(self, path: Path | str) -> None:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER_SIZE or (size - HEADER_SIZE) % DIGEST_SIZE:
+                raise ValueError(f"{path} is not a compiled password list.")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.fingerprint = self._map[:FINGERPRINT_SIZE]
+        self._count = (size - HEADER_SIZE) // DIGEST_SIZE
+        (last,) = _OFFSET.unpack_from(self._map, HEADER_SIZE - _OFFSET.size)
+        if last != self._count:
+            raise ValueError(f"{path} is not a compiled password list.")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, password: str) -> bool:
+        digest = password_digest(password)
+        start, end = _BOUNDS.unpack_from(
+            self._map, TABLE_OFFSET + _bucket(digest) * _OFFSET.size
+        )
+        entries = self._map[
+            HEADER_SIZE + start * DIGEST_SIZE : HEADER_SIZE + end * DIGEST_SIZE
+        ]
+        offset = entries.find(digest)
+        # A match straddling two neighbouring entries is not a match.
+        while offset > 0 and offset % DIGEST_SIZE:
+            offset = entries.find(digest, offset + 1)
+        return offset != -1
+
+
+class CompiledCommonPasswordValidator(CommonPasswordValidator):
+    """
+    CommonPasswordValidator backed by a memory-mapped, compiled password list.
+
+    `compiled_path` defaults to default_compiled_path() of
+    `password_list_path` (Django's list by default). It is (re)built from the
+    list if it is missing, unreadable, or records another list's
+    fingerprint. If the compiled file can't be written, the validator falls
+    back to loading the list into memory like Django's validator.
+    """
+
+    def __init__(
+        self,
+        compiled_path: Path | str | None = None,
+        password_list_path=CommonPasswordValidator.DEFAULT_PASSWORD_LIST_PATH,
+    ) -> None:
+        if password_list_path is CommonPasswordValidator.DEFAULT_PASSWORD_LIST_PATH:
+            password_list_path = DJANGO_PASSWORD_LIST_PATH
+        compiled_path = Path(compiled_path or default_compiled_path(password_list_path))
+
+        try:
+            self.passwords = self._load(compiled_path, password_list_path)
+        except (OSError, ValueError) as error:
+            logger.warning(
+                "Could not load compiled password list %s (%s); "
+                "loading %s into memory instead.",
+                compiled_path,
+                error,
+                password_list_path,
+            )
+            super().__init__(password_list_path)
+
+    @staticmethod
+    def _load(compiled_path: Path, source: Path | str) -> CompiledPasswordList:
+        try:
+            passwords = CompiledPasswordList(compiled_path)
+        except (OSError, ValueError):
+            passwords = None
+        try:
+            fingerprint = source_fingerprint(source)
+        except FileNotFoundError:
+            # Deployed without the list; trust the compiled file if there is one
+            if passwords is None:
+                raise
+            return passwords
+        if passwords is None or passwords.fingerprint != fingerprint:
+            compile_password_list(source, compiled_path)
+            passwords = CompiledPasswordList(compiled_path)
+        return passwords
+
+
+def _quick_ratio(a_counts: Counter[str], a_len: int, b: str) -> float:
+    """
+    Return SequenceMatcher(a=a, b=b).quick_ratio() for a precounted `a`.
+
+    quick_ratio() counts characters the two strings have in common, ignoring
+    order; this computes the same bound without building a SequenceMatcher.
+    """
+    total = a_len + len(b)
+    if not total:
+        return 1.0
+    matches = sum((a_counts & Counter(b)).values())
+    return 2.0 * matches / total
+
+
+class FastUserAttributeSimilarityValidator(UserAttributeSimilarityValidator):
+    """
+    UserAttributeSimilarityValidator with cheap bounds checked first.
+
+    Accepts and rejects exactly the same passwords as Django's validator.
+    Attribute parts whose length alone bounds the similarity below
+    `max_similarity` are skipped outright, and the character-overlap ratio
+    is computed from a single count of the password instead of a new
+    SequenceMatcher per part.
+    """
+
+    def validate(self, password: str, user: User | None = None) -> None:
+        if not user:
+            return
+
+        password = password.lower()
+        password_len = len(password)
+        password_counts: Counter[str] | None = None
+
+        for attribute_name in self.user_attributes:
+            value = getattr(user, attribute_name, None)
+            if not value or not isinstance(value, str):
+                continue
+            value_lower = value.lower()
+            value_parts = re.split(r"\W+", value_lower) + [value_lower]
+            for value_part in value_parts:
+                if exceeds_maximum_length_ratio(
+                    password, self.max_similarity, value_part
+                ):
+                    continue
+
+                # Length-only bound (SequenceMatcher.real_quick_ratio()).
+                total = password_len + len(value_part)
+                if total and 2.0 * min(password_len, len(value_part)) / total < (
+                    self.max_similarity
+                ):
+                    continue
+
+                if password_counts is None:
+                    password_counts = Counter(password)
+                if (
+                    _quick_ratio(password_counts, password_len, value_part)
+                    >= self.max_similarity
+                ):
+                    self._raise_too_similar(user, attribute_name)
+
+    def _raise_too_similar(self, user: User, attribute_name: str) -> None:
+        try:
+            verbose_name = str(user._meta.get_field(attribute_name).verbose_name)
+        except FieldDoesNotExist:
+            verbose_name = attribute_name
+        raise ValidationError(
+            self.get_error_message(),
+            code="password_too_similar",
+            params={"verbose_name": verbose_name},
+        )
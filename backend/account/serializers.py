@@ -8,10 +8,24 @@ from django.contrib.auth import (
     password_validation,
 )
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 
 User = get_user_model()
 
+DUPLICATE_EMAIL_MESSAGE = "A user with this email already exists."
+
+# Unique constraints on User.email: the lower(email) index and the column's own
+EMAIL_CONSTRAINTS = frozenset(
+    {"account_user_email_lower_uniq", "account_user_email_key"}
+)
+
+
+def is_duplicate_email(error: IntegrityError) -> bool:
+    """Return True if the IntegrityError was raised by an email constraint."""
+    diag = getattr(error.__cause__, "diag", None)
+    return getattr(diag, "constraint_name", None) in EMAIL_CONSTRAINTS
+
 
 class UserSerializer(serializers.ModelSerializer):
     """Read-only serializer for the User model."""
@@ -44,11 +58,13 @@ class RegisterSerializer(serializers.Serializer):
     full_name = serializers.CharField(max_length=255, required=False, allow_blank=True)
 
     def validate_email(self, value: str) -> str:
-        """Ensure email is unique (case-insensitive)."""
-        email = value.lower()
-        if User.objects.filter(email__iexact=email).exists():
-            raise serializers.ValidationError("A user with this email already exists.")
-        return email
+        """
+        Normalize the email to lowercase.
+
+        Uniqueness is enforced by the unique index on lower(email) when the
+        user is inserted (see create()), not by a separate query.
+        """
+        return value.lower()
 
     def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
         """Validate password confirmation and password strength."""
@@ -69,15 +85,26 @@ class RegisterSerializer(serializers.Serializer):
         return attrs
 
     def create(self, validated_data: dict[str, Any]) -> User:
-        """Create a new user with the validated data."""
+        """
+        Create a new user with the validated data.
+
+        Raises ValidationError if the email is taken, including by a
+        concurrent registration. Other integrity errors are re-raised.
+        """
         validated_data.pop("password_confirm")
         password = validated_data.pop("password")
 
-        user = User.objects.create_user(
-            email=validated_data["email"],
-            password=password,
-            full_name=validated_data.get("full_name", ""),
-        )
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    email=validated_data["email"],
+                    password=password,
+                    full_name=validated_data.get("full_name", ""),
+                )
+        except IntegrityError as error:
+            if not is_duplicate_email(error):
+                raise
+            raise serializers.ValidationError({"email": [DUPLICATE_EMAIL_MESSAGE]})
         return user
 
 
@@ -201,14 +228,25 @@ class UpdateProfileSerializer(serializers.ModelSerializer):
             return email
 
         # Email is being changed, check if new email already exists
-        if User.objects.filter(email__iexact=email).exists():
-            raise serializers.ValidationError("A user with this email already exists.")
+        if User.objects.with_email(email).exists():
+            raise serializers.ValidationError(DUPLICATE_EMAIL_MESSAGE)
 
         return email
 
     def update(self, instance: User, validated_data: dict[str, Any]) -> User:
-        """Update the user instance with validated data."""
+        """
+        Update the user instance with validated data.
+
+        Raises ValidationError if another user claimed the email after
+        validate_email() checked it. Other integrity errors are re-raised.
+        """
         instance.email = validated_data.get("email", instance.email)
         instance.full_name = validated_data.get("full_name", instance.full_name)
-        instance.save()
+        try:
+            with transaction.atomic():
+                instance.save()
+        except IntegrityError as error:
+            if not is_duplicate_email(error):
+                raise
+            raise serializers.ValidationError({"email": [DUPLICATE_EMAIL_MESSAGE]})
         return instance
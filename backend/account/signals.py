@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from account.caches import invalidate_cached_user
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_cache_on_save(
+    sender: type[User],
+    instance: User,
+    **kwargs: dict,
+) -> None:
+    """
+    Drop the cached auth snapshot when a user is saved.
+
+    Covers profile edits, deactivation and password changes, all of which
+    go through User.save().
+    """
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_user_cache_on_delete(
+    sender: type[User],
+    instance: User,
+    **kwargs: dict,
+) -> None:
+    """Drop the cached auth snapshot when a user is deleted."""
+    invalidate_cached_user(instance.pk)
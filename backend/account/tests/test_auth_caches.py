@@ -0,0 +1,346 @@
+"""
+Tests for the per-process caches used by CookieJWTAuthentication.
+
+These tests verify:
+- Repeated authenticated requests skip the User query
+- Saving the user (profile edit, deactivation) invalidates the snapshot
+- Views never mutate the cached snapshot
+- Verified access tokens are reused until their "exp" claim
+- Refresh-token blacklist checks are answered from the in-memory filters,
+  which are loaded in chunks, catch up with out-of-order commits, drop
+  expired tokens and lose no JTI added by concurrent threads
+- The caches can be disabled via settings
+"""
+
+import hashlib
+import sys
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import AccessToken
+
+from account.authentication import CookieJWTAuthentication
+from account.blacklist import BUCKET_SECONDS, BlacklistIndex, BloomFilter
+from account.caches import blacklist_index, token_cache, user_cache
+from account.tokens import RefreshToken
+from core.caches import LRUCache
+
+User = get_user_model()
+
+
+@override_settings(
+    # Use a simple secret key for testing
+    SECRET_KEY="test-secret-key-for-testing-only",
+    # Disable secure cookies for testing
+    JWT_COOKIE_SECURE=False,
+)
+class UserSnapshotCacheTests(TestCase):
+    """Tests for user snapshot caching in CookieJWTAuthentication."""
+
+    def setUp(self) -> None:
+        user_cache.clear()
+        self.client = APIClient()
+        self.me_url = "/api/auth/me/"
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            password="SecurePass123!",
+            full_name="Test User",
+        )
+        self.client.cookies[settings.JWT_ACCESS_COOKIE_NAME] = str(
+            AccessToken.for_user(self.user)
+        )
+
+    def test_second_request_skips_user_query(self) -> None:
+        """Test the user is loaded once and then served from the cache."""
+        with self.assertNumQueries(1):
+            response = self.client.get(self.me_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.me_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["email"], "test@example.com")
+
+    def test_save_invalidates_snapshot(self) -> None:
+        """Test saving the user drops the cached snapshot."""
+        self.client.get(self.me_url)
+
+        self.user.full_name = "Renamed User"
+        self.user.save()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.me_url)
+        self.assertEqual(response.data["full_name"], "Renamed User")
+
+    def test_deactivation_rejects_cached_user(self) -> None:
+        """Test a deactivated user is rejected even after being cached."""
+        self.client.get(self.me_url)
+
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(self.me_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_update_does_not_leak_into_snapshot(self) -> None:
+        """Test a failed in-view mutation does not alter the cached snapshot."""
+        self.client.get(self.me_url)
+        cached = user_cache.get(str(self.user.pk))
+
+        response = self.client.put(
+            "/api/profile/",
+            {"email": "not-an-email", "full_name": "Changed"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(cached.full_name, "Test User")
+
+    def test_cache_can_be_disabled(self) -> None:
+        """Test every request queries the user when the cache is disabled."""
+        cache_settings = {**settings.AUTH_USER_CACHE, "ENABLED": False}
+        with override_settings(AUTH_USER_CACHE=cache_settings):
+            self.client.get(self.me_url)
+            with self.assertNumQueries(1):
+                self.client.get(self.me_url)
+
+
+@override_settings(
+    # Use a simple secret key for testing
+    SECRET_KEY="test-secret-key-for-testing-only",
+)
+class VerifiedTokenCacheTests(TestCase):
+    """Tests for the verified access token LRU in CookieJWTAuthentication."""
+
+    def setUp(self) -> None:
+        token_cache.clear()
+        self.authenticator = CookieJWTAuthentication()
+        self.user = User.objects.create_user(email="test@example.com")
+        self.raw_token = str(AccessToken.for_user(self.user))
+
+    def test_repeated_token_is_verified_once(self) -> None:
+        """Test the signature is checked only on the first use of a token."""
+        with mock.patch.object(
+            AccessToken, "__init__", autospec=True, side_effect=AccessToken.__init__
+        ) as token_init:
+            first = self.authenticator.get_validated_token(self.raw_token)
+            second = self.authenticator.get_validated_token(self.raw_token)
+
+        self.assertEqual(token_init.call_count, 1)
+        self.assertIs(first, second)
+        self.assertEqual(token_cache.stats.hits, 1)
+        self.assertEqual(token_cache.stats.hit_rate, 0.5)
+
+    def test_entry_expires_with_token(self) -> None:
+        """Test a cached token is dropped once its exp claim passes."""
+        token = AccessToken.for_user(self.user)
+        token.set_exp(lifetime=timedelta(seconds=1))
+        raw_token = str(token)
+        key = hashlib.sha256(raw_token.encode()).digest()
+
+        self.authenticator.get_validated_token(raw_token)
+        self.assertIsNotNone(token_cache.get(key))
+
+        expired = time.monotonic() + 2
+        with mock.patch("core.caches.time.monotonic", return_value=expired):
+            self.assertIsNone(token_cache.get(key))
+
+    def test_invalid_token_is_not_cached(self) -> None:
+        """Test tokens that fail validation never enter the cache."""
+        with self.assertRaises(InvalidToken):
+            self.authenticator.get_validated_token(self.raw_token + "x")
+        self.assertEqual(len(token_cache), 0)
+
+    def test_cache_can_be_disabled(self) -> None:
+        """Test tokens are not cached when the cache is disabled."""
+        cache_settings = {**settings.AUTH_TOKEN_CACHE, "ENABLED": False}
+        with override_settings(AUTH_TOKEN_CACHE=cache_settings):
+            self.authenticator.get_validated_token(self.raw_token)
+        self.assertEqual(len(token_cache), 0)
+
+
+@override_settings(
+    # Use a simple secret key for testing
+    SECRET_KEY="test-secret-key-for-testing-only",
+)
+class BlacklistIndexTests(TestCase):
+    """Tests for the in-memory refresh-token blacklist index."""
+
+    def setUp(self) -> None:
+        blacklist_index.clear()
+        self.user = User.objects.create_user(email="test@example.com")
+        self.raw_token = str(RefreshToken.for_user(self.user))
+
+    def blacklist_row(self, row_id: int | None = None) -> RefreshToken:
+        """Blacklist a new token the way another process would."""
+        token = RefreshToken.for_user(self.user)
+        BlacklistedToken.objects.create(
+            id=row_id, token=OutstandingToken.objects.get(jti=token["jti"])
+        )
+        return token
+
+    def test_negative_lookup_skips_database(self) -> None:
+        """Test parsing a valid refresh token queries nothing once warm."""
+        blacklist_index.refresh(full=True)
+
+        with self.assertNumQueries(0):
+            RefreshToken(self.raw_token)
+
+    def test_blacklisted_token_confirmed_by_query(self) -> None:
+        """Test a token blacklisted by this process is rejected on one query."""
+        RefreshToken(self.raw_token).blacklist()
+        blacklist_index.refresh(full=True)
+
+        with self.assertNumQueries(1), self.assertRaises(TokenError):
+            RefreshToken(self.raw_token)
+
+    def test_false_positive_falls_back_to_query(self) -> None:
+        """Test a filter hit for a token that isn't blacklisted is accepted."""
+        blacklist_index.refresh(full=True)
+
+        with mock.patch.object(BloomFilter, "__contains__", return_value=True):
+            blacklist_index.add("0" * 32, RefreshToken(self.raw_token)["exp"])
+            with self.assertNumQueries(1):
+                RefreshToken(self.raw_token)
+
+    def test_picks_up_rows_written_elsewhere(self) -> None:
+        """Test JTIs blacklisted by another process appear after a refresh."""
+        blacklist_index.refresh(full=True)
+        token = self.blacklist_row()
+        self.assertFalse(blacklist_index.may_contain(token["jti"], token["exp"]))
+
+        blacklist_index.refresh()
+
+        self.assertTrue(blacklist_index.may_contain(token["jti"], token["exp"]))
+
+    def test_rows_committed_out_of_id_order(self) -> None:
+        """Test a row committed after a higher id is still picked up."""
+        self.blacklist_row()
+        base = BlacklistedToken.objects.get().id
+        blacklist_index.refresh(full=True)
+        self.blacklist_row(base + 2)
+        blacklist_index.refresh()
+        late = self.blacklist_row(base + 1)
+
+        blacklist_index.refresh()
+
+        self.assertTrue(blacklist_index.may_contain(late["jti"], late["exp"]))
+
+    def test_loads_in_chunks(self) -> None:
+        """Test the table is loaded a chunk per lookup until caught up."""
+        tokens = [self.blacklist_row() for _ in range(3)]
+
+        with mock.patch("account.blacklist.LOAD_CHUNK", 2):
+            blacklist_index.refresh()
+            self.assertEqual(len(blacklist_index), 2)
+
+            # The next lookup reads the next chunk instead of waiting
+            with self.assertNumQueries(1):
+                blacklist_index.may_contain("0" * 32, tokens[0]["exp"])
+
+        self.assertEqual(len(blacklist_index), 3)
+        with self.assertNumQueries(0):
+            self.assertFalse(blacklist_index.may_contain("0" * 32, tokens[0]["exp"]))
+
+    def test_expired_tokens_are_dropped(self) -> None:
+        """Test expired tokens aren't loaded, and their buckets are dropped."""
+        token = RefreshToken(self.raw_token)
+        token.blacklist()
+        self.assertEqual(len(blacklist_index), 1)
+
+        later = timezone.now() + settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"]
+        with mock.patch(
+            "account.blacklist.timezone.now", return_value=later + timedelta(days=1)
+        ):
+            blacklist_index.refresh()
+
+        self.assertEqual(len(blacklist_index), 0)
+
+    def test_concurrent_adds_are_not_lost(self) -> None:
+        """Test JTIs added by racing threads, during bucket drops, all stay."""
+        # Small filters, so threads keep writing the same bytes
+        index = BlacklistIndex(refresh_interval=60, bits=64, hashes=4)
+        index._loaded, index._next_refresh = True, float("inf")
+        now = time.time()
+        # A new bucket per JTI, so adds keep inserting while buckets are dropped
+        jtis = [
+            [(f"{n:04x}{i:028x}", now + BUCKET_SECONDS * (i + 1)) for i in range(2_000)]
+            for n in range(4)
+        ]
+        start = threading.Barrier(len(jtis) + 1)
+        errors = []
+
+        def add(batch: list[tuple[str, float]]) -> None:
+            start.wait()
+            for jti, expires in batch:
+                index.add(jti, expires)
+
+        def drop_expired() -> None:
+            start.wait()
+            try:
+                for n in range(2_000):
+                    # A bucket that is already expired, so every drop rebuilds
+                    index.add(f"{n:032x}", now - 2 * BUCKET_SECONDS)
+                    index._drop_expired(now)
+            except RuntimeError as error:
+                errors.append(error)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+        threads = [threading.Thread(target=add, args=(batch,)) for batch in jtis]
+        threads.append(threading.Thread(target=drop_expired))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(index), sum(len(batch) for batch in jtis))
+        for batch in jtis:
+            for jti, expires in batch:
+                self.assertTrue(index.may_contain(jti, expires))
+
+    def test_index_can_be_disabled(self) -> None:
+        """Test the table is queried directly when the index is disabled."""
+        index_settings = {**settings.TOKEN_BLACKLIST_INDEX, "ENABLED": False}
+        with override_settings(TOKEN_BLACKLIST_INDEX=index_settings):
+            with self.assertNumQueries(1):
+                RefreshToken(self.raw_token)
+
+
+class LRUCacheTests(TestCase):
+    """Tests for the generic LRU cache backing the snapshot cache."""
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Test the oldest untouched entry is evicted when full."""
+        cache = LRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats.evictions, 1)
+
+    def test_expired_entries_are_misses(self) -> None:
+        """Test entries past their TTL are not returned."""
+        cache = LRUCache(max_entries=10, ttl_seconds=60)
+        cache.set("a", 1, ttl=0)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats.misses, 1)
+        self.assertEqual(len(cache), 0)
@@ -0,0 +1,83 @@
+"""
+Tests for ETag revalidation of the current user and profile endpoints.
+
+These tests verify:
+- GET responses carry a weak ETag and private, no-cache caching headers
+- A matching If-None-Match returns an empty 304 without queries
+- Changing the user changes the ETag
+- Different endpoints and media types never share an ETag
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from account.caches import user_cache
+
+User = get_user_model()
+
+
+@override_settings(
+    # Use a simple secret key for testing
+    SECRET_KEY="test-secret-key-for-testing-only",
+    # Disable secure cookies for testing
+    JWT_COOKIE_SECURE=False,
+)
+class UserConditionalGetTests(TestCase):
+    """Tests for conditional GET on /api/auth/me/ and /api/profile/."""
+
+    def setUp(self) -> None:
+        user_cache.clear()
+        self.user = User.objects.create_user(email="test@example.com")
+        self.client = APIClient()
+        self.client.cookies[settings.JWT_ACCESS_COOKIE_NAME] = str(
+            AccessToken.for_user(self.user)
+        )
+
+    def test_get_returns_etag(self) -> None:
+        """Test GET responses carry an ETag and revalidation headers."""
+        response = self.client.get("/api/auth/me/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_matching_etag_returns_304_without_queries(self) -> None:
+        """Test a revalidation with the current ETag is an empty 304."""
+        for url in ("/api/auth/me/", "/api/profile/"):
+            with self.subTest(url=url):
+                etag = self.client.get(url)["ETag"]
+
+                with self.assertNumQueries(0):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+                self.assertEqual(response.content, b"")
+                self.assertEqual(response["ETag"], etag)
+
+    def test_update_changes_etag(self) -> None:
+        """Test saving the user invalidates the old ETag."""
+        etag = self.client.get("/api/profile/")["ETag"]
+
+        self.client.put(
+            "/api/profile/",
+            {"email": "test@example.com", "full_name": "New Name"},
+            format="json",
+        )
+        response = self.client.get("/api/profile/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["full_name"], "New Name")
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_etag_differs_by_endpoint_and_media_type(self) -> None:
+        """Test representations that differ never share an ETag."""
+        me = self.client.get("/api/auth/me/")["ETag"]
+        profile = self.client.get("/api/profile/")["ETag"]
+        html = self.client.get("/api/auth/me/", HTTP_ACCEPT="text/html")["ETag"]
+
+        self.assertEqual(len({me, profile, html}), 3)
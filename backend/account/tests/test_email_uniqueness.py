@@ -0,0 +1,119 @@
+"""
+Tests for case-insensitive email uniqueness via the lower(email) index.
+
+These tests verify:
+- The database rejects emails that differ only by case
+- Registration reports a taken email as a field error without a pre-check query
+- Profile updates report emails taken after validation as field errors
+- Integrity errors from other constraints are not reported as a taken email
+- Case-insensitive lookups use the functional index
+"""
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, override_settings
+from rest_framework import serializers, status
+from rest_framework.test import APIClient
+
+from account.serializers import UpdateProfileSerializer
+
+User = get_user_model()
+
+
+@override_settings(
+    # Use a simple secret key for testing
+    SECRET_KEY="test-secret-key-for-testing-only",
+    # Disable secure cookies for testing
+    JWT_COOKIE_SECURE=False,
+)
+class EmailUniquenessTests(TestCase):
+    """Tests for the unique lower(email) index."""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="Jane@example.com", password="SecurePass123!"
+        )
+
+    def test_database_rejects_case_variants(self) -> None:
+        """Test inserting an email differing only by case fails."""
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.create_user(email="JANE@example.com")
+
+    def test_register_case_variant_rejected(self) -> None:
+        """Test registering a case variant of an existing email returns 400."""
+        response = self.client.post(
+            "/api/auth/register/",
+            {
+                "email": "jane@EXAMPLE.com",
+                "password": "AnotherPass123!",
+                "password_confirm": "AnotherPass123!",
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("email", response.data)
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_profile_update_conflict_after_validation(self) -> None:
+        """Test an email claimed between validation and save is a field error."""
+        other = User.objects.create_user(email="other@example.com")
+        serializer = UpdateProfileSerializer(
+            other, data={"email": "taken@example.com", "full_name": ""}
+        )
+        self.assertTrue(serializer.is_valid())
+        User.objects.create_user(email="Taken@example.com")
+
+        with self.assertRaises(serializers.ValidationError) as context:
+            serializer.save()
+
+        self.assertIn("email", context.exception.detail)
+
+    def test_profile_update_other_constraint_not_reported_as_email(self) -> None:
+        """Test a different constraint violation is re-raised on update."""
+        serializer = UpdateProfileSerializer(
+            self.user, data={"email": "new@example.com", "full_name": ""}
+        )
+        self.assertTrue(serializer.is_valid())
+        # Violates account_user_token_generation_check
+        self.user.token_generation = -1
+
+        with self.assertRaises(IntegrityError):
+            serializer.save()
+
+    def test_register_other_integrity_error_not_reported_as_email(self) -> None:
+        """Test registration re-raises integrity errors not about the email."""
+        with (
+            mock.patch.object(
+                User.objects, "create_user", side_effect=IntegrityError("other")
+            ),
+            self.assertRaises(IntegrityError),
+        ):
+            self.client.post(
+                "/api/auth/register/",
+                {
+                    "email": "new@example.com",
+                    "password": "AnotherPass123!",
+                    "password_confirm": "AnotherPass123!",
+                },
+                format="json",
+            )
+
+    def test_with_email_ignores_case(self) -> None:
+        """Test with_email matches regardless of case."""
+        self.assertEqual(User.objects.with_email("JANE@EXAMPLE.COM").get(), self.user)
+        self.assertFalse(User.objects.with_email("jane@example.org").exists())
+
+    def test_with_email_uses_index(self) -> None:
+        """Test the lookup is planned as an index scan on lower(email)."""
+        queryset = User.objects.with_email("jane@example.com")
+
+        # The test table is tiny; make the planner prefer any usable index.
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = queryset.explain()
+
+        self.assertIn("account_user_email_lower_uniq", plan)
@@ -0,0 +1,108 @@
+"""
+Tests for hashing passwords on the bounded hashing pool.
+
+These tests verify:
+- Work submitted to the executor runs on a pool thread and returns its result
+- Calls beyond the worker and queue limits are rejected
+- Metrics count submitted, completed and rejected work
+- The pooled hasher verifies hashes made by Django's PBKDF2 hasher
+- Login returns 503 while the hashing queue is full
+"""
+
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, check_password
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from account.hashers import HashingExecutor, PasswordHashingBusy, hashing_executor
+
+User = get_user_model()
+
+
+class HashingExecutorTests(SimpleTestCase):
+    """Tests for HashingExecutor."""
+
+    def test_runs_on_pool_thread(self) -> None:
+        """Test work runs off the calling thread and returns its result."""
+        executor = HashingExecutor(max_workers=1, max_queue=0)
+
+        name = executor.run(lambda: threading.current_thread().name)
+
+        self.assertTrue(name.startswith("password-hashing"))
+        self.assertEqual(executor.metrics.completed, 1)
+
+    def test_rejects_when_queue_full(self) -> None:
+        """Test calls beyond max_workers + max_queue raise PasswordHashingBusy."""
+        executor = HashingExecutor(max_workers=1, max_queue=1)
+        release = threading.Event()
+        started = threading.Event()
+
+        def block() -> None:
+            started.set()
+            release.wait(5)
+
+        callers = [threading.Thread(target=executor.run, args=(block,))]
+        callers.append(threading.Thread(target=executor.run, args=(release.wait, 5)))
+        callers[0].start()
+        started.wait(5)
+        callers[1].start()
+        while executor.metrics.in_flight < 2:
+            time.sleep(0.001)
+
+        with self.assertRaises(PasswordHashingBusy):
+            executor.run(lambda: None)
+
+        release.set()
+        for caller in callers:
+            caller.join()
+
+        metrics = executor.metrics
+        self.assertEqual(metrics.submitted, 2)
+        self.assertEqual(metrics.completed, 2)
+        self.assertEqual(metrics.rejected, 1)
+        self.assertEqual(metrics.in_flight, 0)
+        self.assertEqual(metrics.max_in_flight, 2)
+
+    def test_exceptions_propagate(self) -> None:
+        """Test errors raised by the work reach the caller."""
+        executor = HashingExecutor(max_workers=1, max_queue=0)
+
+        with self.assertRaises(ZeroDivisionError):
+            executor.run(lambda: 1 / 0)
+        self.assertEqual(executor.metrics.in_flight, 0)
+
+
+class PooledHasherTests(TestCase):
+    """Tests for PooledPBKDF2PasswordHasher."""
+
+    def test_verifies_existing_pbkdf2_hashes(self) -> None:
+        """Test hashes made by Django's hasher still verify through the pool."""
+        encoded = PBKDF2PasswordHasher().encode("SecurePass123!", "somesalt")
+        hashing_executor.reset_metrics()
+
+        self.assertTrue(check_password("SecurePass123!", encoded))
+        self.assertEqual(hashing_executor.metrics.completed, 1)
+
+    @override_settings(
+        SECRET_KEY="test-secret-key-for-testing-only",
+        JWT_COOKIE_SECURE=False,
+    )
+    def test_login_returns_503_when_busy(self) -> None:
+        """Test login is rejected with 503 rather than queueing without bound."""
+        User.objects.create_user(email="test@example.com", password="SecurePass123!")
+
+        with mock.patch.object(
+            hashing_executor, "run", side_effect=PasswordHashingBusy
+        ):
+            response = APIClient().post(
+                "/api/auth/login/",
+                {"email": "test@example.com", "password": "SecurePass123!"},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
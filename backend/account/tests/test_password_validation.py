@@ -0,0 +1,209 @@
+"""
+Tests for the compiled common-password and prefiltered similarity validators.
+
+These tests verify:
+- The compiled list rejects exactly the passwords Django's list rejects
+- A missing compiled file is built on first load
+- A compiled file of another list, or an older version of it, is rebuilt
+- A custom list isn't compiled over the default compiled file
+- A corrupt compiled file is rebuilt
+- A compiled file that can't be written falls back to the in-memory list
+- compile_common_passwords writes the compiled file
+- The similarity validator accepts and rejects the same passwords as Django's
+"""
+
+import gzip
+import random
+import string
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.password_validation import (
+    CommonPasswordValidator,
+    UserAttributeSimilarityValidator,
+)
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from account.password_validation import (
+    DJANGO_PASSWORD_LIST_PATH,
+    CompiledCommonPasswordValidator,
+    CompiledPasswordList,
+    FastUserAttributeSimilarityValidator,
+    compile_password_list,
+)
+
+User = get_user_model()
+
+
+def rejects(validator, password: str, user=None) -> bool:
+    try:
+        validator.validate(password, user)
+    except ValidationError:
+        return True
+    return False
+
+
+class CompiledCommonPasswordValidatorTests(SimpleTestCase):
+    """Tests for CompiledCommonPasswordValidator."""
+
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.compiled_path = self.tmp / "common-passwords.bin"
+
+    def test_matches_django_list(self) -> None:
+        """Test every listed password is rejected and others are accepted."""
+        with gzip.open(DJANGO_PASSWORD_LIST_PATH, "rt", encoding="utf-8") as f:
+            listed = {line.strip() for line in f}
+
+        validator = CompiledCommonPasswordValidator(compiled_path=self.compiled_path)
+
+        self.assertEqual(len(validator.passwords), len(listed))
+        for password in listed:
+            self.assertIn(password, validator.passwords)
+        for password in ("SecurePass123!", "correct-horse-battery", "Xk9!qz#Lm2"):
+            self.assertEqual(
+                rejects(validator, password),
+                rejects(CommonPasswordValidator(), password),
+            )
+        self.assertTrue(rejects(validator, "  PASSWORD  "))
+
+    def test_builds_missing_file(self) -> None:
+        """Test the compiled file is created from the source list on load."""
+        source = self.tmp / "passwords.txt"
+        source.write_text("hunter2\nletmein\n")
+
+        validator = CompiledCommonPasswordValidator(
+            compiled_path=self.compiled_path, password_list_path=source
+        )
+
+        self.assertTrue(self.compiled_path.exists())
+        self.assertTrue(rejects(validator, "Hunter2"))
+        self.assertFalse(rejects(validator, "hunter3"))
+
+    def test_rebuilds_file_of_other_list(self) -> None:
+        """Test a file compiled from another list is compiled again."""
+        compile_password_list(DJANGO_PASSWORD_LIST_PATH, self.compiled_path)
+        source = self.tmp / "passwords.txt"
+        source.write_text("hunter2\n")
+
+        validator = CompiledCommonPasswordValidator(
+            compiled_path=self.compiled_path, password_list_path=source
+        )
+
+        self.assertTrue(rejects(validator, "hunter2"))
+        self.assertFalse(rejects(validator, "password"))
+
+    def test_rebuilds_file_of_changed_list(self) -> None:
+        """Test editing the list recompiles it on the next load."""
+        source = self.tmp / "passwords.txt"
+        source.write_text("hunter2\n")
+        compile_password_list(source, self.compiled_path)
+        source.write_text("hunter2\nletmein\n")
+
+        validator = CompiledCommonPasswordValidator(
+            compiled_path=self.compiled_path, password_list_path=source
+        )
+
+        self.assertTrue(rejects(validator, "letmein"))
+
+    def test_custom_list_default_path(self) -> None:
+        """Test a custom list without a compiled path gets its own file."""
+        source = self.tmp / "passwords.txt"
+        source.write_text("hunter2\n")
+
+        with override_settings(COMMON_PASSWORDS_PATH=self.compiled_path):
+            compile_password_list(DJANGO_PASSWORD_LIST_PATH, self.compiled_path)
+            validator = CompiledCommonPasswordValidator(password_list_path=source)
+            default = CompiledCommonPasswordValidator()
+
+        self.assertTrue(rejects(validator, "hunter2"))
+        self.assertFalse(rejects(validator, "password"))
+        self.assertTrue(rejects(default, "password"))
+        self.assertEqual(len(list(self.tmp.glob("common-passwords-*.bin"))), 1)
+
+    def test_rebuilds_corrupt_file(self) -> None:
+        """Test a truncated compiled file is compiled again from the source."""
+        source = self.tmp / "passwords.txt"
+        source.write_text("hunter2\n")
+        self.compiled_path.write_bytes(b"not a password list")
+
+        validator = CompiledCommonPasswordValidator(
+            compiled_path=self.compiled_path, password_list_path=source
+        )
+
+        self.assertIsInstance(validator.passwords, CompiledPasswordList)
+        self.assertTrue(rejects(validator, "hunter2"))
+
+    def test_unwritable_file_falls_back_to_memory(self) -> None:
+        """Test the source is loaded into memory if it can't be compiled."""
+        source = self.tmp / "passwords.txt"
+        source.write_text("hunter2\n")
+        # A file where the compiled file's directory should be
+        compiled_path = source / "common-passwords.bin"
+
+        with self.assertLogs("account.password_validation", "WARNING"):
+            validator = CompiledCommonPasswordValidator(
+                compiled_path=compiled_path, password_list_path=source
+            )
+
+        self.assertEqual(validator.passwords, {"hunter2"})
+        self.assertTrue(rejects(validator, "hunter2"))
+
+    def test_empty_list(self) -> None:
+        """Test a compiled empty list matches nothing."""
+        source = self.tmp / "passwords.txt"
+        source.write_text("")
+        compile_password_list(source, self.compiled_path)
+
+        self.assertNotIn("anything", CompiledPasswordList(self.compiled_path))
+
+    def test_command_compiles_list(self) -> None:
+        """Test compile_common_passwords writes the compiled file."""
+        out = StringIO()
+
+        call_command(
+            "compile_common_passwords", output=str(self.compiled_path), stdout=out
+        )
+
+        self.assertIn("password", CompiledPasswordList(self.compiled_path))
+        self.assertIn("Compiled", out.getvalue())
+
+
+class FastUserAttributeSimilarityValidatorTests(SimpleTestCase):
+    """Tests for FastUserAttributeSimilarityValidator."""
+
+    def test_matches_django_validator(self) -> None:
+        """Test decisions match Django's validator on generated passwords."""
+        user = User(email="jane.doe@example.com", full_name="Jane Doe")
+        rng = random.Random(0)
+        alphabet = string.ascii_lowercase + string.digits + ".@"
+        passwords = ["jane.doe@example.com", "janedoe", "doe", "", "example123"]
+        passwords += [
+            "".join(rng.choices(alphabet, k=rng.randint(1, 30))) for _ in range(500)
+        ]
+
+        for max_similarity in (0.1, 0.5, 0.7, 1.0):
+            django = UserAttributeSimilarityValidator(max_similarity=max_similarity)
+            fast = FastUserAttributeSimilarityValidator(max_similarity=max_similarity)
+            for password in passwords:
+                with self.subTest(password=password, max_similarity=max_similarity):
+                    self.assertEqual(
+                        rejects(fast, password, user),
+                        rejects(django, password, user),
+                    )
+
+    def test_error_names_attribute(self) -> None:
+        """Test the error message names the matched field."""
+        user = User(email="jane.doe@example.com", full_name="Jane Doe")
+
+        with self.assertRaises(ValidationError) as context:
+            FastUserAttributeSimilarityValidator().validate("jane.doe@example", user)
+
+        self.assertEqual(context.exception.code, "password_too_similar")
+        self.assertIn("email", str(context.exception.messages[0]))
@@ -0,0 +1,91 @@
+"""
+Tests for the prune_tokens management command.
+
+These tests verify:
+- Expired outstanding and blacklisted tokens are deleted
+- Unexpired tokens are kept, including blacklisted ones
+- Work is split into batches and can stop early and resume
+- Dry runs delete nothing
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+User = get_user_model()
+
+
+class PruneTokensCommandTests(TestCase):
+    """Tests for batched pruning of expired JWT rows."""
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(email="test@example.com")
+        now = timezone.now()
+        self.expired = [
+            self.create_token(f"expired-{i}", now - timedelta(days=1, minutes=i))
+            for i in range(5)
+        ]
+        self.live = [
+            self.create_token(f"live-{i}", now + timedelta(days=1)) for i in range(2)
+        ]
+        BlacklistedToken.objects.create(token=self.expired[0])
+        BlacklistedToken.objects.create(token=self.live[0])
+
+    def create_token(self, jti: str, expires_at) -> OutstandingToken:
+        """Create an outstanding token row with the given expiry."""
+        return OutstandingToken.objects.create(
+            user=self.user,
+            jti=jti,
+            token="token",
+            created_at=expires_at - timedelta(days=7),
+            expires_at=expires_at,
+        )
+
+    def prune(self, **options) -> str:
+        """Run the command without throttling and return its output."""
+        out = StringIO()
+        call_command("prune_tokens", sleep=0, stdout=out, **options)
+        return out.getvalue()
+
+    def test_deletes_only_expired_rows(self) -> None:
+        """Test expired rows go and unexpired rows stay."""
+        self.prune()
+
+        self.assertEqual(
+            set(OutstandingToken.objects.values_list("jti", flat=True)),
+            {"live-0", "live-1"},
+        )
+        self.assertEqual(
+            list(BlacklistedToken.objects.values_list("token__jti", flat=True)),
+            ["live-0"],
+        )
+
+    def test_stops_after_max_batches_and_resumes(self) -> None:
+        """Test an interrupted run deletes the oldest rows and can resume."""
+        output = self.prune(batch_size=2, max_batches=1)
+
+        self.assertIn("in 1 batches", output)
+        remaining = set(OutstandingToken.objects.values_list("jti", flat=True))
+        # Oldest first: expired-4 and expired-3 expired earliest
+        self.assertNotIn("expired-4", remaining)
+        self.assertNotIn("expired-3", remaining)
+        self.assertIn("expired-0", remaining)
+
+        output = self.prune(batch_size=2)
+        self.assertIn("Pruned 3 outstanding and 1 blacklisted", output)
+        self.assertEqual(OutstandingToken.objects.count(), 2)
+
+    def test_dry_run_deletes_nothing(self) -> None:
+        """Test --dry-run only reports counts."""
+        output = self.prune(dry_run=True)
+
+        self.assertIn("Would delete 5 outstanding and 1 blacklisted", output)
+        self.assertEqual(OutstandingToken.objects.count(), 7)
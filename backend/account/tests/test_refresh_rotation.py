@@ -0,0 +1,96 @@
+"""
+Tests for single-flight refresh-token rotation.
+
+These tests verify:
+- Duplicate refreshes within the grace window share one rotation
+- Only one new outstanding token and one blacklist row are written
+- Reusing a rotated token after the grace window is rejected
+- Revoked and blacklisted tokens are still rejected
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from account.caches import blacklist_index
+from account.tokens import RefreshToken, revoke_all_sessions, rotate_refresh_token
+
+User = get_user_model()
+
+
+@override_settings(
+    # Use a simple secret key for testing
+    SECRET_KEY="test-secret-key-for-testing-only",
+    # Disable secure cookies for testing
+    JWT_COOKIE_SECURE=False,
+)
+class RefreshRotationTests(TestCase):
+    """Tests for coalesced refresh-token rotation."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        blacklist_index.clear()
+        self.user = User.objects.create_user(email="test@example.com")
+        self.raw_token = str(RefreshToken.for_user(self.user))
+
+    def test_duplicate_refreshes_share_one_rotation(self) -> None:
+        """Test two tabs refreshing with one cookie get the same new pair."""
+        first = rotate_refresh_token(self.raw_token)
+        with self.assertNumQueries(0):
+            second = rotate_refresh_token(self.raw_token)
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first.refresh, self.raw_token)
+        self.assertEqual(OutstandingToken.objects.count(), 2)
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+
+    def test_duplicate_refresh_endpoint_calls_succeed(self) -> None:
+        """Test concurrent endpoint calls both succeed with the same cookies."""
+        responses = []
+        for _ in range(2):
+            client = APIClient()
+            client.cookies[settings.JWT_REFRESH_COOKIE_NAME] = self.raw_token
+            responses.append(client.post("/api/auth/refresh/"))
+
+        for response in responses:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            responses[0].cookies[settings.JWT_REFRESH_COOKIE_NAME].value,
+            responses[1].cookies[settings.JWT_REFRESH_COOKIE_NAME].value,
+        )
+
+    def test_reuse_after_grace_window_is_rejected(self) -> None:
+        """Test a rotated token is rejected once the grace window has passed."""
+        rotate_refresh_token(self.raw_token)
+        cache.clear()
+
+        with self.assertRaises(TokenError):
+            rotate_refresh_token(self.raw_token)
+
+    def test_stale_index_still_rejects_blacklisted_token(self) -> None:
+        """Test the locked row catches tokens blacklisted by another worker."""
+        blacklist_index.refresh(full=True)
+        token = RefreshToken(self.raw_token)
+        BlacklistedToken.objects.create(
+            token=OutstandingToken.objects.get(jti=token["jti"])
+        )
+        self.assertFalse(blacklist_index.may_contain(token["jti"], token["exp"]))
+
+        with self.assertRaises(TokenError):
+            rotate_refresh_token(self.raw_token)
+
+    def test_revoked_token_is_rejected(self) -> None:
+        """Test tokens from a revoked generation cannot be rotated."""
+        revoke_all_sessions(self.user)
+
+        with self.assertRaises(TokenError):
+            rotate_refresh_token(self.raw_token)
+        self.assertEqual(BlacklistedToken.objects.count(), 0)
@@ -0,0 +1,183 @@
+"""
+Tests for revoking every session via the per-user token generation.
+
+These tests verify:
+- Issued tokens carry the user's token generation
+- Logging out everywhere rejects old access and refresh tokens
+- Revocation costs the same number of queries for any number of sessions
+- Changing the password revokes other sessions but not the new one
+- Tokens issued without a generation claim are treated as generation 0
+- Revocations are published to workers still holding a cached user
+"""
+
+import time
+from collections.abc import Callable
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken as PlainRefreshToken
+
+from account.caches import user_cache
+from account.tokens import TOKEN_GENERATION_CLAIM, RefreshToken, revoke_all_sessions
+
+User = get_user_model()
+
+
+@override_settings(
+    # Use a simple secret key for testing
+    SECRET_KEY="test-secret-key-for-testing-only",
+    # Disable secure cookies for testing
+    JWT_COOKIE_SECURE=False,
+)
+class SessionRevocationTests(TestCase):
+    """Tests for token generation based session revocation."""
+
+    def setUp(self) -> None:
+        user_cache.clear()
+        cache.clear()
+        self.test_password = "SecurePass123!"
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            password=self.test_password,
+        )
+
+    def client_for(self, refresh: PlainRefreshToken) -> APIClient:
+        """Return a client carrying cookies for the given refresh token."""
+        client = APIClient()
+        client.cookies[settings.JWT_ACCESS_COOKIE_NAME] = str(refresh.access_token)
+        client.cookies[settings.JWT_REFRESH_COOKIE_NAME] = str(refresh)
+        return client
+
+    def test_tokens_carry_generation_claim(self) -> None:
+        """Test refresh and derived access tokens include the generation."""
+        refresh = RefreshToken.for_user(self.user)
+
+        self.assertEqual(refresh[TOKEN_GENERATION_CLAIM], 0)
+        self.assertEqual(refresh.access_token[TOKEN_GENERATION_CLAIM], 0)
+
+    def test_logout_all_revokes_every_session(self) -> None:
+        """Test logging out everywhere rejects tokens from other devices."""
+        phone = self.client_for(RefreshToken.for_user(self.user))
+        laptop = self.client_for(RefreshToken.for_user(self.user))
+        self.assertEqual(phone.get("/api/auth/me/").status_code, status.HTTP_200_OK)
+
+        response = laptop.post("/api/auth/logout/all/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(
+            phone.get("/api/auth/me/").status_code, status.HTTP_401_UNAUTHORIZED
+        )
+        self.assertEqual(
+            phone.post("/api/auth/refresh/").status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+
+    def test_revocation_cost_is_independent_of_session_count(self) -> None:
+        """Test revoking is one UPDATE (plus a re-read) for many sessions."""
+        for _ in range(10):
+            RefreshToken.for_user(self.user)
+
+        with self.assertNumQueries(2):
+            revoke_all_sessions(self.user)
+
+        self.assertEqual(self.user.token_generation, 1)
+
+    def test_password_change_revokes_other_sessions(self) -> None:
+        """Test a password change rejects other sessions but keeps this one."""
+        other_device = self.client_for(RefreshToken.for_user(self.user))
+        this_device = self.client_for(RefreshToken.for_user(self.user))
+
+        response = this_device.post(
+            "/api/auth/password/change/",
+            {
+                "current_password": self.test_password,
+                "new_password": "NewSecurePass456!",
+                "new_password_confirm": "NewSecurePass456!",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(
+            other_device.get("/api/auth/me/").status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+        this_device.cookies[settings.JWT_ACCESS_COOKIE_NAME] = response.cookies[
+            settings.JWT_ACCESS_COOKIE_NAME
+        ].value
+        self.assertEqual(
+            this_device.get("/api/auth/me/").status_code, status.HTTP_200_OK
+        )
+
+    def test_token_without_claim_is_generation_zero(self) -> None:
+        """Test tokens issued before generations existed keep working."""
+        client = self.client_for(PlainRefreshToken.for_user(self.user))
+        self.assertEqual(client.get("/api/auth/me/").status_code, status.HTTP_200_OK)
+
+        revoke_all_sessions(self.user)
+        self.assertEqual(
+            client.get("/api/auth/me/").status_code, status.HTTP_401_UNAUTHORIZED
+        )
+
+    def revoke_elsewhere(self, revoke: Callable[[], object]) -> None:
+        """Revoke as another worker would, leaving this worker's snapshot."""
+        snapshot = user_cache.get(str(self.user.pk))
+        self.assertIsNotNone(snapshot)
+        with self.captureOnCommitCallbacks(execute=True):
+            revoke()
+        user_cache.set(str(self.user.pk), snapshot)
+
+    def test_revocation_reaches_other_workers(self) -> None:
+        """Test a cached snapshot behind the published generation is re-read."""
+        phone = self.client_for(RefreshToken.for_user(self.user))
+        self.assertEqual(phone.get("/api/auth/me/").status_code, status.HTTP_200_OK)
+
+        self.revoke_elsewhere(lambda: revoke_all_sessions(self.user))
+
+        self.assertEqual(
+            phone.get("/api/auth/me/").status_code, status.HTTP_401_UNAUTHORIZED
+        )
+
+    def test_password_change_reaches_other_workers(self) -> None:
+        """Test a password change on another worker rejects cached sessions."""
+        phone = self.client_for(RefreshToken.for_user(self.user))
+        laptop = self.client_for(RefreshToken.for_user(self.user))
+        self.assertEqual(phone.get("/api/auth/me/").status_code, status.HTTP_200_OK)
+
+        self.revoke_elsewhere(
+            lambda: laptop.post(
+                "/api/auth/password/change/",
+                {
+                    "current_password": self.test_password,
+                    "new_password": "NewSecurePass456!",
+                    "new_password_confirm": "NewSecurePass456!",
+                },
+                format="json",
+            )
+        )
+
+        self.assertEqual(
+            phone.get("/api/auth/me/").status_code, status.HTTP_401_UNAUTHORIZED
+        )
+
+    def test_unpublished_revocation_is_bounded_by_ttl(self) -> None:
+        """Test without a shared cache, a stale snapshot lives until its TTL."""
+        phone = self.client_for(RefreshToken.for_user(self.user))
+        self.assertEqual(phone.get("/api/auth/me/").status_code, status.HTTP_200_OK)
+        self.revoke_elsewhere(lambda: revoke_all_sessions(self.user))
+        # As if the cache weren't shared with the worker that revoked
+        cache.clear()
+
+        self.assertEqual(phone.get("/api/auth/me/").status_code, status.HTTP_200_OK)
+
+        expired = time.monotonic() + settings.AUTH_USER_CACHE["TTL_SECONDS"] + 1
+        with mock.patch("core.caches.time.monotonic", return_value=expired):
+            self.assertEqual(
+                phone.get("/api/auth/me/").status_code,
+                status.HTTP_401_UNAUTHORIZED,
+            )
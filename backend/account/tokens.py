@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from account.caches import blacklist_index, invalidate_cached_user
+
+if TYPE_CHECKING:
+    from rest_framework_simplejwt.tokens import Token
+
+    from account.models import User
+
+# Claim carrying the user's token_generation at the time of issue
+TOKEN_GENERATION_CLAIM = "token_gen"
+
+# Striped locks coalescing concurrent rotations of one token in this process
+_ROTATION_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+@dataclass(frozen=True)
+class TokenPair:
+    """Encoded access and refresh tokens issued together."""
+
+    access: str
+    refresh: str
+
+
+class TokenGenerationMixin(tokens.Token):
+    """Embed the user's current token generation in newly issued tokens."""
+
+    @classmethod
+    def for_user(cls, user: User) -> Token:
+        token = super().for_user(user)
+        token[TOKEN_GENERATION_CLAIM] = user.token_generation
+        return token
+
+
+class RefreshToken(tokens.RefreshToken, TokenGenerationMixin):
+    """
+    Refresh token carrying the user's token generation.
+
+    TokenGenerationMixin sits between BlacklistMixin and Token in the MRO, so
+    the claim is set before BlacklistMixin.for_user records the outstanding
+    token. Access tokens derived from it inherit the claim.
+
+    Tokens the per-process blacklist index rules out skip the blacklist
+    query; the query still confirms the index's hits.
+    """
+
+    def check_blacklist(self) -> None:
+        """Raise TokenError if this token's JTI is blacklisted."""
+        if not settings.TOKEN_BLACKLIST_INDEX["ENABLED"]:
+            return super().check_blacklist()
+
+        if blacklist_index.may_contain(
+            self.payload[api_settings.JTI_CLAIM], self.payload["exp"]
+        ):
+            super().check_blacklist()
+
+    def blacklist(self) -> tuple[BlacklistedToken, bool]:
+        """Blacklist this token and record it in the local index immediately."""
+        result = super().blacklist()
+        blacklist_index.add(self.payload[api_settings.JTI_CLAIM], self.payload["exp"])
+        return result
+
+
+def is_token_current(token: Token, user: User) -> bool:
+    """
+    Return True if the token was issued for the user's current generation.
+
+    Tokens issued before generations existed carry no claim and are treated
+    as generation 0.
+    """
+    return token.get(TOKEN_GENERATION_CLAIM, 0) == user.token_generation
+
+
+def check_token_generation(token: Token, user: User) -> None:
+    """Raise TokenError if the token belongs to a revoked generation."""
+    if not is_token_current(token, user):
+        raise TokenError(_("Token has been revoked"))
+
+
+def revoke_all_sessions(user: User) -> None:
+    """
+    Revoke every access and refresh token issued to the user.
+
+    This is a single-row UPDATE regardless of how many sessions exist;
+    tokens carrying an older generation are rejected on their next use.
+    """
+    User = get_user_model()
+    User.objects.filter(pk=user.pk).update(
+        token_generation=F("token_generation") + 1
+    )
+    user.refresh_from_db(fields=["token_generation"])
+    invalidate_cached_user(user.pk)
+    publish_token_generation(user)
+
+
+def _generation_key(user_id: int | str) -> str:
+    return f"token-generation:{user_id}"
+
+
+def publish_token_generation(user: User) -> None:
+    """
+    Announce the user's new token generation to every worker once committed.
+
+    Other workers may hold a cached snapshot of the user with the old
+    generation; CookieJWTAuthentication compares it with the published one
+    and re-reads the user when it is behind. The announcement only has to
+    outlive those snapshots, so it expires with AUTH_USER_CACHE's TTL.
+
+    It is shared through the default cache. With a per-process backend such
+    as the default local-memory cache, other workers keep accepting revoked
+    access tokens until their snapshot expires, at most TTL_SECONDS.
+    """
+    user_id, generation = user.pk, user.token_generation
+    transaction.on_commit(
+        lambda: cache.set(
+            _generation_key(user_id),
+            generation,
+            settings.AUTH_USER_CACHE["TTL_SECONDS"],
+        )
+    )
+
+
+def published_token_generation(user_id: int | str) -> int | None:
+    """Return the user's last published token generation, if still known."""
+    return cache.get(_generation_key(user_id))
+
+
+def issue_token_pair(user: User) -> TokenPair:
+    """Issue a fresh refresh token and its access token for the user."""
+    refresh = RefreshToken.for_user(user)
+    return TokenPair(access=str(refresh.access_token), refresh=str(refresh))
+
+
+def rotate_refresh_token(raw_token: str) -> TokenPair:
+    """
+    Exchange a refresh token for a new token pair, at most once per token.
+
+    Browser tabs often refresh concurrently with the same cookie. The first
+    request blacklists the old token and mints a new pair; duplicates that
+    arrive within REFRESH_ROTATION_GRACE_SECONDS receive that same pair
+    instead of failing on the blacklist. Concurrent duplicates wait on a
+    process-local lock and a row lock on the outstanding token, so only one
+    rotation is ever written. Coalescing across workers needs a shared
+    CACHES backend; with the default local-memory cache, a duplicate on
+    another worker is rejected as blacklisted, as before.
+
+    Raises TokenError if the token is invalid, expired, blacklisted or
+    revoked.
+    """
+    cache_key = "refresh-rotation:" + hashlib.sha256(raw_token.encode()).hexdigest()
+    pair = cache.get(cache_key)
+    if pair is not None:
+        return pair
+
+    with _ROTATION_LOCKS[hash(cache_key) % len(_ROTATION_LOCKS)]:
+        pair = cache.get(cache_key)
+        if pair is not None:
+            return pair
+
+        refresh = RefreshToken(raw_token)
+
+        User = get_user_model()
+        try:
+            user = User.objects.get(id=refresh.payload.get(api_settings.USER_ID_CLAIM))
+        except User.DoesNotExist:
+            raise TokenError(_("User not found"))
+        check_token_generation(refresh, user)
+
+        with transaction.atomic():
+            # Serialize rotations of this token across workers; the joined
+            # blacklist row gives an exact answer even if the index is stale.
+            outstanding = (
+                OutstandingToken.objects.select_for_update(of=("self",))
+                .select_related("blacklistedtoken")
+                .filter(jti=refresh[api_settings.JTI_CLAIM])
+                .first()
+            )
+
+            pair = cache.get(cache_key)
+            if pair is not None:
+                return pair
+
+            if settings.SIMPLE_JWT.get("BLACKLIST_AFTER_ROTATION", False):
+                if outstanding is None:
+                    refresh.blacklist()
+                elif hasattr(outstanding, "blacklistedtoken"):
+                    raise TokenError(_("Token is blacklisted"))
+                else:
+                    BlacklistedToken.objects.create(token=outstanding)
+                    blacklist_index.add(
+                        outstanding.jti, outstanding.expires_at.timestamp()
+                    )
+
+            pair = issue_token_pair(user)
+            cache.set(cache_key, pair, settings.REFRESH_ROTATION_GRACE_SECONDS)
+
+        return pair
@@ -6,6 +6,7 @@ from account.views import (
     CSRFTokenView,
     CurrentUserView,
     LoginView,
+    LogoutAllView,
     LogoutView,
     ProfileView,
     RegisterView,
@@ -16,6 +17,7 @@ urlpatterns = [
     path("auth/register/", RegisterView.as_view(), name="register"),
     path("auth/login/", LoginView.as_view(), name="login"),
     path("auth/logout/", LogoutView.as_view(), name="logout"),
+    path("auth/logout/all/", LogoutAllView.as_view(), name="logout_all"),
     path("auth/refresh/", CookieTokenRefreshView.as_view(), name="token_refresh"),
     path("auth/me/", CurrentUserView.as_view(), name="current_user"),
     path("auth/csrf/", CSRFTokenView.as_view(), name="csrf_token"),
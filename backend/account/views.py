@@ -3,13 +3,14 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import F
 from django.middleware.csrf import get_token
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from account.serializers import (
     ChangePasswordSerializer,
@@ -18,10 +19,30 @@ from account.serializers import (
     UpdateProfileSerializer,
     UserSerializer,
 )
+from account.tokens import (
+    RefreshToken,
+    check_token_generation,
+    publish_token_generation,
+    revoke_all_sessions,
+    rotate_refresh_token,
+)
+from core.conditional import conditional_get
 
 if TYPE_CHECKING:
     from rest_framework.request import Request
 
+User = get_user_model()
+
+
+def user_version(request: Request) -> tuple[int, str]:
+    """
+    Return the ETag version of the authenticated user's serialized data.
+
+    Read from request.user, which usually comes from the auth snapshot cache,
+    so revalidating costs no query.
+    """
+    return request.user.pk, request.user.updated_at.isoformat()
+
 
 def set_jwt_cookies(
     response: Response,
@@ -181,6 +202,29 @@ class LogoutView(APIView):
         return clear_jwt_cookies(response)
 
 
+class LogoutAllView(APIView):
+    """
+    POST /api/auth/logout/all/
+
+    Log the current user out of every device by revoking all of their tokens
+    and clearing cookies on this one.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request: Request) -> Response:
+        # Single-row update regardless of how many sessions are outstanding
+        revoke_all_sessions(request.user)
+
+        response = Response(
+            {"message": "Logged out of all sessions."},
+            status=status.HTTP_200_OK,
+        )
+
+        # Clear JWT cookies
+        return clear_jwt_cookies(response)
+
+
 class CookieTokenRefreshView(APIView):
     """
     POST /api/auth/refresh/
@@ -189,7 +233,9 @@ class CookieTokenRefreshView(APIView):
     This endpoint reads the refresh token from an HttpOnly cookie,
     validates it, and issues a new access token (also via cookie).
 
-    If token rotation is enabled, a new refresh token is also issued.
+    If token rotation is enabled, a new refresh token is also issued, and
+    duplicate refreshes of the same token within a short grace window receive
+    the same new pair.
     """
 
     permission_classes = [AllowAny]
@@ -205,39 +251,31 @@ class CookieTokenRefreshView(APIView):
             )
 
         try:
-            # Validate and rotate the refresh token
-            refresh = RefreshToken(refresh_token)
-            access_token = str(refresh.access_token)
-
-            response = Response(
-                {"message": "Token refreshed successfully."},
-                status=status.HTTP_200_OK,
-            )
-
-            # If rotation is enabled, get the new refresh token
             if settings.SIMPLE_JWT.get("ROTATE_REFRESH_TOKENS", False):
-                # Get the user from the token
-                from django.contrib.auth import get_user_model
+                # Blacklist the old token and issue a new pair. Concurrent
+                # refreshes with the same cookie (e.g. several tabs) share
+                # a single rotation instead of failing on the blacklist.
+                pair = rotate_refresh_token(refresh_token)
+                access_token = pair.access
+                new_refresh_token = pair.refresh
+            else:
+                refresh = RefreshToken(refresh_token)
 
-                User = get_user_model()
+                # Reject tokens issued before the user's sessions were revoked
                 user_id = refresh.payload.get("user_id")
-                user = User.objects.get(id=user_id)
-
-                # Blacklist the old token if blacklisting is enabled
-                if settings.SIMPLE_JWT.get("BLACKLIST_AFTER_ROTATION", False):
-                    try:
-                        refresh.blacklist()
-                    except AttributeError:
-                        # Blacklist app not installed
-                        pass
-
-                # Create a new refresh token for the user
-                new_refresh = RefreshToken.for_user(user)
-                new_refresh_token = str(new_refresh)
-                access_token = str(new_refresh.access_token)
-            else:
+                try:
+                    user = User.objects.get(id=user_id)
+                except User.DoesNotExist:
+                    raise TokenError("User not found")
+                check_token_generation(refresh, user)
+
+                access_token = str(refresh.access_token)
                 new_refresh_token = refresh_token
 
+            response = Response(
+                {"message": "Token refreshed successfully."},
+                status=status.HTTP_200_OK,
+            )
             return set_jwt_cookies(response, access_token, new_refresh_token)
 
         except (InvalidToken, TokenError) as e:
@@ -253,10 +291,12 @@ class CurrentUserView(APIView):
     GET /api/auth/me/
 
     Return the currently authenticated user's information.
+    Supports conditional requests via ETag / If-None-Match.
     """
 
     permission_classes = [IsAuthenticated]
 
+    @conditional_get(user_version)
     def get(self, request: Request) -> Response:
         serializer = UserSerializer(request.user)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -268,10 +308,12 @@ class ProfileView(APIView):
     PUT /api/profile/
 
     Get or update the authenticated user's profile information.
+    GET supports conditional requests via ETag / If-None-Match.
     """
 
     permission_classes = [IsAuthenticated]
 
+    @conditional_get(user_version)
     def get(self, request: Request) -> Response:
         """Return the current user's profile information."""
         user = request.user
@@ -321,6 +363,7 @@ class ChangePasswordView(APIView):
     - Validates current password before allowing change
     - Enforces Django password validation rules
     - Issues new JWT tokens after password change to rotate credentials
+    - Revokes every other session by bumping the user's token generation
     - Blacklists the old refresh token for security
     """
 
@@ -336,10 +379,14 @@ class ChangePasswordView(APIView):
         )
         serializer.is_valid(raise_exception=True)
 
-        # Update the user's password
+        # Update the user's password and revoke every existing session in
+        # the same single-row UPDATE by bumping the token generation
         new_password = serializer.validated_data["new_password"]
         user.set_password(new_password)
+        user.token_generation = F("token_generation") + 1
         user.save()
+        user.refresh_from_db(fields=["token_generation"])
+        publish_token_generation(user)
 
         # Blacklist the current refresh token for security
         # This ensures old tokens cannot be used after password change
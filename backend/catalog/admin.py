@@ -1,10 +1,31 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from django.contrib import admin
 
 from catalog.models import Equipment, Exercise
+from catalog.search import prefix_query
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+    from django.http import HttpRequest
+
+
+class SearchVectorAdminMixin:
+    """Search the changelist with the indexed search_vector column."""
+
+    def get_search_results(
+        self, request: HttpRequest, queryset: QuerySet, search_term: str
+    ) -> tuple[QuerySet, bool]:
+        query = prefix_query(search_term)
+        if query is None:
+            return queryset, False
+        return queryset.filter(search_vector=query), False
 
 
 @admin.register(Equipment)
-class EquipmentAdmin(admin.ModelAdmin):
+class EquipmentAdmin(SearchVectorAdminMixin, admin.ModelAdmin):
     """Admin interface for Equipment model."""
 
     list_display = [
@@ -20,10 +41,10 @@ class EquipmentAdmin(admin.ModelAdmin):
 
 
 @admin.register(Exercise)
-class ExerciseAdmin(admin.ModelAdmin):
+class ExerciseAdmin(SearchVectorAdminMixin, admin.ModelAdmin):
     """Admin interface for Exercise model."""
 
     list_display = ["name", "created_at"]
     list_filter = ["attributes", "created_at"]
     search_fields = ["name", "description"]
-    filter_horizontal = []
+    filter_horizontal = ["equipment"]
@@ -0,0 +1,276 @@
+"""
+Which equipment can each exercise be performed with?
+
+The compatibility relation is Exercise.equipment. An exercise with no linked
+equipment needs none and is compatible with anything. The whole relation
+is small (thousands of rows), so each process keeps a forward and a reverse
+index of it in memory:
+
+    index = compatibility.index()
+    index.equipment_for(exercise_id)   # equipment options for an exercise
+    index.exercises_for(equipment_id)  # exercises a piece of equipment supports
+    index.is_compatible(exercise_id, equipment_id)
+
+Lookups are a dict access each. This is what lets workout building validate
+and suggest equipment per exercise without a join. catalog.signals drops the
+index when the relation changes, including after load_compatibility (which
+sends compatibility_changed). The TTL bounds staleness for changes made by
+other processes, such as the load_exercise_equipment command. Where the
+shared catalog map (see catalog.mapped) is built, it answers the same
+lookups and the per-process index is not built at all.
+
+The relation can be bulk loaded from JSON or CSV (see read_compatibility_file
+and load_compatibility).
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.dispatch import Signal
+
+from catalog.mapped import MappedCatalog, catalog_map
+from catalog.models import Equipment, Exercise
+from catalog.sync import touch_exercises
+
+FILE_FORMATS = ("json", "csv")
+
+INCOMPATIBLE_EQUIPMENT_MESSAGE = "This exercise can't be performed with this equipment."
+
+# Sent after a bulk change to Exercise.equipment that bypassed m2m_changed
+compatibility_changed = Signal()
+
+
+class CompatibilityLoadError(ValueError):
+    """Raised when a compatibility file can't be read or resolved."""
+
+    def __init__(self, errors: list[str]) -> None:
+        super().__init__("\n".join(errors))
+        self.errors = errors
+
+
+@dataclass(frozen=True)
+class CompatibilityIndex:
+    """Forward and reverse lookups over Exercise.equipment."""
+
+    # Exercise id -> ids of the equipment it can be performed with
+    by_exercise: dict[int, frozenset[int]]
+    # Equipment id -> ids of the exercises it can be used for
+    by_equipment: dict[int, frozenset[int]]
+
+    @classmethod
+    def build(cls) -> CompatibilityIndex:
+        """Load the whole relation (one query)."""
+        by_exercise: dict[int, set[int]] = {}
+        by_equipment: dict[int, set[int]] = {}
+        links = Exercise.equipment.through.objects.values_list(
+            "exercise_id", "equipment_id"
+        )
+        for exercise_id, equipment_id in links.iterator(chunk_size=10_000):
+            by_exercise.setdefault(exercise_id, set()).add(equipment_id)
+            by_equipment.setdefault(equipment_id, set()).add(exercise_id)
+        return cls(
+            by_exercise={key: frozenset(ids) for key, ids in by_exercise.items()},
+            by_equipment={key: frozenset(ids) for key, ids in by_equipment.items()},
+        )
+
+    def equipment_for(self, exercise_id: int) -> frozenset[int]:
+        """Return the equipment linked to an exercise (empty if it needs none)."""
+        return self.by_exercise.get(exercise_id, frozenset())
+
+    def exercises_for(self, equipment_id: int) -> frozenset[int]:
+        """Return the exercises linked to a piece of equipment."""
+        return self.by_equipment.get(equipment_id, frozenset())
+
+    def needs_equipment(self, exercise_id: int) -> bool:
+        """Return True if the exercise is linked to any equipment."""
+        return exercise_id in self.by_exercise
+
+    def is_compatible(self, exercise_id: int, equipment_id: int) -> bool:
+        """Return True if the exercise can be performed with the equipment."""
+        options = self.by_exercise.get(exercise_id)
+        return options is None or equipment_id in options
+
+
+class CompatibilityCache:
+    """Per-process CompatibilityIndex, rebuilt when dropped or expired."""
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._index: CompatibilityIndex | None = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def index(self) -> CompatibilityIndex | MappedCatalog:
+        """
+        Return the index, building it if missing or expired.
+
+        The shared catalog map answers instead when it can be used, so the
+        relation isn't held by every process.
+        """
+        mapped = catalog_map.get()
+        if mapped is not None:
+            return mapped
+
+        index = self._index
+        if index is not None and time.monotonic() < self._expires_at:
+            return index
+
+        with self._lock:
+            if self._index is None or time.monotonic() >= self._expires_at:
+                self._index = CompatibilityIndex.build()
+                self._expires_at = time.monotonic() + self.ttl_seconds
+            return self._index
+
+    def invalidate(self) -> None:
+        """Drop the index; the next lookup rebuilds it from the database."""
+        with self._lock:
+            self._index = None
+
+
+compatibility = CompatibilityCache(
+    ttl_seconds=settings.COMPATIBILITY_INDEX["TTL_SECONDS"]
+)
+
+
+# Bulk loading
+
+
+def read_compatibility_file(
+    path: str | Path, file_format: str | None = None
+) -> list[tuple[str, str]]:
+    """
+    Read (exercise, equipment) reference pairs from a JSON or CSV file.
+
+    JSON files hold a list of objects whose "equipment" is one reference or
+    a list of them:
+
+        [{"exercise": "Back Squat", "equipment": ["Power Rack", 12]}]
+
+    CSV files have "exercise" and "equipment" columns, one pair per row.
+    References are ids or exact names (see load_compatibility). The format
+    defaults to the file's extension.
+    """
+    path = Path(path)
+    file_format = (file_format or path.suffix.lstrip(".")).lower()
+    if file_format not in FILE_FORMATS:
+        raise CompatibilityLoadError(
+            [f"Unsupported format '{file_format}' (expected json or csv)."]
+        )
+
+    try:
+        with path.open(newline="", encoding="utf-8") as file:
+            if file_format == "json":
+                return _read_json(json.load(file))
+            return _read_csv(csv.DictReader(file))
+    except (OSError, ValueError) as error:
+        if isinstance(error, CompatibilityLoadError):
+            raise
+        raise CompatibilityLoadError([f"Could not read {path}: {error}"]) from error
+
+
+def _read_json(data: object) -> list[tuple[str, str]]:
+    if not isinstance(data, list):
+        raise CompatibilityLoadError(["Expected a list of objects."])
+
+    pairs, errors = [], []
+    for number, entry in enumerate(data, start=1):
+        if not isinstance(entry, dict) or not {"exercise", "equipment"} <= entry.keys():
+            errors.append(f"Entry {number}: expected 'exercise' and 'equipment'.")
+            continue
+        equipment = entry["equipment"]
+        if not isinstance(equipment, list):
+            equipment = [equipment]
+        pairs.extend((str(entry["exercise"]), str(item)) for item in equipment)
+    if errors:
+        raise CompatibilityLoadError(errors)
+    return pairs
+
+
+def _read_csv(reader: csv.DictReader) -> list[tuple[str, str]]:
+    if not {"exercise", "equipment"} <= set(reader.fieldnames or ()):
+        raise CompatibilityLoadError(["Expected 'exercise' and 'equipment' columns."])
+    return [
+        ((row["exercise"] or "").strip(), (row["equipment"] or "").strip())
+        for row in reader
+    ]
+
+
+def _resolver(rows: Iterable[tuple[int, str]]) -> dict[str, list[int]]:
+    # Maps both "id" and "name" to the matching ids
+    lookup: dict[str, list[int]] = {}
+    for pk, name in rows:
+        lookup[str(pk)] = [pk]
+        lookup.setdefault(name, []).append(pk)
+    return lookup
+
+
+def _resolve(
+    lookup: dict[str, list[int]], reference: str, label: str, errors: list[str]
+) -> int | None:
+    matches = lookup.get(reference, [])
+    if len(matches) == 1:
+        return matches[0]
+    if matches:
+        errors.append(f"{label} '{reference}' is ambiguous; use its id.")
+    else:
+        errors.append(f"{label} '{reference}' does not exist.")
+    return None
+
+
+@transaction.atomic
+def load_compatibility(
+    pairs: Iterable[tuple[str, str]],
+    *,
+    replace: bool = False,
+    batch_size: int = 1_000,
+) -> int:
+    """
+    Link exercises to equipment in bulk and return the number of new links.
+
+    References are resolved in two queries: digits match an id, anything
+    else must match exactly one name. Nothing is written if any reference
+    fails to resolve. Existing links are kept; with `replace`, each listed
+    exercise's links are replaced by the ones in `pairs`.
+    """
+    exercises = _resolver(Exercise.objects.values_list("id", "name"))
+    equipment = _resolver(Equipment.objects.values_list("id", "name"))
+
+    links: set[tuple[int, int]] = set()
+    errors: list[str] = []
+    for exercise_ref, equipment_ref in pairs:
+        exercise_id = _resolve(exercises, exercise_ref, "Exercise", errors)
+        equipment_id = _resolve(equipment, equipment_ref, "Equipment", errors)
+        if exercise_id is not None and equipment_id is not None:
+            links.add((exercise_id, equipment_id))
+    if errors:
+        raise CompatibilityLoadError(list(dict.fromkeys(errors)))
+
+    Link = Exercise.equipment.through
+    if replace:
+        Link.objects.filter(
+            exercise_id__in={exercise_id for exercise_id, _ in links}
+        ).delete()
+    before = Link.objects.count()
+    Link.objects.bulk_create(
+        (
+            Link(exercise_id=exercise_id, equipment_id=equipment_id)
+            for exercise_id, equipment_id in sorted(links)
+        ),
+        batch_size=batch_size,
+        ignore_conflicts=True,
+    )
+    created = Link.objects.count() - before
+    touch_exercises({exercise_id for exercise_id, _ in links})
+
+    compatibility_changed.send(sender=Exercise)
+    transaction.on_commit(lambda: compatibility_changed.send(sender=Exercise))
+    return created
@@ -148,6 +148,7 @@ def regions_for_muscle_groups(
 
     If both UPPER_BODY and LOWER_BODY are present, returns {FULL_BODY}.
     Otherwise returns the set of regions (CORE can coexist with others).
+    catalog.taxonomy.regions_for() is the compiled equivalent.
     """
     regions: set[WorkoutRegion] = set()
     for group in groups:
@@ -170,6 +171,8 @@ def primary_region_for_workout(groups: Iterable[MuscleGroup]) -> WorkoutRegion:
     1. If FULL_BODY condition is met, return FULL_BODY
     2. If only one region present, return it
     3. Otherwise prioritize: UPPER_BODY > LOWER_BODY > CORE
+
+    catalog.taxonomy.primary_region_for() is the compiled equivalent.
     """
     regions = regions_for_muscle_groups(groups)
 
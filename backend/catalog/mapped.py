@@ -0,0 +1,599 @@
+"""
+Catalog lookups shared by every worker process through a memory-mapped file.
+
+Per-process indexes (the compatibility index, per-exercise muscle masks) are
+rebuilt from the database by every worker, and held once per worker. The
+catalog map is instead built by one process into a file that every worker
+maps read-only, like the compiled password list (see
+account.password_validation): opening it costs no query, and all workers
+share its pages through the OS page cache, so memory stays flat as workers
+are added.
+
+The file is a fixed header followed by little-endian, fixed-width arrays:
+
+    exercise ids        int64[exercises], ascending
+    exercise records    EXERCISE_RECORD[exercises]
+    equipment ids       int64[equipment], ascending
+    equipment records   EQUIPMENT_RECORD[equipment]
+    exercise links      int64[links], equipment ids grouped by exercise
+    equipment links     int64[links], exercise ids grouped by equipment
+    strings             UTF-8 names and brands
+
+Records hold the muscle masks of catalog.taxonomy, the attribute and trait
+masks of training.bitmasks, offsets into the string table and ranges of
+the link arrays. Lookups binary search the id arrays and read numpy views of
+the mapping, so nothing is copied into the worker. The header records
+fingerprints of the bit layouts and of the database: a file built for
+another layout or database is ignored.
+
+When a catalog change commits, the committing process rebuilds the file on
+a background thread and atomically replaces it; workers keep the mapping
+they hold and switch to the new file on their next check, at most
+CHECK_SECONDS after it is written. A process that changed the catalog
+doesn't use the map from the change until it is rebuilt, so it reads its
+own writes. Readers fall back to the database while there
+is no usable map; build it at deploy time with
+`python manage.py build_catalog_map`.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.db import DatabaseError, connection
+
+from catalog.models import Equipment, Exercise
+from catalog.taxonomy import MUSCLE_BITS, muscle_mask
+from training.bitmasks import BITS
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"RSCATMAP"
+FORMAT_VERSION = 1
+
+# Magic, format, exercise/equipment/exercise link/equipment link/string
+# counts, and the layout, database and content fingerprints
+HEADER = struct.Struct("<8sI5I8s8s8s")
+
+EXERCISE_RECORD = np.dtype(
+    [
+        ("primary_muscles", "<u8"),
+        ("secondary_muscles", "<u8"),
+        ("attributes", "<u8"),
+        ("name", "<u4"),
+        ("name_length", "<u4"),
+        ("links", "<u4"),
+        ("link_count", "<u4"),
+    ]
+)
+EQUIPMENT_RECORD = np.dtype(
+    [
+        ("traits", "<u8"),
+        ("name", "<u4"),
+        ("name_length", "<u4"),
+        ("brand", "<u4"),
+        ("brand_length", "<u4"),
+        ("links", "<u4"),
+        ("link_count", "<u4"),
+    ]
+)
+ID = np.dtype("<i8")
+
+
+def _fingerprint(value: object) -> bytes:
+    return hashlib.blake2b(
+        json.dumps(value, sort_keys=True).encode(), digest_size=8
+    ).digest()
+
+
+# Masks in a file are only meaningful to code with the same bit layout
+LAYOUT_FINGERPRINT = _fingerprint([MUSCLE_BITS, BITS])
+
+
+def database_fingerprint() -> bytes:
+    """Return the fingerprint of the database the catalog is read from."""
+    params = connection.settings_dict
+    return _fingerprint([params["HOST"], params["PORT"], params["NAME"]])
+
+
+def catalog_map_path() -> Path:
+    return Path(settings.CATALOG_MAP["PATH"])
+
+
+class _Strings:
+    """String table builder; repeated strings are stored once."""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self._offsets: dict[str, tuple[int, int]] = {}
+
+    def add(self, value: str) -> tuple[int, int]:
+        entry = self._offsets.get(value)
+        if entry is None:
+            encoded = value.encode()
+            entry = self._offsets[value] = (len(self.data), len(encoded))
+            self.data += encoded
+        return entry
+
+
+def _link_ranges(
+    ids: list[int], links: list[tuple[int, int]]
+) -> tuple[np.ndarray, list[int], list[int]]:
+    """Return (linked ids, start, count per id) of links sorted by owner."""
+    positions = {pk: i for i, pk in enumerate(ids)}
+    starts, counts = [0] * len(ids), [0] * len(ids)
+    for offset, (owner, _) in enumerate(links):
+        i = positions[owner]
+        if not counts[i]:
+            starts[i] = offset
+        counts[i] += 1
+    targets = np.array([target for _, target in links], dtype=ID)
+    return targets, starts, counts
+
+
+def _encode_catalog() -> tuple[bytes, bytes]:
+    """Return the header and body of a map of the catalog (three queries)."""
+    exercises = list(
+        Exercise.objects.order_by("id").values_list(
+            "id", "name", "primary_muscles", "secondary_muscles", "attribute_mask"
+        )
+    )
+    equipment = list(
+        Equipment.objects.order_by("id").values_list(
+            "id", "name", "brand", "trait_mask"
+        )
+    )
+    links = list(
+        Exercise.equipment.through.objects.order_by(
+            "exercise_id", "equipment_id"
+        ).values_list("exercise_id", "equipment_id")
+    )
+    strings = _Strings()
+
+    exercise_ids = [row[0] for row in exercises]
+    exercise_links, starts, counts = _link_ranges(exercise_ids, links)
+    exercise_records = np.array(
+        [
+            (
+                muscle_mask(primary or ()),
+                muscle_mask(secondary or ()),
+                attributes,
+                *strings.add(name),
+                starts[i],
+                counts[i],
+            )
+            for i, (_, name, primary, secondary, attributes) in enumerate(exercises)
+        ],
+        dtype=EXERCISE_RECORD,
+    )
+
+    equipment_ids = [row[0] for row in equipment]
+    reverse = sorted((equipment_id, exercise_id) for exercise_id, equipment_id in links)
+    equipment_links, starts, counts = _link_ranges(equipment_ids, reverse)
+    equipment_records = np.array(
+        [
+            (traits, *strings.add(name), *strings.add(brand), starts[i], counts[i])
+            for i, (_, name, brand, traits) in enumerate(equipment)
+        ],
+        dtype=EQUIPMENT_RECORD,
+    )
+
+    body = b"".join(
+        [
+            np.array(exercise_ids, dtype=ID).tobytes(),
+            exercise_records.tobytes(),
+            np.array(equipment_ids, dtype=ID).tobytes(),
+            equipment_records.tobytes(),
+            exercise_links.tobytes(),
+            equipment_links.tobytes(),
+            bytes(strings.data),
+        ]
+    )
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        len(exercises),
+        len(equipment),
+        len(exercise_links),
+        len(equipment_links),
+        len(strings.data),
+        LAYOUT_FINGERPRINT,
+        database_fingerprint(),
+        hashlib.blake2b(body, digest_size=8).digest(),
+    )
+    return header, body
+
+
+def build_catalog_map(path: Path | str | None = None) -> str:
+    """
+    Write a map of the catalog to `path` and return its version.
+
+    Builds are serialized by a lock file next to `path`, so the last build
+    to finish read the catalog last. The file is replaced atomically:
+    workers that mapped the old file are not affected.
+    """
+    path = Path(path or catalog_map_path())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        header, body = _encode_catalog()
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                f.write(body)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    return header[-8:].hex()
+
+
+def read_database_fingerprint(path: Path | str) -> bytes | None:
+    """Return the database fingerprint of a map file, or None if unreadable."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+    except OSError:
+        return None
+    if len(header) < HEADER.size or header[:8] != MAGIC:
+        return None
+    return HEADER.unpack(header)[8]
+
+
+class MappedCatalog:
+    """Read-only, memory-mapped catalog lookups."""
+
+    def __init__(self, path: Path | str, database: bytes | None = None) -> None:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"{path} is not a catalog map.")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (
+            magic,
+            format_version,
+            exercises,
+            equipment,
+            exercise_links,
+            equipment_links,
+            strings,
+            layout,
+            file_database,
+            version,
+        ) = HEADER.unpack_from(self._map)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a catalog map.")
+        if layout != LAYOUT_FINGERPRINT:
+            raise ValueError(f"{path} was built for another muscle or trait layout.")
+        if file_database != (database or database_fingerprint()):
+            raise ValueError(f"{path} was built from another database.")
+
+        offset = HEADER.size
+        sections = []
+        for dtype, count in (
+            (ID, exercises),
+            (EXERCISE_RECORD, exercises),
+            (ID, equipment),
+            (EQUIPMENT_RECORD, equipment),
+            (ID, exercise_links),
+            (ID, equipment_links),
+        ):
+            if offset + dtype.itemsize * count > size:
+                raise ValueError(f"{path} is truncated.")
+            sections.append(
+                np.frombuffer(self._map, dtype=dtype, count=count, offset=offset)
+            )
+            offset += dtype.itemsize * count
+        if offset + strings != size:
+            raise ValueError(f"{path} is truncated.")
+
+        (
+            self._exercise_ids,
+            self._exercises,
+            self._equipment_ids,
+            self._equipment,
+            self._exercise_links,
+            self._equipment_links,
+        ) = sections
+        self._strings = offset
+        self.version = version.hex()
+
+    def __len__(self) -> int:
+        return len(self._exercise_ids)
+
+    @staticmethod
+    def _position(ids: np.ndarray, pk: int) -> int | None:
+        position = int(np.searchsorted(ids, pk))
+        if position < len(ids) and ids[position] == pk:
+            return position
+        return None
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings + int(offset)
+        return self._map[start : start + int(length)].decode()
+
+    def exercise_name(self, exercise_id: int) -> str | None:
+        """Return the name of an exercise, or None if it isn't in the map."""
+        position = self._position(self._exercise_ids, exercise_id)
+        if position is None:
+            return None
+        record = self._exercises[position]
+        return self._string(record["name"], record["name_length"])
+
+    def exercise_masks(self, exercise_id: int) -> tuple[int, int, int] | None:
+        """Return the (primary, secondary, attribute) masks of an exercise."""
+        position = self._position(self._exercise_ids, exercise_id)
+        if position is None:
+            return None
+        record = self._exercises[position]
+        return (
+            int(record["primary_muscles"]),
+            int(record["secondary_muscles"]),
+            int(record["attributes"]),
+        )
+
+    def primary_masks(self, exercise_ids: Iterable[int]) -> dict[int, int]:
+        """Return the primary muscle mask of each exercise in the map."""
+        ids = np.fromiter(exercise_ids, dtype=ID)
+        if not len(self._exercise_ids):
+            return {}
+        positions = np.searchsorted(self._exercise_ids, ids)
+        positions[positions == len(self._exercise_ids)] = 0
+        found = self._exercise_ids[positions] == ids
+        masks = self._exercises["primary_muscles"][positions[found]]
+        return dict(zip(ids[found].tolist(), masks.tolist(), strict=True))
+
+    def equipment_traits(self, equipment_id: int) -> int | None:
+        """Return the trait mask of a piece of equipment."""
+        position = self._position(self._equipment_ids, equipment_id)
+        if position is None:
+            return None
+        return int(self._equipment[position]["traits"])
+
+    def equipment_name(self, equipment_id: int) -> tuple[str, str] | None:
+        """Return the (name, brand) of a piece of equipment."""
+        position = self._position(self._equipment_ids, equipment_id)
+        if position is None:
+            return None
+        record = self._equipment[position]
+        return (
+            self._string(record["name"], record["name_length"]),
+            self._string(record["brand"], record["brand_length"]),
+        )
+
+    # The CompatibilityIndex interface (see catalog.compatibility)
+
+    def equipment_for(self, exercise_id: int) -> frozenset[int]:
+        """Return the equipment linked to an exercise (empty if it needs none)."""
+        position = self._position(self._exercise_ids, exercise_id)
+        if position is None:
+            return frozenset()
+        record = self._exercises[position]
+        start = int(record["links"])
+        end = start + int(record["link_count"])
+        return frozenset(self._exercise_links[start:end].tolist())
+
+    def exercises_for(self, equipment_id: int) -> frozenset[int]:
+        """Return the exercises linked to a piece of equipment."""
+        position = self._position(self._equipment_ids, equipment_id)
+        if position is None:
+            return frozenset()
+        record = self._equipment[position]
+        start = int(record["links"])
+        end = start + int(record["link_count"])
+        return frozenset(self._equipment_links[start:end].tolist())
+
+    def needs_equipment(self, exercise_id: int) -> bool:
+        """Return True if the exercise is linked to any equipment."""
+        position = self._position(self._exercise_ids, exercise_id)
+        return position is not None and bool(self._exercises[position]["link_count"])
+
+    def is_compatible(self, exercise_id: int, equipment_id: int) -> bool:
+        """Return True if the exercise can be performed with the equipment."""
+        options = self.equipment_for(exercise_id)
+        return not options or equipment_id in options
+
+    # The whole catalog, for indexes built from the map (training.eligibility)
+
+    def exercises(self) -> Iterator[tuple[int, str, int, int]]:
+        """Yield (id, name, primary mask, attribute mask), in id order."""
+        for pk, record in zip(
+            self._exercise_ids.tolist(), self._exercises, strict=True
+        ):
+            yield (
+                pk,
+                self._string(record["name"], record["name_length"]),
+                int(record["primary_muscles"]),
+                int(record["attributes"]),
+            )
+
+    def links(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return the (exercise ids, equipment ids) of every equipment link."""
+        exercise_ids = np.repeat(self._exercise_ids, self._exercises["link_count"])
+        return exercise_ids, self._exercise_links
+
+    def all_equipment_traits(self) -> dict[int, int]:
+        """Return the trait mask of every piece of equipment, by id."""
+        traits = self._equipment["traits"].tolist()
+        return dict(zip(self._equipment_ids.tolist(), traits, strict=True))
+
+
+def _file_identity(path: Path) -> tuple | None:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (path, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+class CatalogMap:
+    """
+    The current MappedCatalog of this process.
+
+    get() re-checks the file at most every `check_seconds`, and maps it again
+    when it was replaced. It returns None, so callers query the database,
+    while there is no usable map, in a thread whose transaction changed the
+    catalog until that transaction ends, and in a process that committed a
+    catalog change until the map is rebuilt.
+    """
+
+    def __init__(self, check_seconds: float) -> None:
+        self.check_seconds = check_seconds
+        self._mapped: MappedCatalog | None = None
+        self._identity: tuple | None = None
+        self._checked_at: float | None = None
+        # The file this process's committed changes made stale
+        self._stale_identity: tuple | None = None
+        self._rebuild_requested = False
+        self._rebuilder: threading.Thread | None = None
+        # Whether this process used or built a map of this database
+        self._in_use = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def get(self) -> MappedCatalog | None:
+        """Return the mapped catalog, or None if it can't be used."""
+        if getattr(self._local, "dirty", False):
+            if connection.in_atomic_block:
+                return None
+            self._local.dirty = False
+
+        checked_at = self._checked_at
+        if checked_at is not None and (
+            time.monotonic() - checked_at < self.check_seconds
+        ):
+            return self._mapped
+
+        with self._lock:
+            self._checked_at = time.monotonic()
+            path = catalog_map_path()
+            identity = _file_identity(path)
+            if identity is None or identity == self._stale_identity:
+                self._mapped = self._identity = None
+                return None
+
+            if identity != self._identity:
+                self._identity = identity
+                try:
+                    self._mapped = MappedCatalog(path)
+                    self._in_use = True
+                except (OSError, ValueError) as error:
+                    logger.warning("Not using catalog map %s: %s", path, error)
+                    self._mapped = None
+            return self._mapped
+
+    def clear(self) -> None:
+        """Forget the mapping; the next get() checks the file again."""
+        with self._lock:
+            self._forget()
+            self._stale_identity = None
+            self._in_use = False
+
+    def _forget(self) -> None:
+        self._mapped = self._identity = self._checked_at = None
+
+    def mark_changed(self) -> None:
+        """Stop using the map in this thread until its transaction ends."""
+        self._local.dirty = True
+        self._local.changes = getattr(self._local, "changes", 0) + 1
+
+    def refresh(self) -> None:
+        """
+        Rebuild the map after this thread's catalog changes committed.
+
+        Only a map built from this database is rebuilt; without one, readers
+        keep using the database. A map this process used or built is also
+        rebuilt when its file is gone, so a failed rebuild, which removes
+        the file, is retried on the next change. A transaction's later refreshes, after the
+        first requested a rebuild, do nothing. This process stops using the
+        old map at once, and other processes switch when the rebuilt file
+        replaces it.
+
+        The rebuild runs on a background thread unless
+        CATALOG_MAP["BACKGROUND_REBUILD"] is off, so the request that
+        committed doesn't wait for it. Refreshes requested while it runs are
+        folded into one more rebuild.
+        """
+        self._local.dirty = False
+        changes = getattr(self._local, "changes", 0)
+        if getattr(self._local, "built_changes", None) == changes:
+            return
+        self._local.built_changes = changes
+
+        path = catalog_map_path()
+        if read_database_fingerprint(path) != database_fingerprint() and not (
+            self._in_use and _file_identity(path) is None
+        ):
+            return
+        with self._lock:
+            self._stale_identity = _file_identity(path)
+            self._checked_at = None
+
+        if not settings.CATALOG_MAP["BACKGROUND_REBUILD"]:
+            self._rebuild(path)
+            return
+        with self._lock:
+            self._rebuild_requested = True
+            if self._rebuilder is None:
+                self._rebuilder = threading.Thread(
+                    target=self._rebuild_loop, name="catalog-map", daemon=True
+                )
+                self._rebuilder.start()
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Wait for a background rebuild in progress to finish."""
+        rebuilder = self._rebuilder
+        if rebuilder is not None:
+            rebuilder.join(timeout)
+
+    def _rebuild_loop(self) -> None:
+        try:
+            while True:
+                with self._lock:
+                    if not self._rebuild_requested:
+                        self._rebuilder = None
+                        return
+                    self._rebuild_requested = False
+                self._rebuild(catalog_map_path())
+        finally:
+            with self._lock:
+                if self._rebuilder is threading.current_thread():
+                    self._rebuilder = None
+            connection.close()
+
+    def _rebuild(self, path: Path) -> None:
+        try:
+            build_catalog_map(path)
+        except (OSError, DatabaseError) as error:
+            # Don't leave workers on a map that is known to be stale
+            logger.warning(
+                "Could not rebuild catalog map %s: %s; readers use the "
+                "database until the next catalog change rebuilds it",
+                path,
+                error,
+            )
+            path.unlink(missing_ok=True)
+        else:
+            self._in_use = True
+        with self._lock:
+            self._forget()
+            self._stale_identity = None
+
+
+catalog_map = CatalogMap(check_seconds=settings.CATALOG_MAP["CHECK_SECONDS"])
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:18
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0002_alter_equipment_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipment',
+            name='trait_mask',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('modality', 'free_weights')), then=models.Value(1)), default=models.Value(0)), '|', models.Case(models.When(models.Q(('modality', 'machines')), then=models.Value(2)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('modality', 'cables')), then=models.Value(4)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('modality', 'bodyweight')), then=models.Value(8)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('modality', 'bands_suspension')), then=models.Value(16)), default=models.Value(0))), '|', django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('station', 'rack')), then=models.Value(256)), default=models.Value(0)), '|', models.Case(models.When(models.Q(('station', 'bench')), then=models.Value(512)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('station', 'pull_up_bar')), then=models.Value(1024)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('station', 'dip_station')), then=models.Value(2048)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('station', 'floor')), then=models.Value(4096)), default=models.Value(0)))), '|', django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('equipment_type', 'selectorized')), then=models.Value(65536)), default=models.Value(0)), '|', models.Case(models.When(models.Q(('equipment_type', 'plate_loaded')), then=models.Value(131072)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('equipment_type', 'smith')), then=models.Value(262144)), default=models.Value(0)))), output_field=models.BigIntegerField()),
+        ),
+        migrations.AddField(
+            model_name='exercise',
+            name='attribute_mask',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('attributes__contains', ['high_impact'])), then=models.Value(16777216)), default=models.Value(0)), '|', models.Case(models.When(models.Q(('attributes__contains', ['overhead'])), then=models.Value(33554432)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('attributes__contains', ['spotter_advised'])), then=models.Value(67108864)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('attributes__contains', ['technically_complex'])), then=models.Value(134217728)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('attributes__contains', ['floor_required'])), then=models.Value(268435456)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('attributes__contains', ['high_joint_stress'])), then=models.Value(536870912)), default=models.Value(0))), output_field=models.BigIntegerField()),
+        ),
+    ]
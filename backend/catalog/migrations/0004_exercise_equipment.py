@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0003_equipment_trait_mask_exercise_attribute_mask'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exercise',
+            name='equipment',
+            field=models.ManyToManyField(blank=True, related_name='exercises', to='catalog.equipment'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:09
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0004_exercise_equipment'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='exercise',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['primary_muscles'], name='exercise_primary_muscles_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='exercise',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['secondary_muscles'], name='exercise_secondary_muscles_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='exercise',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['attributes'], name='exercise_attributes_gin'),
+        ),
+    ]
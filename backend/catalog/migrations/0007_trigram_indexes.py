@@ -0,0 +1,50 @@
+from django.db import migrations
+
+# (index, table, column) of the trigram indexes catalog.search matches on
+TRIGRAM_INDEXES = [
+    ("exercise_name_trgm", "catalog_exercise", "name"),
+    ("equipment_name_trgm", "catalog_equipment", "name"),
+    ("equipment_brand_trgm", "catalog_equipment", "brand"),
+]
+
+
+def create_trigram_indexes(apps, schema_editor) -> None:
+    """Install pg_trgm and index the names, if the server ships pg_trgm."""
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+        )
+        if cursor.fetchone() is None:
+            return
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for index, table, column in TRIGRAM_INDEXES:
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {index} "
+                f"ON {table} USING gin ({column} gin_trgm_ops)"
+            )
+
+
+def drop_trigram_indexes(apps, schema_editor) -> None:
+    with schema_editor.connection.cursor() as cursor:
+        for index, _table, _column in TRIGRAM_INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {index}")
+
+
+class Migration(migrations.Migration):
+    """
+    Trigram indexes for typo-tolerant catalog search.
+
+    pg_trgm is a contrib extension that not every Postgres build ships, so
+    the extension and its indexes are only created where it is available;
+    catalog.search falls back to full-text prefix matching without it. The
+    indexes aren't declared on the models, whose migrations would otherwise
+    require the extension everywhere.
+    """
+
+    dependencies = [
+        ("catalog", "0006_search_vectors"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
+
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 
 from catalog.enums import MuscleGroup
+from catalog.taxonomy import expand_muscle_groups
+from training.bitmasks import attribute_mask_expression, trait_mask_expression
 from training.enums import (
     EquipmentModality,
     EquipmentStation,
@@ -11,6 +17,21 @@ from training.enums import (
     ExerciseAttribute,
 )
 
+# Text search configuration of the search_vector columns (see catalog.search)
+SEARCH_CONFIG = "english"
+
+
+def search_vector_expression(*weighted_fields: tuple[str, str]) -> SearchVector:
+    """Weighted tsvector of text fields, e.g. (("name", "A"), ("brand", "B"))."""
+    vectors = [
+        SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        for field, weight in weighted_fields
+    ]
+    expression = vectors[0]
+    for vector in vectors[1:]:
+        expression += vector
+    return expression
+
 
 class Equipment(models.Model):
     """Master catalog of equipment types available across all gyms."""
@@ -25,15 +46,102 @@ class Equipment(models.Model):
         null=True,
     )  # Optional - not all equipment requires a station
     equipment_type = models.CharField(max_length=50, choices=EquipmentType.choices)
+    # Modality, station and type bits (see training.bitmasks)
+    trait_mask = models.GeneratedField(
+        expression=trait_mask_expression(),
+        output_field=models.BigIntegerField(),
+        db_persist=True,
+    )
+    # Full-text search document (see catalog.search)
+    search_vector = models.GeneratedField(
+        expression=search_vector_expression(("name", "A"), ("brand", "B")),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
+    # Last change, for delta sync (see catalog.sync)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name_plural = "Equipment"
+        indexes = [
+            GinIndex(fields=["search_vector"], name="equipment_search_vector_gin"),
+            models.Index(fields=["updated_at", "id"], name="equipment_updated_at_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.brand}, {self.name} ({self.equipment_type})"
 
 
+# Array fields of Exercise, each with a GIN index
+EXERCISE_ARRAY_FIELDS = ("primary_muscles", "secondary_muscles", "attributes")
+
+
+class ExerciseQuerySet(models.QuerySet["Exercise"]):
+    """
+    Filters on the muscle and attribute arrays of exercises.
+
+    overlapping() and containing() are the array && and @> operators, which
+    the GIN indexes on the arrays serve. excluding() is NOT &&, which no
+    index can serve: combine it with an indexed filter so it only checks the
+    rows that filter finds.
+    """
+
+    def overlapping(self, field: str, values: Iterable[str]) -> ExerciseQuerySet:
+        """Return exercises whose `field` has any of `values`."""
+        return self.filter(**{f"{_array_field(field)}__overlap": list(values)})
+
+    def containing(self, field: str, values: Iterable[str]) -> ExerciseQuerySet:
+        """Return exercises whose `field` has all of `values`."""
+        return self.filter(**{f"{_array_field(field)}__contains": list(values)})
+
+    def excluding(self, field: str, values: Iterable[str]) -> ExerciseQuerySet:
+        """Return exercises whose `field` has none of `values`."""
+        return self.exclude(**{f"{_array_field(field)}__overlap": list(values)})
+
+    def targeting(
+        self,
+        muscle_groups: Iterable[str] = (),
+        major_groups: Iterable[str] = (),
+        regions: Iterable[str] = (),
+        include_secondary: bool = False,
+    ) -> ExerciseQuerySet:
+        """
+        Return exercises working any of the groups, at any taxonomy level.
+
+        Major groups and regions are expanded to their muscle groups. Only
+        primary muscles count unless `include_secondary`. No groups at all
+        leaves the queryset unfiltered.
+        """
+        muscles = expand_muscle_groups(muscle_groups, major_groups, regions)
+        if not muscles:
+            return self
+        condition = models.Q(primary_muscles__overlap=muscles)
+        if include_secondary:
+            condition |= models.Q(secondary_muscles__overlap=muscles)
+        return self.filter(condition)
+
+    def avoiding(
+        self,
+        muscle_groups: Iterable[str] = (),
+        major_groups: Iterable[str] = (),
+        regions: Iterable[str] = (),
+    ) -> ExerciseQuerySet:
+        """Return exercises working none of the groups, primary or secondary."""
+        muscles = expand_muscle_groups(muscle_groups, major_groups, regions)
+        if not muscles:
+            return self
+        return self.excluding("primary_muscles", muscles).excluding(
+            "secondary_muscles", muscles
+        )
+
+
+def _array_field(field: str) -> str:
+    if field not in EXERCISE_ARRAY_FIELDS:
+        raise ValueError(f"{field!r} is not an array field of Exercise.")
+    return field
+
+
 class Exercise(models.Model):
     """Master catalog of exercises."""
 
@@ -53,7 +161,66 @@ class Exercise(models.Model):
         blank=True,
         null=True,
     )
+    # Equipment the exercise can be performed with; none means no equipment
+    # is needed and the exercise can be done anywhere
+    equipment = models.ManyToManyField(
+        Equipment,
+        blank=True,
+        related_name="exercises",
+    )
+    # Attribute bits (see training.bitmasks)
+    attribute_mask = models.GeneratedField(
+        expression=attribute_mask_expression(),
+        output_field=models.BigIntegerField(),
+        db_persist=True,
+    )
+    # Full-text search document (see catalog.search)
+    search_vector = models.GeneratedField(
+        expression=search_vector_expression(("name", "A"), ("description", "B")),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
+    # Last change, including to the equipment links, for delta sync (see
+    # catalog.sync)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ExerciseQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["primary_muscles"], name="exercise_primary_muscles_gin"),
+            GinIndex(
+                fields=["secondary_muscles"], name="exercise_secondary_muscles_gin"
+            ),
+            GinIndex(fields=["attributes"], name="exercise_attributes_gin"),
+            GinIndex(fields=["search_vector"], name="exercise_search_vector_gin"),
+            models.Index(fields=["updated_at", "id"], name="exercise_updated_at_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.name
+
+
+class CatalogTombstone(models.Model):
+    """
+    A deleted Exercise or Equipment row, so delta sync can report deletions.
+
+    Written by catalog.signals when a row is deleted; catalog rows are
+    deleted rarely, so tombstones are kept indefinitely.
+    """
+
+    # Model name of the deleted row, "exercise" or "equipment"
+    model_name = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["model_name", "deleted_at"], name="tombstone_deleted_at_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.model_name} {self.object_id} deleted {self.deleted_at}"
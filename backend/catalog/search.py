@@ -0,0 +1,178 @@
+"""
+Ranked search over the exercise and equipment catalog.
+
+Exercise (name, description) and Equipment (name, brand) carry a weighted
+tsvector generated column, search_vector, with a GIN index. A search matches
+every word of the query as a prefix of a word in the document, so "bench
+pre" finds "Bench Press" while it is being typed, and ranks matches with
+ts_rank, names above descriptions and brands.
+
+Where the pg_trgm extension is installed (see catalog migration 0007), rows
+whose name is similar to the query match too, which tolerates typos ("bnech
+press"), and the similarity is added to the rank. Both conditions are served
+by GIN indexes, so a search only ranks the rows that match.
+
+Results are ordered by rank, then id, and paginated with an opaque cursor
+holding the (rank, id) of the last row: a later page is a keyset condition
+on the same matches instead of an OFFSET over everything before it.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramSimilarity,
+)
+from django.db import connections
+from django.db.models import F, FloatField, Model, Q, QuerySet, Value
+from django.db.models.functions import Cast, Greatest
+
+from catalog.models import SEARCH_CONFIG, Equipment, Exercise
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+# Words of a query that are matched; the rest are ignored
+MAX_QUERY_WORDS = 8
+# Shorter words only match whole words: a one or two letter prefix matches
+# most of the catalog, and every match has to be ranked
+MIN_PREFIX_LENGTH = 3
+
+# Fields matched by trigram similarity, per model
+EXERCISE_TRIGRAM_FIELDS = ("name",)
+EQUIPMENT_TRIGRAM_FIELDS = ("name", "brand")
+
+# Letters and digits; everything else separates words
+_WORD = re.compile(r"[^\W_]+")
+
+
+class SearchCursorError(ValueError):
+    """Raised for a cursor that wasn't issued by search()."""
+
+
+@dataclass(frozen=True)
+class SearchPage:
+    """One page of search results and the cursor of the next page."""
+
+    results: list[Model]
+    next_cursor: str | None
+
+
+@lru_cache
+def trigram_enabled(using: str = "default") -> bool:
+    """Return whether pg_trgm is installed in the database."""
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def prefix_query(text: str) -> SearchQuery | None:
+    """
+    Return a query matching every word of `text` as a prefix.
+
+    Words shorter than MIN_PREFIX_LENGTH must match whole words. None if
+    `text` has no words. Only letters and digits are kept, so user input
+    can't inject tsquery operators.
+    """
+    words = _WORD.findall(text.lower())[:MAX_QUERY_WORDS]
+    if not words:
+        return None
+    return SearchQuery(
+        " & ".join(
+            f"{word}:*" if len(word) >= MIN_PREFIX_LENGTH else word
+            for word in words
+        ),
+        search_type="raw",
+        config=SEARCH_CONFIG,
+    )
+
+
+def encode_cursor(rank: float, pk: int) -> str:
+    """Return the cursor of the page after a row of `rank` and `pk`."""
+    payload = json.dumps([rank, pk], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[float, int]:
+    """Return the (rank, pk) of a cursor; raise SearchCursorError if invalid."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, pk = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as error:
+        raise SearchCursorError("Invalid cursor.") from error
+    if not isinstance(rank, (int, float)) or not isinstance(pk, int):
+        raise SearchCursorError("Invalid cursor.")
+    return float(rank), pk
+
+
+def search(
+    queryset: QuerySet[Any],
+    text: str,
+    trigram_fields: Sequence[str] = (),
+    cursor: str | None = None,
+    limit: int = DEFAULT_SEARCH_LIMIT,
+) -> SearchPage:
+    """
+    Return one page of the rows of `queryset` matching `text`, best first.
+
+    `queryset` must be of a model with a search_vector column. Rows also
+    match on the similarity of `trigram_fields` to `text` when pg_trgm is
+    installed. Pass the previous page's next_cursor to get the next page.
+    """
+    query = prefix_query(text)
+    condition = Q(search_vector=query) if query is not None else Q(pk__in=[])
+    rank = SearchRank(F("search_vector"), query) if query is not None else Value(0.0)
+    if trigram_fields and trigram_enabled(queryset.db):
+        for field in trigram_fields:
+            condition |= Q(**{f"{field}__trigram_similar": text})
+        similarities = [TrigramSimilarity(field, text) for field in trigram_fields]
+        rank = rank + (
+            Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+        )
+
+    # Ranks are compared in double precision, which round-trips exactly
+    # through the cursor's JSON
+    rows = queryset.filter(condition).annotate(
+        search_rank=Cast(rank, FloatField())
+    )
+    if cursor is not None:
+        after_rank, after_pk = decode_cursor(cursor)
+        rows = rows.filter(
+            Q(search_rank__lt=after_rank)
+            | Q(search_rank=after_rank, pk__gt=after_pk)
+        )
+    results = list(rows.order_by("-search_rank", "pk")[: limit + 1])
+
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        last = results[-1]
+        next_cursor = encode_cursor(last.search_rank, last.pk)
+    return SearchPage(results, next_cursor)
+
+
+def search_exercises(
+    text: str, cursor: str | None = None, limit: int = DEFAULT_SEARCH_LIMIT
+) -> SearchPage:
+    """Search exercises by name and description."""
+    return search(
+        Exercise.objects.all(), text, EXERCISE_TRIGRAM_FIELDS, cursor, limit
+    )
+
+
+def search_equipment(
+    text: str, cursor: str | None = None, limit: int = DEFAULT_SEARCH_LIMIT
+) -> SearchPage:
+    """Search equipment by name and brand."""
+    return search(
+        Equipment.objects.all(), text, EQUIPMENT_TRIGRAM_FIELDS, cursor, limit
+    )
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from rest_framework import serializers
+
+from catalog.enums import MajorMuscleGroup, MuscleGroup, WorkoutRegion
+from catalog.models import Equipment, Exercise
+from catalog.search import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT
+from training.enums import ExerciseAttribute
+
+DEFAULT_EXERCISE_LIMIT = 50
+MAX_EXERCISE_LIMIT = 500
+
+
+class ExerciseSerializer(serializers.ModelSerializer):
+    """Serializer for Exercise model."""
+
+    class Meta:
+        model = Exercise
+        fields = [
+            "id",
+            "name",
+            "primary_muscles",
+            "secondary_muscles",
+            "attributes",
+        ]
+        read_only_fields = fields
+
+
+class EquipmentSerializer(serializers.ModelSerializer):
+    """Serializer for Equipment model."""
+
+    class Meta:
+        model = Equipment
+        fields = [
+            "id",
+            "name",
+            "brand",
+            "modality",
+            "station",
+            "equipment_type",
+        ]
+        read_only_fields = fields
+
+
+def _choice_list(choices: list[tuple[str, str]]) -> serializers.ListField:
+    return serializers.ListField(
+        child=serializers.ChoiceField(choices=choices), required=False
+    )
+
+
+class ExerciseQuerySerializer(serializers.Serializer):
+    """
+    Query parameters of the exercise catalog query endpoint.
+
+    List parameters are repeated (?muscles=glutes&muscles=quads).
+    """
+
+    # Any of these groups (primary muscles, or secondary too)
+    muscles = _choice_list(MuscleGroup.choices)
+    major_groups = _choice_list(MajorMuscleGroup.choices)
+    regions = _choice_list(WorkoutRegion.choices)
+    include_secondary = serializers.BooleanField(default=False)
+    # All of these primary muscles
+    all_muscles = _choice_list(MuscleGroup.choices)
+    # None of these groups, primary or secondary
+    exclude_muscles = _choice_list(MuscleGroup.choices)
+    exclude_major_groups = _choice_list(MajorMuscleGroup.choices)
+    exclude_regions = _choice_list(WorkoutRegion.choices)
+    # All of, any of and none of these attributes
+    attributes = _choice_list(ExerciseAttribute.choices)
+    any_attributes = _choice_list(ExerciseAttribute.choices)
+    exclude_attributes = _choice_list(ExerciseAttribute.choices)
+
+    limit = serializers.IntegerField(
+        min_value=1, max_value=MAX_EXERCISE_LIMIT, default=DEFAULT_EXERCISE_LIMIT
+    )
+    offset = serializers.IntegerField(min_value=0, default=0)
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    """Query parameters of the catalog search endpoints."""
+
+    q = serializers.CharField(max_length=200)
+    cursor = serializers.CharField(required=False)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=MAX_SEARCH_LIMIT, default=DEFAULT_SEARCH_LIMIT
+    )
+
+
+class CatalogChangesQuerySerializer(serializers.Serializer):
+    """Query parameters of the catalog changes endpoint."""
+
+    since = serializers.CharField(required=False)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+
+from catalog.compatibility import compatibility, compatibility_changed
+from catalog.mapped import catalog_map
+from catalog.models import CatalogTombstone, Equipment, Exercise
+from catalog.snapshot import invalidate_snapshot
+from catalog.sync import touch_exercises
+
+
+# m2m_changed actions after which the equipment links have changed; the
+# pre_* actions of the same call are skipped
+LINK_CHANGE_ACTIONS = frozenset({"post_add", "post_remove", "post_clear"})
+
+
+def links_unchanged(kwargs: dict) -> bool:
+    """Return True for m2m_changed actions sent before the links change."""
+    return kwargs.get("action", "post_add") not in LINK_CHANGE_ACTIONS
+
+
+@receiver(post_delete, sender=Exercise)
+@receiver(post_delete, sender=Equipment)
+@receiver(m2m_changed, sender=Exercise.equipment.through)
+@receiver(compatibility_changed)
+def invalidate_compatibility_index(sender: type, **kwargs: dict) -> None:
+    """Drop the compatibility index when exercise/equipment links change."""
+    if links_unchanged(kwargs):
+        return
+    compatibility.invalidate()
+    transaction.on_commit(compatibility.invalidate)
+
+
+@receiver(post_save, sender=Exercise)
+@receiver(post_save, sender=Equipment)
+@receiver(post_delete, sender=Exercise)
+@receiver(post_delete, sender=Equipment)
+@receiver(m2m_changed, sender=Exercise.equipment.through)
+@receiver(compatibility_changed)
+def invalidate_catalog_snapshot(sender: type, **kwargs: dict) -> None:
+    """Rebuild the catalog snapshot and map once a catalog change commits."""
+    if links_unchanged(kwargs):
+        return
+    transaction.on_commit(invalidate_snapshot)
+    catalog_map.mark_changed()
+    transaction.on_commit(catalog_map.refresh)
+
+
+@receiver(post_delete, sender=Exercise)
+@receiver(post_delete, sender=Equipment)
+def record_tombstone(sender: type, instance: Exercise | Equipment, **kwargs) -> None:
+    """Record the deletion for delta sync."""
+    CatalogTombstone.objects.create(
+        model_name=sender._meta.model_name, object_id=instance.pk
+    )
+
+
+@receiver(pre_delete, sender=Equipment)
+def touch_exercises_of_deleted_equipment(
+    sender: type, instance: Equipment, **kwargs
+) -> None:
+    """Mark the exercises losing a link to the equipment as changed."""
+    touch_exercises(instance.exercises.values_list("id", flat=True))
+
+
+@receiver(m2m_changed, sender=Exercise.equipment.through)
+def touch_relinked_exercises(
+    sender: type,
+    instance: Exercise | Equipment,
+    action: str,
+    reverse: bool,
+    pk_set: set[int] | None,
+    **kwargs,
+) -> None:
+    """Mark exercises whose equipment links changed as changed."""
+    if not reverse:
+        if action in LINK_CHANGE_ACTIONS:
+            touch_exercises([instance.pk])
+    elif action in ("post_add", "post_remove"):
+        touch_exercises(pk_set)
+    elif action == "pre_clear":
+        touch_exercises(instance.exercises.values_list("id", flat=True))
@@ -0,0 +1,231 @@
+"""
+Prebuilt, precompressed catalog snapshot for clients.
+
+Clients render exercise and equipment pickers from the whole catalog plus the
+enum metadata (labels and the muscle taxonomy). The catalog changes rarely,
+so instead of serializing it on every request it is built once into a JSON
+document, named after its content hash, and written to CATALOG_SNAPSHOT_DIR
+with its compressed encodings:
+
+    <version>.json  <version>.json.gz  <version>.json.br  current
+
+`current` holds the version being served. The brotli encoding is only
+written when the brotli package is installed. Once a change to Exercise or
+Equipment commits, catalog.signals removes `current` and the next request
+rebuilds the snapshot; otherwise a request is two small file reads and no
+query, and a revalidation that matches reads only `current`. Rebuilding an unchanged catalog gives the same version, and a
+version's content never changes, so versioned URLs can be cached forever.
+
+The document carries the cursor from which clients delta sync their copy
+(see catalog.sync). Build it at deploy time with
+`python manage.py build_catalog_snapshot`.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.db.models import TextChoices
+
+from catalog.enums import (
+    MAJOR_GROUP_TO_REGION,
+    MUSCLE_GROUP_TO_MAJOR_GROUP,
+    MajorMuscleGroup,
+    MuscleGroup,
+    WorkoutRegion,
+)
+from catalog.models import Equipment, Exercise
+from catalog.sync import equipment_rows, exercise_rows, latest_cursor
+from training.enums import (
+    EquipmentModality,
+    EquipmentStation,
+    EquipmentType,
+    ExerciseAttribute,
+    MovementPattern,
+)
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Hex digits of the content hash naming a version
+VERSION_LENGTH = 16
+# Versions kept on disk, so clients holding a recent versioned URL can still
+# fetch it after the catalog changes
+KEEP_VERSIONS = 5
+
+CURRENT_FILE = "current"
+# Rewritten by every invalidation; a build that sees it change while it runs
+# may have read the catalog before the change, and doesn't publish
+INVALIDATED_FILE = "invalidated"
+
+# (Content-Encoding, file suffix, compressor), most preferred first
+ENCODINGS: list[tuple[str, str, Callable[[bytes], bytes]]] = [
+    ("gzip", ".gz", lambda body: gzip.compress(body, compresslevel=9, mtime=0)),
+]
+if brotli is not None:
+    ENCODINGS.insert(0, ("br", ".br", lambda body: brotli.compress(body)))
+
+
+class SnapshotNotFound(LookupError):
+    """Raised for a version that isn't on disk (never built, or pruned)."""
+
+
+def snapshot_dir() -> Path:
+    return Path(settings.CATALOG_SNAPSHOT_DIR)
+
+
+def _choices(choices: type[TextChoices], **extra: dict[str, str]) -> list[dict]:
+    return [
+        {
+            "value": member.value,
+            "label": member.label,
+            **{key: mapping[member] for key, mapping in extra.items()},
+        }
+        for member in choices
+    ]
+
+
+def snapshot_document() -> dict[str, Any]:
+    """Return the catalog and enum metadata served in the snapshot."""
+    return {
+        # Where the client's delta sync starts (see catalog.sync)
+        "cursor": latest_cursor(),
+        "exercises": exercise_rows(Exercise.objects.order_by("id")),
+        "equipment": equipment_rows(Equipment.objects.order_by("id")),
+        "enums": {
+            "muscle_groups": _choices(
+                MuscleGroup, major_group=MUSCLE_GROUP_TO_MAJOR_GROUP
+            ),
+            "major_muscle_groups": _choices(
+                MajorMuscleGroup, region=MAJOR_GROUP_TO_REGION
+            ),
+            "workout_regions": _choices(WorkoutRegion),
+            "exercise_attributes": _choices(ExerciseAttribute),
+            "equipment_modalities": _choices(EquipmentModality),
+            "equipment_stations": _choices(EquipmentStation),
+            "equipment_types": _choices(EquipmentType),
+            "movement_patterns": _choices(MovementPattern),
+        },
+    }
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _read_text(path: Path) -> str | None:
+    try:
+        return path.read_text().strip()
+    except FileNotFoundError:
+        return None
+
+
+def build_snapshot() -> str:
+    """
+    Build the snapshot, publish it as current and return its version.
+
+    Files are replaced atomically, so readers never see a partial file.
+    Versions beyond the KEEP_VERSIONS most recent are removed.
+    """
+    directory = snapshot_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    invalidated = _read_text(directory / INVALIDATED_FILE)
+
+    body = json.dumps(
+        snapshot_document(), separators=(",", ":"), ensure_ascii=False
+    ).encode()
+    version = hashlib.blake2b(body, digest_size=VERSION_LENGTH // 2).hexdigest()
+    path = directory / f"{version}.json"
+    if not path.exists():
+        for _encoding, suffix, compress in ENCODINGS:
+            _write_atomic(directory / f"{version}.json{suffix}", compress(body))
+        # Written last: a version whose .json exists is complete
+        _write_atomic(path, body)
+    else:
+        # Mark the version as the newest for pruning
+        os.utime(path)
+
+    _write_atomic(directory / CURRENT_FILE, version.encode())
+    if _read_text(directory / INVALIDATED_FILE) != invalidated:
+        (directory / CURRENT_FILE).unlink(missing_ok=True)
+    _prune(directory)
+    return version
+
+
+def _prune(directory: Path) -> None:
+    versions = sorted(
+        directory.glob("*.json"), key=lambda path: path.stat().st_mtime, reverse=True
+    )
+    for path in versions[KEEP_VERSIONS:]:
+        for _encoding, suffix, _compress in ENCODINGS:
+            path.with_name(path.name + suffix).unlink(missing_ok=True)
+        path.unlink(missing_ok=True)
+
+
+def invalidate_snapshot() -> None:
+    """Stop serving the current snapshot; the next request rebuilds it."""
+    directory = snapshot_dir()
+    if not directory.exists():
+        return
+    _write_atomic(directory / INVALIDATED_FILE, uuid.uuid4().hex.encode())
+    (directory / CURRENT_FILE).unlink(missing_ok=True)
+
+
+def current_version() -> str:
+    """Return the version being served, building the snapshot if there is none."""
+    version = _read_text(snapshot_dir() / CURRENT_FILE)
+    return version or build_snapshot()
+
+
+def snapshot_file(version: str, accepted: set[str]) -> tuple[Path, str | None]:
+    """
+    Return the file of a version in the preferred `accepted` encoding.
+
+    Only stats the files, so conditional requests can be answered without
+    reading the body. Returns (path, Content-Encoding or None for identity).
+    Raises SnapshotNotFound if the version isn't on disk.
+    """
+    path = snapshot_dir() / f"{version}.json"
+    if not path.exists():
+        raise SnapshotNotFound(version)
+    for encoding, suffix, _compress in ENCODINGS:
+        if encoding in accepted:
+            encoded = path.with_name(path.name + suffix)
+            # Versions built before an encoding was enabled lack its file
+            if encoded.exists():
+                return encoded, encoding
+    return path, None
+
+
+def read_snapshot(version: str, accepted: set[str]) -> tuple[bytes, str | None]:
+    """
+    Return the body of a version in the preferred `accepted` encoding.
+
+    Returns (body, Content-Encoding or None for identity). Raises
+    SnapshotNotFound if the version isn't on disk.
+    """
+    path, encoding = snapshot_file(version, accepted)
+    try:
+        return path.read_bytes(), encoding
+    except FileNotFoundError:
+        # Pruned since it was found
+        raise SnapshotNotFound(version) from None
@@ -0,0 +1,191 @@
+"""
+Delta sync of the exercise and equipment catalog.
+
+Clients that keep a copy of the catalog (see catalog.snapshot) refresh it
+with the rows changed since their last sync instead of downloading it again.
+Exercise and Equipment carry an updated_at column, indexed with the id, and
+deleted rows leave a CatalogTombstone, so a delta is three index range
+scans. Changes to an exercise's equipment links bump its updated_at too
+(see catalog.signals and catalog.compatibility).
+
+The sync cursor is an opaque encoding of a change time. updated_at is set
+when a row is saved, not when its transaction commits, so a row can become
+visible after rows with later timestamps. Cursors therefore trail the
+present by SYNC_LAG: rows changed within that window are sent again on the
+next sync, which clients apply idempotently, rather than missed.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from django.db.models import Max, QuerySet
+from django.utils import timezone
+
+from catalog.models import CatalogTombstone, Equipment, Exercise
+
+# How far cursors trail the present; longer than any catalog write
+# transaction
+SYNC_LAG = timedelta(seconds=60)
+# Rows of a delta beyond which the client should download the snapshot
+MAX_CHANGES = 1000
+
+EXERCISE_FIELDS = [
+    "id",
+    "name",
+    "description",
+    "primary_muscles",
+    "secondary_muscles",
+    "attributes",
+]
+EQUIPMENT_FIELDS = ["id", "name", "brand", "modality", "station", "equipment_type"]
+
+
+class SyncCursorError(ValueError):
+    """Raised for a cursor that wasn't issued by catalog sync."""
+
+
+@dataclass(frozen=True)
+class CatalogChanges:
+    """
+    The catalog rows changed and deleted since a cursor.
+
+    `reset` is set, with no rows, when there are more than MAX_CHANGES: the
+    client should download the snapshot instead.
+    """
+
+    exercises: list[dict[str, Any]]
+    equipment: list[dict[str, Any]]
+    deleted_exercises: list[int]
+    deleted_equipment: list[int]
+    next_cursor: str | None
+    reset: bool = False
+
+
+def exercise_rows(exercises: QuerySet[Exercise]) -> list[dict[str, Any]]:
+    """Return exercises as plain rows, with the ids of their equipment."""
+    rows = list(exercises.values(*EXERCISE_FIELDS))
+    links: dict[int, list[int]] = defaultdict(list)
+    for exercise_id, equipment_id in (
+        Exercise.equipment.through.objects.filter(
+            exercise_id__in=exercises.values("id")
+        )
+        .order_by("exercise_id", "equipment_id")
+        .values_list("exercise_id", "equipment_id")
+    ):
+        links[exercise_id].append(equipment_id)
+
+    for row in rows:
+        row["attributes"] = row["attributes"] or []
+        row["equipment"] = links.get(row["id"], [])
+    return rows
+
+
+def equipment_rows(equipment: QuerySet[Equipment]) -> list[dict[str, Any]]:
+    """Return equipment as plain rows."""
+    return list(equipment.values(*EQUIPMENT_FIELDS))
+
+
+def touch_exercises(exercise_ids: Iterable[int]) -> None:
+    """Mark exercises changed, e.g. after their equipment links change."""
+    Exercise.objects.filter(pk__in=list(exercise_ids)).update(
+        updated_at=timezone.now()
+    )
+
+
+def encode_cursor(moment: datetime) -> str:
+    """Return the cursor of changes after `moment`."""
+    micros = round(moment.timestamp() * 1_000_000)
+    payload = json.dumps([micros], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> datetime:
+    """Return the time of a cursor; raise SyncCursorError if invalid."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        (micros,) = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(micros, int):
+            raise TypeError(micros)
+        return datetime.fromtimestamp(0, UTC) + timedelta(microseconds=micros)
+    except (
+        binascii.Error,
+        UnicodeDecodeError,
+        ValueError,
+        TypeError,
+        OverflowError,
+    ) as error:
+        raise SyncCursorError("Invalid cursor.") from error
+
+
+def latest_cursor() -> str | None:
+    """
+    Return the cursor of the catalog as it is now, or None if it is empty.
+
+    Derived from the latest change rather than the clock, so it only changes
+    with the catalog.
+    """
+    latest = [
+        Exercise.objects.aggregate(latest=Max("updated_at"))["latest"],
+        Equipment.objects.aggregate(latest=Max("updated_at"))["latest"],
+        CatalogTombstone.objects.aggregate(latest=Max("deleted_at"))["latest"],
+    ]
+    moments = [moment for moment in latest if moment is not None]
+    return encode_cursor(max(moments) - SYNC_LAG) if moments else None
+
+
+def _deleted_ids(
+    model: type[Exercise | Equipment], since: datetime | None
+) -> list[int]:
+    tombstones = CatalogTombstone.objects.filter(model_name=model._meta.model_name)
+    if since is not None:
+        tombstones = tombstones.filter(deleted_at__gt=since)
+    return list(
+        tombstones.order_by("deleted_at", "id").values_list("object_id", flat=True)[
+            : MAX_CHANGES + 1
+        ]
+    )
+
+
+def catalog_changes(cursor: str | None = None) -> CatalogChanges:
+    """
+    Return the catalog rows changed and deleted after `cursor`.
+
+    Without a cursor every row is a change. Pass the result's next_cursor
+    to the next sync.
+    """
+    since = decode_cursor(cursor) if cursor is not None else None
+    # Taken before reading, so changes made during the reads are sent again
+    next_moment = timezone.now() - SYNC_LAG
+    if since is not None:
+        next_moment = max(next_moment, since)
+
+    exercises = Exercise.objects.order_by("updated_at", "id")
+    equipment = Equipment.objects.order_by("updated_at", "id")
+    if since is not None:
+        exercises = exercises.filter(updated_at__gt=since)
+        equipment = equipment.filter(updated_at__gt=since)
+
+    changes = CatalogChanges(
+        exercises=exercise_rows(exercises[: MAX_CHANGES + 1]),
+        equipment=equipment_rows(equipment[: MAX_CHANGES + 1]),
+        deleted_exercises=_deleted_ids(Exercise, since),
+        deleted_equipment=_deleted_ids(Equipment, since),
+        next_cursor=encode_cursor(next_moment),
+    )
+    total = (
+        len(changes.exercises)
+        + len(changes.equipment)
+        + len(changes.deleted_exercises)
+        + len(changes.deleted_equipment)
+    )
+    if total > MAX_CHANGES:
+        return CatalogChanges([], [], [], [], next_cursor=None, reset=True)
+    return changes
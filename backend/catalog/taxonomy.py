@@ -0,0 +1,155 @@
+"""
+Compiled muscle taxonomy.
+
+catalog.enums defines the MuscleGroup -> MajorMuscleGroup -> WorkoutRegion
+hierarchy with dicts, and regions_for_muscle_groups() and
+primary_region_for_workout() walk them (and build sets) on every call. This
+module compiles the hierarchy once at import:
+
+- Every MuscleGroup owns one bit (its position in the enum), so a collection
+  of muscle groups is a single integer (muscle_mask()).
+- Every MajorMuscleGroup and WorkoutRegion has the mask of its muscle groups,
+  so "does this workout hit the lower body?" is one AND.
+- The regions present (upper, lower, core) form a 3-bit key into tables of
+  results, which are computed with the reference functions in catalog.enums
+  so the two can't disagree.
+
+Masks are only meant for in-memory use: appending a MuscleGroup keeps the
+existing bits, but reordering the enum would change them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from catalog.enums import (
+    MAJOR_GROUP_TO_REGION,
+    MUSCLE_GROUP_TO_MAJOR_GROUP,
+    MajorMuscleGroup,
+    MuscleGroup,
+    WorkoutRegion,
+    primary_region_for_workout,
+    regions_for_muscle_groups,
+)
+
+# Single bit for every muscle group value
+MUSCLE_BITS: dict[str, int] = {
+    muscle.value: 1 << position for position, muscle in enumerate(MuscleGroup)
+}
+
+
+def muscle_mask(groups: Iterable[str]) -> int:
+    """Return the mask of muscle groups (unknown values raise KeyError)."""
+    mask = 0
+    for group in groups:
+        mask |= MUSCLE_BITS[group]
+    return mask
+
+
+MAJOR_GROUP_MASKS: dict[MajorMuscleGroup, int] = {
+    major: muscle_mask(
+        muscle
+        for muscle, group in MUSCLE_GROUP_TO_MAJOR_GROUP.items()
+        if group == major
+    )
+    for major in MajorMuscleGroup
+}
+
+# Regions muscle groups map to; FULL_BODY is derived, never mapped to
+REGION_MASKS: dict[WorkoutRegion, int] = {
+    region: muscle_mask(
+        muscle
+        for muscle, major in MUSCLE_GROUP_TO_MAJOR_GROUP.items()
+        if MAJOR_GROUP_TO_REGION[major] == region
+    )
+    for region in (
+        WorkoutRegion.UPPER_BODY,
+        WorkoutRegion.LOWER_BODY,
+        WorkoutRegion.CORE,
+    )
+}
+UPPER_BODY_MASK = REGION_MASKS[WorkoutRegion.UPPER_BODY]
+LOWER_BODY_MASK = REGION_MASKS[WorkoutRegion.LOWER_BODY]
+CORE_MASK = REGION_MASKS[WorkoutRegion.CORE]
+ALL_MUSCLES_MASK = UPPER_BODY_MASK | LOWER_BODY_MASK | CORE_MASK
+
+
+def _region_key(mask: int) -> int:
+    # Bit 0: upper body, bit 1: lower body, bit 2: core
+    return (
+        bool(mask & UPPER_BODY_MASK)
+        | bool(mask & LOWER_BODY_MASK) << 1
+        | bool(mask & CORE_MASK) << 2
+    )
+
+
+def _build_region_tables() -> tuple[
+    tuple[frozenset[WorkoutRegion], ...], tuple[WorkoutRegion, ...]
+]:
+    # One representative muscle per region is enough to cover every key
+    representatives = [
+        next(m for m in MuscleGroup if MUSCLE_BITS[m] & region_mask)
+        for region_mask in (UPPER_BODY_MASK, LOWER_BODY_MASK, CORE_MASK)
+    ]
+    regions, primary = [], []
+    for key in range(8):
+        muscles = [m for bit, m in enumerate(representatives) if key >> bit & 1]
+        regions.append(frozenset(regions_for_muscle_groups(muscles)))
+        primary.append(primary_region_for_workout(muscles))
+    return tuple(regions), tuple(primary)
+
+
+_REGIONS, _PRIMARY_REGIONS = _build_region_tables()
+
+
+def muscle_groups_for_mask(mask: int) -> list[MuscleGroup]:
+    """Return the muscle groups of a mask, in enum order."""
+    return [muscle for muscle in MuscleGroup if MUSCLE_BITS[muscle] & mask]
+
+
+def expand_muscle_groups(
+    muscle_groups: Iterable[str] = (),
+    major_groups: Iterable[str] = (),
+    regions: Iterable[str] = (),
+) -> list[MuscleGroup]:
+    """
+    Return the muscle groups covered by groups at any level, in enum order.
+
+    FULL_BODY covers every muscle group.
+    """
+    mask = muscle_mask(muscle_groups)
+    for major in major_groups:
+        mask |= MAJOR_GROUP_MASKS[MajorMuscleGroup(major)]
+    for region in regions:
+        region = WorkoutRegion(region)
+        mask |= (
+            ALL_MUSCLES_MASK
+            if region == WorkoutRegion.FULL_BODY
+            else REGION_MASKS[region]
+        )
+    return muscle_groups_for_mask(mask)
+
+
+def major_groups_for_mask(mask: int) -> list[MajorMuscleGroup]:
+    """Return the major muscle groups a mask touches, in enum order."""
+    return [major for major, bits in MAJOR_GROUP_MASKS.items() if bits & mask]
+
+
+def regions_for_mask(mask: int) -> frozenset[WorkoutRegion]:
+    """Bitmask version of catalog.enums.regions_for_muscle_groups."""
+    return _REGIONS[_region_key(mask)]
+
+
+def primary_region_for_mask(mask: int) -> WorkoutRegion:
+    """Bitmask version of catalog.enums.primary_region_for_workout."""
+    return _PRIMARY_REGIONS[_region_key(mask)]
+
+
+def regions_for(groups: Iterable[str]) -> frozenset[WorkoutRegion]:
+    """Return the same regions as regions_for_muscle_groups(groups)."""
+    return _REGIONS[_region_key(muscle_mask(groups))]
+
+
+def primary_region_for(groups: Iterable[str]) -> WorkoutRegion:
+    """Return the same region as primary_region_for_workout(groups)."""
+    return _PRIMARY_REGIONS[_region_key(muscle_mask(groups))]
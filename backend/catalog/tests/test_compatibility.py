@@ -0,0 +1,210 @@
+"""
+Tests for exercise/equipment compatibility.
+
+These tests verify:
+- The forward and reverse indexes mirror Exercise.equipment
+- Exercises without linked equipment are compatible with anything
+- The index is dropped when links change, including bulk loads
+- JSON and CSV files load by id or name, all-or-nothing
+- The load_exercise_equipment command reports and rejects bad files
+"""
+
+import json
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from catalog.compatibility import (
+    CompatibilityLoadError,
+    compatibility,
+    load_compatibility,
+    read_compatibility_file,
+)
+from catalog.models import Equipment, Exercise
+from training.enums import EquipmentModality, EquipmentType
+
+
+class CompatibilityTestCase(TestCase):
+    """Base test case with a small catalog."""
+
+    def setUp(self) -> None:
+        compatibility.invalidate()
+        self.rack = Equipment.objects.create(
+            name="Power Rack",
+            brand="Acme",
+            modality=EquipmentModality.FREE_WEIGHTS,
+            equipment_type=EquipmentType.PLATE_LOADED,
+        )
+        self.smith = Equipment.objects.create(
+            name="Smith Machine",
+            brand="Acme",
+            modality=EquipmentModality.MACHINES,
+            equipment_type=EquipmentType.SMITH,
+        )
+        self.squat = Exercise.objects.create(name="Back Squat")
+        self.lunge = Exercise.objects.create(name="Lunge")
+        self.plank = Exercise.objects.create(name="Plank")
+
+    def write_file(self, name: str, content: str) -> Path:
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory)
+        path = directory / name
+        path.write_text(content)
+        return path
+
+
+class CompatibilityIndexTests(CompatibilityTestCase):
+    """Tests for CompatibilityIndex."""
+
+    def test_forward_and_reverse_lookups(self) -> None:
+        """Test both directions mirror the relation."""
+        self.squat.equipment.set([self.rack, self.smith])
+        self.lunge.equipment.set([self.smith])
+
+        index = compatibility.index()
+
+        self.assertEqual(
+            index.equipment_for(self.squat.pk), {self.rack.pk, self.smith.pk}
+        )
+        self.assertEqual(
+            index.exercises_for(self.smith.pk), {self.squat.pk, self.lunge.pk}
+        )
+        self.assertEqual(index.exercises_for(self.rack.pk), {self.squat.pk})
+        self.assertTrue(index.is_compatible(self.lunge.pk, self.smith.pk))
+        self.assertFalse(index.is_compatible(self.lunge.pk, self.rack.pk))
+
+    def test_exercise_without_equipment(self) -> None:
+        """Test exercises that need no equipment are compatible with anything."""
+        index = compatibility.index()
+
+        self.assertFalse(index.needs_equipment(self.plank.pk))
+        self.assertEqual(index.equipment_for(self.plank.pk), frozenset())
+        self.assertTrue(index.is_compatible(self.plank.pk, self.rack.pk))
+
+    def test_lookups_are_cached(self) -> None:
+        """Test the index is built once and reused."""
+        compatibility.index()
+
+        with self.assertNumQueries(0):
+            compatibility.index().is_compatible(self.squat.pk, self.rack.pk)
+
+    def test_link_changes_invalidate(self) -> None:
+        """Test adding and removing links is reflected immediately."""
+        self.assertTrue(compatibility.index().is_compatible(self.lunge.pk, self.rack.pk))
+
+        self.lunge.equipment.add(self.smith)
+        self.assertFalse(
+            compatibility.index().is_compatible(self.lunge.pk, self.rack.pk)
+        )
+
+        self.smith.delete()
+        self.assertTrue(compatibility.index().is_compatible(self.lunge.pk, self.rack.pk))
+
+
+class LoadCompatibilityTests(CompatibilityTestCase):
+    """Tests for reading and loading compatibility files."""
+
+    def test_load_json(self) -> None:
+        """Test JSON entries accept one reference or a list, by name or id."""
+        path = self.write_file(
+            "links.json",
+            json.dumps(
+                [
+                    {"exercise": "Back Squat", "equipment": ["Power Rack", self.smith.pk]},
+                    {"exercise": self.lunge.pk, "equipment": "Smith Machine"},
+                ]
+            ),
+        )
+
+        created = load_compatibility(read_compatibility_file(path))
+
+        self.assertEqual(created, 3)
+        self.assertEqual(
+            compatibility.index().equipment_for(self.squat.pk),
+            {self.rack.pk, self.smith.pk},
+        )
+        self.assertEqual(
+            compatibility.index().exercises_for(self.smith.pk),
+            {self.squat.pk, self.lunge.pk},
+        )
+
+    def test_load_csv(self) -> None:
+        """Test CSV rows are loaded and existing links are kept."""
+        self.squat.equipment.add(self.rack)
+        path = self.write_file(
+            "links.csv",
+            "exercise,equipment\nBack Squat,Power Rack\nBack Squat,Smith Machine\n",
+        )
+
+        created = load_compatibility(read_compatibility_file(path))
+
+        self.assertEqual(created, 1)
+        self.assertEqual(self.squat.equipment.count(), 2)
+
+    def test_replace(self) -> None:
+        """Test replace drops the listed exercises' other links."""
+        self.squat.equipment.add(self.rack)
+        self.lunge.equipment.add(self.rack)
+
+        load_compatibility([("Back Squat", "Smith Machine")], replace=True)
+
+        self.assertEqual(list(self.squat.equipment.all()), [self.smith])
+        self.assertEqual(list(self.lunge.equipment.all()), [self.rack])
+
+    def test_unresolved_references_write_nothing(self) -> None:
+        """Test unknown and ambiguous references fail the whole load."""
+        Exercise.objects.create(name="Lunge")
+
+        with self.assertRaises(CompatibilityLoadError) as context:
+            load_compatibility(
+                [
+                    ("Back Squat", "Power Rack"),
+                    ("Lunge", "Smith Machine"),
+                    ("Plank", "Yoga Mat"),
+                ]
+            )
+
+        self.assertEqual(
+            context.exception.errors,
+            [
+                "Exercise 'Lunge' is ambiguous; use its id.",
+                "Equipment 'Yoga Mat' does not exist.",
+            ],
+        )
+        self.assertFalse(Exercise.equipment.through.objects.exists())
+
+    def test_invalid_files(self) -> None:
+        """Test malformed files raise CompatibilityLoadError."""
+        cases = [
+            ("links.json", '{"exercise": "Back Squat"}'),
+            ("links.json", '[{"exercise": "Back Squat"}]'),
+            ("links.json", "not json"),
+            ("links.csv", "name,equipment\nBack Squat,Power Rack\n"),
+            ("links.xml", "<links />"),
+        ]
+        for name, content in cases:
+            with self.subTest(name=name, content=content):
+                with self.assertRaises(CompatibilityLoadError):
+                    read_compatibility_file(self.write_file(name, content))
+
+    def test_command(self) -> None:
+        """Test the command loads a file and reports the result."""
+        path = self.write_file("links.txt", "exercise,equipment\nLunge,Power Rack\n")
+        out = StringIO()
+
+        call_command("load_exercise_equipment", str(path), format="csv", stdout=out)
+
+        self.assertIn("Loaded 1 pairs (1 new links)", out.getvalue())
+        self.assertEqual(list(self.lunge.equipment.all()), [self.rack])
+
+    def test_command_rejects_bad_references(self) -> None:
+        """Test the command turns load errors into a CommandError."""
+        path = self.write_file("links.csv", "exercise,equipment\nDeadlift,Power Rack\n")
+
+        with self.assertRaisesMessage(CommandError, "Exercise 'Deadlift' does not exist."):
+            call_command("load_exercise_equipment", str(path), stdout=StringIO())
@@ -0,0 +1,317 @@
+"""
+Tests for querying the exercise catalog by muscles and attributes.
+
+These tests verify:
+- overlapping, containing and excluding filters on the exercise arrays
+- Muscle filters at major group and region level, primary or secondary
+- The GIN indexes serve the filters on a 100k exercise catalog
+- The exercise query endpoint validates and applies its parameters
+"""
+
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from catalog.enums import MajorMuscleGroup, MuscleGroup, WorkoutRegion
+from catalog.models import Exercise
+from training.enums import ExerciseAttribute
+
+User = get_user_model()
+
+# Size of the catalog the EXPLAIN tests plan against
+EXPLAIN_CATALOG_SIZE = 100_000
+
+
+class ExerciseQueryTestCase(TestCase):
+    """Base test case with a small catalog."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.hip_thrust = Exercise.objects.create(
+            name="Hip Thrust",
+            primary_muscles=[MuscleGroup.GLUTES],
+            secondary_muscles=[MuscleGroup.HAMSTRINGS],
+            attributes=[],
+        )
+        cls.box_jump = Exercise.objects.create(
+            name="Box Jump",
+            primary_muscles=[MuscleGroup.QUADS, MuscleGroup.GLUTES],
+            secondary_muscles=[MuscleGroup.CALVES],
+            attributes=[ExerciseAttribute.HIGH_IMPACT],
+        )
+        cls.pull_up = Exercise.objects.create(
+            name="Pull Up",
+            primary_muscles=[MuscleGroup.LATS],
+            secondary_muscles=[MuscleGroup.BICEPS],
+            attributes=None,
+        )
+        cls.plank = Exercise.objects.create(
+            name="Plank",
+            primary_muscles=[MuscleGroup.ABS],
+            secondary_muscles=[MuscleGroup.GLUTES],
+            attributes=[ExerciseAttribute.FLOOR_REQUIRED],
+        )
+
+    def names(self, exercises) -> list[str]:
+        return list(exercises.order_by("id").values_list("name", flat=True))
+
+
+class ExerciseQuerySetTests(ExerciseQueryTestCase):
+    """Tests for the ExerciseQuerySet filters."""
+
+    def test_array_filters(self) -> None:
+        """Test overlap, contains and excludes on the arrays."""
+        exercises = Exercise.objects
+
+        self.assertEqual(
+            self.names(exercises.overlapping("primary_muscles", ["glutes", "lats"])),
+            ["Hip Thrust", "Box Jump", "Pull Up"],
+        )
+        self.assertEqual(
+            self.names(exercises.containing("primary_muscles", ["glutes", "quads"])),
+            ["Box Jump"],
+        )
+        # Exercises without attributes (NULL or empty) have none to exclude
+        self.assertEqual(
+            self.names(exercises.excluding("attributes", ["high_impact"])),
+            ["Hip Thrust", "Pull Up", "Plank"],
+        )
+
+    def test_glutes_but_not_high_impact(self) -> None:
+        """Test filters combine."""
+        exercises = Exercise.objects.overlapping(
+            "primary_muscles", ["glutes"]
+        ).excluding("attributes", ["high_impact"])
+
+        self.assertEqual(self.names(exercises), ["Hip Thrust"])
+
+    def test_unknown_field(self) -> None:
+        """Test only the array fields can be filtered."""
+        with self.assertRaises(ValueError):
+            Exercise.objects.overlapping("name", ["Plank"])
+
+    def test_targeting_expands_taxonomy(self) -> None:
+        """Test major groups and regions match their muscle groups."""
+        exercises = Exercise.objects
+
+        self.assertEqual(
+            self.names(exercises.targeting(major_groups=[MajorMuscleGroup.HIPS])),
+            ["Hip Thrust", "Box Jump"],
+        )
+        self.assertEqual(
+            self.names(
+                exercises.targeting(
+                    [MuscleGroup.ABS], regions=[WorkoutRegion.UPPER_BODY]
+                )
+            ),
+            ["Pull Up", "Plank"],
+        )
+        self.assertEqual(self.names(exercises.targeting()), self.names(exercises))
+
+    def test_targeting_secondary_muscles(self) -> None:
+        """Test secondary muscles only count when asked for."""
+        self.assertEqual(
+            self.names(Exercise.objects.targeting([MuscleGroup.HAMSTRINGS])), []
+        )
+        self.assertEqual(
+            self.names(
+                Exercise.objects.targeting(
+                    [MuscleGroup.HAMSTRINGS], include_secondary=True
+                )
+            ),
+            ["Hip Thrust"],
+        )
+
+    def test_avoiding(self) -> None:
+        """Test avoided groups count as primary or secondary muscles."""
+        self.assertEqual(
+            self.names(Exercise.objects.avoiding(major_groups=[MajorMuscleGroup.HIPS])),
+            ["Pull Up"],
+        )
+
+
+class ExerciseQueryPlanTests(TestCase):
+    """Tests the filters use the GIN indexes on a large catalog."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        # One primary muscle per exercise, half of them chest (the rest spread
+        # evenly), a secondary muscle on every 5th and an attribute on every
+        # 50th, spread evenly
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {Exercise._meta.db_table}
+                    (name, description, primary_muscles, secondary_muscles,
+                     attributes, created_at, updated_at)
+                SELECT 'Exercise ' || i, '',
+                       ARRAY[(%(muscles)s::varchar[])[
+                           CASE WHEN i %% (2 * %(m)s) < %(m)s
+                                THEN i %% (2 * %(m)s) ELSE 0 END + 1]],
+                       CASE WHEN i %% 5 = 0
+                            THEN ARRAY[(%(muscles)s::varchar[])[
+                                i / 5 %% %(m)s + 1]]
+                            ELSE '{{}}'::varchar[] END,
+                       CASE WHEN i %% 50 = 0
+                            THEN ARRAY[(%(attributes)s::varchar[])[
+                                i / 50 %% %(a)s + 1]]
+                            ELSE '{{}}'::varchar[] END,
+                       now(), now()
+                FROM generate_series(1, %(size)s) AS i
+                """,
+                {
+                    "muscles": MuscleGroup.values,
+                    "m": len(MuscleGroup.values),
+                    "attributes": ExerciseAttribute.values,
+                    "a": len(ExerciseAttribute.values),
+                    "size": EXPLAIN_CATALOG_SIZE,
+                },
+            )
+            # Merge the rows into the GIN indexes, as (auto)vacuum would
+            for index in Exercise._meta.indexes:
+                if not isinstance(index, GinIndex):
+                    continue
+                cursor.execute(
+                    "SELECT gin_clean_pending_list(%s::regclass)", [index.name]
+                )
+            cursor.execute(f"ANALYZE {Exercise._meta.db_table}")
+
+    def assertUsesIndexes(self, exercises, *indexes: str) -> None:
+        plan = exercises.explain()
+        for index in indexes:
+            self.assertIn(f"Bitmap Index Scan on {index}", plan)
+        self.assertNotIn("Seq Scan", plan)
+
+    def test_glutes_but_not_high_impact(self) -> None:
+        """Test the muscle overlap is an index scan, the exclusion a filter."""
+        exercises = Exercise.objects.targeting([MuscleGroup.GLUTES]).excluding(
+            "attributes", [ExerciseAttribute.HIGH_IMPACT]
+        )
+
+        self.assertUsesIndexes(exercises, "exercise_primary_muscles_gin")
+        glutes = MuscleGroup.values.index(MuscleGroup.GLUTES)
+        high_impact = ExerciseAttribute.values.index(ExerciseAttribute.HIGH_IMPACT)
+        expected = sum(
+            1
+            for i in range(1, EXPLAIN_CATALOG_SIZE + 1)
+            if i % (2 * len(MuscleGroup.values)) == glutes
+            and not (
+                i % 50 == 0 and i // 50 % len(ExerciseAttribute.values) == high_impact
+            )
+        )
+        self.assertEqual(exercises.count(), expected)
+
+    def test_major_group(self) -> None:
+        """Test an expanded major group is one index scan."""
+        exercises = Exercise.objects.targeting(major_groups=[MajorMuscleGroup.BACK])
+
+        self.assertUsesIndexes(exercises, "exercise_primary_muscles_gin")
+
+    def test_secondary_muscles(self) -> None:
+        """Test including secondary muscles scans both muscle indexes."""
+        exercises = Exercise.objects.targeting(
+            [MuscleGroup.GLUTES], include_secondary=True
+        )
+
+        self.assertUsesIndexes(
+            exercises, "exercise_primary_muscles_gin", "exercise_secondary_muscles_gin"
+        )
+
+    def test_attributes_contain(self) -> None:
+        """Test attribute filters scan the attributes index."""
+        exercises = Exercise.objects.containing(
+            "attributes", [ExerciseAttribute.OVERHEAD]
+        )
+
+        self.assertUsesIndexes(exercises, "exercise_attributes_gin")
+
+
+@override_settings(
+    # Use a simple secret key for testing
+    SECRET_KEY="test-secret-key-for-testing-only",
+    # Disable secure cookies for testing
+    JWT_COOKIE_SECURE=False,
+)
+class ExerciseQueryAPITests(ExerciseQueryTestCase):
+    """Tests for GET /api/exercises/."""
+
+    url = "/api/exercises/"
+
+    def setUp(self) -> None:
+        user = User.objects.create_user(email="test@example.com")
+        self.client = APIClient()
+        self.client.cookies[settings.JWT_ACCESS_COOKIE_NAME] = str(
+            AccessToken.for_user(user)
+        )
+
+    def get_names(self, params: dict) -> list[str]:
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row["name"] for row in response.data["results"]]
+
+    def test_filters(self) -> None:
+        """Test each parameter filters the catalog."""
+        cases = [
+            ({}, ["Hip Thrust", "Box Jump", "Pull Up", "Plank"]),
+            ({"muscles": ["glutes", "lats"]}, ["Hip Thrust", "Box Jump", "Pull Up"]),
+            ({"major_groups": "back"}, ["Pull Up"]),
+            ({"regions": "core", "include_secondary": "true"}, ["Plank"]),
+            ({"all_muscles": ["quads", "glutes"]}, ["Box Jump"]),
+            ({"exclude_regions": "lower_body"}, ["Pull Up"]),
+            ({"attributes": "high_impact"}, ["Box Jump"]),
+            (
+                {"any_attributes": ["high_impact", "floor_required"]},
+                ["Box Jump", "Plank"],
+            ),
+            (
+                {"muscles": "glutes", "exclude_attributes": "high_impact"},
+                ["Hip Thrust"],
+            ),
+        ]
+        for params, expected in cases:
+            with self.subTest(params=params):
+                self.assertEqual(self.get_names(params), expected)
+
+    def test_pagination(self) -> None:
+        """Test limit and offset page the results, with the total count."""
+        response = self.client.get(self.url, {"limit": 2, "offset": 1})
+
+        self.assertEqual(response.data["count"], 4)
+        self.assertEqual(
+            [row["id"] for row in response.data["results"]],
+            [self.box_jump.pk, self.pull_up.pk],
+        )
+        self.assertEqual(
+            dict(response.data["results"][0]),
+            {
+                "id": self.box_jump.pk,
+                "name": "Box Jump",
+                "primary_muscles": ["quads", "glutes"],
+                "secondary_muscles": ["calves"],
+                "attributes": ["high_impact"],
+            },
+        )
+
+    def test_invalid_parameters(self) -> None:
+        """Test unknown groups or attributes and bad pages are a 400."""
+        for params in (
+            {"muscles": "wings"},
+            {"major_groups": "glutes"},
+            {"exclude_attributes": "loud"},
+            {"limit": 0},
+            {"offset": -1},
+        ):
+            response = self.client.get(self.url, params)
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_authentication(self) -> None:
+        """Test the endpoint requires authentication."""
+        response = APIClient().get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
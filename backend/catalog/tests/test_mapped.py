@@ -0,0 +1,398 @@
+"""
+Tests for the shared, memory-mapped catalog.
+
+These tests verify:
+- A map answers the lookups the database and CompatibilityIndex answer
+- Maps of another database, another format or truncated are rejected
+- Processes switch to a replaced map, and don't use it in a transaction
+  that changed the catalog
+- Committed catalog changes rebuild an existing map of this database only,
+  once per transaction and off the committing thread
+- A map removed by a failed rebuild is rebuilt by the next change
+- The compatibility index is served from the map once it is built
+"""
+
+import shutil
+import tempfile
+import threading
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from catalog.compatibility import CompatibilityIndex, compatibility
+from catalog.enums import MuscleGroup
+from catalog.mapped import (
+    HEADER,
+    CatalogMap,
+    MappedCatalog,
+    build_catalog_map,
+    catalog_map,
+)
+from catalog.models import Equipment, Exercise
+from catalog.snapshot import invalidate_snapshot
+from catalog.taxonomy import muscle_mask
+from training.bitmasks import mask_for
+from training.enums import (
+    EquipmentModality,
+    EquipmentStation,
+    EquipmentType,
+    ExerciseAttribute,
+)
+
+
+class MappedCatalogTestCase(TestCase):
+    """Base test case with a small catalog and a temporary map path."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.rack = Equipment.objects.create(
+            name="Power Rack",
+            brand="Rogue",
+            modality=EquipmentModality.FREE_WEIGHTS,
+            station=EquipmentStation.RACK,
+            equipment_type=EquipmentType.PLATE_LOADED,
+        )
+        cls.bench = Equipment.objects.create(
+            name="Flat Bench",
+            brand="Rogue",
+            modality=EquipmentModality.FREE_WEIGHTS,
+            equipment_type=EquipmentType.PLATE_LOADED,
+        )
+        cls.squat = Exercise.objects.create(
+            name="Back Squat",
+            primary_muscles=[MuscleGroup.QUADS, MuscleGroup.GLUTES],
+            secondary_muscles=[MuscleGroup.HAMSTRINGS],
+            attributes=[ExerciseAttribute.HIGH_IMPACT],
+        )
+        cls.squat.equipment.add(cls.rack)
+        cls.bench_press = Exercise.objects.create(
+            name="Bench Press", primary_muscles=[MuscleGroup.CHEST]
+        )
+        cls.bench_press.equipment.add(cls.rack, cls.bench)
+        cls.plank = Exercise.objects.create(
+            name="Plank", primary_muscles=[MuscleGroup.ABS], attributes=None
+        )
+
+    def setUp(self) -> None:
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = Path(directory) / "catalog.map"
+        settings_override = override_settings(
+            CATALOG_MAP={
+                **settings.CATALOG_MAP,
+                "PATH": self.path,
+                "BACKGROUND_REBUILD": False,
+            }
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # Check the file on every get()
+        patcher = mock.patch.object(catalog_map, "check_seconds", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(catalog_map.clear)
+        # The fixture's changes were never committed; forget them
+        catalog_map.refresh()
+        catalog_map.clear()
+
+
+class MappedCatalogTests(MappedCatalogTestCase):
+    """Tests for building and reading maps."""
+
+    def test_exercise_lookups(self) -> None:
+        """Test names and masks are read back as stored."""
+        build_catalog_map()
+        mapped = MappedCatalog(self.path)
+
+        self.assertEqual(len(mapped), 3)
+        self.assertEqual(mapped.exercise_name(self.squat.pk), "Back Squat")
+        self.assertEqual(
+            mapped.exercise_masks(self.squat.pk),
+            (
+                muscle_mask([MuscleGroup.QUADS, MuscleGroup.GLUTES]),
+                muscle_mask([MuscleGroup.HAMSTRINGS]),
+                mask_for([ExerciseAttribute.HIGH_IMPACT]),
+            ),
+        )
+        self.assertEqual(mapped.exercise_masks(self.plank.pk)[2], 0)
+        self.assertIsNone(mapped.exercise_name(self.plank.pk + 1000))
+        self.assertIsNone(mapped.exercise_masks(0))
+
+    def test_primary_masks(self) -> None:
+        """Test batch mask lookups skip exercises that aren't in the map."""
+        build_catalog_map()
+        mapped = MappedCatalog(self.path)
+
+        self.assertEqual(
+            mapped.primary_masks([self.plank.pk, 0, self.bench_press.pk, 10**9]),
+            {
+                self.plank.pk: muscle_mask([MuscleGroup.ABS]),
+                self.bench_press.pk: muscle_mask([MuscleGroup.CHEST]),
+            },
+        )
+        self.assertEqual(mapped.primary_masks([]), {})
+
+    def test_equipment_lookups(self) -> None:
+        """Test equipment names, brands and trait masks are read back."""
+        build_catalog_map()
+        mapped = MappedCatalog(self.path)
+
+        self.assertEqual(
+            mapped.equipment_name(self.rack.pk), ("Power Rack", "Rogue")
+        )
+        self.assertEqual(
+            mapped.equipment_traits(self.rack.pk),
+            Equipment.objects.get(pk=self.rack.pk).trait_mask,
+        )
+        self.assertIsNone(mapped.equipment_traits(0))
+
+    def test_compatibility_matches_index(self) -> None:
+        """Test the map answers compatibility like CompatibilityIndex."""
+        build_catalog_map()
+        mapped = MappedCatalog(self.path)
+        index = CompatibilityIndex.build()
+
+        exercise_ids = [self.squat.pk, self.bench_press.pk, self.plank.pk, 0]
+        equipment_ids = [self.rack.pk, self.bench.pk, 0]
+        for exercise_id in exercise_ids:
+            self.assertEqual(
+                mapped.equipment_for(exercise_id), index.equipment_for(exercise_id)
+            )
+            self.assertEqual(
+                mapped.needs_equipment(exercise_id),
+                index.needs_equipment(exercise_id),
+            )
+            for equipment_id in equipment_ids:
+                self.assertEqual(
+                    mapped.is_compatible(exercise_id, equipment_id),
+                    index.is_compatible(exercise_id, equipment_id),
+                )
+        for equipment_id in equipment_ids:
+            self.assertEqual(
+                mapped.exercises_for(equipment_id), index.exercises_for(equipment_id)
+            )
+
+    def test_empty_catalog(self) -> None:
+        """Test a map of an empty catalog answers every lookup."""
+        Exercise.objects.all().delete()
+        Equipment.objects.all().delete()
+        build_catalog_map()
+        mapped = MappedCatalog(self.path)
+
+        self.assertEqual(len(mapped), 0)
+        self.assertEqual(mapped.primary_masks([1]), {})
+        self.assertTrue(mapped.is_compatible(1, 1))
+
+    def test_version_follows_content(self) -> None:
+        """Test the version only changes with the catalog."""
+        version = build_catalog_map()
+
+        self.assertEqual(build_catalog_map(), version)
+
+        Exercise.objects.filter(pk=self.plank.pk).update(name="Side Plank")
+
+        self.assertNotEqual(build_catalog_map(), version)
+        self.assertEqual(
+            MappedCatalog(self.path).exercise_name(self.plank.pk), "Side Plank"
+        )
+
+    def test_rejects_other_databases(self) -> None:
+        """Test a map built from another database is rejected."""
+        build_catalog_map()
+
+        with self.assertRaisesMessage(ValueError, "another database"):
+            MappedCatalog(self.path, database=b"\0" * 8)
+
+    def test_rejects_invalid_files(self) -> None:
+        """Test files that aren't complete maps are rejected."""
+        build_catalog_map()
+        data = self.path.read_bytes()
+        for invalid in (b"", b"not a map" * 10, data[:-1], data[: HEADER.size + 8]):
+            self.path.write_bytes(invalid)
+
+            with self.assertRaises(ValueError):
+                MappedCatalog(self.path)
+
+    def test_command(self) -> None:
+        """Test build_catalog_map writes the map."""
+        call_command("build_catalog_map", stdout=StringIO())
+
+        self.assertEqual(len(MappedCatalog(self.path)), 3)
+
+
+class CatalogMapTests(MappedCatalogTestCase):
+    """Tests for the per-process CatalogMap."""
+
+    def test_missing_map(self) -> None:
+        """Test there is no map until one is built."""
+        self.assertIsNone(catalog_map.get())
+
+        build_catalog_map()
+
+        self.assertEqual(len(catalog_map.get()), 3)
+
+    def test_switches_to_replaced_map(self) -> None:
+        """Test a replaced file is mapped again, and the old map still reads."""
+        build_catalog_map()
+        before = catalog_map.get()
+
+        Exercise.objects.filter(pk=self.plank.pk).update(name="Side Plank")
+        build_catalog_map()
+        after = catalog_map.get()
+
+        self.assertIsNot(after, before)
+        self.assertNotEqual(after.version, before.version)
+        self.assertEqual(before.exercise_name(self.plank.pk), "Plank")
+        self.assertEqual(after.exercise_name(self.plank.pk), "Side Plank")
+
+    def test_checks_file_at_most_every_interval(self) -> None:
+        """Test the file is only checked again after check_seconds."""
+        build_catalog_map()
+        cached = CatalogMap(check_seconds=3600)
+        before = cached.get()
+
+        Exercise.objects.filter(pk=self.plank.pk).update(name="Side Plank")
+        build_catalog_map()
+
+        self.assertIs(cached.get(), before)
+
+        cached.clear()
+
+        self.assertNotEqual(cached.get().version, before.version)
+
+    def test_no_queries(self) -> None:
+        """Test reading through a built map doesn't query the database."""
+        build_catalog_map()
+        catalog_map.get()
+
+        with CaptureQueriesContext(connection) as queries:
+            mapped = catalog_map.get()
+            mapped.equipment_for(self.bench_press.pk)
+            mapped.primary_masks([self.squat.pk])
+
+        self.assertEqual(len(queries), 0)
+
+    def test_change_rebuilds_on_commit(self) -> None:
+        """Test the map isn't used until the change commits and rebuilds it."""
+        build_catalog_map()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.plank.equipment.add(self.bench)
+
+            self.assertIsNone(catalog_map.get())
+
+        mapped = catalog_map.get()
+        self.assertEqual(mapped.equipment_for(self.plank.pk), {self.bench.pk})
+        self.assertEqual(
+            mapped.exercises_for(self.bench.pk), {self.bench_press.pk, self.plank.pk}
+        )
+
+    def test_rebuilds_once_per_transaction(self) -> None:
+        """Test many changes in one transaction rebuild the map once."""
+        build_catalog_map()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            for n in range(3):
+                Exercise.objects.create(name=f"Lunge {n}")
+            self.plank.equipment.set([self.rack, self.bench])
+
+        with CaptureQueriesContext(connection) as queries:
+            for callback in callbacks:
+                callback()
+
+        self.assertEqual(len(catalog_map.get()), 6)
+        self.assertEqual(len(queries), 3)
+
+    def test_link_changes_notify_after_the_change(self) -> None:
+        """Test only the post_* actions of an equipment link change count."""
+        with self.captureOnCommitCallbacks() as callbacks:
+            with mock.patch.object(catalog_map, "mark_changed") as mark_changed:
+                self.plank.equipment.set([self.rack])
+
+        # One link added: a single post_add, no pre_add
+        mark_changed.assert_called_once_with()
+        self.assertEqual(callbacks.count(catalog_map.refresh), 1)
+        self.assertEqual(callbacks.count(invalidate_snapshot), 1)
+
+    def test_rebuilds_in_background(self) -> None:
+        """Test the committing thread doesn't wait for the rebuild."""
+        build_catalog_map()
+        catalog_map.get()
+        threads = []
+        released = threading.Event()
+
+        def rebuild(path) -> None:
+            threads.append(threading.current_thread())
+            released.wait(5)
+
+        background = {**settings.CATALOG_MAP, "BACKGROUND_REBUILD": True}
+        with override_settings(CATALOG_MAP=background), mock.patch(
+            "catalog.mapped.build_catalog_map", side_effect=rebuild
+        ):
+            catalog_map.mark_changed()
+            catalog_map.refresh()
+
+            # This process stops using the stale map right away
+            self.assertIsNone(catalog_map.get())
+            released.set()
+            catalog_map.wait(5)
+
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    def test_failed_rebuild_recovers_on_next_change(self) -> None:
+        """Test a transient rebuild error doesn't turn the map off for good."""
+        build_catalog_map()
+        self.assertIsNotNone(catalog_map.get())
+
+        with (
+            mock.patch(
+                "catalog.mapped.build_catalog_map",
+                side_effect=DatabaseError("connection lost"),
+            ),
+            self.assertLogs("catalog.mapped", "WARNING"),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            Exercise.objects.create(name="Lunge")
+
+        self.assertFalse(self.path.exists())
+        self.assertIsNone(catalog_map.get())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Exercise.objects.create(name="Split Squat")
+
+        mapped = catalog_map.get()
+        self.assertIsNotNone(mapped)
+        self.assertEqual(len(mapped), 5)
+
+    def test_refresh_needs_map_of_this_database(self) -> None:
+        """Test commits don't create a map, or replace another database's."""
+        with self.captureOnCommitCallbacks(execute=True):
+            Exercise.objects.create(name="Lunge")
+
+        self.assertFalse(self.path.exists())
+
+        self.path.write_bytes(b"another map")
+        with self.captureOnCommitCallbacks(execute=True):
+            Exercise.objects.create(name="Split Squat")
+
+        self.assertEqual(self.path.read_bytes(), b"another map")
+        with self.assertLogs("catalog.mapped", "WARNING"):
+            self.assertIsNone(catalog_map.get())
+
+    def test_compatibility_uses_map(self) -> None:
+        """Test compatibility lookups are served by the map once it is built."""
+        self.assertIsInstance(compatibility.index(), CompatibilityIndex)
+
+        build_catalog_map()
+
+        self.assertIsInstance(compatibility.index(), MappedCatalog)
+        self.assertFalse(
+            compatibility.index().is_compatible(self.squat.pk, self.bench.pk)
+        )
@@ -0,0 +1,255 @@
+"""
+Tests for catalog search.
+
+These tests verify:
+- Words match as prefixes, all of them, and names rank above descriptions
+- Query text can't inject tsquery syntax
+- Cursors page through every match exactly once and reject tampering
+- Searches use the search_vector GIN index
+- The exercise and equipment search endpoints
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from catalog.models import Equipment, Exercise
+from catalog.search import (
+    SearchCursorError,
+    decode_cursor,
+    encode_cursor,
+    prefix_query,
+    search_equipment,
+    search_exercises,
+    trigram_enabled,
+)
+from training.enums import EquipmentModality, EquipmentType
+
+User = get_user_model()
+
+
+class SearchTestCase(TestCase):
+    """Base test case with a small catalog."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.bench_press = Exercise.objects.create(
+            name="Bench Press", description="Press the barbell from the chest."
+        )
+        cls.incline_press = Exercise.objects.create(
+            name="Incline Dumbbell Press", description="Bench set to 30 degrees."
+        )
+        cls.squat = Exercise.objects.create(
+            name="Back Squat", description="Squat with the barbell on the back."
+        )
+        cls.rack = Equipment.objects.create(
+            name="Power Rack",
+            brand="Rogue",
+            modality=EquipmentModality.FREE_WEIGHTS,
+            equipment_type=EquipmentType.PLATE_LOADED,
+        )
+        cls.bench = Equipment.objects.create(
+            name="Adjustable Bench",
+            brand="Rogue Fitness",
+            modality=EquipmentModality.FREE_WEIGHTS,
+            equipment_type=EquipmentType.PLATE_LOADED,
+        )
+
+    def names(self, text: str) -> list[str]:
+        return [exercise.name for exercise in search_exercises(text).results]
+
+
+class SearchTests(SearchTestCase):
+    """Tests for search_exercises and search_equipment."""
+
+    def test_prefixes_of_every_word_match(self) -> None:
+        """Test each word matches as a prefix, stemmed, and all must match."""
+        self.assertEqual(self.names("squa"), ["Back Squat"])
+        self.assertEqual(self.names("incline dumb"), ["Incline Dumbbell Press"])
+        self.assertEqual(
+            self.names("pressing"), ["Bench Press", "Incline Dumbbell Press"]
+        )
+        self.assertEqual(self.names("bench squat"), [])
+
+    def test_names_rank_above_descriptions(self) -> None:
+        """Test a name match outranks a description match."""
+        self.assertEqual(
+            self.names("bench"), ["Bench Press", "Incline Dumbbell Press"]
+        )
+
+    def test_equipment_by_name_and_brand(self) -> None:
+        """Test equipment matches on name and brand, names first."""
+        self.assertEqual(
+            [equipment.name for equipment in search_equipment("rogue").results],
+            ["Power Rack", "Adjustable Bench"],
+        )
+        self.assertEqual(
+            [equipment.name for equipment in search_equipment("bench").results],
+            ["Adjustable Bench"],
+        )
+
+    def test_short_words_match_whole_words(self) -> None:
+        """Test one and two letter words aren't matched as prefixes."""
+        self.assertEqual(self.names("ba"), [])
+        self.assertEqual(self.names("bac"), ["Back Squat"])
+        self.assertEqual(self.names("30"), ["Incline Dumbbell Press"])
+
+    def test_query_syntax_is_ignored(self) -> None:
+        """Test tsquery operators in the text are treated as separators."""
+        self.assertEqual(self.names("squat | !bench & (press"), [])
+        self.assertEqual(self.names("back:* squat'"), ["Back Squat"])
+        self.assertIsNone(prefix_query("!&|()"))
+        self.assertEqual(self.names("!&|()"), [])
+
+    def test_typos_match_with_trigrams(self) -> None:
+        """Test misspelled names still match where pg_trgm is installed."""
+        if not trigram_enabled():
+            self.skipTest("pg_trgm is not installed")
+        self.assertEqual(self.names("bnech press")[0], "Bench Press")
+
+    def test_uses_search_index(self) -> None:
+        """Test prefix queries can be served by the search_vector index."""
+        # The catalog is too small for the planner to prefer an index
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        for model, index in (
+            (Exercise, "exercise_search_vector_gin"),
+            (Equipment, "equipment_search_vector_gin"),
+        ):
+            plan = model.objects.filter(search_vector=prefix_query("ben pre")).explain()
+
+            self.assertIn(f"Bitmap Index Scan on {index}", plan)
+
+
+class SearchCursorTests(SearchTestCase):
+    """Tests for cursor pagination."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        Exercise.objects.bulk_create(
+            Exercise(name=f"Cable Row {n}", description="Row" if n % 2 else "")
+            for n in range(25)
+        )
+
+    def test_pages_cover_every_match_once(self) -> None:
+        """Test following cursors returns each match once, in rank order."""
+        seen, cursor = [], None
+        while True:
+            page = search_exercises("row", cursor=cursor, limit=4)
+            seen.extend(page.results)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        ranks = [exercise.search_rank for exercise in seen]
+        self.assertEqual(len({exercise.pk for exercise in seen}), 25)
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+
+    def test_last_page_has_no_cursor(self) -> None:
+        """Test there is no next cursor once the matches run out."""
+        self.assertIsNone(search_exercises("row", limit=25).next_cursor)
+        self.assertIsNotNone(search_exercises("row", limit=24).next_cursor)
+
+    def test_cursor_round_trip(self) -> None:
+        """Test cursors decode to what they encode, exactly."""
+        rank = search_exercises("row", limit=1).results[0].search_rank
+
+        self.assertEqual(decode_cursor(encode_cursor(rank, 7)), (rank, 7))
+
+    def test_invalid_cursors(self) -> None:
+        """Test garbage and tampered cursors raise SearchCursorError."""
+        for cursor in ("", "!!", "bm90IGpzb24", encode_cursor(0.5, 1)[:-3] + "e30"):
+            with self.assertRaises(SearchCursorError, msg=cursor):
+                search_exercises("row", cursor=cursor)
+
+    def test_one_query_per_page(self) -> None:
+        """Test a page, first or later, is one query."""
+        search_exercises("row")
+        cursor = search_exercises("row", limit=3).next_cursor
+
+        with CaptureQueriesContext(connection) as queries:
+            search_exercises("row", cursor=cursor, limit=3)
+
+        self.assertEqual(len(queries), 1)
+
+
+@override_settings(
+    # Use a simple secret key for testing
+    SECRET_KEY="test-secret-key-for-testing-only",
+    # Disable secure cookies for testing
+    JWT_COOKIE_SECURE=False,
+)
+class SearchAPITests(SearchTestCase):
+    """Tests for GET /api/exercises/search/ and /api/equipment/search/."""
+
+    def setUp(self) -> None:
+        user = User.objects.create_user(email="test@example.com")
+        self.client = APIClient()
+        self.client.cookies[settings.JWT_ACCESS_COOKIE_NAME] = str(
+            AccessToken.for_user(user)
+        )
+
+    def test_exercise_search(self) -> None:
+        """Test exercises are returned best first, with a next cursor."""
+        response = self.client.get(
+            "/api/exercises/search/", {"q": "press", "limit": 1}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row["name"] for row in response.data["results"]], ["Bench Press"]
+        )
+
+        response = self.client.get(
+            "/api/exercises/search/",
+            {"q": "press", "limit": 1, "cursor": response.data["next"]},
+        )
+
+        self.assertEqual(
+            [row["name"] for row in response.data["results"]],
+            ["Incline Dumbbell Press"],
+        )
+        self.assertIsNone(response.data["next"])
+
+    def test_equipment_search(self) -> None:
+        """Test equipment is returned with its brand."""
+        response = self.client.get("/api/equipment/search/", {"q": "power"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            dict(response.data["results"][0]),
+            {
+                "id": self.rack.pk,
+                "name": "Power Rack",
+                "brand": "Rogue",
+                "modality": EquipmentModality.FREE_WEIGHTS,
+                "station": None,
+                "equipment_type": EquipmentType.PLATE_LOADED,
+            },
+        )
+
+    def test_invalid_parameters(self) -> None:
+        """Test a missing query, bad limits and bad cursors are a 400."""
+        for params in (
+            {},
+            {"q": ""},
+            {"q": "bench", "limit": 0},
+            {"q": "bench", "cursor": "!!"},
+        ):
+            response = self.client.get("/api/exercises/search/", params)
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_authentication(self) -> None:
+        """Test the endpoints require authentication."""
+        for url in ("/api/exercises/search/", "/api/equipment/search/"):
+            response = APIClient().get(url, {"q": "bench"})
+
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,332 @@
+"""
+Tests for the catalog snapshot.
+
+These tests verify:
+- The snapshot holds the catalog, equipment links and enum metadata
+- Versions are content hashes, and gzip files decompress to the document
+- Catalog changes invalidate the snapshot once they commit, including
+  changes that race a build
+- Old versions are pruned
+- The snapshot endpoints: encodings (skipping ones a version lacks), ETags,
+  304s without reading the body, cache headers and no queries per request
+"""
+
+import gzip
+import json
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from catalog import snapshot
+from catalog.enums import MuscleGroup
+from catalog.models import Equipment, Exercise
+from catalog.snapshot import (
+    CURRENT_FILE,
+    KEEP_VERSIONS,
+    SnapshotNotFound,
+    build_snapshot,
+    current_version,
+    invalidate_snapshot,
+    read_snapshot,
+)
+from training.enums import EquipmentModality, EquipmentType
+
+User = get_user_model()
+
+
+class SnapshotTestCase(TestCase):
+    """Base test case with a small catalog and a temporary snapshot dir."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.rack = Equipment.objects.create(
+            name="Power Rack",
+            brand="Rogue",
+            modality=EquipmentModality.FREE_WEIGHTS,
+            equipment_type=EquipmentType.PLATE_LOADED,
+        )
+        cls.squat = Exercise.objects.create(
+            name="Back Squat",
+            primary_muscles=[MuscleGroup.QUADS],
+            secondary_muscles=[MuscleGroup.GLUTES],
+            attributes=None,
+        )
+        cls.squat.equipment.add(cls.rack)
+
+    def setUp(self) -> None:
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.directory = Path(directory)
+        settings_override = override_settings(CATALOG_SNAPSHOT_DIR=self.directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def read_current(self) -> str | None:
+        path = self.directory / CURRENT_FILE
+        return path.read_text() if path.exists() else None
+
+
+class SnapshotBuildTests(SnapshotTestCase):
+    """Tests for building, invalidating and pruning snapshots."""
+
+    def test_document(self) -> None:
+        """Test the snapshot holds exercises, equipment and enum metadata."""
+        document = json.loads(read_snapshot(build_snapshot(), set())[0])
+
+        self.assertEqual(
+            document["exercises"],
+            [
+                {
+                    "id": self.squat.pk,
+                    "name": "Back Squat",
+                    "description": "",
+                    "primary_muscles": ["quads"],
+                    "secondary_muscles": ["glutes"],
+                    "attributes": [],
+                    "equipment": [self.rack.pk],
+                }
+            ],
+        )
+        self.assertEqual(document["equipment"][0]["name"], "Power Rack")
+        quads = next(
+            group
+            for group in document["enums"]["muscle_groups"]
+            if group["value"] == "quads"
+        )
+        self.assertEqual(quads["major_group"], "legs")
+
+    def test_version_is_content_hash(self) -> None:
+        """Test rebuilding an unchanged catalog gives the same version."""
+        version = build_snapshot()
+
+        self.assertRegex(version, r"^[0-9a-f]{16}$")
+        self.assertEqual(build_snapshot(), version)
+        self.assertEqual(self.read_current(), version)
+
+        Exercise.objects.create(name="Front Squat")
+
+        self.assertNotEqual(build_snapshot(), version)
+
+    def test_gzip_round_trip(self) -> None:
+        """Test the gzip encoding decompresses to the identity body."""
+        version = build_snapshot()
+        body, _encoding = read_snapshot(version, set())
+        compressed, encoding = read_snapshot(version, {"gzip"})
+
+        self.assertEqual(encoding, "gzip")
+        self.assertEqual(gzip.decompress(compressed), body)
+        self.assertLess(len(compressed), len(body))
+
+    def test_unknown_version(self) -> None:
+        """Test reading a version that was never built raises."""
+        with self.assertRaises(SnapshotNotFound):
+            read_snapshot("0" * 16, {"gzip"})
+
+    def test_change_invalidates_on_commit(self) -> None:
+        """Test a catalog change stops serving the snapshot once committed."""
+        version = build_snapshot()
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Exercise.objects.filter(pk=self.squat.pk).get().save()
+
+        self.assertEqual(self.read_current(), version)
+
+        for callback in callbacks:
+            callback()
+
+        self.assertIsNone(self.read_current())
+
+    def test_equipment_link_invalidates(self) -> None:
+        """Test linking equipment to an exercise invalidates the snapshot."""
+        version = build_snapshot()
+        bench = Equipment.objects.create(
+            name="Flat Bench",
+            brand="Rogue",
+            modality=EquipmentModality.FREE_WEIGHTS,
+            equipment_type=EquipmentType.PLATE_LOADED,
+        )
+        build_snapshot()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.squat.equipment.add(bench)
+
+        self.assertNotEqual(current_version(), version)
+        document = json.loads(read_snapshot(current_version(), set())[0])
+        self.assertEqual(
+            document["exercises"][0]["equipment"], [self.rack.pk, bench.pk]
+        )
+
+    def test_invalidation_during_build_is_not_lost(self) -> None:
+        """Test a build that raced an invalidation doesn't publish."""
+        document = snapshot.snapshot_document
+
+        def racing_document() -> dict:
+            result = document()
+            invalidate_snapshot()
+            return result
+
+        build_snapshot()
+        snapshot.snapshot_document = racing_document
+        try:
+            build_snapshot()
+        finally:
+            snapshot.snapshot_document = document
+
+        self.assertIsNone(self.read_current())
+
+    def test_old_versions_are_pruned(self) -> None:
+        """Test only the most recent versions are kept on disk."""
+        versions = []
+        for n in range(KEEP_VERSIONS + 2):
+            Exercise.objects.create(name=f"Lunge {n}")
+            versions.append(build_snapshot())
+
+        kept = {path.name.split(".")[0] for path in self.directory.glob("*.json*")}
+        self.assertEqual(kept, set(versions[-KEEP_VERSIONS:]))
+
+    def test_command(self) -> None:
+        """Test build_catalog_snapshot builds and publishes the snapshot."""
+        call_command("build_catalog_snapshot", stdout=StringIO())
+
+        self.assertRegex(self.read_current(), r"^[0-9a-f]{16}$")
+
+
+@override_settings(
+    # Use a simple secret key for testing
+    SECRET_KEY="test-secret-key-for-testing-only",
+    # Disable secure cookies for testing
+    JWT_COOKIE_SECURE=False,
+)
+class SnapshotAPITests(SnapshotTestCase):
+    """Tests for GET /api/catalog/snapshot/."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        user = User.objects.create_user(email="test@example.com")
+        self.client = APIClient()
+        self.client.cookies[settings.JWT_ACCESS_COOKIE_NAME] = str(
+            AccessToken.for_user(user)
+        )
+
+    def test_current_snapshot(self) -> None:
+        """Test the current snapshot is served gzipped, to be revalidated."""
+        response = self.client.get(
+            "/api/catalog/snapshot/", HTTP_ACCEPT_ENCODING="gzip, deflate"
+        )
+        version = self.read_current()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["ETag"], f'"{version}-gzip"')
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(
+            response["Content-Location"], f"/api/catalog/snapshot/{version}/"
+        )
+        self.assertIn("no-cache", response["Cache-Control"])
+        document = json.loads(gzip.decompress(response.content))
+        self.assertEqual(document["exercises"][0]["name"], "Back Squat")
+
+    def test_identity_encoding(self) -> None:
+        """Test clients that don't accept gzip get plain JSON."""
+        for accept in ("", "gzip;q=0, identity"):
+            response = self.client.get(
+                "/api/catalog/snapshot/", HTTP_ACCEPT_ENCODING=accept
+            )
+
+            self.assertNotIn("Content-Encoding", response.headers)
+            self.assertEqual(response["ETag"], f'"{self.read_current()}"')
+            self.assertEqual(response.json()["equipment"][0]["brand"], "Rogue")
+
+    def test_falls_back_to_next_accepted_encoding(self) -> None:
+        """Test a version built without brotli is still served gzipped."""
+        version = build_snapshot()
+        (self.directory / f"{version}.json.br").unlink(missing_ok=True)
+        encodings = [("br", ".br", lambda body: body), *snapshot.ENCODINGS]
+
+        with mock.patch.object(snapshot, "ENCODINGS", encodings):
+            response = self.client.get(
+                "/api/catalog/snapshot/", HTTP_ACCEPT_ENCODING="br, gzip"
+            )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["ETag"], f'"{version}-gzip"')
+
+    def test_versioned_snapshot_is_immutable(self) -> None:
+        """Test a versioned URL may be cached forever."""
+        version = build_snapshot()
+
+        response = self.client.get(f"/api/catalog/snapshot/{version}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertIn("max-age=31536000", response["Cache-Control"])
+        self.assertNotIn("Content-Location", response.headers)
+
+    def test_unknown_version(self) -> None:
+        """Test an unknown or malformed version is a 404."""
+        build_snapshot()
+        for version in ("0" * 16, "not-a-version"):
+            response = self.client.get(f"/api/catalog/snapshot/{version}/")
+
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_not_modified(self) -> None:
+        """Test a matching If-None-Match is answered with a bodiless 304."""
+        etag = self.client.get(
+            "/api/catalog/snapshot/", HTTP_ACCEPT_ENCODING="gzip"
+        )["ETag"]
+
+        response = self.client.get(
+            "/api/catalog/snapshot/",
+            HTTP_ACCEPT_ENCODING="gzip",
+            HTTP_IF_NONE_MATCH=etag,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+        # The body isn't read for a 304
+        with mock.patch.object(Path, "read_bytes", side_effect=AssertionError):
+            response = self.client.get(
+                f"/api/catalog/snapshot/{self.read_current()}/",
+                HTTP_ACCEPT_ENCODING="gzip",
+                HTTP_IF_NONE_MATCH=etag,
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # The identity body is a different representation
+        response = self.client.get("/api/catalog/snapshot/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_no_queries_once_built(self) -> None:
+        """Test serving a built snapshot doesn't query the database."""
+        self.client.get("/api/catalog/snapshot/")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                "/api/catalog/snapshot/", HTTP_ACCEPT_ENCODING="gzip"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 0)
+
+    def test_requires_authentication(self) -> None:
+        """Test the endpoint requires authentication."""
+        response = APIClient().get("/api/catalog/snapshot/")
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,279 @@
+"""
+Tests for delta sync of the catalog.
+
+These tests verify:
+- Only rows changed after the cursor are returned, with deletions
+- Equipment link changes mark the exercise changed
+- Cursors trail the present, round-trip and reject garbage
+- Too many changes ask the client to reset from the snapshot
+- Deltas are served by the updated_at indexes
+- The catalog changes endpoint
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from catalog.compatibility import load_compatibility
+from catalog.models import CatalogTombstone, Equipment, Exercise
+from catalog.sync import (
+    SYNC_LAG,
+    SyncCursorError,
+    catalog_changes,
+    decode_cursor,
+    encode_cursor,
+    latest_cursor,
+)
+from training.enums import EquipmentModality, EquipmentType
+
+User = get_user_model()
+
+
+class SyncTestCase(TestCase):
+    """Base test case with a catalog last changed a day ago."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.rack = Equipment.objects.create(
+            name="Power Rack",
+            brand="Rogue",
+            modality=EquipmentModality.FREE_WEIGHTS,
+            equipment_type=EquipmentType.PLATE_LOADED,
+        )
+        cls.bench = Equipment.objects.create(
+            name="Flat Bench",
+            brand="Rogue",
+            modality=EquipmentModality.FREE_WEIGHTS,
+            equipment_type=EquipmentType.PLATE_LOADED,
+        )
+        cls.squat = Exercise.objects.create(name="Back Squat")
+        cls.squat.equipment.add(cls.rack)
+        cls.bench_press = Exercise.objects.create(name="Bench Press")
+        cls.bench_press.equipment.add(cls.bench)
+
+        day_ago = timezone.now() - timedelta(days=1)
+        Exercise.objects.update(updated_at=day_ago)
+        Equipment.objects.update(updated_at=day_ago)
+        cls.cursor = encode_cursor(day_ago + timedelta(hours=1))
+
+    def changed(self) -> tuple[list[str], list[str]]:
+        changes = catalog_changes(self.cursor)
+        return (
+            [row["name"] for row in changes.exercises],
+            [row["name"] for row in changes.equipment],
+        )
+
+
+class CatalogChangesTests(SyncTestCase):
+    """Tests for catalog_changes."""
+
+    def test_nothing_changed(self) -> None:
+        """Test a sync with no changes since the cursor is empty."""
+        changes = catalog_changes(self.cursor)
+
+        self.assertEqual(changes.exercises, [])
+        self.assertEqual(changes.equipment, [])
+        self.assertEqual(changes.deleted_exercises, [])
+        self.assertEqual(changes.deleted_equipment, [])
+        self.assertFalse(changes.reset)
+
+    def test_without_cursor_everything_changed(self) -> None:
+        """Test the first sync returns the whole catalog."""
+        changes = catalog_changes()
+
+        self.assertEqual(len(changes.exercises), 2)
+        self.assertEqual(len(changes.equipment), 2)
+
+    def test_saved_rows(self) -> None:
+        """Test saved rows are returned, in the snapshot's row format."""
+        self.squat.description = "Bar on the back."
+        self.squat.save()
+        self.rack.save()
+
+        changes = catalog_changes(self.cursor)
+
+        self.assertEqual(
+            changes.exercises,
+            [
+                {
+                    "id": self.squat.pk,
+                    "name": "Back Squat",
+                    "description": "Bar on the back.",
+                    "primary_muscles": [],
+                    "secondary_muscles": [],
+                    "attributes": [],
+                    "equipment": [self.rack.pk],
+                }
+            ],
+        )
+        self.assertEqual(
+            [row["name"] for row in changes.equipment], ["Power Rack"]
+        )
+
+    def test_deleted_rows(self) -> None:
+        """Test deleted rows are returned as ids only."""
+        squat_id, rack_id = self.squat.pk, self.rack.pk
+        self.squat.delete()
+        Equipment.objects.filter(pk=rack_id).delete()
+
+        changes = catalog_changes(self.cursor)
+
+        self.assertEqual(changes.deleted_exercises, [squat_id])
+        self.assertEqual(changes.deleted_equipment, [rack_id])
+        self.assertEqual(changes.exercises, [])
+        self.assertEqual(CatalogTombstone.objects.count(), 2)
+
+    def test_equipment_links_mark_exercise_changed(self) -> None:
+        """Test adding, removing and clearing links, from either side."""
+        self.squat.equipment.add(self.bench)
+        self.assertEqual(self.changed()[0], ["Back Squat"])
+
+        Exercise.objects.update(updated_at=timezone.now() - timedelta(days=1))
+        self.bench.exercises.remove(self.bench_press)
+        self.assertEqual(self.changed()[0], ["Bench Press"])
+
+        Exercise.objects.update(updated_at=timezone.now() - timedelta(days=1))
+        self.rack.exercises.clear()
+        self.assertEqual(self.changed()[0], ["Back Squat"])
+
+    def test_deleted_equipment_marks_exercises_changed(self) -> None:
+        """Test exercises linked to deleted equipment lose the link."""
+        self.bench.delete()
+
+        changes = catalog_changes(self.cursor)
+
+        self.assertEqual(
+            [(row["name"], row["equipment"]) for row in changes.exercises],
+            [("Bench Press", [])],
+        )
+
+    def test_loaded_links_mark_exercises_changed(self) -> None:
+        """Test bulk loaded links mark their exercises changed."""
+        load_compatibility([("Bench Press", "Power Rack")])
+
+        self.assertEqual(self.changed()[0], ["Bench Press"])
+
+    def test_next_cursor_trails_present(self) -> None:
+        """Test the next cursor resends recent changes, never going back."""
+        now = timezone.now()
+        next_moment = decode_cursor(catalog_changes(self.cursor).next_cursor)
+
+        self.assertAlmostEqual(
+            next_moment, now - SYNC_LAG, delta=timedelta(seconds=5)
+        )
+
+        future = encode_cursor(now + timedelta(hours=1))
+        self.assertEqual(catalog_changes(future).next_cursor, future)
+
+        self.squat.save()
+        changes = catalog_changes(catalog_changes(self.cursor).next_cursor)
+        self.assertEqual([row["name"] for row in changes.exercises], ["Back Squat"])
+
+    def test_too_many_changes_reset(self) -> None:
+        """Test the client is told to reset when a delta is too large."""
+        self.squat.save()
+        self.rack.save()
+
+        with mock.patch("catalog.sync.MAX_CHANGES", 1):
+            changes = catalog_changes(self.cursor)
+
+        self.assertTrue(changes.reset)
+        self.assertIsNone(changes.next_cursor)
+        self.assertEqual(changes.exercises, [])
+
+    def test_cursor_round_trip(self) -> None:
+        """Test cursors decode to the microsecond they encode."""
+        moment = timezone.now()
+
+        self.assertEqual(decode_cursor(encode_cursor(moment)), moment)
+
+    def test_invalid_cursors(self) -> None:
+        """Test garbage cursors raise SyncCursorError."""
+        for cursor in ("", "!!", "bm90IGpzb24", encode_cursor(timezone.now()) + "e30"):
+            with self.assertRaises(SyncCursorError, msg=cursor):
+                catalog_changes(cursor)
+
+    def test_latest_cursor_follows_changes(self) -> None:
+        """Test the snapshot cursor only moves when the catalog changes."""
+        cursor = latest_cursor()
+
+        self.assertEqual(latest_cursor(), cursor)
+
+        self.squat.delete()
+
+        self.assertGreater(decode_cursor(latest_cursor()), decode_cursor(cursor))
+
+    def test_uses_updated_at_indexes(self) -> None:
+        """Test deltas can be served by the change timestamp indexes."""
+        # The catalog is too small for the planner to prefer an index
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        since = timezone.now()
+        for model, index in (
+            (Exercise, "exercise_updated_at_idx"),
+            (Equipment, "equipment_updated_at_idx"),
+        ):
+            plan = (
+                model.objects.filter(updated_at__gt=since)
+                .order_by("updated_at", "id")[:10]
+                .explain()
+            )
+
+            self.assertIn(index, plan)
+
+
+@override_settings(
+    # Use a simple secret key for testing
+    SECRET_KEY="test-secret-key-for-testing-only",
+    # Disable secure cookies for testing
+    JWT_COOKIE_SECURE=False,
+)
+class CatalogChangesAPITests(SyncTestCase):
+    """Tests for GET /api/catalog/changes/."""
+
+    def setUp(self) -> None:
+        user = User.objects.create_user(email="test@example.com")
+        self.client = APIClient()
+        self.client.cookies[settings.JWT_ACCESS_COOKIE_NAME] = str(
+            AccessToken.for_user(user)
+        )
+
+    def test_changes(self) -> None:
+        """Test changed and deleted rows are returned with the next cursor."""
+        squat_id = self.squat.pk
+        self.squat.delete()
+        self.rack.save()
+
+        response = self.client.get("/api/catalog/changes/", {"since": self.cursor})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["reset"])
+        self.assertEqual(response.data["exercises"], [])
+        self.assertEqual(
+            [row["name"] for row in response.data["equipment"]], ["Power Rack"]
+        )
+        self.assertEqual(
+            response.data["deleted"], {"exercises": [squat_id], "equipment": []}
+        )
+        self.assertIsNotNone(response.data["next"])
+
+    def test_invalid_cursor(self) -> None:
+        """Test an invalid cursor is a 400."""
+        response = self.client.get("/api/catalog/changes/", {"since": "!!"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("since", response.data)
+
+    def test_requires_authentication(self) -> None:
+        """Test the endpoint requires authentication."""
+        response = APIClient().get("/api/catalog/changes/")
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,142 @@
+"""
+Tests for the compiled muscle taxonomy.
+
+These tests verify:
+- Every muscle group has its own bit and major groups/regions their masks
+- Groups at any level expand to their muscle groups
+- regions_for and primary_region_for match the catalog.enums functions for
+  every combination of up to three muscle groups, and for larger ones
+- The cases of test_muscle_taxonomy give the same results
+"""
+
+import random
+from itertools import combinations
+
+from django.test import SimpleTestCase
+
+from catalog.enums import (
+    MUSCLE_GROUP_TO_MAJOR_GROUP,
+    MajorMuscleGroup,
+    MuscleGroup,
+    WorkoutRegion,
+    primary_region_for_workout,
+    regions_for_muscle_groups,
+)
+from catalog.taxonomy import (
+    MAJOR_GROUP_MASKS,
+    MUSCLE_BITS,
+    expand_muscle_groups,
+    major_groups_for_mask,
+    muscle_groups_for_mask,
+    muscle_mask,
+    primary_region_for,
+    regions_for,
+)
+
+
+def muscle_combinations() -> list[tuple[MuscleGroup, ...]]:
+    """Every combination of up to three muscle groups, plus larger samples."""
+    muscles = list(MuscleGroup)
+    combos = [
+        combo for size in range(4) for combo in combinations(muscles, size)
+    ]
+    rng = random.Random(0)
+    combos += [
+        tuple(rng.sample(muscles, rng.randint(4, len(muscles)))) for _ in range(2_000)
+    ]
+    return combos
+
+
+class TaxonomyMaskTests(SimpleTestCase):
+    """Tests for the bit layout."""
+
+    def test_one_bit_per_muscle_group(self) -> None:
+        """Test muscle groups have distinct single bits."""
+        bits = list(MUSCLE_BITS.values())
+        self.assertEqual(len(bits), len(MuscleGroup))
+        self.assertEqual(len(set(bits)), len(bits))
+        self.assertTrue(all(bit & (bit - 1) == 0 for bit in bits))
+
+    def test_major_group_masks(self) -> None:
+        """Test major group masks hold exactly their muscle groups."""
+        for muscle, major in MUSCLE_GROUP_TO_MAJOR_GROUP.items():
+            self.assertEqual(
+                major_groups_for_mask(MUSCLE_BITS[muscle]),
+                [major],
+                muscle,
+            )
+        self.assertEqual(
+            muscle_groups_for_mask(MAJOR_GROUP_MASKS[MajorMuscleGroup.BACK]),
+            [MuscleGroup.LATS, MuscleGroup.UPPER_BACK],
+        )
+
+    def test_expand_muscle_groups(self) -> None:
+        """Test groups at every level expand to their muscle groups."""
+        self.assertEqual(
+            expand_muscle_groups(
+                [MuscleGroup.CHEST], [MajorMuscleGroup.BACK], [WorkoutRegion.CORE]
+            ),
+            [
+                MuscleGroup.CHEST,
+                MuscleGroup.LATS,
+                MuscleGroup.UPPER_BACK,
+                MuscleGroup.ABS,
+                MuscleGroup.OBLIQUES,
+                MuscleGroup.LOWER_BACK,
+            ],
+        )
+        self.assertEqual(
+            expand_muscle_groups(regions=[WorkoutRegion.FULL_BODY]), list(MuscleGroup)
+        )
+        self.assertEqual(expand_muscle_groups(), [])
+
+    def test_unknown_muscle_group(self) -> None:
+        """Test unknown values raise KeyError, as in catalog.enums."""
+        with self.assertRaises(KeyError):
+            muscle_mask(["wings"])
+
+
+class TaxonomyParityTests(SimpleTestCase):
+    """Tests the compiled functions against the catalog.enums ones."""
+
+    def test_regions_parity(self) -> None:
+        """Test regions_for matches regions_for_muscle_groups."""
+        for combo in muscle_combinations():
+            self.assertEqual(
+                regions_for(combo), regions_for_muscle_groups(combo), combo
+            )
+
+    def test_primary_region_parity(self) -> None:
+        """Test primary_region_for matches primary_region_for_workout."""
+        for combo in muscle_combinations():
+            self.assertEqual(
+                primary_region_for(combo), primary_region_for_workout(combo), combo
+            )
+
+    def test_taxonomy_cases(self) -> None:
+        """Test the cases of test_muscle_taxonomy."""
+        cases = [
+            ([MuscleGroup.CHEST, MuscleGroup.QUADS], {WorkoutRegion.FULL_BODY}),
+            ([MuscleGroup.CHEST, MuscleGroup.BICEPS], {WorkoutRegion.UPPER_BODY}),
+            ([MuscleGroup.ABS], {WorkoutRegion.CORE}),
+            (
+                [MuscleGroup.GLUTES, MuscleGroup.HAMSTRINGS],
+                {WorkoutRegion.LOWER_BODY},
+            ),
+            (
+                [MuscleGroup.CHEST, MuscleGroup.ABS],
+                {WorkoutRegion.UPPER_BODY, WorkoutRegion.CORE},
+            ),
+        ]
+        for groups, regions in cases:
+            self.assertEqual(regions_for(groups), regions)
+
+        self.assertEqual(
+            primary_region_for([MuscleGroup.CHEST, MuscleGroup.ABS]),
+            WorkoutRegion.UPPER_BODY,
+        )
+        self.assertEqual(
+            primary_region_for([MuscleGroup.QUADS, MuscleGroup.ABS]),
+            WorkoutRegion.LOWER_BODY,
+        )
+        self.assertEqual(primary_region_for(["abs"]), WorkoutRegion.CORE)
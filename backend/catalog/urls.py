@@ -0,0 +1,22 @@
+from django.urls import path, re_path
+
+from catalog.views import (
+    CatalogChangesView,
+    CatalogSnapshotView,
+    EquipmentSearchView,
+    ExerciseQueryView,
+    ExerciseSearchView,
+)
+
+urlpatterns = [
+    path("exercises/", ExerciseQueryView.as_view(), name="exercise_query"),
+    path("exercises/search/", ExerciseSearchView.as_view(), name="exercise_search"),
+    path("equipment/search/", EquipmentSearchView.as_view(), name="equipment_search"),
+    path("catalog/changes/", CatalogChangesView.as_view(), name="catalog_changes"),
+    path("catalog/snapshot/", CatalogSnapshotView.as_view(), name="catalog_snapshot"),
+    re_path(
+        r"^catalog/snapshot/(?P<version>[0-9a-f]{16})/$",
+        CatalogSnapshotView.as_view(),
+        name="catalog_snapshot_version",
+    ),
+]
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from django.http import Http404, HttpResponse, HttpResponseBase
+from django.urls import reverse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from rest_framework import serializers, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from catalog.models import Exercise, ExerciseQuerySet
+from catalog.search import (
+    SearchCursorError,
+    SearchPage,
+    search_equipment,
+    search_exercises,
+)
+from catalog.serializers import (
+    CatalogChangesQuerySerializer,
+    EquipmentSerializer,
+    ExerciseQuerySerializer,
+    ExerciseSerializer,
+    SearchQuerySerializer,
+)
+from catalog.snapshot import SnapshotNotFound, current_version, snapshot_file
+from catalog.sync import SyncCursorError, catalog_changes
+
+if TYPE_CHECKING:
+    from rest_framework.request import Request
+
+
+def query_exercises(params: dict[str, Any]) -> ExerciseQuerySet:
+    """Return the exercises matching validated ExerciseQuerySerializer data."""
+    exercises = Exercise.objects.targeting(
+        params.get("muscles", ()),
+        params.get("major_groups", ()),
+        params.get("regions", ()),
+        include_secondary=params["include_secondary"],
+    ).avoiding(
+        params.get("exclude_muscles", ()),
+        params.get("exclude_major_groups", ()),
+        params.get("exclude_regions", ()),
+    )
+    if params.get("all_muscles"):
+        exercises = exercises.containing("primary_muscles", params["all_muscles"])
+    if params.get("attributes"):
+        exercises = exercises.containing("attributes", params["attributes"])
+    if params.get("any_attributes"):
+        exercises = exercises.overlapping("attributes", params["any_attributes"])
+    if params.get("exclude_attributes"):
+        exercises = exercises.excluding("attributes", params["exclude_attributes"])
+    return exercises
+
+
+class ExerciseQueryView(APIView):
+    """
+    GET /api/exercises/?muscles=glutes&exclude_attributes=high_impact
+
+    Query the exercise catalog by muscles, at any taxonomy level, and by
+    attributes (see ExerciseQuerySerializer for the parameters). Filters are
+    served by the GIN indexes on the exercise arrays.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request) -> Response:
+        """Return one page of the matching exercises, in id order."""
+        query = ExerciseQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        exercises = query_exercises(params)
+        offset, limit = params["offset"], params["limit"]
+        page = exercises.order_by("id")[offset : offset + limit]
+        return Response(
+            {
+                "count": exercises.count(),
+                "results": ExerciseSerializer(page, many=True).data,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class CatalogSearchView(APIView):
+    """
+    Base view for ranked catalog search (see catalog.search).
+
+    Takes `q`, `limit` and the `cursor` of a previous response, and returns
+    {"next": cursor or null, "results": [...]}.
+    """
+
+    permission_classes = [IsAuthenticated]
+    search: Callable[..., SearchPage]
+    serializer_class: type[serializers.Serializer]
+
+    def get(self, request: Request) -> Response:
+        """Return one page of the matches, best first."""
+        query = SearchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        try:
+            page = self.search(params["q"], params.get("cursor"), params["limit"])
+        except SearchCursorError as error:
+            raise ValidationError({"cursor": [str(error)]})
+        return Response(
+            {
+                "next": page.next_cursor,
+                "results": self.serializer_class(page.results, many=True).data,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class ExerciseSearchView(CatalogSearchView):
+    """
+    GET /api/exercises/search/?q=bench
+
+    Search exercises by name and description.
+    """
+
+    search = staticmethod(search_exercises)
+    serializer_class = ExerciseSerializer
+
+
+class EquipmentSearchView(CatalogSearchView):
+    """
+    GET /api/equipment/search/?q=rack
+
+    Search equipment by name and brand.
+    """
+
+    search = staticmethod(search_equipment)
+    serializer_class = EquipmentSerializer
+
+
+class CatalogChangesView(APIView):
+    """
+    GET /api/catalog/changes/?since=<cursor>
+
+    The exercises and equipment changed, and the ids of those deleted, since
+    `since` (see catalog.sync). Start from the cursor of the catalog
+    snapshot, then pass each response's `next`. When `reset` is true there
+    were too many changes to list: download the snapshot again.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request) -> Response:
+        """Return the rows changed and deleted since the cursor."""
+        query = CatalogChangesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        try:
+            changes = catalog_changes(query.validated_data.get("since"))
+        except SyncCursorError as error:
+            raise ValidationError({"since": [str(error)]})
+        return Response(
+            {
+                "next": changes.next_cursor,
+                "reset": changes.reset,
+                "exercises": changes.exercises,
+                "equipment": changes.equipment,
+                "deleted": {
+                    "exercises": changes.deleted_exercises,
+                    "equipment": changes.deleted_equipment,
+                },
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+def accepted_encodings(request: Request) -> set[str]:
+    """Return the content codings the client accepts, ignoring q=0."""
+    accepted = set()
+    for coding in request.headers.get("Accept-Encoding", "").split(","):
+        name, _, params = coding.partition(";")
+        key, _, quality = params.strip().partition("=")
+        if key.strip().lower() == "q":
+            try:
+                if float(quality) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+class CatalogSnapshotView(APIView):
+    """
+    GET /api/catalog/snapshot/
+    GET /api/catalog/snapshot/<version>/
+
+    The whole exercise and equipment catalog with the enum metadata, as one
+    prebuilt JSON document (see catalog.snapshot), brotli or gzip encoded
+    when the client accepts it.
+
+    The unversioned URL serves the current version and must be revalidated;
+    its Content-Location is the versioned URL, whose content never changes
+    and may be cached forever. Both answer If-None-Match with a 304.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request, version: str | None = None) -> HttpResponseBase:
+        """Return the snapshot body from disk, without querying the catalog."""
+        immutable = version is not None
+        if version is None:
+            version = current_version()
+
+        try:
+            path, encoding = snapshot_file(version, accepted_encodings(request))
+        except SnapshotNotFound:
+            raise Http404("Unknown catalog snapshot version.")
+        # Strong, and distinct per encoding: the bytes differ
+        etag = f'"{version}-{encoding}"' if encoding else f'"{version}"'
+
+        # Answered before reading the body, which a 304 doesn't need
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            try:
+                body = path.read_bytes()
+            except FileNotFoundError:
+                # Pruned since it was found
+                raise Http404("Unknown catalog snapshot version.")
+            response = HttpResponse(body, content_type="application/json")
+            if encoding:
+                response.headers["Content-Encoding"] = encoding
+        response.headers["ETag"] = etag
+        patch_vary_headers(response, ["Accept-Encoding"])
+        if immutable:
+            patch_cache_control(
+                response, private=True, max_age=31536000, immutable=True
+            )
+        else:
+            response.headers["Content-Location"] = reverse(
+                "catalog_snapshot_version", args=[version]
+            )
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -0,0 +1,73 @@
+"""
+Conditional GET support for API views.
+
+Endpoints that clients poll can answer `If-None-Match` revalidations with a
+bodiless 304 instead of re-serializing an unchanged resource. The ETag is
+derived from a cheap version source (typically an `updated_at` value that is
+already in memory or cached), so a 304 costs neither a serializer pass nor,
+ideally, a query.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+from collections.abc import Callable, Hashable
+from typing import TYPE_CHECKING, Any
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+if TYPE_CHECKING:
+    from django.http import HttpResponseBase
+    from rest_framework.request import Request
+    from rest_framework.views import APIView
+
+    Handler = Callable[..., HttpResponseBase]
+
+
+def make_etag(*parts: Hashable) -> str:
+    """Return a weak ETag identifying the given version parts."""
+    digest = hashlib.blake2b(
+        "\x1f".join(map(str, parts)).encode(), digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def conditional_get(
+    version_func: Callable[[Request], Hashable | None],
+) -> Callable[[Handler], Handler]:
+    """
+    Decorate an APIView GET handler with ETag revalidation.
+
+    `version_func(request)` runs after authentication and must return a value
+    that changes whenever the response body would, or None to skip
+    conditional handling. The ETag also covers the request path and the
+    negotiated media type, so the browsable API and JSON never share a tag.
+
+    Responses are marked `Cache-Control: private, no-cache`: clients keep
+    them but revalidate on every use, and shared caches never store them.
+    """
+
+    def decorator(handler: Handler) -> Handler:
+        @functools.wraps(handler)
+        def wrapper(
+            view: APIView, request: Request, *args: Any, **kwargs: Any
+        ) -> HttpResponseBase:
+            version = version_func(request)
+            if version is None:
+                return handler(view, request, *args, **kwargs)
+
+            etag = make_etag(request.path, request.accepted_media_type, version)
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = handler(view, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+
+            response.headers["ETag"] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -104,22 +104,50 @@ DATABASES = {
 
 AUTH_PASSWORD_VALIDATORS = [
     {
-        "NAME": (
-            "django.contrib.auth.password_validation"
-            ".UserAttributeSimilarityValidator"
-        ),
+        "NAME": "account.password_validation.FastUserAttributeSimilarityValidator",
     },
     {
         "NAME": ("django.contrib.auth.password_validation.MinimumLengthValidator"),
     },
     {
-        "NAME": ("django.contrib.auth.password_validation.CommonPasswordValidator"),
+        "NAME": "account.password_validation.CompiledCommonPasswordValidator",
     },
     {
         "NAME": ("django.contrib.auth.password_validation.NumericPasswordValidator"),
     },
 ]
 
+# Sorted digests of Django's common-password list, memory-mapped by
+# CompiledCommonPasswordValidator. Rebuild with compile_common_passwords.
+COMMON_PASSWORDS_PATH = BASE_DIR / "var" / "common-passwords.bin"
+
+# Prebuilt, compressed catalog snapshots served by /api/catalog/snapshot/
+# (see catalog.snapshot). Rebuild with build_catalog_snapshot.
+CATALOG_SNAPSHOT_DIR = BASE_DIR / "var" / "catalog-snapshot"
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/5.0/topics/auth/passwords/
+
+# PBKDF2-SHA256 runs on a bounded per-process pool (see account.hashers).
+# The pooled hasher replaces Django's PBKDF2PasswordHasher: hashers are looked
+# up by algorithm name, so listing both would bypass the pool.
+PASSWORD_HASHERS = [
+    "account.hashers.PooledPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+# At most MAX_WORKERS hashes run at once per process; up to MAX_QUEUE more
+# wait, and anything beyond that is rejected with 503 Service Unavailable.
+PASSWORD_HASHING_POOL = {
+    "ENABLED": True,
+    "MAX_WORKERS": 2,
+    "MAX_QUEUE": 32,
+}
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
@@ -181,6 +209,95 @@ SIMPLE_JWT = {
 }
 
 
+# =============================================================================
+# Authentication Caches
+# =============================================================================
+
+# Per-process snapshot of authenticated users (see account.caches).
+# Snapshots are invalidated when the user is saved or deleted; the TTL bounds
+# staleness for writes made by other worker processes. Session revocations are
+# also published through the default cache, so with a shared CACHES backend
+# other workers reject revoked tokens immediately (see
+# account.tokens.publish_token_generation).
+AUTH_USER_CACHE = {
+    "ENABLED": True,
+    "TTL_SECONDS": 60,
+    "MAX_ENTRIES": 10_000,
+}
+
+# Per-process LRU of verified access tokens (see account.caches).
+# Entries expire at the token's "exp" claim.
+AUTH_TOKEN_CACHE = {
+    "ENABLED": True,
+    "MAX_ENTRIES": 10_000,
+}
+
+# Per-process Bloom filters of blacklisted refresh-token JTIs (see
+# account.blacklist). Tokens blacklisted by another worker are seen within
+# REFRESH_INTERVAL_SECONDS. One filter of FILTER_BITS is kept per day of
+# refresh-token expiry (1 MiB each, about 1% false positives, confirmed by a
+# query, at 870k tokens a day).
+TOKEN_BLACKLIST_INDEX = {
+    "ENABLED": True,
+    "REFRESH_INTERVAL_SECONDS": 5,
+    "FILTER_BITS": 2**23,
+    "FILTER_HASHES": 7,
+}
+
+# Window in which duplicate refreshes of one token receive the pair minted by
+# the first (see account.tokens.rotate_refresh_token). Uses the default cache.
+REFRESH_ROTATION_GRACE_SECONDS = 10
+
+
+# =============================================================================
+# Training Caches
+# =============================================================================
+
+# Per-process snapshots of each user's training preferences (see
+# training.caches), serving GETs and their ETags without a query. Entries are
+# invalidated when preferences are saved; the TTL bounds staleness for writes
+# made by other worker processes.
+TRAINING_PREFERENCES_CACHE = {
+    "ENABLED": True,
+    "TTL_SECONDS": 60,
+    "MAX_ENTRIES": 10_000,
+}
+
+# Per-process exercise eligibility indexes (see training.eligibility). Dropped
+# when the catalog or a gym's inventory changes; the TTL bounds staleness for
+# changes made by other worker processes.
+ELIGIBILITY_INDEX = {
+    "TTL_SECONDS": 300,
+    "MAX_GYMS": 1_000,
+    "MAX_PROFILES_PER_GYM": 256,
+}
+
+# Per-process forward and reverse index of Exercise.equipment (see
+# catalog.compatibility). Dropped when the relation changes; the TTL bounds
+# staleness for changes made by other worker processes.
+COMPATIBILITY_INDEX = {
+    "TTL_SECONDS": 300,
+}
+
+# Catalog lookups shared by every worker process through one memory-mapped
+# file (see catalog.mapped). Rebuilt when a catalog change commits, on a
+# background thread unless BACKGROUND_REBUILD is off; other workers notice a
+# new file within CHECK_SECONDS. Build it at deploy time with
+# build_catalog_map.
+CATALOG_MAP = {
+    "PATH": BASE_DIR / "var" / "catalog.map",
+    "CHECK_SECONDS": 1.0,
+    "BACKGROUND_REBUILD": True,
+}
+
+# Per-process inventory of each gym's equipment (see gym.inventory), used to
+# validate and suggest equipment while building workouts.
+GYM_INVENTORY_CACHE = {
+    "TTL_SECONDS": 300,
+    "MAX_ENTRIES": 1_000,
+}
+
+
 # =============================================================================
 # CORS Configuration
 # =============================================================================
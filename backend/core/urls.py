@@ -11,5 +11,6 @@ from django.urls import include, path
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("account.urls")),
+    path("api/", include("catalog.urls")),
     path("api/", include("training.urls")),
 ]
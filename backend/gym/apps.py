@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class GymConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "gym"
+
+    def ready(self) -> None:
+        """Import signals when the app is ready."""
+        import gym.signals  # noqa: F401
@@ -0,0 +1,58 @@
+"""Per-process cache of the equipment each gym has on the floor."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from django.conf import settings
+
+from core.caches import LRUCache
+from gym.models import GymEquipment
+
+
+@dataclass(frozen=True)
+class GymInventory:
+    """A gym's equipment, by catalog equipment and by gym equipment id."""
+
+    gym_id: int
+    # Equipment id -> ids of the gym's instances of it, in id order
+    by_equipment: dict[int, tuple[int, ...]]
+    # GymEquipment id -> equipment id
+    equipment_of: dict[int, int]
+
+    @classmethod
+    def build(cls, gym_id: int) -> GymInventory:
+        """Load the gym's equipment (one query)."""
+        rows = GymEquipment.objects.filter(gym_id=gym_id).order_by("id")
+        by_equipment: dict[int, list[int]] = {}
+        equipment_of: dict[int, int] = {}
+        for pk, equipment_id in rows.values_list("id", "equipment_id"):
+            by_equipment.setdefault(equipment_id, []).append(pk)
+            equipment_of[pk] = equipment_id
+        return cls(
+            gym_id=gym_id,
+            by_equipment={key: tuple(ids) for key, ids in by_equipment.items()},
+            equipment_of=equipment_of,
+        )
+
+
+# Inventories keyed by gym id. Entries are dropped by gym.signals whenever
+# one of the gym's GymEquipment rows is saved or deleted.
+inventory_cache = LRUCache(
+    max_entries=settings.GYM_INVENTORY_CACHE["MAX_ENTRIES"],
+    ttl_seconds=settings.GYM_INVENTORY_CACHE["TTL_SECONDS"],
+)
+
+
+def get_inventory(gym_id: int) -> GymInventory:
+    """Return the gym's inventory, loading it on a miss."""
+    inventory = inventory_cache.get(gym_id)
+    if inventory is None:
+        inventory = GymInventory.build(gym_id)
+        inventory_cache.set(gym_id, inventory)
+    return inventory
+
+
+def invalidate_inventory(gym_id: int) -> None:
+    """Drop the cached inventory for the given gym id."""
+    inventory_cache.delete(gym_id)
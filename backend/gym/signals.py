@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from gym.inventory import invalidate_inventory
+from gym.models import GymEquipment
+
+
+@receiver(post_save, sender=GymEquipment)
+@receiver(post_delete, sender=GymEquipment)
+def invalidate_cached_inventory(
+    sender: type[GymEquipment],
+    instance: GymEquipment,
+    **kwargs: dict,
+) -> None:
+    """Drop the gym's cached inventory when its equipment changes."""
+    gym_id = instance.gym_id
+    invalidate_inventory(gym_id)
+    transaction.on_commit(lambda: invalidate_inventory(gym_id))
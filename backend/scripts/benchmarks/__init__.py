@@ -0,0 +1,27 @@
+"""
+Benchmarks for performance-sensitive code paths.
+
+Each module listed in BENCHMARKS exposes `add_arguments(parser)` and
+`run(command, options)`. Run one with:
+
+    python manage.py benchmark <name> [options]
+
+Benchmarks that touch the database run inside a transaction that is rolled
+back at the end, so they are safe to run against a development database.
+Benchmarks that need concurrent connections commit their fixtures and delete
+them again when they finish.
+"""
+
+BENCHMARKS: dict[str, str] = {
+    "auth_queries": "scripts.benchmarks.auth_queries",
+    "eligibility": "scripts.benchmarks.eligibility",
+    "email_lookup": "scripts.benchmarks.email_lookup",
+    "login_burst": "scripts.benchmarks.login_burst",
+    "password_validation": "scripts.benchmarks.password_validation",
+    "progression": "scripts.benchmarks.progression",
+    "search": "scripts.benchmarks.search",
+    "taxonomy": "scripts.benchmarks.taxonomy",
+    "token_burst": "scripts.benchmarks.token_burst",
+    "workout_equipment": "scripts.benchmarks.workout_equipment",
+    "workout_generation": "scripts.benchmarks.workout_generation",
+}
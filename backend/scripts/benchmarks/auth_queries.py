@@ -0,0 +1,67 @@
+"""
+Queries per request on read-heavy authenticated endpoints.
+
+Compares CookieJWTAuthentication with the per-process user snapshot cache
+disabled and enabled.
+"""
+
+from __future__ import annotations
+
+import time
+from argparse import ArgumentParser
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from account.caches import user_cache
+from scripts.benchmarks.utils import authenticated_client, rolled_back
+
+ENDPOINTS = [
+    "/api/auth/me/",
+    "/api/profile/",
+    "/api/preferences/training/",
+]
+
+
+def add_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=200,
+        help="Requests per endpoint and mode",
+    )
+
+
+def run(command: BaseCommand, options: dict[str, Any]) -> None:
+    requests = options["requests"]
+    User = get_user_model()
+
+    with rolled_back():
+        user = User.objects.create_user(email="bench-auth@example.com")
+
+        with authenticated_client(user) as client:
+            command.stdout.write(
+                f"{'endpoint':<30} {'cache':<8} {'queries/req':>12} {'ms/req':>8}"
+            )
+            for path in ENDPOINTS:
+                for enabled in (False, True):
+                    user_cache.clear()
+                    cache_settings = {**settings.AUTH_USER_CACHE, "ENABLED": enabled}
+                    with override_settings(AUTH_USER_CACHE=cache_settings):
+                        with CaptureQueriesContext(connection) as queries:
+                            start = time.perf_counter()
+                            for _ in range(requests):
+                                response = client.get(path)
+                                assert response.status_code == 200, response
+                            elapsed = time.perf_counter() - start
+
+                    command.stdout.write(
+                        f"{path:<30} {'on' if enabled else 'off':<8} "
+                        f"{len(queries) / requests:>12.2f} "
+                        f"{elapsed / requests * 1000:>8.2f}"
+                    )
@@ -0,0 +1,187 @@
+"""
+Exercise eligibility per (gym, preference profile).
+
+Fills the catalog and gym inventories with synthetic rows (500 gyms x 2k
+exercises by default), then times building the catalog and gym indexes,
+cold and warm eligibility queries through training.eligibility, and the same
+question answered by a single ORM query.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from argparse import ArgumentParser
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
+
+from catalog.models import Equipment, Exercise
+from gym.models import Gym, GymEquipment
+from scripts.benchmarks.utils import format_micros, percentile, rolled_back, time_calls
+from training.bitmasks import exclude_masked, mask_for
+from training.eligibility import EligibilityEngine
+from training.enums import (
+    EquipmentModality,
+    EquipmentStation,
+    EquipmentType,
+    ExerciseAttribute,
+)
+
+
+def add_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument("--gyms", type=int, default=500, help="Synthetic gyms")
+    parser.add_argument(
+        "--exercises", type=int, default=2_000, help="Synthetic exercises"
+    )
+    parser.add_argument(
+        "--equipment", type=int, default=300, help="Synthetic equipment models"
+    )
+    parser.add_argument(
+        "--per-gym", type=int, default=60, help="Equipment models per gym"
+    )
+    parser.add_argument(
+        "--profiles", type=int, default=20, help="Distinct preference profiles"
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=200, help="Queries per method"
+    )
+
+
+def _populate(options: dict[str, Any], rng: random.Random) -> list[int]:
+    stations = [None, *EquipmentStation.values]
+    equipment = Equipment.objects.bulk_create(
+        Equipment(
+            name=f"Bench Equipment {n}",
+            brand="Bench",
+            modality=rng.choice(EquipmentModality.values),
+            station=rng.choice(stations),
+            equipment_type=rng.choice(EquipmentType.values),
+        )
+        for n in range(options["equipment"])
+    )
+
+    exercises = Exercise.objects.bulk_create(
+        Exercise(
+            name=f"Bench Exercise {n}",
+            attributes=rng.sample(ExerciseAttribute.values, rng.randint(0, 2)),
+        )
+        for n in range(options["exercises"])
+    )
+    Link = Exercise.equipment.through
+    Link.objects.bulk_create(
+        Link(exercise_id=exercise.pk, equipment_id=item.pk)
+        for exercise in exercises
+        # Roughly one in ten exercises needs no equipment
+        for item in rng.sample(equipment, rng.choice([0, 1, 1, 2, 2, 3, 3, 4, 5, 6]))
+    )
+
+    gyms = Gym.objects.bulk_create(
+        Gym(
+            name=f"Bench Gym {n}",
+            street_address="1 Main St",
+            city="Portland",
+            state_province="OR",
+            postal_code="97201",
+            country="US",
+        )
+        for n in range(options["gyms"])
+    )
+    GymEquipment.objects.bulk_create(
+        GymEquipment(gym=gym, equipment=item, equipment_display_number=str(i))
+        for gym in gyms
+        for i, item in enumerate(rng.sample(equipment, options["per_gym"]))
+    )
+    return [gym.pk for gym in gyms]
+
+
+def _orm_eligible_ids(gym_id: int, exclusion_mask: int) -> list[int]:
+    links = Exercise.equipment.through.objects.filter(exercise_id=OuterRef("pk"))
+    usable = exclude_masked(
+        Equipment.objects.filter(gym_instances__gym_id=gym_id),
+        "trait_mask",
+        exclusion_mask,
+    )
+    queryset = exclude_masked(Exercise.objects.all(), "attribute_mask", exclusion_mask)
+    return list(
+        queryset.filter(
+            ~Exists(links) | Exists(links.filter(equipment_id__in=usable.values("id")))
+        ).values_list("id", flat=True)
+    )
+
+
+def run(command: BaseCommand, options: dict[str, Any]) -> None:
+    rng = random.Random(0)
+    traits = [
+        *EquipmentModality.values,
+        *EquipmentStation.values,
+        *EquipmentType.values,
+        *ExerciseAttribute.values,
+    ]
+    profiles = [0] + [
+        mask_for(rng.sample(traits, rng.randint(1, 4)))
+        for _ in range(options["profiles"] - 1)
+    ]
+
+    with rolled_back():
+        command.stdout.write(
+            f"Inserting {options['gyms']:,} gyms x {options['exercises']:,} "
+            "exercises..."
+        )
+        start = time.perf_counter()
+        gym_ids = _populate(options, rng)
+        command.stdout.write(f"  done in {time.perf_counter() - start:.1f}s")
+
+        engine = EligibilityEngine(
+            ttl_seconds=3600,
+            max_gyms=len(gym_ids) + 1,
+            max_profiles=len(profiles),
+        )
+        start = time.perf_counter()
+        engine.catalog()
+        command.stdout.write(
+            f"catalog index: {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+        start = time.perf_counter()
+        for gym_id in gym_ids:
+            engine.gym(gym_id)
+        command.stdout.write(
+            f"gym indexes:   {(time.perf_counter() - start) * 1000:.1f}ms "
+            f"for {len(gym_ids):,} gyms"
+        )
+
+        # Check the engine and the ORM agree before timing them
+        for gym_id in rng.sample(gym_ids, 5):
+            for mask in profiles[:5]:
+                expected = sorted(_orm_eligible_ids(gym_id, mask))
+                assert engine.eligible_exercise_ids(gym_id, mask) == expected
+
+        exercise_ids = engine.catalog().exercise_ids
+
+        def pick() -> tuple[int, int]:
+            return rng.choice(gym_ids), rng.choice(profiles)
+
+        def cold() -> None:
+            gym_id, mask = pick()
+            engine.gym(gym_id)._results.clear()
+            engine.eligible_bits(gym_id, mask)
+
+        cases = [
+            ("engine cold bits", cold),
+            ("engine warm bits", lambda: engine.eligible_bits(*pick())),
+            ("engine warm ids", lambda: engine.eligible_exercise_ids(*pick())),
+            (
+                "engine is_eligible",
+                lambda: engine.is_eligible(*pick(), rng.choice(exercise_ids)),
+            ),
+            ("orm query", lambda: _orm_eligible_ids(*pick())),
+        ]
+
+        command.stdout.write(f"{'method':<20} {'p50':>12} {'p99':>12}")
+        for name, func in cases:
+            durations = time_calls(func, options["iterations"])
+            command.stdout.write(
+                f"{name:<20} {format_micros(percentile(durations, 50)):>12} "
+                f"{format_micros(percentile(durations, 99)):>12}"
+            )
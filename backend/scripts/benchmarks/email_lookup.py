@@ -0,0 +1,105 @@
+"""
+Case-insensitive email lookups and duplicate registrations at scale.
+
+Fills the users table with synthetic rows (generate_series, 1M by default),
+then times the old email__iexact existence check against User.objects
+.with_email(), which uses the unique lower(email) index, and a duplicate
+registration that is rejected by that index on insert.
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+import time
+from argparse import ArgumentParser
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework import serializers
+
+from account.serializers import RegisterSerializer
+from scripts.benchmarks.utils import format_micros, percentile, rolled_back, time_calls
+
+
+def add_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "--users",
+        type=int,
+        default=1_000_000,
+        help="Synthetic users to insert",
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=50,
+        help="Lookups per method",
+    )
+
+
+def _register_duplicate(email: str) -> None:
+    # A None password skips hashing; only the insert path is being measured.
+    try:
+        RegisterSerializer().create(
+            {"email": email, "password": None, "password_confirm": None}
+        )
+    except serializers.ValidationError:
+        pass
+
+
+def run(command: BaseCommand, options: dict[str, Any]) -> None:
+    users = options["users"]
+    iterations = options["iterations"]
+    User = get_user_model()
+
+    with rolled_back():
+        command.stdout.write(f"Inserting {users:,} users...")
+        start = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {User._meta.db_table}
+                    (email, full_name, password, is_active, is_staff,
+                     is_superuser, token_generation, created_at, updated_at)
+                SELECT 'bench-user-' || g || '@example.com', '', '!', true,
+                       false, false, 0, now(), now()
+                FROM generate_series(1, %s) AS g
+                """,
+                [users],
+            )
+            cursor.execute(f"ANALYZE {User._meta.db_table}")
+        command.stdout.write(f"  done in {time.perf_counter() - start:.1f}s")
+
+        # Use a different email on every call: repeating one lookup lets
+        # Postgres' synchronized seqscans start right next to the last match.
+        rng = random.Random(0)
+        emails = itertools.cycle(
+            f"BENCH-USER-{rng.randint(1, users)}@EXAMPLE.COM" for _ in range(1_000)
+        )
+        missing = (f"new-user-{n}@example.com" for n in itertools.count())
+        cases = [
+            (
+                "iexact hit",
+                lambda: User.objects.filter(email__iexact=next(emails)).exists(),
+            ),
+            ("with_email hit", lambda: User.objects.with_email(next(emails)).exists()),
+            (
+                "iexact miss",
+                lambda: User.objects.filter(email__iexact=next(missing)).exists(),
+            ),
+            (
+                "with_email miss",
+                lambda: User.objects.with_email(next(missing)).exists(),
+            ),
+            ("register duplicate", lambda: _register_duplicate(next(emails).lower())),
+        ]
+
+        command.stdout.write(f"{'lookup':<20} {'p50':>12} {'p99':>12}")
+        for name, func in cases:
+            durations = time_calls(func, iterations)
+            command.stdout.write(
+                f"{name:<20} {format_micros(percentile(durations, 50)):>12} "
+                f"{format_micros(percentile(durations, 99)):>12}"
+            )
@@ -0,0 +1,121 @@
+"""
+Latency of /api/auth/me/ while a burst of logins is hashing passwords.
+
+Login threads stand in for the threads of a gthread gunicorn worker: each one
+posts to /api/auth/login/ in a loop while the main thread times /me requests.
+Runs three modes: no logins, logins hashing inline on their request threads,
+and logins hashing on the bounded pool from account.hashers.
+
+Login threads use their own database connections, so the benchmark user is
+committed and deleted again at the end instead of being rolled back.
+"""
+
+from __future__ import annotations
+
+import threading
+import uuid
+from argparse import ArgumentParser
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+
+from account.hashers import hashing_executor
+from scripts.benchmarks.utils import (
+    authenticated_client,
+    format_micros,
+    percentile,
+    time_calls,
+)
+
+PASSWORD = "bench-login-burst-password"
+
+
+def add_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "--login-threads",
+        type=int,
+        default=8,
+        help="Threads posting logins concurrently",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=200,
+        help="/api/auth/me/ requests timed per mode",
+    )
+
+
+def _login_loop(email: str, stop: threading.Event, counts: dict[str, int]) -> None:
+    client = Client()
+    try:
+        while not stop.is_set():
+            response = client.post(
+                "/api/auth/login/",
+                {"email": email, "password": PASSWORD},
+                content_type="application/json",
+            )
+            key = str(response.status_code)
+            counts[key] = counts.get(key, 0) + 1
+    finally:
+        connection.close()
+
+
+def _measure(user, options: dict[str, Any], threads: int) -> tuple[list[float], dict]:
+    stop = threading.Event()
+    counts: dict[str, int] = {}
+    workers = [
+        threading.Thread(target=_login_loop, args=(user.email, stop, counts))
+        for _ in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        with authenticated_client(user) as client:
+            durations = time_calls(
+                lambda: client.get("/api/auth/me/"), options["requests"]
+            )
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join()
+    return durations, counts
+
+
+def run(command: BaseCommand, options: dict[str, Any]) -> None:
+    User = get_user_model()
+    user = User.objects.create_user(
+        email=f"bench-login-{uuid.uuid4().hex[:8]}@example.com", password=PASSWORD
+    )
+
+    modes = [
+        ("idle", 0, True),
+        ("inline", options["login_threads"], False),
+        ("pool", options["login_threads"], True),
+    ]
+    try:
+        command.stdout.write(
+            f"{'mode':<8} {'me p50':>12} {'me p99':>12} {'logins':>8} "
+            f"{'503s':>6} {'hash wait':>12}"
+        )
+        with override_settings(ALLOWED_HOSTS=["*"]):
+            for name, threads, pooled in modes:
+                pool_settings = {**settings.PASSWORD_HASHING_POOL, "ENABLED": pooled}
+                hashing_executor.reset_metrics()
+                with override_settings(PASSWORD_HASHING_POOL=pool_settings):
+                    durations, counts = _measure(user, options, threads)
+
+                metrics = hashing_executor.metrics
+                command.stdout.write(
+                    f"{name:<8} "
+                    f"{format_micros(percentile(durations, 50)):>12} "
+                    f"{format_micros(percentile(durations, 99)):>12} "
+                    f"{counts.get('200', 0):>8} "
+                    f"{counts.get('503', 0):>6} "
+                    f"{format_micros(metrics.mean_wait_seconds):>12}"
+                )
+    finally:
+        user.delete()
@@ -0,0 +1,89 @@
+"""
+Cost of loading and running the password validators.
+
+Compares Django's CommonPasswordValidator and UserAttributeSimilarityValidator
+with the compiled, memory-mapped and prefiltered versions from
+account.password_validation. "load" is what the first registration in a fresh
+worker pays; "validate" is the per-call cost after that.
+"""
+
+from __future__ import annotations
+
+import tempfile
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.password_validation import (
+    CommonPasswordValidator,
+    UserAttributeSimilarityValidator,
+)
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand
+
+from account.password_validation import (
+    DJANGO_PASSWORD_LIST_PATH,
+    CompiledCommonPasswordValidator,
+    FastUserAttributeSimilarityValidator,
+    compile_password_list,
+)
+from scripts.benchmarks.utils import format_micros, percentile, time_calls
+
+PASSWORDS = ["correct-horse-battery", "password1", "benchmark.user.2024", "Xk9!qz"]
+
+
+def add_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=5_000,
+        help="Validation calls per validator",
+    )
+
+
+def _validate_all(validator, user) -> None:
+    for password in PASSWORDS:
+        try:
+            validator.validate(password, user)
+        except ValidationError:
+            pass
+
+
+def run(command: BaseCommand, options: dict[str, Any]) -> None:
+    User = get_user_model()
+    user = User(email="benchmark.user@example.com", full_name="Bench User")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        compiled_path = Path(tmp) / "common-passwords.bin"
+        compile_password_list(DJANGO_PASSWORD_LIST_PATH, compiled_path)
+
+        validators = [
+            ("common", "django", lambda: CommonPasswordValidator()),
+            (
+                "common",
+                "compiled",
+                lambda: CompiledCommonPasswordValidator(compiled_path=compiled_path),
+            ),
+            ("similarity", "django", lambda: UserAttributeSimilarityValidator()),
+            ("similarity", "fast", lambda: FastUserAttributeSimilarityValidator()),
+        ]
+
+        command.stdout.write(
+            f"{'validator':<11} {'impl':<9} {'load':>12} {'validate p50':>14} "
+            f"{'validate p99':>14}"
+        )
+        for name, impl, factory in validators:
+            start = time.perf_counter()
+            validator = factory()
+            load = time.perf_counter() - start
+
+            durations = time_calls(
+                lambda: _validate_all(validator, user), options["iterations"]
+            )
+            command.stdout.write(
+                f"{name:<11} {impl:<9} {format_micros(load):>12} "
+                f"{format_micros(percentile(durations, 50)):>14} "
+                f"{format_micros(percentile(durations, 99)):>14}"
+            )
@@ -0,0 +1,303 @@
+"""
+Progressive overload targets over a large set history.
+
+Fills the workout tables with synthetic history (10M completed sets by
+default, spread over --users users doing 10 exercises of 5 sets per workout)
+plus one scheduled workout per user, then times training.progression
+(columnar load, vectorized estimate, bulk UPDATE) over every user against a
+naive loop over ORM objects and Decimals that saves each scheduled set.
+
+The naive loop is linear in the sets it reads, so by default it runs over
+the first --naive-sets sets' worth of users and is extrapolated to the full
+history. Its targets are then checked against the engine's.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from argparse import ArgumentParser
+from collections import defaultdict
+from decimal import ROUND_FLOOR, Decimal
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from catalog.models import Equipment, Exercise
+from gym.models import Gym, GymEquipment
+from scripts.benchmarks.utils import rolled_back
+from training.enums import EquipmentModality, EquipmentType, WorkoutStatus
+from training.models import Workout, WorkoutExercise, WorkoutSet
+from training.progression import (
+    DELOAD_RATE,
+    PROGRESSION_RATE,
+    ROUNDING_TOLERANCE,
+    WEIGHT_STEP_LBS,
+    WINDOW_SETS,
+    estimate,
+    load_history,
+    refresh_scheduled_targets,
+)
+
+EXERCISES_PER_WORKOUT = 10
+SETS_PER_EXERCISE = 5
+TARGET_REPS = 10
+
+
+def add_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "--sets", type=int, default=10_000_000, help="Completed sets of history"
+    )
+    parser.add_argument("--users", type=int, default=2_000, help="Synthetic users")
+    parser.add_argument(
+        "--naive-sets",
+        type=int,
+        default=1_000_000,
+        help="Sets of history for the naive loop (0 for all)",
+    )
+
+
+def _populate(options: dict[str, Any]) -> tuple[list[int], int]:
+    """Insert users and their history; return user ids and workouts per user."""
+    User = get_user_model()
+    users = options["users"]
+    per_workout = EXERCISES_PER_WORKOUT * SETS_PER_EXERCISE
+    workouts = max(1, options["sets"] // (users * per_workout))
+
+    equipment = Equipment.objects.create(
+        name="Bench Barbell",
+        brand="Bench",
+        modality=EquipmentModality.FREE_WEIGHTS,
+        equipment_type=EquipmentType.PLATE_LOADED,
+    )
+    exercise_ids = [
+        exercise.pk
+        for exercise in Exercise.objects.bulk_create(
+            Exercise(name=f"Bench Exercise {n}") for n in range(EXERCISES_PER_WORKOUT)
+        )
+    ]
+    gym = Gym.objects.create(
+        name="Bench Gym",
+        street_address="1 Main St",
+        city="Portland",
+        state_province="OR",
+        postal_code="97201",
+        country="US",
+    )
+    gym_equipment = GymEquipment.objects.create(
+        gym=gym, equipment=equipment, equipment_display_number="1"
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT setseed(0)")
+        cursor.execute(
+            f"""
+            INSERT INTO {User._meta.db_table}
+                (email, full_name, password, is_active, is_staff, is_superuser,
+                 token_generation, gym_id, created_at, updated_at)
+            SELECT 'bench-progression-' || g || '@example.com', '', '!', true,
+                   false, false, 0, %s, now(), now()
+            FROM generate_series(1, %s) AS g
+            RETURNING id
+            """,
+            [gym.pk, users],
+        )
+        user_ids = sorted(row[0] for row in cursor.fetchall())
+
+        # Completed workouts a day apart, then one scheduled workout
+        cursor.execute(
+            f"""
+            INSERT INTO {Workout._meta.db_table}
+                (user_id, workout_number, status, completed_at, created_at,
+                 updated_at)
+            SELECT u, n,
+                   CASE WHEN n > %(workouts)s THEN %(scheduled)s
+                        ELSE %(completed)s END,
+                   CASE WHEN n > %(workouts)s THEN NULL
+                        ELSE now() - (%(workouts)s - n) * interval '1 day' END,
+                   now(), now()
+            FROM unnest(%(users)s::bigint[]) AS u,
+                 generate_series(1, %(workouts)s + 1) AS n
+            """,
+            {
+                "users": user_ids,
+                "workouts": workouts,
+                "scheduled": WorkoutStatus.SCHEDULED,
+                "completed": WorkoutStatus.COMPLETED,
+            },
+        )
+        cursor.execute(
+            f"""
+            INSERT INTO {WorkoutExercise._meta.db_table}
+                (workout_id, exercise_id, gym_equipment_id, "order")
+            SELECT w.id, (%s::bigint[])[k], %s, k - 1
+            FROM {Workout._meta.db_table} AS w, generate_series(1, %s) AS k
+            WHERE w.user_id = ANY(%s)
+            """,
+            [exercise_ids, gym_equipment.pk, EXERCISES_PER_WORKOUT, user_ids],
+        )
+        # Each (user, exercise) works around its own weight; reps vary
+        # around the target so every kind of decision occurs
+        cursor.execute(
+            f"""
+            INSERT INTO {WorkoutSet._meta.db_table}
+                (workout_exercise_id, set_number, target_weight_lbs,
+                 target_reps, rest_seconds, actual_weight_lbs, actual_reps,
+                 is_completed, completed_at)
+            SELECT we.id, s, x.weight, %(reps)s, 60,
+                   CASE WHEN done THEN x.weight END,
+                   CASE WHEN done THEN %(reps)s - 3 + floor(random() * 5) END,
+                   done, w.completed_at
+            FROM {WorkoutExercise._meta.db_table} AS we
+            JOIN {Workout._meta.db_table} AS w ON w.id = we.workout_id
+            CROSS JOIN LATERAL (
+                SELECT w.status = %(completed)s AS done,
+                       20 + ((w.user_id * 7 + we.exercise_id * 13) %% 40
+                             + floor(random() * 3)) * 2.5 AS weight
+            ) AS x,
+            generate_series(1, %(sets)s) AS s
+            WHERE w.user_id = ANY(%(users)s)
+            """,
+            {
+                "reps": TARGET_REPS,
+                "completed": WorkoutStatus.COMPLETED,
+                "sets": SETS_PER_EXERCISE,
+                "users": user_ids,
+            },
+        )
+        for model in (User, Workout, WorkoutExercise, WorkoutSet):
+            cursor.execute(f"ANALYZE {model._meta.db_table}")
+    return user_ids, workouts
+
+
+def _round_to_step(weight: Decimal) -> Decimal:
+    step = Decimal(str(WEIGHT_STEP_LBS))
+    half = Decimal("0.5") + Decimal(str(ROUNDING_TOLERANCE))
+    return (weight / step + half).to_integral_value(ROUND_FLOOR) * step
+
+
+def _naive_target(window: list[WorkoutSet], reps: int) -> Decimal:
+    last = window[0].actual_weight_lbs
+    if not last:
+        return Decimal("0")
+    one_rep_max = max(
+        s.actual_weight_lbs * (1 + Decimal(s.actual_reps) / 30) for s in window
+    )
+    reached = sum(s.actual_reps >= s.target_reps for s in window) / len(window)
+    base = one_rep_max / (1 + Decimal(reps) / 30)
+    if reached >= 1:
+        weight = max(
+            base * (1 + Decimal(str(PROGRESSION_RATE))),
+            last + Decimal(str(WEIGHT_STEP_LBS)),
+        )
+    elif reached < 0.5:
+        weight = base * (1 - Decimal(str(DELOAD_RATE)))
+    else:
+        weight = base
+    return _round_to_step(weight)
+
+
+def _naive_refresh(user_ids: list[int]) -> int:
+    """Walk every set as an ORM object and save each changed scheduled set."""
+    windows: dict[tuple[int, int], list[WorkoutSet]] = defaultdict(list)
+    history = (
+        WorkoutSet.objects.filter(
+            workout_exercise__workout__user_id__in=user_ids,
+            is_completed=True,
+            actual_weight_lbs__isnull=False,
+            actual_reps__isnull=False,
+        )
+        .select_related("workout_exercise__workout")
+        .order_by("-completed_at", "-id")
+    )
+    for workout_set in history.iterator(chunk_size=10_000):
+        workout_exercise = workout_set.workout_exercise
+        window = windows[workout_exercise.workout.user_id, workout_exercise.exercise_id]
+        if len(window) < WINDOW_SETS:
+            window.append(workout_set)
+
+    updated = 0
+    scheduled = WorkoutSet.objects.filter(
+        workout_exercise__workout__user_id__in=user_ids,
+        workout_exercise__workout__status=WorkoutStatus.SCHEDULED,
+        is_completed=False,
+    ).select_related("workout_exercise__workout")
+    for workout_set in scheduled.iterator(chunk_size=10_000):
+        workout_exercise = workout_set.workout_exercise
+        window = windows.get(
+            (workout_exercise.workout.user_id, workout_exercise.exercise_id)
+        )
+        if not window:
+            continue
+        target = _naive_target(window, workout_set.target_reps)
+        if target != workout_set.target_weight_lbs:
+            workout_set.target_weight_lbs = target
+            workout_set.save(update_fields=["target_weight_lbs"])
+            updated += 1
+    return updated
+
+
+def _reset_scheduled_targets(user_ids: list[int]) -> None:
+    WorkoutSet.objects.filter(
+        workout_exercise__workout__user_id__in=user_ids,
+        workout_exercise__workout__status=WorkoutStatus.SCHEDULED,
+    ).update(target_weight_lbs=0)
+
+
+def run(command: BaseCommand, options: dict[str, Any]) -> None:
+    with rolled_back():
+        command.stdout.write(
+            f"Inserting ~{options['sets']:,} sets for {options['users']:,} users..."
+        )
+        start = time.perf_counter()
+        user_ids, workouts = _populate(options)
+        sets_per_user = workouts * EXERCISES_PER_WORKOUT * SETS_PER_EXERCISE
+        total_sets = sets_per_user * len(user_ids)
+        command.stdout.write(
+            f"{total_sets:,} completed sets inserted in "
+            f"{time.perf_counter() - start:.1f}s"
+        )
+
+        start = time.perf_counter()
+        history = load_history(user_ids)
+        loaded = time.perf_counter()
+        estimates = estimate(history)
+        estimated = time.perf_counter()
+        command.stdout.write(
+            f"load_history: {len(history):,} sets in {loaded - start:.1f}s "
+            f"({history.weights.nbytes * 4 / 2**20:,.0f} MiB of arrays); "
+            f"estimate: {len(estimates):,} pairs in {estimated - loaded:.2f}s"
+        )
+        del history, estimates
+
+        start = time.perf_counter()
+        updated = refresh_scheduled_targets(user_ids)
+        vectorized = time.perf_counter() - start
+        command.stdout.write(
+            f"refresh_scheduled_targets: {updated:,} sets updated in "
+            f"{vectorized:.1f}s ({total_sets / vectorized:,.0f} history sets/s)"
+        )
+
+        naive_users = len(user_ids)
+        if options["naive_sets"]:
+            naive_users = min(
+                naive_users, max(1, math.ceil(options["naive_sets"] / sets_per_user))
+            )
+        naive_ids = user_ids[:naive_users]
+        naive_sets = naive_users * sets_per_user
+        _reset_scheduled_targets(naive_ids)
+        start = time.perf_counter()
+        _naive_refresh(naive_ids)
+        naive = time.perf_counter() - start
+        extrapolated = naive * total_sets / naive_sets
+        command.stdout.write(
+            f"naive loop: {naive_sets:,} sets in {naive:.1f}s "
+            f"({naive_sets / naive:,.0f} sets/s); {total_sets:,} sets would take "
+            f"~{extrapolated:,.0f}s ({extrapolated / vectorized:,.0f}x slower)"
+        )
+
+        # Sets where the engine disagrees with the naive loop's targets
+        mismatches = refresh_scheduled_targets(naive_ids)
+        command.stdout.write(f"targets differing from the naive loop: {mismatches:,}")
@@ -0,0 +1,179 @@
+"""
+Ranked catalog search at scale.
+
+Fills the exercise and equipment tables with synthetic rows (100k each by
+default) whose names combine a small vocabulary, so common words match
+thousands of rows, then times catalog.search for first pages, prefixes and
+a page reached through a cursor. The admin's icontains scan over the same
+columns is timed as the baseline.
+"""
+
+from __future__ import annotations
+
+import time
+from argparse import ArgumentParser
+from typing import Any
+
+from django.contrib.postgres.indexes import GinIndex
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+
+from catalog.models import Equipment, Exercise
+from catalog.search import (
+    prefix_query,
+    search_equipment,
+    search_exercises,
+    trigram_enabled,
+)
+from scripts.benchmarks.utils import format_micros, percentile, rolled_back, time_calls
+
+MODIFIERS = [
+    "Incline", "Decline", "Seated", "Standing", "Single Arm", "Kneeling",
+    "Paused", "Tempo", "Wide Grip", "Close Grip", "Reverse Grip", "Deficit",
+]
+IMPLEMENTS = [
+    "Barbell", "Dumbbell", "Cable", "Machine", "Kettlebell", "Band",
+    "Smith Machine", "Landmine", "Trap Bar", "Bodyweight",
+]
+MOVEMENTS = [
+    "Bench Press", "Squat", "Deadlift", "Row", "Curl", "Fly", "Lunge",
+    "Shoulder Press", "Pulldown", "Extension", "Raise", "Shrug", "Thrust",
+    "Good Morning", "Split Squat", "Pullover", "Kickback", "Calf Raise",
+]
+BRANDS = [
+    "Rogue", "Titan Fitness", "Eleiko", "Hammer Strength", "Life Fitness",
+    "Precor", "Cybex", "Matrix", "Nautilus", "REP Fitness",
+]
+EQUIPMENT_NAMES = [
+    "Power Rack", "Adjustable Bench", "Cable Crossover", "Leg Press",
+    "Lat Pulldown", "Hack Squat", "Smith Machine", "Dumbbell Rack",
+    "Pec Deck", "Glute Ham Developer", "Preacher Curl Bench", "Rower",
+]
+
+QUERIES = [
+    ("exercise word", Exercise, search_exercises, "deadlift"),
+    ("exercise phrase", Exercise, search_exercises, "incline dumbbell bench press"),
+    ("exercise prefix", Exercise, search_exercises, "kettleb"),
+    ("equipment brand", Equipment, search_equipment, "hammer strength"),
+    ("equipment prefix", Equipment, search_equipment, "pull"),
+]
+
+
+def add_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=100_000,
+        help="Synthetic exercises and equipment to insert (each)",
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=50,
+        help="Searches per query",
+    )
+
+
+def _insert_catalog(rows: int) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {Exercise._meta.db_table}
+                (name, description, primary_muscles, secondary_muscles,
+                 attributes, created_at, updated_at)
+            SELECT m.w || ' ' || i.w || ' ' || v.w || ' ' || g,
+                   'A ' || lower(v.w) || ' variation using a ' || lower(i.w),
+                   '{{}}', '{{}}', '{{}}', now(), now()
+            FROM generate_series(1, %(rows)s) AS g,
+                 LATERAL (SELECT (%(modifiers)s::text[])[
+                     g %% cardinality(%(modifiers)s::text[]) + 1]) AS m(w),
+                 LATERAL (SELECT (%(implements)s::text[])[
+                     g / 7 %% cardinality(%(implements)s::text[]) + 1]) AS i(w),
+                 LATERAL (SELECT (%(movements)s::text[])[
+                     g / 13 %% cardinality(%(movements)s::text[]) + 1]) AS v(w)
+            """,
+            {
+                "rows": rows,
+                "modifiers": MODIFIERS,
+                "implements": IMPLEMENTS,
+                "movements": MOVEMENTS,
+            },
+        )
+        cursor.execute(
+            f"""
+            INSERT INTO {Equipment._meta.db_table}
+                (name, brand, modality, equipment_type, created_at, updated_at)
+            SELECT n.w || ' ' || g, b.w, 'free_weights', 'plate_loaded', now(),
+                   now()
+            FROM generate_series(1, %(rows)s) AS g,
+                 LATERAL (SELECT (%(names)s::text[])[
+                     g %% cardinality(%(names)s::text[]) + 1]) AS n(w),
+                 LATERAL (SELECT (%(brands)s::text[])[
+                     g / 11 %% cardinality(%(brands)s::text[]) + 1]) AS b(w)
+            """,
+            {"rows": rows, "names": EQUIPMENT_NAMES, "brands": BRANDS},
+        )
+        # Merge the rows into the GIN indexes, as (auto)vacuum would
+        for model in (Exercise, Equipment):
+            for index in model._meta.indexes:
+                if not isinstance(index, GinIndex):
+                    continue
+                cursor.execute(
+                    "SELECT gin_clean_pending_list(%s::regclass)", [index.name]
+                )
+            cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+
+def _report(
+    command: BaseCommand, name: str, func: Any, iterations: int, matches: int
+) -> None:
+    durations = time_calls(func, iterations)
+    command.stdout.write(
+        f"{name:<22} {matches:>8,} {format_micros(percentile(durations, 50)):>12} "
+        f"{format_micros(percentile(durations, 99)):>12}"
+    )
+
+
+def _matches(model: type[Exercise | Equipment], text: str) -> int:
+    return model.objects.filter(search_vector=prefix_query(text)).count()
+
+
+def run(command: BaseCommand, options: dict[str, Any]) -> None:
+    rows = options["rows"]
+    iterations = options["iterations"]
+
+    with rolled_back():
+        command.stdout.write(f"Inserting {rows:,} exercises and equipment...")
+        start = time.perf_counter()
+        _insert_catalog(rows)
+        command.stdout.write(f"  done in {time.perf_counter() - start:.1f}s")
+        command.stdout.write(f"pg_trgm installed: {trigram_enabled()}")
+
+        command.stdout.write(
+            f"{'search':<22} {'matches':>8} {'p50':>12} {'p99':>12}"
+        )
+        for name, model, search, text in QUERIES:
+            matches = _matches(model, text)
+            _report(command, name, lambda: search(text), iterations, matches)
+
+        matches = _matches(Exercise, "deadlift")
+        second_page = search_exercises("deadlift").next_cursor
+        _report(
+            command,
+            "exercise next page",
+            lambda: search_exercises("deadlift", cursor=second_page),
+            iterations,
+            matches,
+        )
+        _report(
+            command,
+            "icontains (admin)",
+            lambda: list(
+                Exercise.objects.filter(
+                    Q(name__icontains="deadlift") | Q(description__icontains="deadlift")
+                )[:20]
+            ),
+            iterations,
+            matches,
+        )
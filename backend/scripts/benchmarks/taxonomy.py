@@ -0,0 +1,121 @@
+"""
+Per-call cost of region and label derivation.
+
+Compares the catalog.enums region functions and derive_workout_label with
+their compiled bitmask versions (catalog.taxonomy, training.mappings) over a
+fixed pool of random workouts. The compiled functions are timed both from
+muscle group lists and from precomputed masks, as callers that keep masks
+(e.g. batch labeling) use them. Label timings are with a warm memo; "cold"
+clears it before every pass over the pool.
+"""
+
+from __future__ import annotations
+
+import random
+from argparse import ArgumentParser
+from collections.abc import Callable
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from catalog.enums import (
+    MuscleGroup,
+    primary_region_for_workout,
+    regions_for_muscle_groups,
+)
+from catalog.taxonomy import (
+    muscle_mask,
+    primary_region_for,
+    primary_region_for_mask,
+    regions_for,
+    regions_for_mask,
+)
+from scripts.benchmarks.utils import format_micros, percentile, time_calls
+from training.enums import MovementPattern
+from training.mappings import (
+    derive_workout_label,
+    pattern_flags,
+    workout_label,
+    workout_label_for_mask,
+)
+
+
+def add_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "--workouts", type=int, default=1_000, help="Random workouts in the pool"
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=50, help="Passes over the pool"
+    )
+
+
+def _pool(size: int) -> list[tuple[list[MuscleGroup], list[MovementPattern]]]:
+    rng = random.Random(0)
+    muscles = list(MuscleGroup)
+    patterns = list(MovementPattern)
+    return [
+        (
+            rng.sample(muscles, rng.randint(1, 8)),
+            rng.sample(patterns, rng.randint(0, 2)),
+        )
+        for _ in range(size)
+    ]
+
+
+def run(command: BaseCommand, options: dict[str, Any]) -> None:
+    pool = _pool(options["workouts"])
+    masks = [
+        (muscle_mask(groups), pattern_flags(patterns)) for groups, patterns in pool
+    ]
+
+    def timed(label: str, func: Callable[[], object]) -> float:
+        """Time one pass over the pool; report and return the median per call."""
+        durations = time_calls(func, options["iterations"])
+        per_call = percentile(durations, 50) / len(pool)
+        command.stdout.write(f"  {label:<34} {format_micros(per_call)} per call")
+        return per_call
+
+    command.stdout.write("regions:")
+    before = timed(
+        "regions_for_muscle_groups",
+        lambda: [regions_for_muscle_groups(groups) for groups, _ in pool],
+    )
+    after = timed("regions_for", lambda: [regions_for(groups) for groups, _ in pool])
+    timed("regions_for_mask", lambda: [regions_for_mask(mask) for mask, _ in masks])
+    command.stdout.write(f"  {before / after:.1f}x faster from lists")
+
+    command.stdout.write("primary region:")
+    before = timed(
+        "primary_region_for_workout",
+        lambda: [primary_region_for_workout(groups) for groups, _ in pool],
+    )
+    after = timed(
+        "primary_region_for", lambda: [primary_region_for(groups) for groups, _ in pool]
+    )
+    timed(
+        "primary_region_for_mask",
+        lambda: [primary_region_for_mask(mask) for mask, _ in masks],
+    )
+    command.stdout.write(f"  {before / after:.1f}x faster from lists")
+
+    command.stdout.write("labels:")
+    before = timed(
+        "derive_workout_label",
+        lambda: [derive_workout_label(groups, patterns) for groups, patterns in pool],
+    )
+
+    def cold() -> None:
+        workout_label_for_mask.cache_clear()
+        for groups, patterns in pool:
+            workout_label(groups, patterns)
+
+    timed("workout_label (cold)", cold)
+    after = timed(
+        "workout_label",
+        lambda: [workout_label(groups, patterns) for groups, patterns in pool],
+    )
+    timed(
+        "workout_label_for_mask",
+        lambda: [workout_label_for_mask(mask, flags) for mask, flags in masks],
+    )
+    command.stdout.write(f"  {before / after:.1f}x faster from lists")
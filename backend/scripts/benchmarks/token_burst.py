@@ -0,0 +1,65 @@
+"""
+Cost of authenticating a burst of requests that reuse one access token.
+
+Compares CookieJWTAuthentication with the verified-token LRU disabled and
+enabled. The user snapshot cache stays on in both modes, so the difference
+is the token decode and signature check.
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from account.authentication import CookieJWTAuthentication
+from account.caches import token_cache, user_cache
+from scripts.benchmarks.utils import format_micros, percentile, rolled_back, time_calls
+
+
+def add_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=10_000,
+        help="Authentications per mode",
+    )
+
+
+def run(command: BaseCommand, options: dict[str, Any]) -> None:
+    requests = options["requests"]
+    User = get_user_model()
+
+    with rolled_back():
+        user = User.objects.create_user(email="bench-token@example.com")
+        request = APIRequestFactory().get("/api/auth/me/")
+        request.COOKIES[settings.JWT_ACCESS_COOKIE_NAME] = str(
+            AccessToken.for_user(user)
+        )
+        authenticator = CookieJWTAuthentication()
+
+        command.stdout.write(
+            f"{'token cache':<12} {'mean':>10} {'p99':>10} {'hit rate':>9}"
+        )
+        for enabled in (False, True):
+            user_cache.clear()
+            token_cache.clear()
+            cache_settings = {**settings.AUTH_TOKEN_CACHE, "ENABLED": enabled}
+            with override_settings(AUTH_TOKEN_CACHE=cache_settings):
+                durations = time_calls(
+                    lambda: authenticator.authenticate(request), requests
+                )
+
+            stats = token_cache.stats
+            command.stdout.write(
+                f"{'on' if enabled else 'off':<12} "
+                f"{format_micros(sum(durations) / len(durations)):>10} "
+                f"{format_micros(percentile(durations, 99)):>10} "
+                f"{stats.hit_rate:>9.1%}"
+            )
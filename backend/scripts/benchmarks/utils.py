@@ -0,0 +1,61 @@
+"""Shared helpers for benchmark modules."""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+from django.test import Client, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+class _Rollback(Exception):
+    """Raised to unwind the benchmark transaction."""
+
+
+@contextmanager
+def rolled_back() -> Iterator[None]:
+    """Run the block inside a transaction that is always rolled back."""
+    try:
+        with transaction.atomic():
+            yield
+            raise _Rollback
+    except _Rollback:
+        pass
+
+
+@contextmanager
+def authenticated_client(user) -> Iterator[Client]:
+    """Yield a test client carrying a fresh access token cookie for `user`."""
+    client = Client()
+    client.cookies[settings.JWT_ACCESS_COOKIE_NAME] = str(AccessToken.for_user(user))
+    with override_settings(ALLOWED_HOSTS=["*"]):
+        yield client
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Return the `pct` percentile (0-100) of `samples` (nearest rank)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def time_calls(func: Callable[[], object], iterations: int) -> list[float]:
+    """Call `func` repeatedly and return per-call durations in seconds."""
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def format_micros(seconds: float) -> str:
+    """Format a duration in microseconds."""
+    return f"{seconds * 1_000_000:,.1f}µs"
@@ -0,0 +1,146 @@
+"""
+Validating and suggesting equipment while building a workout.
+
+Fills the catalog and one gym with synthetic rows, then times checking and
+suggesting equipment for every exercise of a workout through
+training.workouts against one joined ORM query per exercise.
+"""
+
+from __future__ import annotations
+
+import random
+from argparse import ArgumentParser
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand
+
+from catalog.compatibility import compatibility
+from catalog.models import Equipment, Exercise
+from gym.inventory import invalidate_inventory
+from gym.models import Gym, GymEquipment
+from scripts.benchmarks.utils import format_micros, percentile, rolled_back, time_calls
+from training.enums import EquipmentModality, EquipmentType
+from training.models import WorkoutExercise
+from training.workouts import suggest_gym_equipment, validate_workout_exercises
+
+
+def add_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "--exercises", type=int, default=2_000, help="Synthetic exercises"
+    )
+    parser.add_argument(
+        "--equipment", type=int, default=300, help="Synthetic equipment models"
+    )
+    parser.add_argument(
+        "--per-gym", type=int, default=100, help="Equipment instances at the gym"
+    )
+    parser.add_argument(
+        "--workout-size", type=int, default=10, help="Exercises per workout"
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=200, help="Workouts per method"
+    )
+
+
+def _orm_validate(gym_id: int, pairs: list[tuple[int, int]]) -> None:
+    for exercise_id, gym_equipment_id in pairs:
+        GymEquipment.objects.filter(
+            pk=gym_equipment_id, gym_id=gym_id, equipment__exercises=exercise_id
+        ).exists()
+
+
+def _orm_suggest(gym_id: int, exercise_ids: list[int]) -> None:
+    for exercise_id in exercise_ids:
+        list(
+            GymEquipment.objects.filter(
+                gym_id=gym_id, equipment__exercises=exercise_id
+            ).values_list("id", flat=True)
+        )
+
+
+def run(command: BaseCommand, options: dict[str, Any]) -> None:
+    rng = random.Random(0)
+
+    with rolled_back():
+        equipment = Equipment.objects.bulk_create(
+            Equipment(
+                name=f"Bench Equipment {n}",
+                brand="Bench",
+                modality=rng.choice(EquipmentModality.values),
+                equipment_type=rng.choice(EquipmentType.values),
+            )
+            for n in range(options["equipment"])
+        )
+        exercises = Exercise.objects.bulk_create(
+            Exercise(name=f"Bench Exercise {n}") for n in range(options["exercises"])
+        )
+        Link = Exercise.equipment.through
+        Link.objects.bulk_create(
+            Link(exercise_id=exercise.pk, equipment_id=item.pk)
+            for exercise in exercises
+            for item in rng.sample(equipment, rng.randint(1, 6))
+        )
+        gym = Gym.objects.create(
+            name="Bench Gym",
+            street_address="1 Main St",
+            city="Portland",
+            state_province="OR",
+            postal_code="97201",
+            country="US",
+        )
+        gym_equipment = GymEquipment.objects.bulk_create(
+            GymEquipment(gym=gym, equipment=item, equipment_display_number=str(i))
+            for i, item in enumerate(rng.choices(equipment, k=options["per_gym"]))
+        )
+        compatibility.invalidate()
+        invalidate_inventory(gym.pk)
+
+        exercise_ids = [exercise.pk for exercise in exercises]
+        gym_equipment_ids = [item.pk for item in gym_equipment]
+        size = options["workout_size"]
+
+        def workout_pairs() -> list[tuple[int, int]]:
+            return list(
+                zip(
+                    rng.sample(exercise_ids, size),
+                    rng.choices(gym_equipment_ids, k=size),
+                )
+            )
+
+        def validate() -> None:
+            try:
+                validate_workout_exercises(
+                    gym.pk,
+                    [
+                        WorkoutExercise(exercise_id=e, gym_equipment_id=g)
+                        for e, g in workout_pairs()
+                    ],
+                )
+            except ValidationError:
+                # Random pairings are mostly invalid; all of them are checked
+                pass
+
+        def suggest() -> None:
+            for exercise_id in rng.sample(exercise_ids, size):
+                suggest_gym_equipment(gym.pk, exercise_id)
+
+        cases = [
+            ("index validate", validate),
+            ("orm validate", lambda: _orm_validate(gym.pk, workout_pairs())),
+            ("index suggest", suggest),
+            (
+                "orm suggest",
+                lambda: _orm_suggest(gym.pk, rng.sample(exercise_ids, size)),
+            ),
+        ]
+
+        command.stdout.write(
+            f"{size}-exercise workouts\n{'method':<16} {'p50':>12} {'p99':>12}"
+        )
+        for name, func in cases:
+            durations = time_calls(func, options["iterations"])
+            command.stdout.write(
+                f"{name:<16} {format_micros(percentile(durations, 50)):>12} "
+                f"{format_micros(percentile(durations, 99)):>12}"
+            )
@@ -0,0 +1,157 @@
+"""
+Workout generation latency per user and batch throughput.
+
+Fills the catalog and one gym with synthetic rows (2k exercises by default),
+then times generate_workout() for single users and generate_week() over
+chunks of users, as run by each worker of the pregenerate_workouts command.
+Every chunk runs in this process: workers can't see the rolled-back
+fixtures, and they each add throughput independently.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from argparse import ArgumentParser
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from catalog.compatibility import compatibility
+from catalog.enums import MuscleGroup
+from catalog.models import Equipment, Exercise
+from gym.inventory import invalidate_inventory
+from gym.models import Gym, GymEquipment
+from scripts.benchmarks.utils import format_micros, percentile, rolled_back, time_calls
+from training.eligibility import eligibility
+from training.enums import EquipmentModality, EquipmentType
+from training.generator import generate_week, generate_workout
+from training.models import Workout, WorkoutExercise, WorkoutSet
+
+
+def add_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "--exercises", type=int, default=2_000, help="Synthetic exercises"
+    )
+    parser.add_argument(
+        "--equipment", type=int, default=300, help="Synthetic equipment models"
+    )
+    parser.add_argument(
+        "--per-gym", type=int, default=100, help="Equipment instances at the gym"
+    )
+    parser.add_argument(
+        "--users", type=int, default=2_000, help="Users for the batch run"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=500, help="Users per batch chunk"
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=100, help="Single-user generations"
+    )
+
+
+def _populate(options: dict[str, Any], rng: random.Random) -> Gym:
+    equipment = Equipment.objects.bulk_create(
+        Equipment(
+            name=f"Bench Equipment {n}",
+            brand="Bench",
+            modality=rng.choice(EquipmentModality.values),
+            equipment_type=rng.choice(EquipmentType.values),
+        )
+        for n in range(options["equipment"])
+    )
+    exercises = Exercise.objects.bulk_create(
+        Exercise(
+            name=f"Bench Exercise {n}",
+            primary_muscles=rng.sample(MuscleGroup.values, rng.randint(1, 2)),
+        )
+        for n in range(options["exercises"])
+    )
+    Link = Exercise.equipment.through
+    Link.objects.bulk_create(
+        Link(exercise_id=exercise.pk, equipment_id=item.pk)
+        for exercise in exercises
+        for item in rng.sample(equipment, rng.randint(1, 6))
+    )
+    gym = Gym.objects.create(
+        name="Bench Gym",
+        street_address="1 Main St",
+        city="Portland",
+        state_province="OR",
+        postal_code="97201",
+        country="US",
+    )
+    GymEquipment.objects.bulk_create(
+        GymEquipment(gym=gym, equipment=item, equipment_display_number=str(i))
+        for i, item in enumerate(rng.choices(equipment, k=options["per_gym"]))
+    )
+    return gym
+
+
+def run(command: BaseCommand, options: dict[str, Any]) -> None:
+    rng = random.Random(0)
+    User = get_user_model()
+
+    with rolled_back():
+        command.stdout.write(
+            f"Inserting {options['exercises']:,} exercises and "
+            f"{options['users']:,} users..."
+        )
+        gym = _populate(options, rng)
+        # Skip password hashing and the per-user signal work; the batch run
+        # falls back to preference defaults for users without a row.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {User._meta.db_table}
+                    (email, full_name, password, is_active, is_staff,
+                     is_superuser, token_generation, gym_id, created_at,
+                     updated_at)
+                SELECT 'bench-gen-' || g || '@example.com', '', '!', true,
+                       false, false, 0, %s, now(), now()
+                FROM generate_series(1, %s) AS g
+                """,
+                [gym.pk, options["users"]],
+            )
+            cursor.execute(f"ANALYZE {User._meta.db_table}")
+        eligibility.invalidate_catalog()
+        compatibility.invalidate()
+        invalidate_inventory(gym.pk)
+
+        user = User.objects.create_user(email="bench-gen@example.com", gym=gym)
+        start = time.perf_counter()
+        generate_workout(user)
+        command.stdout.write(
+            f"first generation (cold indexes): "
+            f"{(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+
+        durations = time_calls(lambda: generate_workout(user), options["iterations"])
+        command.stdout.write(
+            f"generate_workout p50 {format_micros(percentile(durations, 50))}, "
+            f"p99 {format_micros(percentile(durations, 99))}"
+        )
+
+        # Plan history queries on real statistics, as in production
+        with connection.cursor() as cursor:
+            for model in (Workout, WorkoutExercise, WorkoutSet):
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+        user_ids = list(
+            User.objects.filter(email__startswith="bench-gen-")
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        chunk_size = options["chunk_size"]
+        start = time.perf_counter()
+        created = sum(
+            generate_week(user_ids[i : i + chunk_size])
+            for i in range(0, len(user_ids), chunk_size)
+        )
+        elapsed = time.perf_counter() - start
+        command.stdout.write(
+            f"generate_week: {created:,} workouts for {len(user_ids):,} users in "
+            f"{elapsed:.1f}s ({created / elapsed:,.0f} workouts/s per worker)"
+        )
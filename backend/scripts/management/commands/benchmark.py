@@ -0,0 +1,44 @@
+"""
+Django management command to run a registered benchmark.
+
+Usage:
+    python manage.py benchmark --list
+    python manage.py benchmark auth_queries --requests 500
+"""
+from importlib import import_module
+
+from django.core.management.base import BaseCommand, CommandError
+
+from scripts.benchmarks import BENCHMARKS
+
+
+class Command(BaseCommand):
+    help = "Run a performance benchmark from scripts.benchmarks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--list",
+            action="store_true",
+            help="List available benchmarks and exit",
+        )
+        subparsers = parser.add_subparsers(dest="benchmark")
+        for name, module_path in BENCHMARKS.items():
+            module = import_module(module_path)
+            subparser = subparsers.add_parser(
+                name,
+                help=(module.__doc__ or "").strip().splitlines()[0],
+            )
+            module.add_arguments(subparser)
+
+    def handle(self, *args, **options):
+        if options["list"]:
+            for name in BENCHMARKS:
+                self.stdout.write(name)
+            return
+
+        name = options.get("benchmark")
+        if name is None:
+            raise CommandError("Name a benchmark to run (see --list).")
+
+        module = import_module(BENCHMARKS[name])
+        module.run(self, options)
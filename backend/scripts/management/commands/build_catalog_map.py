@@ -0,0 +1,38 @@
+"""
+Django management command to build the shared catalog map.
+
+Worker processes read catalog lookups (equipment compatibility, muscle and
+trait masks) from one memory-mapped file instead of building them from the
+database each (see catalog.mapped). Run this at deploy time, before the
+workers start; catalog changes rebuild the file once they commit.
+
+Usage:
+    python manage.py build_catalog_map
+    python manage.py build_catalog_map --output /tmp/catalog.map
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.mapped import build_catalog_map, catalog_map_path
+
+
+class Command(BaseCommand):
+    help = "Build the memory-mapped catalog shared by worker processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=None,
+            help="Map file to write (default: CATALOG_MAP['PATH'])",
+        )
+
+    def handle(self, *args, **options):
+        output = options["output"] or catalog_map_path()
+
+        try:
+            version = build_catalog_map(output)
+        except OSError as error:
+            raise CommandError(f"Could not write {output}: {error}")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Built catalog map {version} in {output}")
+        )
@@ -0,0 +1,33 @@
+"""
+Django management command to build the catalog snapshot.
+
+/api/catalog/snapshot/ serves a prebuilt, compressed JSON document of the
+exercise and equipment catalog (see catalog.snapshot). It is rebuilt on the
+first request after the catalog changes; run this at deploy time, or after
+loading the catalog, so no request pays for the build.
+
+Usage:
+    python manage.py build_catalog_snapshot
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.snapshot import build_snapshot
+
+
+class Command(BaseCommand):
+    help = "Build the catalog snapshot served by /api/catalog/snapshot/"
+
+    def handle(self, *args, **options):
+        try:
+            version = build_snapshot()
+        except OSError as error:
+            raise CommandError(
+                f"Could not write to {settings.CATALOG_SNAPSHOT_DIR}: {error}"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Built catalog snapshot {version} in {settings.CATALOG_SNAPSHOT_DIR}"
+            )
+        )
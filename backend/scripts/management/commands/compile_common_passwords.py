@@ -0,0 +1,51 @@
+"""
+Django management command to compile the common-password list.
+
+CompiledCommonPasswordValidator checks passwords against a memory-mapped file
+of sorted password digests instead of decompressing the list in every worker.
+Run this at build time, or after upgrading Django, to (re)build that file;
+the validator otherwise rebuilds it on first load when the list changed.
+
+Usage:
+    python manage.py compile_common_passwords
+    python manage.py compile_common_passwords --source passwords.txt.gz
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from account.password_validation import (
+    DJANGO_PASSWORD_LIST_PATH,
+    compile_password_list,
+    default_compiled_path,
+)
+
+
+class Command(BaseCommand):
+    help = "Compile the common-password list used by password validation"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source",
+            default=None,
+            help="Password list to compile (default: Django's built-in list)",
+        )
+        parser.add_argument(
+            "--output",
+            default=None,
+            help=(
+                "Compiled file to write (default: COMMON_PASSWORDS_PATH, or a "
+                "file next to it named after --source)"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        source = options["source"] or DJANGO_PASSWORD_LIST_PATH
+        output = options["output"] or default_compiled_path(source)
+
+        try:
+            count = compile_password_list(source, output)
+        except OSError as error:
+            raise CommandError(f"Could not compile {source}: {error}")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Compiled {count:,} passwords into {output}")
+        )
@@ -0,0 +1,60 @@
+"""
+Django management command to bulk load exercise/equipment compatibility.
+
+Reads (exercise, equipment) pairs from a JSON or CSV file and links them in
+one transaction. Exercises and equipment are referenced by id or by exact
+name; nothing is written if any reference is unknown or ambiguous.
+
+JSON:
+    [{"exercise": "Back Squat", "equipment": ["Power Rack", "Smith Machine"]}]
+
+CSV:
+    exercise,equipment
+    Back Squat,Power Rack
+
+Running API workers pick the change up within COMPATIBILITY_INDEX and
+ELIGIBILITY_INDEX TTL_SECONDS.
+
+Usage:
+    python manage.py load_exercise_equipment compatibility.json
+    python manage.py load_exercise_equipment links.txt --format csv --replace
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.compatibility import (
+    FILE_FORMATS,
+    CompatibilityLoadError,
+    load_compatibility,
+    read_compatibility_file,
+)
+
+
+class Command(BaseCommand):
+    help = "Bulk load which equipment each exercise can be performed with"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="JSON or CSV file to load")
+        parser.add_argument(
+            "--format",
+            choices=FILE_FORMATS,
+            default=None,
+            help="File format (default: from the file extension)",
+        )
+        parser.add_argument(
+            "--replace",
+            action="store_true",
+            help="Replace the existing links of every exercise in the file",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            pairs = read_compatibility_file(options["path"], options["format"])
+            created = load_compatibility(pairs, replace=options["replace"])
+        except CompatibilityLoadError as error:
+            raise CommandError(f"Could not load {options['path']}:\n{error}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Loaded {len(pairs):,} pairs ({created:,} new links)"
+            )
+        )
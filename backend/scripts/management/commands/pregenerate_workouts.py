@@ -0,0 +1,94 @@
+"""
+Django management command to pre-generate next week's workouts.
+
+Tops up every active user's scheduled workouts to their sessions_per_week
+(see training.generator.generate_week). Users are split into chunks that a
+pool of worker processes generates in parallel. Each worker builds its own
+eligibility, compatibility and inventory indexes once and reuses them for
+every chunk it handles, and each chunk is written in one transaction.
+
+Already scheduled workouts count towards the week, so re-running the command
+is safe.
+
+Usage:
+    python manage.py pregenerate_workouts
+    python manage.py pregenerate_workouts --workers 8 --chunk-size 1000
+    python manage.py pregenerate_workouts --workers 0   # in this process
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from training.generator import generate_week
+
+
+def _init_worker() -> None:
+    # Spawned workers start without Django (a no-op for forked ones)
+    django.setup()
+
+
+def _generate_chunk(user_ids: list[int]) -> int:
+    return generate_week(user_ids)
+
+
+class Command(BaseCommand):
+    help = "Pre-generate each user's scheduled workouts for the coming week"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Worker processes (0 generates in this process)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Users per chunk (and per transaction)",
+        )
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        chunk_size = options["chunk_size"]
+        if workers < 0:
+            raise CommandError("--workers can't be negative.")
+        if chunk_size <= 0:
+            raise CommandError("--chunk-size must be a positive number.")
+
+        User = get_user_model()
+        user_ids = list(
+            User.objects.filter(is_active=True, gym__isnull=False)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        chunks = [
+            user_ids[i : i + chunk_size] for i in range(0, len(user_ids), chunk_size)
+        ]
+        started = time.monotonic()
+
+        created = 0
+        if workers == 0:
+            for chunk in chunks:
+                created += _generate_chunk(chunk)
+        else:
+            # Workers open their own connections; don't hand them ours
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker
+            ) as executor:
+                futures = [executor.submit(_generate_chunk, chunk) for chunk in chunks]
+                for future in as_completed(futures):
+                    created += future.result()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {created:,} workouts for {len(user_ids):,} users in "
+                f"{time.monotonic() - started:.1f}s"
+            )
+        )
@@ -0,0 +1,121 @@
+"""
+Django management command to prune expired JWT bookkeeping rows.
+
+Every login, registration, refresh and password change inserts an
+OutstandingToken, and every rotation inserts a BlacklistedToken. Once a token
+has expired neither row is needed: the token is rejected on its "exp" claim
+alone. This command deletes expired rows in small batches, oldest first, so
+it can run while traffic is live without holding long locks.
+
+Batches are keyed on (expires_at, id), so an interrupted run simply resumes
+from the oldest remaining expired row the next time it is started.
+
+Usage:
+    python manage.py prune_tokens
+    python manage.py prune_tokens --batch-size 5000 --sleep 0.2
+    python manage.py prune_tokens --dry-run
+"""
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+
+class Command(BaseCommand):
+    help = "Delete expired outstanding and blacklisted JWT rows in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Outstanding tokens deleted per transaction",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.1,
+            help="Seconds to pause between batches",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=None,
+            help="Stop after this many batches (resume on the next run)",
+        )
+        parser.add_argument(
+            "--grace-minutes",
+            type=int,
+            default=0,
+            help="Only prune tokens that expired at least this long ago",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many rows would be deleted without deleting",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be a positive number.")
+
+        cutoff = timezone.now() - timedelta(minutes=options["grace_minutes"])
+        expired = OutstandingToken.objects.filter(expires_at__lt=cutoff)
+
+        if options["dry_run"]:
+            blacklisted = BlacklistedToken.objects.filter(token__expires_at__lt=cutoff)
+            self.stdout.write(
+                f"Would delete {expired.count()} outstanding and "
+                f"{blacklisted.count()} blacklisted tokens expired before {cutoff}"
+            )
+            return
+
+        total_outstanding = 0
+        total_blacklisted = 0
+        batches = 0
+        started = time.monotonic()
+
+        while options["max_batches"] is None or batches < options["max_batches"]:
+            with transaction.atomic():
+                ids = list(
+                    expired.order_by("expires_at", "id").values_list("id", flat=True)[
+                        :batch_size
+                    ]
+                )
+                if not ids:
+                    break
+
+                blacklisted, _ = BlacklistedToken.objects.filter(
+                    token_id__in=ids
+                ).delete()
+                outstanding, _ = OutstandingToken.objects.filter(id__in=ids).delete()
+
+            batches += 1
+            total_blacklisted += blacklisted
+            total_outstanding += outstanding
+
+            elapsed = time.monotonic() - started
+            rate = (total_outstanding + total_blacklisted) / elapsed
+            self.stdout.write(
+                f"Batch {batches}: {total_outstanding} outstanding, "
+                f"{total_blacklisted} blacklisted deleted ({rate:.0f} rows/s)"
+            )
+
+            if len(ids) < batch_size:
+                break
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Pruned {total_outstanding} outstanding and {total_blacklisted} "
+                f"blacklisted tokens in {batches} batches"
+            )
+        )
@@ -0,0 +1,57 @@
+"""
+Django management command to rebuild personal records from set history.
+
+Personal records are kept up to date as sets are completed (see
+training.records); this recomputes them from every completed set, picking up
+corrected, deleted or bulk-updated sets. Users are streamed in chunks of
+--chunk-size, each rebuilt with one aggregate INSERT in its own transaction,
+so the command can run against a live database.
+
+Usage:
+    python manage.py rebuild_personal_records
+    python manage.py rebuild_personal_records --chunk-size 5000
+"""
+import time
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from training.records import rebuild_personal_records
+
+
+class Command(BaseCommand):
+    help = "Recompute every user's personal records from set history"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1_000,
+            help="Users per chunk (and per transaction)",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        if chunk_size <= 0:
+            raise CommandError("--chunk-size must be a positive number.")
+
+        User = get_user_model()
+        user_ids = (
+            User.objects.order_by("id")
+            .values_list("id", flat=True)
+            .iterator(chunk_size=chunk_size)
+        )
+        started = time.monotonic()
+
+        users = records = 0
+        while chunk := list(islice(user_ids, chunk_size)):
+            records += rebuild_personal_records(chunk)
+            users += len(chunk)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {records:,} personal records for {users:,} users in "
+                f"{time.monotonic() - started:.1f}s"
+            )
+        )
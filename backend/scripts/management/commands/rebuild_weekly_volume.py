@@ -0,0 +1,57 @@
+"""
+Django management command to rebuild weekly muscle volume from set history.
+
+Weekly volume rollups are kept up to date as sets are saved (see
+training.volume); this recomputes them from every completed set, picking up
+queryset updates and exercises whose muscles were re-tagged. Users are
+streamed in chunks of --chunk-size, each rebuilt with one aggregate INSERT in
+its own transaction, so the command can run against a live database.
+
+Usage:
+    python manage.py rebuild_weekly_volume
+    python manage.py rebuild_weekly_volume --chunk-size 5000
+"""
+import time
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from training.volume import rebuild_weekly_volume
+
+
+class Command(BaseCommand):
+    help = "Recompute every user's weekly muscle volume from set history"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1_000,
+            help="Users per chunk (and per transaction)",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        if chunk_size <= 0:
+            raise CommandError("--chunk-size must be a positive number.")
+
+        User = get_user_model()
+        user_ids = (
+            User.objects.order_by("id")
+            .values_list("id", flat=True)
+            .iterator(chunk_size=chunk_size)
+        )
+        started = time.monotonic()
+
+        users = rows = 0
+        while chunk := list(islice(user_ids, chunk_size)):
+            rows += rebuild_weekly_volume(chunk)
+            users += len(chunk)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {rows:,} weekly volume rows for {users:,} users in "
+                f"{time.monotonic() - started:.1f}s"
+            )
+        )
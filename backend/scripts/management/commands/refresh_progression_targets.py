@@ -0,0 +1,55 @@
+"""
+Django management command to refresh the target weights of scheduled sets.
+
+Recomputes every scheduled, not yet completed set's target weight from the
+user's set history (see training.progression), so workouts generated ahead
+of time follow the sets logged since. Meant to run nightly.
+
+Users are processed in chunks: each loads its chunk's history into arrays
+once and writes the new targets with one UPDATE per batch of sets.
+
+Usage:
+    python manage.py refresh_progression_targets
+    python manage.py refresh_progression_targets --chunk-size 10000
+"""
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from training.progression import refresh_scheduled_targets
+
+
+class Command(BaseCommand):
+    help = "Recompute target weights of scheduled sets from set history"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5_000,
+            help="Users whose history is loaded at a time",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        if chunk_size <= 0:
+            raise CommandError("--chunk-size must be a positive number.")
+
+        User = get_user_model()
+        user_ids = list(
+            User.objects.filter(is_active=True).order_by("id").values_list("id", flat=True)
+        )
+        started = time.monotonic()
+
+        updated = sum(
+            refresh_scheduled_targets(user_ids[i : i + chunk_size])
+            for i in range(0, len(user_ids), chunk_size)
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Updated {updated:,} sets for {len(user_ids):,} users in "
+                f"{time.monotonic() - started:.1f}s"
+            )
+        )
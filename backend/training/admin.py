@@ -1,7 +1,9 @@
 from django.contrib import admin
 
 from training.models import (
+    PersonalRecord,
     UserTrainingPreferences,
+    WeeklyMuscleVolume,
     Workout,
     WorkoutExercise,
     WorkoutSet,
@@ -108,3 +110,30 @@ class WorkoutSetAdmin(admin.ModelAdmin):
         "workout_exercise__exercise__name",
     ]
     raw_id_fields = ["workout_exercise"]
+
+
+@admin.register(PersonalRecord)
+class PersonalRecordAdmin(admin.ModelAdmin):
+    """Admin interface for PersonalRecord model."""
+
+    list_display = [
+        "user",
+        "exercise",
+        "best_e1rm_lbs",
+        "heaviest_weight_lbs",
+        "most_reps",
+        "updated_at",
+    ]
+    search_fields = ["user__email", "exercise__name"]
+    readonly_fields = ["updated_at"]
+    raw_id_fields = ["user", "exercise"]
+
+
+@admin.register(WeeklyMuscleVolume)
+class WeeklyMuscleVolumeAdmin(admin.ModelAdmin):
+    """Admin interface for WeeklyMuscleVolume model."""
+
+    list_display = ["user", "week", "muscle_group", "volume_lbs", "sets"]
+    list_filter = ["muscle_group", "week"]
+    search_fields = ["user__email"]
+    raw_id_fields = ["user"]
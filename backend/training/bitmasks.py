@@ -0,0 +1,158 @@
+"""
+Bitmask encoding of equipment traits and exercise attributes.
+
+Every EquipmentModality, EquipmentStation, EquipmentType and ExerciseAttribute
+value owns one bit of a shared 64-bit layout, so a user's four exclusion lists
+collapse into a single integer and "is this excluded?" becomes one bitwise AND:
+
+    equipment.trait_mask & preferences.exclusion_mask == 0     # allowed
+    exercise.attribute_mask & preferences.exclusion_mask == 0  # allowed
+
+Each enum owns a fixed block of GROUP_WIDTH bits and a member's bit is its
+position in the enum, so masks stored in the database stay valid as long as
+new members are appended (never inserted or reordered) and each enum stays
+within its block.
+
+The masks are stored as generated columns (see exclusion_mask_expression and
+friends) so they can never drift from the arrays they are derived from, and
+are recomputed in Python by the functions below for in-memory use. Appending
+an enum member changes the generated expressions, so it needs a migration.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from functools import reduce
+from typing import TYPE_CHECKING
+
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.expressions import Combinable
+
+from training.enums import (
+    EquipmentModality,
+    EquipmentStation,
+    EquipmentType,
+    ExerciseAttribute,
+)
+
+if TYPE_CHECKING:
+    from django.db.models import Model, QuerySet, TextChoices
+
+    from training.models import UserTrainingPreferences
+
+# Bits reserved for each enum
+GROUP_WIDTH = 8
+
+# Bit offset of each enum's block, in layout order
+GROUP_OFFSETS: dict[type[TextChoices], int] = {
+    EquipmentModality: 0,
+    EquipmentStation: GROUP_WIDTH,
+    EquipmentType: 2 * GROUP_WIDTH,
+    ExerciseAttribute: 3 * GROUP_WIDTH,
+}
+
+
+def _build_bits() -> dict[str, int]:
+    bits = {}
+    for enum, offset in GROUP_OFFSETS.items():
+        if len(enum) > GROUP_WIDTH:
+            raise ValueError(f"{enum.__name__} has outgrown its {GROUP_WIDTH} bits.")
+        for position, member in enumerate(enum):
+            bits[member.value] = 1 << (offset + position)
+    return bits
+
+
+# Single bit for every equipment trait and exercise attribute value. The four
+# enums share no values, so one lookup table covers them all.
+BITS: dict[str, int] = _build_bits()
+
+
+def mask_for(values: Iterable[str] | None) -> int:
+    """Return the mask with the bit of every value set (unknown values raise)."""
+    mask = 0
+    for value in values or ():
+        mask |= BITS[value]
+    return mask
+
+
+def is_excluded(mask: int, exclusion_mask: int) -> bool:
+    """Return True if any bit of `mask` is in `exclusion_mask`."""
+    return bool(mask & exclusion_mask)
+
+
+def exclude_masked(
+    queryset: QuerySet[Model], field: str, exclusion_mask: int
+) -> QuerySet[Model]:
+    """Filter out rows whose mask `field` shares a bit with `exclusion_mask`."""
+    if not exclusion_mask:
+        return queryset
+    return queryset.alias(_excluded_bits=F(field).bitand(exclusion_mask)).filter(
+        _excluded_bits=0
+    )
+
+
+# Generated-column expressions. Each bit is a CASE on the source column(s),
+# OR-ed together; everything involved is immutable, as Postgres requires.
+
+
+def _or_all(terms: list[Combinable]) -> Combinable:
+    return reduce(lambda left, right: left.bitor(right), terms)
+
+
+def _bit_if(condition: Q, value: str) -> Case:
+    return Case(When(condition, then=Value(BITS[value])), default=Value(0))
+
+
+def array_mask_expression(field: str, enum: type[TextChoices]) -> Combinable:
+    """Mask of the `enum` values contained in the ArrayField `field`."""
+    return _or_all(
+        [_bit_if(Q(**{f"{field}__contains": [value]}), value) for value in enum.values]
+    )
+
+
+def choice_mask_expression(field: str, enum: type[TextChoices]) -> Combinable:
+    """Bit of the `enum` value stored in the choice field `field` (0 if none)."""
+    return _or_all([_bit_if(Q(**{field: value}), value) for value in enum.values])
+
+
+def exclusion_mask_expression() -> Combinable:
+    """UserTrainingPreferences.exclusion_mask from the four exclusion arrays."""
+    return _or_all(
+        [
+            array_mask_expression("excluded_equipment_modalities", EquipmentModality),
+            array_mask_expression("excluded_equipment_stations", EquipmentStation),
+            array_mask_expression("excluded_equipment_types", EquipmentType),
+            array_mask_expression("excluded_exercise_attributes", ExerciseAttribute),
+        ]
+    )
+
+
+def trait_mask_expression() -> Combinable:
+    """Equipment.trait_mask from modality, station and equipment_type."""
+    return _or_all(
+        [
+            choice_mask_expression("modality", EquipmentModality),
+            choice_mask_expression("station", EquipmentStation),
+            choice_mask_expression("equipment_type", EquipmentType),
+        ]
+    )
+
+
+def attribute_mask_expression() -> Combinable:
+    """Exercise.attribute_mask from the attributes array."""
+    return array_mask_expression("attributes", ExerciseAttribute)
+
+
+def preferences_exclusion_mask(preferences: UserTrainingPreferences) -> int:
+    """
+    Compute a preferences' exclusion mask from its arrays in Python.
+
+    Matches the exclusion_mask column, but also works on unsaved or modified
+    instances, whose generated column has not been read back yet.
+    """
+    return (
+        mask_for(preferences.excluded_equipment_modalities)
+        | mask_for(preferences.excluded_equipment_stations)
+        | mask_for(preferences.excluded_equipment_types)
+        | mask_for(preferences.excluded_exercise_attributes)
+    )
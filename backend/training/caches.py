@@ -0,0 +1,58 @@
+"""Per-process caches for training data read on hot paths."""
+
+from __future__ import annotations
+
+import copy
+from datetime import datetime
+
+from django.conf import settings
+
+from core.caches import LRUCache
+from training.models import UserTrainingPreferences
+
+# Snapshots of each user's training preferences, keyed by user id. Users
+# without a row get an unsaved instance holding the model defaults. Entries
+# are dropped by training.signals whenever the row is saved or deleted.
+preferences_cache = LRUCache(
+    max_entries=settings.TRAINING_PREFERENCES_CACHE["MAX_ENTRIES"],
+    ttl_seconds=settings.TRAINING_PREFERENCES_CACHE["TTL_SECONDS"],
+)
+
+
+def get_preferences(user_id: int) -> UserTrainingPreferences:
+    """
+    Return the user's training preferences for reading, without writing.
+
+    Falls back to an unsaved instance with the model defaults when the user
+    has no row. Each call returns its own copy of the cached snapshot; use
+    UserTrainingPreferences.objects to load a row that will be saved.
+    """
+    if not settings.TRAINING_PREFERENCES_CACHE["ENABLED"]:
+        return _load_preferences(user_id)
+
+    snapshot = preferences_cache.get(user_id)
+    if snapshot is None:
+        snapshot = _load_preferences(user_id)
+        preferences_cache.set(user_id, snapshot)
+    return copy.copy(snapshot)
+
+
+def _load_preferences(user_id: int) -> UserTrainingPreferences:
+    preferences = UserTrainingPreferences.objects.filter(user_id=user_id).first()
+    if preferences is None:
+        preferences = UserTrainingPreferences(user_id=user_id)
+    return preferences
+
+
+def get_preferences_version(user_id: int) -> datetime | None:
+    """
+    Return when the user's preferences last changed.
+
+    None if the user has no preferences row and is served the defaults.
+    """
+    return get_preferences(user_id).updated_at
+
+
+def invalidate_preferences(user_id: int) -> None:
+    """Drop cached preferences data for the given user id."""
+    preferences_cache.delete(user_id)
@@ -0,0 +1,314 @@
+"""
+Which catalog exercises can a user do at their gym?
+
+An exercise is eligible for a user when
+- none of its attributes is excluded by the user's training preferences, and
+- it needs no equipment, or the user's gym has at least one piece of
+  compatible equipment whose modality, station and type are not excluded.
+
+The catalog index numbers exercises 0..n-1 and keeps Python ints as bitsets
+over those positions: the exercises each piece of equipment supports, the
+exercises that need no equipment, and the exercises carrying each attribute.
+A gym index groups the gym's equipment by trait mask (see training.bitmasks)
+and pre-ORs each group's bitsets, so answering for an exclusion mask is one
+AND per trait group plus an AND NOT for excluded attributes - a few
+microseconds for a catalog of thousands of exercises. Answers are memoized per
+gym and distinct exclusion mask, so users who share a gym and a preference
+profile share one cached result.
+
+Indexes are per process. The catalog index is built from the shared catalog
+map (see catalog.mapped) when it can be used, without a query, and rebuilt
+when the map is replaced; otherwise it is loaded from the database. Gym
+indexes take the gym's equipment from gym.inventory. training.signals drops
+them when the catalog or a gym's inventory changes; the TTL bounds staleness
+for changes made by other worker processes or by bulk operations that send
+no signals.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+
+from catalog.mapped import MappedCatalog, catalog_map
+from catalog.models import Equipment, Exercise
+from catalog.taxonomy import muscle_groups_for_mask
+from core.caches import LRUCache
+from gym.inventory import get_inventory
+from training.bitmasks import preferences_exclusion_mask
+from training.caches import get_preferences
+
+if TYPE_CHECKING:
+    from account.models import User
+
+
+@dataclass(frozen=True)
+class CatalogIndex:
+    """Bitsets over the exercise catalog, keyed by exercise position."""
+
+    exercise_ids: tuple[int, ...]
+    exercise_names: tuple[str, ...]
+    primary_muscles: tuple[tuple[str, ...], ...]
+    positions: dict[int, int]
+    # Exercises that need no equipment
+    unrestricted: int
+    # Equipment id -> exercises it can be used for
+    by_equipment: dict[int, int]
+    # Equipment id -> trait mask
+    equipment_traits: dict[int, int]
+    # Attribute bit -> exercises carrying that attribute
+    by_attribute: dict[int, int]
+    # Version of the catalog map it was built from (None if the database)
+    version: str | None = None
+
+    @classmethod
+    def build(cls) -> CatalogIndex:
+        """
+        Index the catalog map, or load the exercise catalog and its
+        equipment links from the database (three queries) without one.
+        """
+        mapped = catalog_map.get()
+        if mapped is not None:
+            return cls.from_map(mapped)
+
+        links = Exercise.equipment.through.objects.values_list(
+            "exercise_id", "equipment_id"
+        )
+        return cls.from_rows(
+            Exercise.objects.order_by("id").values_list(
+                "id", "name", "primary_muscles", "attribute_mask"
+            ),
+            links.iterator(chunk_size=10_000),
+            dict(Equipment.objects.values_list("id", "trait_mask")),
+        )
+
+    @classmethod
+    def from_map(cls, mapped: MappedCatalog) -> CatalogIndex:
+        """Index the catalog held by a catalog map (no queries)."""
+        exercise_ids, equipment_ids = mapped.links()
+        rows = [
+            (pk, name, muscle_groups_for_mask(primary), attributes)
+            for pk, name, primary, attributes in mapped.exercises()
+        ]
+        return cls.from_rows(
+            rows,
+            zip(exercise_ids.tolist(), equipment_ids.tolist(), strict=True),
+            mapped.all_equipment_traits(),
+            version=mapped.version,
+        )
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[tuple[int, str, Iterable[str], int]],
+        links: Iterable[tuple[int, int]],
+        equipment_traits: dict[int, int],
+        version: str | None = None,
+    ) -> CatalogIndex:
+        """
+        Index (id, name, primary muscles, attribute mask) exercise rows in id
+        order, their (exercise id, equipment id) links and equipment traits.
+        """
+        rows = list(rows)
+        positions = {row[0]: i for i, row in enumerate(rows)}
+
+        by_attribute: dict[int, int] = {}
+        for i, (_, _, _, attribute_mask) in enumerate(rows):
+            while attribute_mask:
+                bit = attribute_mask & -attribute_mask
+                by_attribute[bit] = by_attribute.get(bit, 0) | (1 << i)
+                attribute_mask ^= bit
+
+        by_equipment: dict[int, int] = {}
+        restricted = 0
+        for exercise_id, equipment_id in links:
+            bit = 1 << positions[exercise_id]
+            by_equipment[equipment_id] = by_equipment.get(equipment_id, 0) | bit
+            restricted |= bit
+
+        return cls(
+            exercise_ids=tuple(row[0] for row in rows),
+            exercise_names=tuple(row[1] for row in rows),
+            primary_muscles=tuple(tuple(row[2]) for row in rows),
+            positions=positions,
+            unrestricted=((1 << len(rows)) - 1) & ~restricted,
+            by_equipment=by_equipment,
+            equipment_traits=equipment_traits,
+            by_attribute=by_attribute,
+            version=version,
+        )
+
+    def attribute_excluded(self, exclusion_mask: int) -> int:
+        """Return the exercises carrying any attribute in `exclusion_mask`."""
+        excluded = 0
+        for bit, exercises in self.by_attribute.items():
+            if bit & exclusion_mask:
+                excluded |= exercises
+        return excluded
+
+    def positions_of(self, bits: int) -> list[int]:
+        """Return the positions set in `bits`, in ascending order."""
+        flags = bin(bits)[:1:-1]
+        return [i for i, flag in enumerate(flags) if flag == "1"]
+
+
+class GymIndex:
+    """A gym's equipment grouped by trait mask, with memoized answers."""
+
+    def __init__(
+        self, catalog: CatalogIndex, equipment_ids: set[int], max_profiles: int
+    ) -> None:
+        self.catalog = catalog
+        groups: dict[int, int] = {}
+        for equipment_id in equipment_ids:
+            traits = catalog.equipment_traits.get(equipment_id)
+            if traits is None:
+                continue
+            exercises = catalog.by_equipment.get(equipment_id, 0)
+            groups[traits] = groups.get(traits, 0) | exercises
+        self.groups = tuple(groups.items())
+        self._results = LRUCache(max_entries=max_profiles)
+
+    @classmethod
+    def build(
+        cls, catalog: CatalogIndex, gym_id: int | None, max_profiles: int
+    ) -> GymIndex:
+        """Index the distinct equipment at the gym (none if gym_id is None)."""
+        equipment_ids: set[int] = set()
+        if gym_id is not None:
+            equipment_ids = set(get_inventory(gym_id).by_equipment)
+        return cls(catalog, equipment_ids, max_profiles)
+
+    def eligible(self, exclusion_mask: int) -> int:
+        """Return the bitset of exercises eligible under `exclusion_mask`."""
+        bits = self._results.get(exclusion_mask)
+        if bits is not None:
+            return bits
+
+        bits = self.catalog.unrestricted
+        for traits, exercises in self.groups:
+            if not traits & exclusion_mask:
+                bits |= exercises
+        bits &= ~self.catalog.attribute_excluded(exclusion_mask)
+
+        self._results.set(exclusion_mask, bits)
+        return bits
+
+
+class EligibilityEngine:
+    """Per-process catalog and gym indexes answering eligibility queries."""
+
+    def __init__(self, ttl_seconds: float, max_gyms: int, max_profiles: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_profiles = max_profiles
+        self._catalog: CatalogIndex | None = None
+        self._catalog_expires_at = 0.0
+        self._gyms = LRUCache(max_entries=max_gyms, ttl_seconds=ttl_seconds)
+        self._lock = threading.Lock()
+
+    def catalog(self) -> CatalogIndex:
+        """
+        Return the catalog index, building it if missing or expired, or if
+        the catalog map was replaced.
+        """
+        mapped = catalog_map.get()
+        version = mapped.version if mapped is not None else None
+        catalog = self._catalog
+        if catalog is not None and not self._stale(catalog, version):
+            return catalog
+
+        with self._lock:
+            if self._catalog is None or self._stale(self._catalog, version):
+                self._catalog = (
+                    CatalogIndex.from_map(mapped)
+                    if mapped is not None
+                    else CatalogIndex.build()
+                )
+                self._catalog_expires_at = time.monotonic() + self.ttl_seconds
+                self._gyms.clear()
+            return self._catalog
+
+    def _stale(self, catalog: CatalogIndex, version: str | None) -> bool:
+        if version is not None and version != catalog.version:
+            return True
+        return time.monotonic() >= self._catalog_expires_at
+
+    def gym(self, gym_id: int | None) -> GymIndex:
+        """Return the index for a gym (None for users without a gym)."""
+        catalog = self.catalog()
+        index = self._gyms.get(gym_id)
+        if index is None or index.catalog is not catalog:
+            index = GymIndex.build(catalog, gym_id, self.max_profiles)
+            self._gyms.set(gym_id, index)
+        return index
+
+    def eligible_bits(self, gym_id: int | None, exclusion_mask: int) -> int:
+        """Return the eligible exercises as a bitset over catalog positions."""
+        return self.gym(gym_id).eligible(exclusion_mask)
+
+    def eligible_exercise_ids(
+        self, gym_id: int | None, exclusion_mask: int
+    ) -> list[int]:
+        """Return the ids of eligible exercises, in id order."""
+        index = self.gym(gym_id)
+        bits = index.eligible(exclusion_mask)
+        ids = index.catalog.exercise_ids
+        return [ids[i] for i in index.catalog.positions_of(bits)]
+
+    def eligible_exercises(
+        self, gym_id: int | None, exclusion_mask: int
+    ) -> list[tuple[int, str]]:
+        """Return (id, name) of eligible exercises, in id order."""
+        index = self.gym(gym_id)
+        bits = index.eligible(exclusion_mask)
+        ids, names = index.catalog.exercise_ids, index.catalog.exercise_names
+        return [(ids[i], names[i]) for i in index.catalog.positions_of(bits)]
+
+    def is_eligible(
+        self, gym_id: int | None, exclusion_mask: int, exercise_id: int
+    ) -> bool:
+        """Return True if the exercise is eligible at the gym."""
+        index = self.gym(gym_id)
+        position = index.catalog.positions.get(exercise_id)
+        if position is None:
+            return False
+        return bool(index.eligible(exclusion_mask) >> position & 1)
+
+    def invalidate_catalog(self) -> None:
+        """Drop every index; the next query rebuilds from the database."""
+        with self._lock:
+            self._catalog = None
+            self._gyms.clear()
+
+    def invalidate_gym(self, gym_id: int) -> None:
+        """Drop one gym's index after its inventory changed."""
+        self._gyms.delete(gym_id)
+
+
+eligibility = EligibilityEngine(
+    ttl_seconds=settings.ELIGIBILITY_INDEX["TTL_SECONDS"],
+    max_gyms=settings.ELIGIBILITY_INDEX["MAX_GYMS"],
+    max_profiles=settings.ELIGIBILITY_INDEX["MAX_PROFILES_PER_GYM"],
+)
+
+
+def user_exclusion_mask(user: User) -> int:
+    """Return the user's exclusion mask, from the preferences cache."""
+    return preferences_exclusion_mask(get_preferences(user.pk))
+
+
+def eligible_exercise_ids(user: User) -> list[int]:
+    """Return the ids of the exercises the user can do at their gym."""
+    return eligibility.eligible_exercise_ids(user.gym_id, user_exclusion_mask(user))
+
+
+def is_exercise_eligible(user: User, exercise_id: int) -> bool:
+    """Return True if the user can do the exercise at their gym."""
+    return eligibility.is_eligible(
+        user.gym_id, user_exclusion_mask(user), exercise_id
+    )
@@ -0,0 +1,370 @@
+"""
+Automatic workout generation.
+
+A workout is planned in memory from the per-process indexes and then written
+with three bulk_create calls (workouts, exercises, sets):
+
+1. Candidates are the exercises the user can do at their gym under their
+   exclusions (training.eligibility).
+2. Exercises are picked greedily, each time preferring the one whose primary
+   muscles belong to the major groups covered least so far. Candidates are
+   sampled and shuffled with a seed derived from (user, workout number), so
+   consecutive workouts differ and regenerating one is reproducible.
+3. Each exercise gets gym equipment it can be performed with (see
+   training.workouts) whose traits aren't excluded, preferring equipment not
+   used yet in the workout.
+4. Sets, reps and rest follow training_intensity. Exercises are added while
+   the estimated time (work, rest between sets and a changeover per exercise)
+   stays within max_session_mins.
+5. Target weights continue from the user's set history of each exercise
+   (see training.progression), or start from a per-modality default.
+
+Apart from writing, planning for one user costs one query for the history
+(all exercises at once). Batches of users share every other lookup (see
+generate_week).
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Max, Q
+
+from catalog.compatibility import compatibility
+from catalog.enums import MUSCLE_GROUP_TO_MAJOR_GROUP
+from gym.inventory import get_inventory
+from training.bitmasks import BITS, preferences_exclusion_mask
+from training.caches import get_preferences
+from training.eligibility import eligibility
+from training.enums import EquipmentModality, WorkoutStatus
+from training.models import (
+    UserTrainingPreferences,
+    Workout,
+    WorkoutExercise,
+    WorkoutSet,
+)
+from training.progression import estimate, load_history
+
+if TYPE_CHECKING:
+    from catalog.compatibility import CompatibilityIndex
+    from gym.inventory import GymInventory
+
+User = get_user_model()
+
+# Estimated time under tension per rep, and to move between exercises
+SECONDS_PER_REP = 4
+CHANGEOVER_SECONDS = 90
+
+MAX_EXERCISES = 12
+# Candidates considered per pick; bounds planning time for large catalogs
+CANDIDATE_SAMPLE = 200
+
+STARTING_WEIGHT_LBS = {
+    EquipmentModality.FREE_WEIGHTS: Decimal("45"),
+    EquipmentModality.MACHINES: Decimal("40"),
+    EquipmentModality.CABLES: Decimal("20"),
+    EquipmentModality.BODYWEIGHT: Decimal("0"),
+    EquipmentModality.BANDS_SUSPENSION: Decimal("0"),
+}
+
+
+class WorkoutGenerationError(ValueError):
+    """Raised when no workout can be generated for a user."""
+
+
+@dataclass(frozen=True)
+class Prescription:
+    """Sets, reps and rest for every exercise of a workout."""
+
+    sets: int
+    reps: int
+    rest_seconds: int
+
+    @classmethod
+    def for_intensity(cls, intensity: int) -> Prescription:
+        """
+        Map training_intensity (1-10) to a prescription.
+
+        Higher intensity means more sets of fewer reps with longer rest.
+        """
+        intensity = min(max(intensity, 1), 10)
+        return cls(
+            sets=2 + intensity // 4,
+            reps=15 - intensity,
+            rest_seconds=45 + 10 * intensity,
+        )
+
+    @property
+    def exercise_seconds(self) -> int:
+        """Estimated time for one exercise, changeover included."""
+        work = self.sets * self.reps * SECONDS_PER_REP
+        rest = (self.sets - 1) * self.rest_seconds
+        return CHANGEOVER_SECONDS + work + rest
+
+
+@dataclass
+class PlannedExercise:
+    """An exercise of a planned workout, before it is written."""
+
+    exercise_id: int
+    gym_equipment_id: int
+    equipment_traits: int
+    target_weight_lbs: Decimal = Decimal("0")
+
+
+@dataclass
+class WorkoutPlan:
+    """A workout planned in memory."""
+
+    user_id: int
+    workout_number: int
+    prescription: Prescription
+    exercises: list[PlannedExercise] = field(default_factory=list)
+
+    @property
+    def estimated_seconds(self) -> int:
+        """Estimated duration of the whole workout."""
+        return len(self.exercises) * self.prescription.exercise_seconds
+
+
+def plan_workout(
+    user_id: int,
+    gym_id: int,
+    preferences: UserTrainingPreferences,
+    workout_number: int,
+) -> WorkoutPlan:
+    """Plan one workout without touching the database (weights not set)."""
+    prescription = Prescription.for_intensity(preferences.training_intensity)
+    plan = WorkoutPlan(user_id, workout_number, prescription)
+    budget = preferences.max_session_mins * 60
+    count = min(budget // prescription.exercise_seconds, MAX_EXERCISES)
+    if count <= 0:
+        return plan
+
+    exclusion_mask = preferences_exclusion_mask(preferences)
+    gym = eligibility.gym(gym_id)
+    catalog = gym.catalog
+    candidates = catalog.positions_of(gym.eligible(exclusion_mask))
+    inventory = get_inventory(gym_id)
+    index = compatibility.index()
+    rng = random.Random(f"{user_id}:{workout_number}")
+
+    coverage: dict[str, int] = {}
+    used_equipment: set[int] = set()
+    chosen: set[int] = set()
+    while len(plan.exercises) < count:
+        pool = [position for position in candidates if position not in chosen]
+        if not pool:
+            break
+        pool = rng.sample(pool, min(len(pool), CANDIDATE_SAMPLE))
+
+        # Prefer the exercise working the least covered major groups
+        position = min(
+            pool,
+            key=lambda p: _coverage_score(catalog.primary_muscles[p], coverage),
+        )
+        chosen.add(position)
+
+        exercise_id = catalog.exercise_ids[position]
+        options = _equipment_options(
+            exercise_id, inventory, index, catalog.equipment_traits, exclusion_mask
+        )
+        if not options:
+            # Needs no equipment, but nothing at the gym may be used
+            continue
+        gym_equipment_id, equipment_id, traits = next(
+            (option for option in options if option[1] not in used_equipment),
+            options[0],
+        )
+        used_equipment.add(equipment_id)
+        for muscle in catalog.primary_muscles[position]:
+            major = MUSCLE_GROUP_TO_MAJOR_GROUP.get(muscle)
+            coverage[major] = coverage.get(major, 0) + 1
+        plan.exercises.append(PlannedExercise(exercise_id, gym_equipment_id, traits))
+    return plan
+
+
+def _coverage_score(muscles: Sequence[str], coverage: dict[str, int]) -> float:
+    if not muscles:
+        # Untagged exercises come last
+        return float("inf")
+    return sum(coverage.get(MUSCLE_GROUP_TO_MAJOR_GROUP.get(m), 0) for m in muscles)
+
+
+def _equipment_options(
+    exercise_id: int,
+    inventory: GymInventory,
+    index: CompatibilityIndex,
+    equipment_traits: dict[int, int],
+    exclusion_mask: int,
+) -> list[tuple[int, int, int]]:
+    # (gym equipment id, equipment id, traits) the exercise may use, by id
+    if index.needs_equipment(exercise_id):
+        equipment_ids = index.equipment_for(exercise_id)
+    else:
+        equipment_ids = inventory.by_equipment.keys()
+    options = []
+    for equipment_id in equipment_ids:
+        traits = equipment_traits.get(equipment_id, 0)
+        if traits & exclusion_mask:
+            continue
+        for gym_equipment_id in inventory.by_equipment.get(equipment_id, ()):
+            options.append((gym_equipment_id, equipment_id, traits))
+    return sorted(options)
+
+
+def _starting_weight(traits: int) -> Decimal:
+    for modality, weight in STARTING_WEIGHT_LBS.items():
+        if traits & BITS[modality]:
+            return weight
+    return Decimal("0")
+
+
+def _assign_weights(plans: Sequence[WorkoutPlan]) -> None:
+    """Set target weights from the users' set history (one query)."""
+    planned = [(plan, exercise) for plan in plans for exercise in plan.exercises]
+    if not planned:
+        return
+
+    user_ids = np.array([plan.user_id for plan, _ in planned])
+    exercise_ids = np.array([exercise.exercise_id for _, exercise in planned])
+    reps = np.array([plan.prescription.reps for plan, _ in planned])
+
+    history = load_history(set(user_ids.tolist()), set(exercise_ids.tolist()))
+    estimates = estimate(history)
+    rows = estimates.lookup(user_ids, exercise_ids)
+    known = rows >= 0
+    weights = np.zeros(len(planned))
+    weights[known] = estimates.target_weights(rows[known], reps[known])
+
+    for (_, exercise), has_history, weight in zip(planned, known, weights):
+        if has_history:
+            exercise.target_weight_lbs = Decimal(str(weight))
+        else:
+            exercise.target_weight_lbs = _starting_weight(exercise.equipment_traits)
+
+
+@transaction.atomic(savepoint=False)
+def save_workouts(plans: Sequence[WorkoutPlan]) -> list[Workout]:
+    """Write planned workouts with one bulk_create per table."""
+    _assign_weights(plans)
+    workouts = Workout.objects.bulk_create(
+        Workout(user_id=plan.user_id, workout_number=plan.workout_number)
+        for plan in plans
+    )
+    workout_exercises = WorkoutExercise.objects.bulk_create(
+        WorkoutExercise(
+            workout=workout,
+            exercise_id=exercise.exercise_id,
+            gym_equipment_id=exercise.gym_equipment_id,
+            order=order,
+        )
+        for workout, plan in zip(workouts, plans)
+        for order, exercise in enumerate(plan.exercises)
+    )
+    planned = [exercise for plan in plans for exercise in plan.exercises]
+    prescriptions = [plan.prescription for plan in plans for _ in plan.exercises]
+    WorkoutSet.objects.bulk_create(
+        WorkoutSet(
+            workout_exercise=workout_exercise,
+            set_number=set_number,
+            target_weight_lbs=exercise.target_weight_lbs,
+            target_reps=prescription.reps,
+            rest_seconds=prescription.rest_seconds,
+        )
+        for workout_exercise, exercise, prescription in zip(
+            workout_exercises, planned, prescriptions
+        )
+        for set_number in range(1, prescription.sets + 1)
+    )
+    return workouts
+
+
+def _lock_users(user_ids: Iterable[int]) -> list[int]:
+    """
+    Lock the users' rows for the rest of the transaction; return their ids.
+
+    Taken before reading each user's last workout number, so two
+    generations for one user never plan the same number. Rows are locked in
+    id order so overlapping batches can't deadlock.
+    """
+    return list(
+        User.objects.select_for_update()
+        .filter(pk__in=list(user_ids))
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+@transaction.atomic
+def generate_workout(user: User) -> Workout:
+    """
+    Plan and write the user's next workout.
+
+    The user's row is locked until the workout is written, so concurrent
+    generations for one user take consecutive workout numbers.
+    """
+    if user.gym_id is None:
+        raise WorkoutGenerationError("Set a gym before generating workouts.")
+
+    _lock_users([user.pk])
+    last_number = user.workouts.aggregate(last=Max("workout_number"))["last"] or 0
+    plan = plan_workout(
+        user.pk, user.gym_id, get_preferences(user.pk), last_number + 1
+    )
+    if not plan.exercises:
+        raise WorkoutGenerationError(
+            "No exercises at your gym fit your preferences and session length."
+        )
+    return save_workouts([plan])[0]
+
+
+@transaction.atomic
+def generate_week(user_ids: Iterable[int]) -> int:
+    """
+    Top up each user's scheduled workouts to their sessions_per_week.
+
+    Users without a gym are skipped. Running it again before any workout is
+    completed creates nothing. Returns the number of workouts created. The
+    users' rows are locked until the workouts are written, like
+    generate_workout.
+    """
+    user_ids = _lock_users(user_ids)
+    gyms = dict(
+        User.objects.filter(pk__in=user_ids, gym__isnull=False).values_list(
+            "id", "gym_id"
+        )
+    )
+    preferences = {
+        row.user_id: row
+        for row in UserTrainingPreferences.objects.filter(user_id__in=gyms)
+    }
+    numbers = {
+        row["user_id"]: row
+        for row in Workout.objects.filter(user_id__in=gyms)
+        .values("user_id")
+        .annotate(
+            last=Max("workout_number"),
+            scheduled=Count("id", filter=Q(status=WorkoutStatus.SCHEDULED)),
+        )
+    }
+
+    plans = []
+    for user_id, gym_id in gyms.items():
+        # Users without a preferences row get the model defaults
+        row = preferences.get(user_id) or UserTrainingPreferences(user_id=user_id)
+        counts = numbers.get(user_id, {"last": 0, "scheduled": 0})
+        for offset in range(1, row.sessions_per_week - counts["scheduled"] + 1):
+            plan = plan_workout(user_id, gym_id, row, counts["last"] + offset)
+            if plan.exercises:
+                plans.append(plan)
+    save_workouts(plans)
+    return len(plans)
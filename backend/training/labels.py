@@ -0,0 +1,94 @@
+"""
+Workout labels for many workouts at once.
+
+derive_workout_label() labels one workout from its muscle groups; calling it
+per workout on a history page also means fetching each workout's exercises.
+label_workouts() instead reads the primary muscles of every exercise of a
+batch of workouts in one query, folds them into a catalog.taxonomy muscle
+mask per workout, and computes each distinct (mask, pattern flags) label
+once with workout_label_for_mask(). Histories repeat the same few splits, so
+N workouts cost one query and a handful of label computations.
+
+Where the shared catalog map (see catalog.mapped) is built, the masks are
+read from it and the query doesn't join the exercises.
+
+Labels use the exercises' primary muscles: secondary muscles would turn most
+chest days into "Chest & Triceps" and most splits into "Full Body".
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+
+from catalog.mapped import catalog_map
+from catalog.models import Exercise
+from catalog.taxonomy import muscle_mask
+from training.enums import MovementPattern
+from training.mappings import pattern_flags, workout_label_for_mask
+from training.models import WorkoutExercise
+
+
+def workout_masks(workout_ids: Iterable[int]) -> dict[int, int]:
+    """
+    Return the muscle mask of each workout's exercises' primary muscles.
+
+    One query for all workouts. Workouts without exercises map to 0.
+    """
+    workout_ids = list(workout_ids)
+    masks = dict.fromkeys(workout_ids, 0)
+    if not workout_ids:
+        return masks
+
+    workout_exercises = WorkoutExercise.objects.filter(workout_id__in=workout_ids)
+    mapped = catalog_map.get()
+    if mapped is None:
+        rows = workout_exercises.values_list(
+            "workout_id", "exercise_id", "exercise__primary_muscles"
+        )
+        exercise_masks: dict[int, int] = {}
+        for workout_id, exercise_id, muscles in rows:
+            mask = exercise_masks.get(exercise_id)
+            if mask is None:
+                mask = exercise_masks[exercise_id] = muscle_mask(muscles or ())
+            masks[workout_id] |= mask
+        return masks
+
+    # The masks are read from the shared catalog map, without a join;
+    # exercises added since it was built are read from the database
+    pairs = list(workout_exercises.values_list("workout_id", "exercise_id"))
+    exercise_ids = {exercise_id for _, exercise_id in pairs}
+    exercise_masks = mapped.primary_masks(exercise_ids)
+    missing = exercise_ids - exercise_masks.keys()
+    if missing:
+        for exercise_id, muscles in Exercise.objects.filter(
+            pk__in=missing
+        ).values_list("id", "primary_muscles"):
+            exercise_masks[exercise_id] = muscle_mask(muscles or ())
+    for workout_id, exercise_id in pairs:
+        masks[workout_id] |= exercise_masks.get(exercise_id, 0)
+    return masks
+
+
+def label_workouts(
+    workout_ids: Iterable[int],
+    movement_patterns: Mapping[int, Iterable[MovementPattern]] | None = None,
+) -> dict[int, str | None]:
+    """
+    Return the label of each workout, as derive_workout_label() would.
+
+    `movement_patterns` optionally maps workout ids to the movement patterns
+    of the workout. Each distinct combination of muscles and patterns is
+    labeled once.
+    """
+    movement_patterns = movement_patterns or {}
+    by_combination: dict[tuple[int, int], list[int]] = {}
+    for workout_id, mask in workout_masks(workout_ids).items():
+        flags = pattern_flags(movement_patterns.get(workout_id))
+        by_combination.setdefault((mask, flags), []).append(workout_id)
+
+    labels: dict[int, str | None] = {}
+    for (mask, flags), ids in by_combination.items():
+        label = workout_label_for_mask(mask, flags)
+        for workout_id in ids:
+            labels[workout_id] = label
+    return labels
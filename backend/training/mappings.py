@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
+from functools import lru_cache
 
 from catalog.enums import (
     MajorMuscleGroup,
@@ -9,8 +10,26 @@ from catalog.enums import (
     major_group_for,
     regions_for_muscle_groups,
 )
+from catalog.taxonomy import (
+    LOWER_BODY_MASK,
+    MAJOR_GROUP_MASKS,
+    MUSCLE_BITS,
+    UPPER_BODY_MASK,
+    muscle_mask,
+)
 from training.enums import MovementPattern
 
+# Pattern flags of workout_label_for_mask
+PUSH, PULL = 1, 2
+
+_CHEST = MUSCLE_BITS[MuscleGroup.CHEST]
+_TRICEPS = MUSCLE_BITS[MuscleGroup.TRICEPS]
+_BACK = MUSCLE_BITS[MuscleGroup.LATS] | MUSCLE_BITS[MuscleGroup.UPPER_BACK]
+_BICEPS = MUSCLE_BITS[MuscleGroup.BICEPS]
+
+# Distinct (muscle mask, pattern flags) labels kept
+LABEL_CACHE_SIZE = 4_096
+
 
 def derive_workout_label(
     muscle_groups: Iterable[MuscleGroup],
@@ -29,6 +48,8 @@ def derive_workout_label(
     5. If regions include both UPPER_BODY and LOWER_BODY -> "Full Body"
     6. If only one major muscle group -> use that label (e.g., "Chest", "Back")
     7. Otherwise -> None
+
+    workout_label() returns the same labels from compiled bitmask tables.
     """
     muscle_groups_list = list(muscle_groups)
     if not muscle_groups_list:
@@ -97,3 +118,59 @@ def derive_workout_label(
 
     # Rule 7: No clear label
     return None
+
+
+def pattern_flags(movement_patterns: Iterable[MovementPattern] | None) -> int:
+    """Return the PUSH/PULL flags of movement patterns (enum members or values)."""
+    flags = 0
+    for pattern in movement_patterns or ():
+        value = getattr(pattern, "value", pattern)
+        if value == MovementPattern.PUSH:
+            flags |= PUSH
+        elif value == MovementPattern.PULL:
+            flags |= PULL
+    return flags
+
+
+@lru_cache(maxsize=LABEL_CACHE_SIZE)
+def workout_label_for_mask(mask: int, flags: int = 0) -> str | None:
+    """
+    Bitmask version of derive_workout_label, memoized by (mask, flags).
+
+    `mask` is a catalog.taxonomy muscle mask and `flags` the pattern_flags()
+    of the movement patterns. The rules and their order are the same.
+    """
+    if not mask:
+        return None
+
+    upper = mask & UPPER_BODY_MASK
+    lower = mask & LOWER_BODY_MASK
+    if flags & PUSH and upper and not lower:
+        return "Push"
+    if flags & PULL and upper and not lower:
+        return "Pull"
+
+    chest, triceps = mask & _CHEST, mask & _TRICEPS
+    back, biceps = mask & _BACK, mask & _BICEPS
+    if chest and triceps and not back and not biceps:
+        return "Chest & Triceps"
+    if back and biceps and not chest and not triceps:
+        return "Back & Biceps"
+
+    if upper and lower:
+        return "Full Body"
+
+    majors = [major for major, bits in MAJOR_GROUP_MASKS.items() if bits & mask]
+    if len(majors) == 1:
+        return majors[0].label
+    return None
+
+
+def workout_label(
+    muscle_groups: Iterable[MuscleGroup],
+    movement_patterns: Iterable[MovementPattern] | None = None,
+) -> str | None:
+    """Return the same label as derive_workout_label, from compiled tables."""
+    return workout_label_for_mask(
+        muscle_mask(muscle_groups), pattern_flags(movement_patterns)
+    )
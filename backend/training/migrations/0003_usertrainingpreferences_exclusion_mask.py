@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:18
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0002_remove_workout_focus_field'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usertrainingpreferences',
+            name='exclusion_mask',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('excluded_equipment_modalities__contains', ['free_weights'])), then=models.Value(1)), default=models.Value(0)), '|', models.Case(models.When(models.Q(('excluded_equipment_modalities__contains', ['machines'])), then=models.Value(2)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('excluded_equipment_modalities__contains', ['cables'])), then=models.Value(4)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('excluded_equipment_modalities__contains', ['bodyweight'])), then=models.Value(8)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('excluded_equipment_modalities__contains', ['bands_suspension'])), then=models.Value(16)), default=models.Value(0))), '|', django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('excluded_equipment_stations__contains', ['rack'])), then=models.Value(256)), default=models.Value(0)), '|', models.Case(models.When(models.Q(('excluded_equipment_stations__contains', ['bench'])), then=models.Value(512)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('excluded_equipment_stations__contains', ['pull_up_bar'])), then=models.Value(1024)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('excluded_equipment_stations__contains', ['dip_station'])), then=models.Value(2048)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('excluded_equipment_stations__contains', ['floor'])), then=models.Value(4096)), default=models.Value(0)))), '|', django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('excluded_equipment_types__contains', ['selectorized'])), then=models.Value(65536)), default=models.Value(0)), '|', models.Case(models.When(models.Q(('excluded_equipment_types__contains', ['plate_loaded'])), then=models.Value(131072)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('excluded_equipment_types__contains', ['smith'])), then=models.Value(262144)), default=models.Value(0)))), '|', django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(models.Q(('excluded_exercise_attributes__contains', ['high_impact'])), then=models.Value(16777216)), default=models.Value(0)), '|', models.Case(models.When(models.Q(('excluded_exercise_attributes__contains', ['overhead'])), then=models.Value(33554432)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('excluded_exercise_attributes__contains', ['spotter_advised'])), then=models.Value(67108864)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('excluded_exercise_attributes__contains', ['technically_complex'])), then=models.Value(134217728)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('excluded_exercise_attributes__contains', ['floor_required'])), then=models.Value(268435456)), default=models.Value(0))), '|', models.Case(models.When(models.Q(('excluded_exercise_attributes__contains', ['high_joint_stress'])), then=models.Value(536870912)), default=models.Value(0)))), output_field=models.BigIntegerField()),
+        ),
+    ]
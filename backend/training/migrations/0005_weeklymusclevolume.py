@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0004_personalrecord'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeeklyMuscleVolume',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week', models.DateField()),
+                ('muscle_group', models.CharField(choices=[('chest', 'Chest'), ('front_delts', 'Front Delts'), ('side_delts', 'Side Delts'), ('triceps', 'Triceps'), ('lats', 'Lats'), ('upper_back', 'Upper Back'), ('rear_delts', 'Rear Delts'), ('biceps', 'Biceps'), ('forearms', 'Forearms'), ('grip', 'Grip'), ('abs', 'Abs'), ('obliques', 'Obliques'), ('lower_back', 'Lower Back'), ('quads', 'Quads'), ('hamstrings', 'Hamstrings'), ('glutes', 'Glutes'), ('calves', 'Calves'), ('shins', 'Shins'), ('feet', 'Feet'), ('hip_flexors', 'Hip Flexors'), ('adductors', 'Adductors'), ('abductors', 'Abductors')], max_length=50)),
+                ('volume_lbs', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('sets', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='weekly_muscle_volumes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'week', 'muscle_group'), name='weekly_muscle_volume_user_week_muscle')],
+            },
+        ),
+    ]
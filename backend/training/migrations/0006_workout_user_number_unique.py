@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def renumber_duplicates(apps, schema_editor) -> None:
+    """Move workouts that repeat a user's workout number after their last one."""
+    Workout = apps.get_model("training", "Workout")
+    duplicates = (
+        Workout.objects.values("user_id", "workout_number")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+    )
+    for row in duplicates:
+        workouts = Workout.objects.filter(user_id=row["user_id"])
+        last = workouts.aggregate(last=Max("workout_number"))["last"]
+        repeated = workouts.filter(workout_number=row["workout_number"]).order_by("id")
+        for offset, workout in enumerate(repeated[1:], start=1):
+            workout.workout_number = last + offset
+            workout.save(update_fields=["workout_number"])
+
+
+class Migration(migrations.Migration):
+    """
+    Make workout numbers unique per user.
+
+    Concurrent generations could read the same last workout number and
+    create two workouts with the next one. Existing repeats keep their
+    earliest workout; the others are renumbered after the user's last.
+    """
+
+    dependencies = [
+        ("training", "0005_weeklymusclevolume"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(renumber_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="workout",
+            constraint=models.UniqueConstraint(
+                fields=("user", "workout_number"), name="workout_user_number_unique"
+            ),
+        ),
+    ]
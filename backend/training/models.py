@@ -2,8 +2,12 @@ from __future__ import annotations
 
 from django.contrib.auth import get_user_model
 from django.contrib.postgres.fields import ArrayField
+from django.core.exceptions import ValidationError
 from django.db import models
 
+from catalog.compatibility import INCOMPATIBLE_EQUIPMENT_MESSAGE, compatibility
+from catalog.enums import MuscleGroup
+from training.bitmasks import exclusion_mask_expression
 from training.enums import (
     EquipmentModality,
     EquipmentStation,
@@ -48,6 +52,13 @@ class UserTrainingPreferences(models.Model):
         blank=True,
     )
 
+    # Every excluded value above as one bit (see training.bitmasks)
+    exclusion_mask = models.GeneratedField(
+        expression=exclusion_mask_expression(),
+        output_field=models.BigIntegerField(),
+        db_persist=True,
+    )
+
     sessions_per_week = models.SmallIntegerField(default=3)
     training_intensity = models.PositiveSmallIntegerField(default=5)
     max_session_mins = models.IntegerField(default=60)
@@ -78,6 +89,13 @@ class Workout(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "workout_number"], name="workout_user_number_unique"
+            ),
+        ]
+
     def __str__(self) -> str:
         return f"Workout #{self.workout_number} - {self.user.email}"
 
@@ -102,6 +120,14 @@ class WorkoutExercise(models.Model):
     def __str__(self) -> str:
         return f"{self.workout} - {self.exercise.name}"
 
+    def clean(self) -> None:
+        """Reject equipment the exercise can't be performed with."""
+        if self.exercise_id is None or self.gym_equipment_id is None:
+            return
+        equipment_id = self.gym_equipment.equipment_id
+        if not compatibility.index().is_compatible(self.exercise_id, equipment_id):
+            raise ValidationError({"gym_equipment": INCOMPATIBLE_EQUIPMENT_MESSAGE})
+
 
 class WorkoutSet(models.Model):
     """A single set within an exercise, with target and actual values."""
@@ -132,3 +158,83 @@ class WorkoutSet(models.Model):
 
     def __str__(self) -> str:
         return f"{self.workout_exercise} - Set {self.set_number}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Values as loaded, so saves can adjust rollups by what changed
+        # (see training.volume)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+
+class PersonalRecord(models.Model):
+    """
+    A user's best performances on an exercise.
+
+    Maintained incrementally from completed sets (see training.records) and
+    rebuilt from history by the rebuild_personal_records command.
+    """
+
+    # Looked up through the (user, exercise) unique index
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="personal_records",
+        db_index=False,
+    )
+    exercise = models.ForeignKey(
+        "catalog.Exercise", on_delete=models.CASCADE, related_name="personal_records"
+    )
+
+    # Epley estimate, weight * (1 + reps / 30)
+    # Wide enough for any weight and rep count a set can hold
+    best_e1rm_lbs = models.DecimalField(max_digits=10, decimal_places=2)
+    heaviest_weight_lbs = models.DecimalField(max_digits=6, decimal_places=2)
+    most_reps = models.PositiveSmallIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "exercise"], name="personal_record_user_exercise"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user.email} - {self.exercise.name}"
+
+
+class WeeklyMuscleVolume(models.Model):
+    """
+    A user's training volume for a muscle group in one ISO week.
+
+    Maintained incrementally from completed sets (see training.volume) and
+    rebuilt from history by the rebuild_weekly_volume command.
+    """
+
+    # Looked up through the (user, week, muscle_group) unique index
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="weekly_muscle_volumes",
+        db_index=False,
+    )
+    # Monday of the ISO week
+    week = models.DateField()
+    muscle_group = models.CharField(max_length=50, choices=MuscleGroup.choices)
+
+    # Weight x reps and sets, secondary muscles weighted down
+    volume_lbs = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    sets = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "week", "muscle_group"],
+                name="weekly_muscle_volume_user_week_muscle",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user.email} - {self.week} - {self.muscle_group}"
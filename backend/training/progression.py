@@ -0,0 +1,250 @@
+"""
+Progressive overload targets computed from set history with NumPy.
+
+Set history is loaded as columnar arrays (one values_list query, converted
+chunk by chunk) sorted by (user, exercise, most recent first). Everything
+after that is vectorized over (user, exercise) groups:
+
+- Each completed set's estimated one-rep max uses Epley's formula,
+  weight * (1 + reps / 30).
+- A group's estimate is the best e1RM among its last WINDOW_SETS sets.
+- If every set in the window reached its target reps, the next target
+  progresses by PROGRESSION_RATE, and by at least one WEIGHT_STEP_LBS over
+  the last weight. If fewer than half did, it deloads by DELOAD_RATE.
+  Otherwise it holds.
+- The target weight for a number of reps inverts Epley's formula and is
+  rounded to the nearest WEIGHT_STEP_LBS. Exercises last done without
+  weight stay at zero.
+
+refresh_scheduled_targets() applies this to the sets of scheduled workouts
+with one UPDATE per batch; training.generator uses it for new workouts.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+
+import numpy as np
+from django.db import connection, transaction
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+from training.enums import WorkoutStatus
+from training.models import WorkoutSet
+
+# Most recent sets per (user, exercise) that count towards the estimate
+WINDOW_SETS = 6
+PROGRESSION_RATE = 0.025
+DELOAD_RATE = 0.10
+WEIGHT_STEP_LBS = 2.5
+ROUNDING_TOLERANCE = 1e-9
+
+# Rows converted to arrays at a time while loading
+LOAD_CHUNK_SIZE = 100_000
+# Rows per UPDATE when writing targets back
+WRITE_BATCH_SIZE = 50_000
+
+HOLD, PROGRESS, DELOAD = 0, 1, -1
+
+
+@dataclass(frozen=True)
+class SetHistory:
+    """Completed sets as columns, sorted by user, exercise, newest first."""
+
+    user_ids: np.ndarray
+    exercise_ids: np.ndarray
+    weights: np.ndarray
+    reps: np.ndarray
+    target_reps: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+
+@dataclass(frozen=True)
+class Estimates:
+    """Per (user, exercise) estimates, sorted by user then exercise."""
+
+    user_ids: np.ndarray
+    exercise_ids: np.ndarray
+    one_rep_max: np.ndarray
+    last_weight: np.ndarray
+    # PROGRESS, HOLD or DELOAD
+    decision: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def lookup(self, user_ids: np.ndarray, exercise_ids: np.ndarray) -> np.ndarray:
+        """Return the row of each (user, exercise) pair, or -1 if unknown."""
+        if not len(self):
+            return np.full(len(user_ids), -1, dtype=np.int64)
+        keys = _pair_keys(self.user_ids, self.exercise_ids)
+        wanted = _pair_keys(np.asarray(user_ids), np.asarray(exercise_ids))
+        rows = np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)
+        return np.where(keys[rows] == wanted, rows, -1)
+
+    def target_weights(self, rows: np.ndarray, reps: np.ndarray) -> np.ndarray:
+        """Return the target weight for `reps` reps of each estimate row."""
+        one_rep_max = self.one_rep_max[rows]
+        last_weight = self.last_weight[rows]
+        decision = self.decision[rows]
+
+        base = one_rep_max / (1 + np.asarray(reps, dtype=np.float64) / 30)
+        progressed = np.maximum(
+            base * (1 + PROGRESSION_RATE), last_weight + WEIGHT_STEP_LBS
+        )
+        weights = np.select(
+            [decision == PROGRESS, decision == DELOAD],
+            [progressed, base * (1 - DELOAD_RATE)],
+            default=base,
+        )
+        # Round half up, tolerating float error on exact halves
+        steps = np.floor(weights / WEIGHT_STEP_LBS + 0.5 + ROUNDING_TOLERANCE)
+        weights = steps * WEIGHT_STEP_LBS
+        return np.where(last_weight > 0, np.maximum(weights, 0), 0)
+
+
+# Structured (user, exercise) keys compare field by field, so they sort and
+# search like the tuples for any 64-bit ids
+PAIR_DTYPE = np.dtype([("user", np.int64), ("exercise", np.int64)])
+
+
+def _pair_keys(user_ids: np.ndarray, exercise_ids: np.ndarray) -> np.ndarray:
+    keys = np.empty(len(user_ids), dtype=PAIR_DTYPE)
+    keys["user"] = user_ids
+    keys["exercise"] = exercise_ids
+    return keys
+
+
+def _chunks(rows: Iterator[tuple], size: int) -> Iterator[list[tuple]]:
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def load_history(
+    user_ids: Iterable[int] | None = None,
+    exercise_ids: Iterable[int] | None = None,
+) -> SetHistory:
+    """Load completed, weighed sets (all users if `user_ids` is None)."""
+    queryset = WorkoutSet.objects.filter(
+        is_completed=True,
+        actual_weight_lbs__isnull=False,
+        actual_reps__isnull=False,
+    )
+    if user_ids is not None:
+        queryset = queryset.filter(workout_exercise__workout__user_id__in=user_ids)
+    if exercise_ids is not None:
+        queryset = queryset.filter(workout_exercise__exercise_id__in=exercise_ids)
+
+    rows = queryset.order_by(
+        "workout_exercise__workout__user_id",
+        "workout_exercise__exercise_id",
+        F("completed_at").desc(nulls_last=True),
+        "-id",
+    ).values_list(
+        "workout_exercise__workout__user_id",
+        "workout_exercise__exercise_id",
+        Cast("actual_weight_lbs", FloatField()),
+        "actual_reps",
+        "target_reps",
+    )
+
+    dtypes = (np.int64, np.int64, np.float64, np.int16, np.int16)
+    columns: list[list[np.ndarray]] = [[] for _ in dtypes]
+    for chunk in _chunks(rows.iterator(chunk_size=10_000), LOAD_CHUNK_SIZE):
+        for values, dtype, column in zip(zip(*chunk), dtypes, columns):
+            column.append(np.fromiter(values, dtype=dtype, count=len(chunk)))
+
+    return SetHistory(
+        *(
+            np.concatenate(column) if column else np.empty(0, dtype=dtype)
+            for column, dtype in zip(columns, dtypes)
+        )
+    )
+
+
+def estimate(history: SetHistory) -> Estimates:
+    """Estimate each (user, exercise) group's one-rep max and next step."""
+    if not len(history):
+        empty = np.empty(0, dtype=np.int64)
+        return Estimates(empty, empty, np.empty(0), np.empty(0), empty)
+
+    keys = _pair_keys(history.user_ids, history.exercise_ids)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    sizes = np.diff(np.r_[starts, len(keys)])
+
+    # Position of each set within its group, newest first
+    positions = np.arange(len(keys)) - np.repeat(starts, sizes)
+    in_window = positions < WINDOW_SETS
+
+    one_rep_max = history.weights * (1 + history.reps / 30)
+    best = np.maximum.reduceat(np.where(in_window, one_rep_max, 0), starts)
+
+    reached = (history.reps >= history.target_reps) & in_window
+    reached_share = np.add.reduceat(reached, starts) / np.minimum(sizes, WINDOW_SETS)
+    decision = np.select(
+        [reached_share >= 1, reached_share < 0.5], [PROGRESS, DELOAD], default=HOLD
+    )
+
+    return Estimates(
+        user_ids=history.user_ids[starts],
+        exercise_ids=history.exercise_ids[starts],
+        one_rep_max=best,
+        last_weight=history.weights[starts],
+        decision=decision,
+    )
+
+
+def refresh_scheduled_targets(user_ids: Iterable[int] | None = None) -> int:
+    """
+    Recompute target weights of the sets of scheduled workouts.
+
+    Covers all users if `user_ids` is None. Sets of exercises without history
+    keep their targets. Returns the number of sets updated.
+    """
+    if user_ids is not None:
+        user_ids = list(user_ids)
+    estimates = estimate(load_history(user_ids))
+
+    scheduled = WorkoutSet.objects.filter(
+        workout_exercise__workout__status=WorkoutStatus.SCHEDULED,
+        is_completed=False,
+    )
+    if user_ids is not None:
+        scheduled = scheduled.filter(workout_exercise__workout__user_id__in=user_ids)
+    rows = scheduled.values_list(
+        "id",
+        "workout_exercise__workout__user_id",
+        "workout_exercise__exercise_id",
+        "target_reps",
+    )
+
+    updated = 0
+    for chunk in _chunks(rows.iterator(chunk_size=10_000), WRITE_BATCH_SIZE):
+        set_ids, users, exercises, reps = (np.array(column) for column in zip(*chunk))
+        matches = estimates.lookup(users, exercises)
+        known = matches >= 0
+        weights = estimates.target_weights(matches[known], reps[known])
+        updated += _write_target_weights(set_ids[known], weights)
+    return updated
+
+
+@transaction.atomic
+def _write_target_weights(set_ids: np.ndarray, weights: np.ndarray) -> int:
+    if not len(set_ids):
+        return 0
+    table = WorkoutSet._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {table} AS s
+            SET target_weight_lbs = t.weight
+            FROM unnest(%s::bigint[], %s::numeric[]) AS t(id, weight)
+            WHERE s.id = t.id AND s.target_weight_lbs <> t.weight
+            """,
+            [set_ids.tolist(), weights.round(2).tolist()],
+        )
+        return cursor.rowcount
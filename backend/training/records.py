@@ -0,0 +1,97 @@
+"""
+Personal records per (user, exercise).
+
+PersonalRecord rows are maintained incrementally: when a set is saved as
+completed, one INSERT ... ON CONFLICT statement folds it into the user's
+record for the exercise with GREATEST(), so reading a user's records is a
+single lookup on the (user, exercise) index instead of MAX() aggregates over
+the WorkoutSet -> WorkoutExercise -> Workout join.
+
+Records only ever grow incrementally. Corrections that lower a logged set,
+un-completed or deleted sets, and bulk updates that bypass save() are picked
+up by rebuild_personal_records() (the rebuild_personal_records command),
+which recomputes records from history for a chunk of users at a time.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from django.db import connection, transaction
+
+from training.models import PersonalRecord, Workout, WorkoutExercise, WorkoutSet
+
+# Completed, weighed sets as (user, exercise, e1RM, weight, reps), joined to
+# their workouts; callers add a WHERE clause on `s` or `w`
+_SETS_SQL = f"""
+    SELECT w.user_id,
+           we.exercise_id,
+           round(s.actual_weight_lbs * (1 + s.actual_reps / 30.0), 2) AS e1rm,
+           s.actual_weight_lbs AS weight,
+           s.actual_reps AS reps
+    FROM {WorkoutSet._meta.db_table} AS s
+    JOIN {WorkoutExercise._meta.db_table} AS we ON we.id = s.workout_exercise_id
+    JOIN {Workout._meta.db_table} AS w ON w.id = we.workout_id
+    WHERE s.is_completed
+      AND s.actual_weight_lbs IS NOT NULL
+      AND s.actual_reps IS NOT NULL
+"""
+
+_COLUMNS = """
+    (user_id, exercise_id, best_e1rm_lbs, heaviest_weight_lbs, most_reps,
+     updated_at)
+"""
+
+
+def record_sets(set_ids: Iterable[int]) -> int:
+    """
+    Fold completed sets into their users' personal records.
+
+    Sets that aren't completed are ignored. Returns the number of records
+    inserted or updated.
+    """
+    set_ids = list(set_ids)
+    if not set_ids:
+        return 0
+    table = PersonalRecord._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} {_COLUMNS}
+            SELECT user_id, exercise_id, max(e1rm), max(weight), max(reps), now()
+            FROM ({_SETS_SQL} AND s.id = ANY(%s)) AS sets
+            GROUP BY user_id, exercise_id
+            ON CONFLICT (user_id, exercise_id) DO UPDATE SET
+                best_e1rm_lbs = GREATEST(
+                    {table}.best_e1rm_lbs, EXCLUDED.best_e1rm_lbs
+                ),
+                heaviest_weight_lbs = GREATEST(
+                    {table}.heaviest_weight_lbs, EXCLUDED.heaviest_weight_lbs
+                ),
+                most_reps = GREATEST({table}.most_reps, EXCLUDED.most_reps),
+                updated_at = EXCLUDED.updated_at
+            WHERE EXCLUDED.best_e1rm_lbs > {table}.best_e1rm_lbs
+               OR EXCLUDED.heaviest_weight_lbs > {table}.heaviest_weight_lbs
+               OR EXCLUDED.most_reps > {table}.most_reps
+            """,
+            [set_ids],
+        )
+        return cursor.rowcount
+
+
+@transaction.atomic
+def rebuild_personal_records(user_ids: Iterable[int]) -> int:
+    """Recompute the users' records from their history; return the count."""
+    user_ids = list(user_ids)
+    PersonalRecord.objects.filter(user_id__in=user_ids).delete()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {PersonalRecord._meta.db_table} {_COLUMNS}
+            SELECT user_id, exercise_id, max(e1rm), max(weight), max(reps), now()
+            FROM ({_SETS_SQL} AND w.user_id = ANY(%s)) AS sets
+            GROUP BY user_id, exercise_id
+            """,
+            [user_ids],
+        )
+        return cursor.rowcount
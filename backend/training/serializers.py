@@ -8,7 +8,36 @@ from training.enums import (
     EquipmentType,
     ExerciseAttribute,
 )
-from training.models import UserTrainingPreferences
+from training.models import (
+    PersonalRecord,
+    UserTrainingPreferences,
+    Workout,
+    WorkoutExercise,
+    WorkoutSet,
+)
+from training.volume import LEVELS
+
+DEFAULT_VOLUME_WEEKS = 12
+MAX_VOLUME_WEEKS = 520
+DEFAULT_HISTORY_LIMIT = 20
+MAX_HISTORY_LIMIT = 100
+
+# Valid values for each exclusion list, built once at import
+EQUIPMENT_MODALITIES = frozenset(EquipmentModality.values)
+EQUIPMENT_STATIONS = frozenset(EquipmentStation.values)
+EQUIPMENT_TYPES = frozenset(EquipmentType.values)
+EXERCISE_ATTRIBUTES = frozenset(ExerciseAttribute.values)
+
+
+def _validate_choices(
+    value: list[str], valid_choices: frozenset[str], label: str
+) -> list[str]:
+    """Raise ValidationError for the first item not in `valid_choices`."""
+    invalid = set(value) - valid_choices
+    if invalid:
+        item = next(item for item in value if item in invalid)
+        raise serializers.ValidationError(f"'{item}' is not a valid {label}.")
+    return value
 
 
 class TrainingPreferencesSerializer(serializers.ModelSerializer):
@@ -55,40 +84,146 @@ class TrainingPreferencesSerializer(serializers.ModelSerializer):
 
     def validate_excluded_equipment_modalities(self, value: list[str]) -> list[str]:
         """Validate excluded_equipment_modalities contains valid choices."""
-        valid_choices = {choice[0] for choice in EquipmentModality.choices}
-        for item in value:
-            if item not in valid_choices:
-                raise serializers.ValidationError(
-                    f"'{item}' is not a valid equipment modality."
-                )
-        return value
+        return _validate_choices(value, EQUIPMENT_MODALITIES, "equipment modality")
 
     def validate_excluded_equipment_stations(self, value: list[str]) -> list[str]:
         """Validate excluded_equipment_stations contains valid choices."""
-        valid_choices = {choice[0] for choice in EquipmentStation.choices}
-        for item in value:
-            if item not in valid_choices:
-                raise serializers.ValidationError(
-                    f"'{item}' is not a valid equipment station."
-                )
-        return value
+        return _validate_choices(value, EQUIPMENT_STATIONS, "equipment station")
 
     def validate_excluded_equipment_types(self, value: list[str]) -> list[str]:
         """Validate excluded_equipment_types contains valid choices."""
-        valid_choices = {choice[0] for choice in EquipmentType.choices}
-        for item in value:
-            if item not in valid_choices:
-                raise serializers.ValidationError(
-                    f"'{item}' is not a valid equipment type."
-                )
-        return value
+        return _validate_choices(value, EQUIPMENT_TYPES, "equipment type")
 
     def validate_excluded_exercise_attributes(self, value: list[str]) -> list[str]:
         """Validate excluded_exercise_attributes contains valid choices."""
-        valid_choices = {choice[0] for choice in ExerciseAttribute.choices}
-        for item in value:
-            if item not in valid_choices:
-                raise serializers.ValidationError(
-                    f"'{item}' is not a valid exercise attribute."
-                )
-        return value
+        return _validate_choices(value, EXERCISE_ATTRIBUTES, "exercise attribute")
+
+
+class WorkoutSetSerializer(serializers.ModelSerializer):
+    """Serializer for WorkoutSet model."""
+
+    class Meta:
+        model = WorkoutSet
+        fields = [
+            "id",
+            "set_number",
+            "target_weight_lbs",
+            "target_reps",
+            "rest_seconds",
+            "actual_weight_lbs",
+            "actual_reps",
+            "is_completed",
+            "completed_at",
+        ]
+        read_only_fields = fields
+
+
+class WorkoutExerciseSerializer(serializers.ModelSerializer):
+    """Serializer for WorkoutExercise model, with its sets."""
+
+    exercise_name = serializers.CharField(source="exercise.name", read_only=True)
+    sets = WorkoutSetSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = WorkoutExercise
+        fields = [
+            "id",
+            "exercise",
+            "exercise_name",
+            "gym_equipment",
+            "order",
+            "sets",
+        ]
+        read_only_fields = fields
+
+
+class WorkoutSerializer(serializers.ModelSerializer):
+    """Serializer for Workout model, with its exercises and sets."""
+
+    exercises = WorkoutExerciseSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Workout
+        fields = [
+            "id",
+            "workout_number",
+            "status",
+            "started_at",
+            "completed_at",
+            "created_at",
+            "exercises",
+        ]
+        read_only_fields = fields
+
+
+class PersonalRecordSerializer(serializers.ModelSerializer):
+    """Serializer for PersonalRecord model."""
+
+    exercise_name = serializers.CharField(source="exercise.name", read_only=True)
+
+    class Meta:
+        model = PersonalRecord
+        fields = [
+            "exercise",
+            "exercise_name",
+            "best_e1rm_lbs",
+            "heaviest_weight_lbs",
+            "most_reps",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
+class WeeklyVolumeSerializer(serializers.Serializer):
+    """Serializer for one group's volume in a week (see training.volume)."""
+
+    week = serializers.DateField()
+    group = serializers.CharField()
+    volume_lbs = serializers.DecimalField(max_digits=14, decimal_places=2)
+    sets = serializers.DecimalField(max_digits=8, decimal_places=2)
+
+
+class WeeklyVolumeQuerySerializer(serializers.Serializer):
+    """Query parameters of the weekly volume endpoint."""
+
+    level = serializers.ChoiceField(choices=list(LEVELS), default="major_group")
+    weeks = serializers.IntegerField(
+        min_value=1, max_value=MAX_VOLUME_WEEKS, default=DEFAULT_VOLUME_WEEKS
+    )
+
+
+class WorkoutSummarySerializer(serializers.ModelSerializer):
+    """
+    Serializer for a Workout in the user's history, with its label.
+
+    Labels are computed for the whole page with training.labels and passed
+    in the "labels" context, keyed by workout id.
+    """
+
+    label = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Workout
+        fields = [
+            "id",
+            "workout_number",
+            "status",
+            "label",
+            "started_at",
+            "completed_at",
+            "created_at",
+        ]
+        read_only_fields = fields
+
+    def get_label(self, workout: Workout) -> str | None:
+        """Return the workout's label from the "labels" context."""
+        return self.context["labels"].get(workout.pk)
+
+
+class WorkoutHistoryQuerySerializer(serializers.Serializer):
+    """Query parameters of the workout history endpoint."""
+
+    limit = serializers.IntegerField(
+        min_value=1, max_value=MAX_HISTORY_LIMIT, default=DEFAULT_HISTORY_LIMIT
+    )
+    offset = serializers.IntegerField(min_value=0, default=0)
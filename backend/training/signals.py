@@ -1,10 +1,24 @@
 from __future__ import annotations
 
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
-from training.models import UserTrainingPreferences
+from catalog.compatibility import compatibility_changed
+from catalog.models import Equipment, Exercise
+from catalog.signals import links_unchanged
+from gym.models import GymEquipment
+from training.caches import invalidate_preferences
+from training.eligibility import eligibility
+from training.models import UserTrainingPreferences, WorkoutSet
+from training.records import record_sets
+from training.volume import (
+    apply_contributions,
+    contribution,
+    current_values,
+    loaded_values,
+)
 
 User = get_user_model()
 
@@ -21,3 +35,88 @@ def create_user_training_preferences(
         UserTrainingPreferences.objects.create(user=instance)
 
 
+@receiver(post_save, sender=WorkoutSet)
+def update_personal_records(
+    sender: type[WorkoutSet],
+    instance: WorkoutSet,
+    **kwargs: dict,
+) -> None:
+    """Fold a completed set into the user's personal record."""
+    if instance.is_completed:
+        record_sets([instance.pk])
+
+
+@receiver(post_save, sender=WorkoutSet)
+def update_weekly_volume(
+    sender: type[WorkoutSet],
+    instance: WorkoutSet,
+    **kwargs: dict,
+) -> None:
+    """Move the set's contribution to the weekly volume rollups."""
+    loaded = loaded_values(instance)
+    current = current_values(instance)
+    before = contribution(loaded) if loaded is not None else None
+    after = contribution(current)
+    if before != after:
+        apply_contributions(
+            added=[after] if after else [], removed=[before] if before else []
+        )
+    # Later saves of this instance start from what was just stored
+    instance._loaded_values = current
+
+
+@receiver(post_delete, sender=WorkoutSet)
+def remove_weekly_volume(
+    sender: type[WorkoutSet],
+    instance: WorkoutSet,
+    **kwargs: dict,
+) -> None:
+    """Remove a deleted set's contribution from the weekly volume rollups."""
+    stored = contribution(loaded_values(instance) or current_values(instance))
+    if stored:
+        apply_contributions(removed=[stored])
+
+
+@receiver(post_save, sender=UserTrainingPreferences)
+@receiver(post_delete, sender=UserTrainingPreferences)
+def invalidate_cached_preferences(
+    sender: type[UserTrainingPreferences],
+    instance: UserTrainingPreferences,
+    **kwargs: dict,
+) -> None:
+    """
+    Drop cached preferences data when the row changes.
+
+    Dropped again on commit, so a concurrent GET that cached the old row
+    before the write committed doesn't keep serving it.
+    """
+    user_id = instance.user_id
+    invalidate_preferences(user_id)
+    transaction.on_commit(lambda: invalidate_preferences(user_id))
+
+
+@receiver(post_save, sender=Exercise)
+@receiver(post_delete, sender=Exercise)
+@receiver(post_save, sender=Equipment)
+@receiver(post_delete, sender=Equipment)
+@receiver(m2m_changed, sender=Exercise.equipment.through)
+@receiver(compatibility_changed)
+def invalidate_eligibility_on_catalog_change(sender: type, **kwargs: dict) -> None:
+    """Drop the eligibility indexes when the exercise catalog changes."""
+    if links_unchanged(kwargs):
+        return
+    eligibility.invalidate_catalog()
+    transaction.on_commit(eligibility.invalidate_catalog)
+
+
+@receiver(post_save, sender=GymEquipment)
+@receiver(post_delete, sender=GymEquipment)
+def invalidate_eligibility_on_inventory_change(
+    sender: type[GymEquipment],
+    instance: GymEquipment,
+    **kwargs: dict,
+) -> None:
+    """Drop the gym's eligibility index when its inventory changes."""
+    gym_id = instance.gym_id
+    eligibility.invalidate_gym(gym_id)
+    transaction.on_commit(lambda: eligibility.invalidate_gym(gym_id))
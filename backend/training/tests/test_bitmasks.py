@@ -0,0 +1,125 @@
+"""
+Tests for the bitmask encoding of equipment traits and exercise attributes.
+
+These tests verify:
+- Every enum value owns a distinct bit inside its enum's block
+- Existing bit positions never move
+- Generated mask columns match the masks computed in Python
+- exclude_masked() filters rows with a single bitwise AND
+"""
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from catalog.models import Equipment, Exercise
+from training.bitmasks import (
+    BITS,
+    GROUP_OFFSETS,
+    GROUP_WIDTH,
+    exclude_masked,
+    is_excluded,
+    mask_for,
+    preferences_exclusion_mask,
+)
+from training.enums import (
+    EquipmentModality,
+    EquipmentStation,
+    EquipmentType,
+    ExerciseAttribute,
+)
+from training.models import UserTrainingPreferences
+
+User = get_user_model()
+
+
+class BitLayoutTests(SimpleTestCase):
+    """Tests for the bit layout."""
+
+    def test_every_value_has_a_distinct_bit(self) -> None:
+        """Test each value maps to one bit within its enum's block."""
+        for enum, offset in GROUP_OFFSETS.items():
+            for member in enum:
+                bit = BITS[member.value]
+                self.assertEqual(bit.bit_count(), 1)
+                self.assertTrue(1 << offset <= bit < 1 << (offset + GROUP_WIDTH))
+        self.assertEqual(len(set(BITS.values())), len(BITS))
+
+    def test_positions_are_stable(self) -> None:
+        """Test stored masks keep their meaning (append new members only)."""
+        self.assertEqual(BITS[EquipmentModality.FREE_WEIGHTS], 1 << 0)
+        self.assertEqual(BITS[EquipmentModality.BANDS_SUSPENSION], 1 << 4)
+        self.assertEqual(BITS[EquipmentStation.RACK], 1 << 8)
+        self.assertEqual(BITS[EquipmentStation.FLOOR], 1 << 12)
+        self.assertEqual(BITS[EquipmentType.SELECTORIZED], 1 << 16)
+        self.assertEqual(BITS[EquipmentType.SMITH], 1 << 18)
+        self.assertEqual(BITS[ExerciseAttribute.HIGH_IMPACT], 1 << 24)
+        self.assertEqual(BITS[ExerciseAttribute.HIGH_JOINT_STRESS], 1 << 29)
+
+    def test_mask_for(self) -> None:
+        """Test masks combine bits and treat None as empty."""
+        mask = mask_for([EquipmentModality.CABLES, ExerciseAttribute.OVERHEAD])
+
+        self.assertEqual(
+            mask, BITS[EquipmentModality.CABLES] | BITS[ExerciseAttribute.OVERHEAD]
+        )
+        self.assertEqual(mask_for(None), 0)
+        self.assertTrue(is_excluded(BITS[EquipmentModality.CABLES], mask))
+        self.assertFalse(is_excluded(BITS[EquipmentModality.MACHINES], mask))
+
+
+class GeneratedMaskTests(TestCase):
+    """Tests for the generated mask columns."""
+
+    def test_preferences_exclusion_mask(self) -> None:
+        """Test exclusion_mask covers all four exclusion arrays."""
+        user = User.objects.create_user(email="test@example.com")
+        preferences = UserTrainingPreferences.objects.get(user=user)
+        preferences.excluded_equipment_modalities = [EquipmentModality.MACHINES]
+        preferences.excluded_equipment_stations = [EquipmentStation.BENCH]
+        preferences.excluded_equipment_types = [EquipmentType.SMITH]
+        preferences.excluded_exercise_attributes = [
+            ExerciseAttribute.OVERHEAD,
+            ExerciseAttribute.HIGH_IMPACT,
+        ]
+        preferences.save()
+        preferences.refresh_from_db()
+
+        self.assertEqual(
+            preferences.exclusion_mask, preferences_exclusion_mask(preferences)
+        )
+        self.assertEqual(preferences.exclusion_mask.bit_count(), 5)
+
+    def test_equipment_and_exercise_masks(self) -> None:
+        """Test trait_mask and attribute_mask match the Python encoding."""
+        equipment = Equipment.objects.create(
+            name="Smith Machine",
+            brand="Acme",
+            modality=EquipmentModality.MACHINES,
+            station=None,
+            equipment_type=EquipmentType.SMITH,
+        )
+        exercise = Exercise.objects.create(name="Plank", attributes=None)
+        equipment.refresh_from_db()
+        exercise.refresh_from_db()
+
+        self.assertEqual(
+            equipment.trait_mask,
+            mask_for([EquipmentModality.MACHINES, EquipmentType.SMITH]),
+        )
+        self.assertEqual(exercise.attribute_mask, 0)
+
+    def test_exclude_masked(self) -> None:
+        """Test rows sharing a bit with the exclusion mask are filtered in SQL."""
+        Exercise.objects.create(name="Jump Squat", attributes=["high_impact"])
+        Exercise.objects.create(name="Press", attributes=["overhead"])
+        Exercise.objects.create(name="Curl", attributes=[])
+
+        remaining = exclude_masked(
+            Exercise.objects.all(),
+            "attribute_mask",
+            mask_for([ExerciseAttribute.HIGH_IMPACT, EquipmentModality.CABLES]),
+        )
+
+        self.assertEqual(
+            sorted(remaining.values_list("name", flat=True)), ["Curl", "Press"]
+        )
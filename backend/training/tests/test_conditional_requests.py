@@ -0,0 +1,118 @@
+"""
+Tests for ETag revalidation of the training preferences endpoint.
+
+These tests verify:
+- A matching If-None-Match returns 304 from the cached version without queries
+- Updating preferences changes the ETag
+- Users without a preferences row get a plain 200
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from account.caches import user_cache
+from training.caches import preferences_cache
+from training.models import UserTrainingPreferences
+
+User = get_user_model()
+
+
+@override_settings(
+    # Use a simple secret key for testing
+    SECRET_KEY="test-secret-key-for-testing-only",
+    # Disable secure cookies for testing
+    JWT_COOKIE_SECURE=False,
+)
+class PreferencesConditionalGetTests(TestCase):
+    """Tests for conditional GET on /api/preferences/training/."""
+
+    url = "/api/preferences/training/"
+
+    def setUp(self) -> None:
+        user_cache.clear()
+        preferences_cache.clear()
+        self.user = User.objects.create_user(email="test@example.com")
+        self.client = APIClient()
+        self.client.cookies[settings.JWT_ACCESS_COOKIE_NAME] = str(
+            AccessToken.for_user(self.user)
+        )
+
+    def test_matching_etag_returns_304_without_queries(self) -> None:
+        """Test revalidation is answered from the cached version."""
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_put_changes_etag(self) -> None:
+        """Test updating preferences invalidates the cached version."""
+        etag = self.client.get(self.url)["ETag"]
+        data = {**self.client.get(self.url).data, "sessions_per_week": 5}
+
+        put = self.client.put(self.url, data, format="json")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(put.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["sessions_per_week"], 5)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_missing_preferences_skip_etag(self) -> None:
+        """Test a user without a preferences row gets a plain 200."""
+        UserTrainingPreferences.objects.filter(user=self.user).delete()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='W/"stale"')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+@override_settings(
+    SECRET_KEY="test-secret-key-for-testing-only",
+    JWT_COOKIE_SECURE=False,
+)
+class PreferencesReadPathTests(TestCase):
+    """Tests for serving preferences GETs from the cache without writes."""
+
+    url = "/api/preferences/training/"
+
+    def setUp(self) -> None:
+        user_cache.clear()
+        preferences_cache.clear()
+        self.user = User.objects.create_user(email="test@example.com")
+        self.client = APIClient()
+        self.client.cookies[settings.JWT_ACCESS_COOKIE_NAME] = str(
+            AccessToken.for_user(self.user)
+        )
+
+    def test_get_is_a_single_read(self) -> None:
+        """Test a cold GET runs one SELECT and a warm GET runs none."""
+        self.client.get("/api/auth/me/")  # warm the auth snapshot
+
+        with self.assertNumQueries(1) as context:
+            self.client.get(self.url)
+        self.assertTrue(context.captured_queries[0]["sql"].startswith("SELECT"))
+        self.assertNotIn("FOR UPDATE", context.captured_queries[0]["sql"])
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_missing_row_cached_until_put(self) -> None:
+        """Test defaults are cached for users without a row until they PUT."""
+        UserTrainingPreferences.objects.filter(user=self.user).delete()
+        data = dict(self.client.get(self.url).data)
+
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+        data["training_intensity"] = 8
+        self.client.put(self.url, data, format="json")
+
+        self.assertEqual(self.client.get(self.url).data["training_intensity"], 8)
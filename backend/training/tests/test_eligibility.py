@@ -0,0 +1,294 @@
+"""
+Tests for the exercise eligibility engine and endpoint.
+
+These tests verify:
+- Exercises need compatible equipment at the gym unless they need none
+- Equipment excluded by modality, station or type doesn't count
+- Exercises with excluded attributes are never eligible
+- Users without a gym only get exercises that need no equipment
+- Inventory and catalog changes invalidate the cached indexes
+- The catalog index is built from the catalog map without queries, and
+  rebuilt when the map is replaced
+- The endpoint lists the authenticated user's eligible exercises
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from account.caches import user_cache
+from catalog.mapped import build_catalog_map, catalog_map
+from catalog.models import Equipment, Exercise
+from gym.inventory import inventory_cache
+from gym.models import Gym, GymEquipment
+from training.bitmasks import mask_for
+from training.caches import preferences_cache
+from training.eligibility import eligibility, is_exercise_eligible
+from training.enums import (
+    EquipmentModality,
+    EquipmentStation,
+    EquipmentType,
+    ExerciseAttribute,
+)
+from training.models import UserTrainingPreferences
+
+User = get_user_model()
+
+
+def create_gym(name: str) -> Gym:
+    return Gym.objects.create(
+        name=name,
+        street_address="1 Main St",
+        city="Portland",
+        state_province="OR",
+        postal_code="97201",
+        country="US",
+    )
+
+
+class EligibilityTestCase(TestCase):
+    """Base test case with a small catalog and two gyms."""
+
+    def setUp(self) -> None:
+        eligibility.invalidate_catalog()
+        inventory_cache.clear()
+        self.barbell = Equipment.objects.create(
+            name="Barbell",
+            brand="Acme",
+            modality=EquipmentModality.FREE_WEIGHTS,
+            station=EquipmentStation.RACK,
+            equipment_type=EquipmentType.PLATE_LOADED,
+        )
+        self.cable = Equipment.objects.create(
+            name="Cable Stack",
+            brand="Acme",
+            modality=EquipmentModality.CABLES,
+            equipment_type=EquipmentType.SELECTORIZED,
+        )
+        self.smith = Equipment.objects.create(
+            name="Smith Machine",
+            brand="Acme",
+            modality=EquipmentModality.MACHINES,
+            equipment_type=EquipmentType.SMITH,
+        )
+
+        self.squat = Exercise.objects.create(
+            name="Squat", attributes=[ExerciseAttribute.SPOTTER_ADVISED]
+        )
+        self.squat.equipment.set([self.barbell, self.smith])
+        self.fly = Exercise.objects.create(name="Cable Fly")
+        self.fly.equipment.set([self.cable])
+        self.push_up = Exercise.objects.create(
+            name="Push-up", attributes=[ExerciseAttribute.FLOOR_REQUIRED]
+        )
+        self.box_jump = Exercise.objects.create(
+            name="Box Jump", attributes=[ExerciseAttribute.HIGH_IMPACT]
+        )
+
+        self.gym_a = create_gym("Gym A")
+        self.gym_b = create_gym("Gym B")
+        GymEquipment.objects.create(
+            gym=self.gym_a, equipment=self.barbell, equipment_display_number="1"
+        )
+        GymEquipment.objects.create(
+            gym=self.gym_a, equipment=self.cable, equipment_display_number="2"
+        )
+        GymEquipment.objects.create(
+            gym=self.gym_b, equipment=self.smith, equipment_display_number="1"
+        )
+
+    def eligible_names(self, gym: Gym | None, excluded: list[str]) -> set[str]:
+        gym_id = gym.pk if gym else None
+        ids = eligibility.eligible_exercise_ids(gym_id, mask_for(excluded))
+        return set(Exercise.objects.filter(id__in=ids).values_list("name", flat=True))
+
+
+class EligibilityEngineTests(EligibilityTestCase):
+    """Tests for EligibilityEngine."""
+
+    def test_gym_inventory(self) -> None:
+        """Test exercises need compatible equipment present at the gym."""
+        self.assertEqual(
+            self.eligible_names(self.gym_a, []),
+            {"Squat", "Cable Fly", "Push-up", "Box Jump"},
+        )
+        self.assertEqual(
+            self.eligible_names(self.gym_b, []), {"Squat", "Push-up", "Box Jump"}
+        )
+
+    def test_excluded_equipment_traits(self) -> None:
+        """Test equipment with an excluded trait can't be used."""
+        self.assertNotIn(
+            "Squat", self.eligible_names(self.gym_a, [EquipmentModality.FREE_WEIGHTS])
+        )
+        self.assertNotIn(
+            "Squat", self.eligible_names(self.gym_a, [EquipmentStation.RACK])
+        )
+        self.assertNotIn("Squat", self.eligible_names(self.gym_b, [EquipmentType.SMITH]))
+        self.assertIn(
+            "Cable Fly",
+            self.eligible_names(self.gym_a, [EquipmentModality.FREE_WEIGHTS]),
+        )
+
+    def test_excluded_attributes(self) -> None:
+        """Test exercises with an excluded attribute are dropped everywhere."""
+        self.assertEqual(
+            self.eligible_names(
+                self.gym_a,
+                [ExerciseAttribute.HIGH_IMPACT, ExerciseAttribute.SPOTTER_ADVISED],
+            ),
+            {"Cable Fly", "Push-up"},
+        )
+
+    def test_no_gym(self) -> None:
+        """Test users without a gym get exercises that need no equipment."""
+        self.assertEqual(self.eligible_names(None, []), {"Push-up", "Box Jump"})
+
+    def test_inventory_change_invalidates_gym(self) -> None:
+        """Test adding equipment to a gym is reflected immediately."""
+        excluded = [EquipmentModality.FREE_WEIGHTS]
+        self.assertNotIn("Squat", self.eligible_names(self.gym_a, excluded))
+
+        GymEquipment.objects.create(
+            gym=self.gym_a, equipment=self.smith, equipment_display_number="3"
+        )
+
+        self.assertIn("Squat", self.eligible_names(self.gym_a, excluded))
+
+    def test_catalog_change_invalidates_index(self) -> None:
+        """Test new exercises and equipment links are picked up."""
+        self.eligible_names(self.gym_b, [])
+        row = Exercise.objects.create(name="Cable Row")
+
+        self.assertIn("Cable Row", self.eligible_names(self.gym_b, []))
+
+        row.equipment.add(self.cable)
+
+        self.assertNotIn("Cable Row", self.eligible_names(self.gym_b, []))
+
+    def test_cached_queries(self) -> None:
+        """Test repeated questions are answered without queries."""
+        mask = mask_for([ExerciseAttribute.HIGH_IMPACT])
+        eligibility.eligible_bits(self.gym_a.pk, mask)
+        eligibility.eligible_bits(self.gym_b.pk, 0)
+
+        with self.assertNumQueries(0):
+            eligibility.eligible_bits(self.gym_a.pk, mask)
+            eligibility.eligible_bits(self.gym_a.pk, 0)
+            self.assertTrue(eligibility.is_eligible(self.gym_a.pk, 0, self.squat.pk))
+            self.assertFalse(eligibility.is_eligible(self.gym_b.pk, 0, self.fly.pk))
+
+
+class CatalogMapEligibilityTests(EligibilityTestCase):
+    """Tests for building the catalog index from the catalog map."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        settings_override = override_settings(
+            CATALOG_MAP={
+                **settings.CATALOG_MAP,
+                "PATH": Path(directory) / "catalog.map",
+                "BACKGROUND_REBUILD": False,
+            }
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # Check the file on every get()
+        patcher = mock.patch.object(catalog_map, "check_seconds", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(catalog_map.clear)
+        self.addCleanup(eligibility.invalidate_catalog)
+        # The fixture's changes were never committed; forget them
+        catalog_map.refresh()
+        catalog_map.clear()
+
+    def test_matches_database_index(self) -> None:
+        """Test the map answers like the database without a catalog query."""
+        profiles = [
+            [],
+            [EquipmentModality.FREE_WEIGHTS],
+            [ExerciseAttribute.HIGH_IMPACT],
+        ]
+        gyms = [self.gym_a, self.gym_b, None]
+        expected = [self.eligible_names(g, p) for g in gyms for p in profiles]
+
+        build_catalog_map()
+        eligibility.invalidate_catalog()
+        inventory_cache.clear()
+
+        # The gym's inventory only
+        with self.assertNumQueries(1):
+            eligibility.eligible_bits(self.gym_a.pk, 0)
+        self.assertEqual(eligibility.catalog().version, catalog_map.get().version)
+        self.assertEqual(
+            [self.eligible_names(g, p) for g in gyms for p in profiles], expected
+        )
+
+    def test_rebuilds_when_map_replaced(self) -> None:
+        """Test a map rebuilt by another process replaces the index."""
+        build_catalog_map()
+        self.assertNotIn("Cable Row", self.eligible_names(self.gym_b, []))
+
+        # Sends no signals, as if written by another process
+        Exercise.objects.bulk_create([Exercise(name="Cable Row")])
+        build_catalog_map()
+
+        self.assertIn("Cable Row", self.eligible_names(self.gym_b, []))
+
+
+@override_settings(
+    # Use a simple secret key for testing
+    SECRET_KEY="test-secret-key-for-testing-only",
+    # Disable secure cookies for testing
+    JWT_COOKIE_SECURE=False,
+)
+class EligibleExercisesAPITests(EligibilityTestCase):
+    """Tests for GET /api/exercises/eligible/."""
+
+    url = "/api/exercises/eligible/"
+
+    def setUp(self) -> None:
+        super().setUp()
+        user_cache.clear()
+        preferences_cache.clear()
+        self.user = User.objects.create_user(email="test@example.com", gym=self.gym_b)
+        UserTrainingPreferences.objects.filter(user=self.user).update(
+            excluded_exercise_attributes=[ExerciseAttribute.HIGH_IMPACT]
+        )
+        self.client = APIClient()
+        self.client.cookies[settings.JWT_ACCESS_COOKIE_NAME] = str(
+            AccessToken.for_user(self.user)
+        )
+
+    def test_lists_eligible_exercises(self) -> None:
+        """Test the user's gym and exclusions are applied."""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["gym"], self.gym_b.pk)
+        self.assertEqual(
+            response.data["results"],
+            [
+                {"id": self.squat.pk, "name": "Squat"},
+                {"id": self.push_up.pk, "name": "Push-up"},
+            ],
+        )
+        self.assertTrue(is_exercise_eligible(self.user, self.squat.pk))
+        self.assertFalse(is_exercise_eligible(self.user, self.box_jump.pk))
+
+    def test_requires_authentication(self) -> None:
+        """Test the endpoint requires authentication."""
+        response = APIClient().get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,389 @@
+"""
+Tests for automatic workout generation.
+
+These tests verify:
+- Workouts fit max_session_mins and follow training_intensity
+- Only eligible exercises and non-excluded gym equipment are used
+- Target weights continue from the user's last completed sets
+- generate_week tops scheduled workouts up to sessions_per_week
+- Concurrent generations for one user take consecutive workout numbers
+- The generate endpoint and pregenerate_workouts command
+"""
+
+import shutil
+import tempfile
+import threading
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from account.caches import user_cache
+from catalog.compatibility import compatibility
+from catalog.enums import MuscleGroup
+from catalog.models import Equipment, Exercise
+from gym.inventory import inventory_cache
+from gym.models import Gym, GymEquipment
+from training.caches import preferences_cache
+from training.eligibility import eligibility
+from training.enums import (
+    EquipmentModality,
+    EquipmentType,
+    ExerciseAttribute,
+    WorkoutStatus,
+)
+from training import generator
+from training.generator import (
+    Prescription,
+    WorkoutGenerationError,
+    generate_week,
+    generate_workout,
+)
+from training.models import UserTrainingPreferences, Workout
+
+User = get_user_model()
+
+
+class GeneratorFixtures:
+    """Creates a gym, a catalog and a user for each test."""
+
+    def setUp(self) -> None:
+        eligibility.invalidate_catalog()
+        compatibility.invalidate()
+        inventory_cache.clear()
+        preferences_cache.clear()
+        user_cache.clear()
+
+        self.gym = Gym.objects.create(
+            name="Gym A",
+            street_address="1 Main St",
+            city="Portland",
+            state_province="OR",
+            postal_code="97201",
+            country="US",
+        )
+        self.dumbbells = Equipment.objects.create(
+            name="Dumbbells",
+            brand="Acme",
+            modality=EquipmentModality.FREE_WEIGHTS,
+            equipment_type=EquipmentType.PLATE_LOADED,
+        )
+        self.cable = Equipment.objects.create(
+            name="Cable Stack",
+            brand="Acme",
+            modality=EquipmentModality.CABLES,
+            equipment_type=EquipmentType.SELECTORIZED,
+        )
+        self.gym_dumbbells = GymEquipment.objects.create(
+            gym=self.gym, equipment=self.dumbbells, equipment_display_number="1"
+        )
+        self.gym_cable = GymEquipment.objects.create(
+            gym=self.gym, equipment=self.cable, equipment_display_number="2"
+        )
+
+        muscles = [
+            MuscleGroup.CHEST,
+            MuscleGroup.LATS,
+            MuscleGroup.QUADS,
+            MuscleGroup.ABS,
+            MuscleGroup.BICEPS,
+            MuscleGroup.GLUTES,
+        ]
+        self.exercises = []
+        for n in range(24):
+            exercise = Exercise.objects.create(
+                name=f"Exercise {n}",
+                primary_muscles=[muscles[n % len(muscles)]],
+                attributes=[ExerciseAttribute.OVERHEAD] if n % 4 == 0 else [],
+            )
+            exercise.equipment.set([self.dumbbells if n % 2 else self.cable])
+            self.exercises.append(exercise)
+
+        self.user = User.objects.create_user(email="test@example.com", gym=self.gym)
+        self.preferences = UserTrainingPreferences.objects.get(user=self.user)
+
+    def set_preferences(self, **fields) -> None:
+        for name, value in fields.items():
+            setattr(self.preferences, name, value)
+        self.preferences.save()
+
+
+class GeneratorTestCase(GeneratorFixtures, TestCase):
+    """Base test case with a gym, a catalog and a user."""
+
+
+class PrescriptionTests(TestCase):
+    """Tests for Prescription."""
+
+    def test_intensity_scales_volume_and_rest(self) -> None:
+        """Test higher intensity means more sets of fewer reps, more rest."""
+        low = Prescription.for_intensity(1)
+        high = Prescription.for_intensity(10)
+
+        self.assertEqual((low.sets, low.reps, low.rest_seconds), (2, 14, 55))
+        self.assertEqual((high.sets, high.reps, high.rest_seconds), (4, 5, 145))
+        self.assertEqual(Prescription.for_intensity(42), high)
+
+
+class GenerateWorkoutTests(GeneratorTestCase):
+    """Tests for generate_workout."""
+
+    def test_fits_the_session(self) -> None:
+        """Test the workout fits max_session_mins and follows intensity."""
+        self.set_preferences(max_session_mins=30, training_intensity=8)
+        prescription = Prescription.for_intensity(8)
+
+        workout = generate_workout(self.user)
+
+        exercises = list(workout.exercises.prefetch_related("sets"))
+        self.assertEqual(workout.workout_number, 1)
+        self.assertTrue(exercises)
+        self.assertLessEqual(len(exercises) * prescription.exercise_seconds, 30 * 60)
+        for workout_exercise in exercises:
+            sets = list(workout_exercise.sets.all())
+            self.assertEqual(len(sets), prescription.sets)
+            self.assertEqual(
+                {(s.target_reps, s.rest_seconds) for s in sets},
+                {(prescription.reps, prescription.rest_seconds)},
+            )
+
+    def test_respects_exclusions(self) -> None:
+        """Test excluded attributes and equipment are never used."""
+        self.set_preferences(
+            max_session_mins=120,
+            excluded_equipment_modalities=[EquipmentModality.CABLES],
+            excluded_exercise_attributes=[ExerciseAttribute.OVERHEAD],
+        )
+
+        workout = generate_workout(self.user)
+
+        for workout_exercise in workout.exercises.select_related("exercise"):
+            self.assertEqual(workout_exercise.gym_equipment_id, self.gym_dumbbells.pk)
+            self.assertNotIn(
+                ExerciseAttribute.OVERHEAD, workout_exercise.exercise.attributes
+            )
+
+    def test_balances_muscle_groups(self) -> None:
+        """Test picks spread over major muscle groups before repeating."""
+        self.set_preferences(max_session_mins=120, training_intensity=1)
+
+        workout = generate_workout(self.user)
+
+        muscles = [
+            workout_exercise.exercise.primary_muscles[0]
+            for workout_exercise in workout.exercises.select_related("exercise")
+        ]
+        self.assertEqual(len(set(muscles[:6])), 6)
+
+    def test_weights_continue_from_history(self) -> None:
+        """Test weights progress after reached reps and deload after misses."""
+        Exercise.objects.exclude(pk__in=[e.pk for e in self.exercises[:2]]).delete()
+        self.set_preferences(max_session_mins=120, training_intensity=1)
+        first = generate_workout(self.user)
+
+        # Starting weights follow the equipment's modality
+        reached, missed = first.exercises.order_by("exercise_id")
+        self.assertEqual(reached.sets.first().target_weight_lbs, Decimal("20"))
+        self.assertEqual(missed.sets.first().target_weight_lbs, Decimal("45"))
+
+        reached.sets.update(
+            is_completed=True,
+            actual_weight_lbs=Decimal("50"),
+            actual_reps=14,
+            completed_at=timezone.now(),
+        )
+        missed.sets.update(
+            is_completed=True,
+            actual_weight_lbs=Decimal("30"),
+            actual_reps=8,
+            completed_at=timezone.now(),
+        )
+
+        second = generate_workout(self.user)
+
+        weights = {
+            workout_exercise.exercise_id: workout_exercise.sets.first().target_weight_lbs
+            for workout_exercise in second.exercises.all()
+        }
+        self.assertEqual(second.workout_number, 2)
+        # 50 lbs x 14 progresses a step; 30 lbs x 8 of 14 deloads
+        self.assertEqual(weights.get(reached.exercise_id), Decimal("52.5"))
+        self.assertEqual(weights.get(missed.exercise_id), Decimal("22.5"))
+
+    def test_warm_generation_query_count(self) -> None:
+        """Test a warm generation needs a handful of queries."""
+        generate_workout(self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            generate_workout(self.user)
+
+        # Lock, number, history, three inserts (plus savepoints)
+        self.assertLessEqual(len(queries), 8)
+
+    def test_workout_numbers_are_unique(self) -> None:
+        """Test a user can't have two workouts with the same number."""
+        workout = generate_workout(self.user)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Workout.objects.create(
+                user=self.user, workout_number=workout.workout_number
+            )
+
+    def test_requires_a_gym(self) -> None:
+        """Test users without a gym get a WorkoutGenerationError."""
+        self.user.gym = None
+        self.user.save()
+
+        with self.assertRaises(WorkoutGenerationError):
+            generate_workout(self.user)
+
+    def test_session_too_short(self) -> None:
+        """Test a session too short for one exercise is an error."""
+        self.set_preferences(max_session_mins=1)
+
+        with self.assertRaises(WorkoutGenerationError):
+            generate_workout(self.user)
+
+
+class GenerateWeekTests(GeneratorTestCase):
+    """Tests for generate_week and the pregenerate_workouts command."""
+
+    def test_tops_up_scheduled_workouts(self) -> None:
+        """Test users get sessions_per_week scheduled workouts, once."""
+        self.set_preferences(sessions_per_week=3)
+        generate_workout(self.user)
+        no_gym = User.objects.create_user(email="nogym@example.com")
+
+        created = generate_week([self.user.pk, no_gym.pk])
+
+        self.assertEqual(created, 2)
+        self.assertEqual(
+            list(
+                self.user.workouts.order_by("workout_number").values_list(
+                    "workout_number", "status"
+                )
+            ),
+            [(n, WorkoutStatus.SCHEDULED) for n in (1, 2, 3)],
+        )
+        self.assertFalse(Workout.objects.filter(user=no_gym).exists())
+        self.assertEqual(generate_week([self.user.pk]), 0)
+
+    def test_command(self) -> None:
+        """Test the command generates in-process with --workers 0."""
+        self.set_preferences(sessions_per_week=2)
+        out = StringIO()
+
+        call_command("pregenerate_workouts", workers=0, stdout=out)
+
+        self.assertIn("Generated 2 workouts for 1 users", out.getvalue())
+        self.assertEqual(self.user.workouts.count(), 2)
+
+
+class ConcurrentGenerationTests(GeneratorFixtures, TransactionTestCase):
+    """Tests for generations for one user racing in two transactions."""
+
+    def setUp(self) -> None:
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        settings_override = override_settings(CATALOG_SNAPSHOT_DIR=directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        super().setUp()
+
+    def test_concurrent_generations_take_consecutive_numbers(self) -> None:
+        """Test a second generation waits for the first's workout number."""
+        planning = threading.Event()
+        release = threading.Event()
+        plan_workout = generator.plan_workout
+        errors: list[Exception] = []
+
+        def slow_plan(*args, **kwargs):
+            if not planning.is_set():
+                planning.set()
+                release.wait(5)
+            return plan_workout(*args, **kwargs)
+
+        def generate() -> None:
+            try:
+                generate_workout(User.objects.get(pk=self.user.pk))
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        with mock.patch("training.generator.plan_workout", slow_plan):
+            first = threading.Thread(target=generate)
+            first.start()
+            self.assertTrue(planning.wait(5))
+            second = threading.Thread(target=generate)
+            second.start()
+            # The second generation is blocked on the first's lock
+            second.join(0.5)
+            self.assertTrue(second.is_alive())
+            release.set()
+            first.join(5)
+            second.join(5)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            sorted(self.user.workouts.values_list("workout_number", flat=True)),
+            [1, 2],
+        )
+
+
+@override_settings(
+    # Use a simple secret key for testing
+    SECRET_KEY="test-secret-key-for-testing-only",
+    # Disable secure cookies for testing
+    JWT_COOKIE_SECURE=False,
+)
+class GenerateWorkoutAPITests(GeneratorTestCase):
+    """Tests for POST /api/workouts/generate/."""
+
+    url = "/api/workouts/generate/"
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.client = APIClient()
+        self.client.cookies[settings.JWT_ACCESS_COOKIE_NAME] = str(
+            AccessToken.for_user(self.user)
+        )
+
+    def test_generates_workout(self) -> None:
+        """Test the new workout is returned with exercises and sets."""
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["workout_number"], 1)
+        self.assertEqual(response.data["status"], WorkoutStatus.SCHEDULED)
+        self.assertTrue(response.data["exercises"])
+        self.assertTrue(response.data["exercises"][0]["sets"])
+        self.assertIn("exercise_name", response.data["exercises"][0])
+
+    def test_without_gym(self) -> None:
+        """Test users without a gym get a 400."""
+        self.user.gym = None
+        self.user.save()
+
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json(), {"detail": "Set a gym before generating workouts."}
+        )
+
+    def test_requires_authentication(self) -> None:
+        """Test the endpoint requires authentication."""
+        response = APIClient().post(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,186 @@
+"""
+Tests for personal records.
+
+These tests verify:
+- Completing a set updates the user's record for the exercise
+- Records only grow incrementally; rebuilding recomputes them
+- The rebuild_personal_records command
+- The personal records endpoint is one query
+"""
+
+from decimal import Decimal
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from catalog.models import Equipment, Exercise
+from gym.models import Gym, GymEquipment
+from training.enums import EquipmentModality, EquipmentType
+from training.models import PersonalRecord, Workout, WorkoutExercise, WorkoutSet
+from training.records import rebuild_personal_records, record_sets
+
+User = get_user_model()
+
+
+class PersonalRecordTestCase(TestCase):
+    """Base test case with a user, an exercise and a workout to log."""
+
+    def setUp(self) -> None:
+        gym = Gym.objects.create(
+            name="Gym A",
+            street_address="1 Main St",
+            city="Portland",
+            state_province="OR",
+            postal_code="97201",
+            country="US",
+        )
+        equipment = Equipment.objects.create(
+            name="Barbell",
+            brand="Acme",
+            modality=EquipmentModality.FREE_WEIGHTS,
+            equipment_type=EquipmentType.PLATE_LOADED,
+        )
+        self.gym_equipment = GymEquipment.objects.create(
+            gym=gym, equipment=equipment, equipment_display_number="1"
+        )
+        self.squat = Exercise.objects.create(name="Squat")
+        self.user = User.objects.create_user(email="test@example.com", gym=gym)
+        workout = Workout.objects.create(user=self.user, workout_number=1)
+        self.workout_exercise = WorkoutExercise.objects.create(
+            workout=workout, exercise=self.squat, gym_equipment=self.gym_equipment
+        )
+
+    def log_set(self, weight: str, reps: int, completed: bool = True) -> WorkoutSet:
+        """Save a set of `reps` at `weight`, as the set logging flow does."""
+        set_number = self.workout_exercise.sets.count() + 1
+        workout_set = WorkoutSet.objects.create(
+            workout_exercise=self.workout_exercise,
+            set_number=set_number,
+            target_weight_lbs=Decimal(weight),
+            target_reps=reps,
+        )
+        workout_set.actual_weight_lbs = Decimal(weight)
+        workout_set.actual_reps = reps
+        workout_set.is_completed = completed
+        workout_set.completed_at = timezone.now() if completed else None
+        workout_set.save()
+        return workout_set
+
+    def record(self) -> tuple[Decimal, Decimal, int]:
+        record = PersonalRecord.objects.get(user=self.user, exercise=self.squat)
+        return record.best_e1rm_lbs, record.heaviest_weight_lbs, record.most_reps
+
+
+class IncrementalRecordTests(PersonalRecordTestCase):
+    """Tests for updating records as sets are completed."""
+
+    def test_completing_sets_updates_record(self) -> None:
+        """Test each completed set raises whichever bests it beats."""
+        self.log_set("100", 10)
+        self.assertEqual(self.record(), (Decimal("133.33"), Decimal("100"), 10))
+
+        self.log_set("150", 1)
+        self.log_set("50", 20)
+
+        self.assertEqual(self.record(), (Decimal("155.00"), Decimal("150"), 20))
+
+    def test_incomplete_sets_are_ignored(self) -> None:
+        """Test sets that aren't completed don't create records."""
+        workout_set = self.log_set("100", 10, completed=False)
+
+        self.assertEqual(record_sets([workout_set.pk]), 0)
+        self.assertFalse(PersonalRecord.objects.exists())
+
+    def test_records_only_grow(self) -> None:
+        """Test lowering a set keeps the record until it is rebuilt."""
+        workout_set = self.log_set("100", 10)
+        workout_set.actual_weight_lbs = Decimal("90")
+        workout_set.save()
+
+        self.assertEqual(self.record(), (Decimal("133.33"), Decimal("100"), 10))
+
+        self.assertEqual(rebuild_personal_records([self.user.pk]), 1)
+        self.assertEqual(self.record(), (Decimal("120.00"), Decimal("90"), 10))
+
+    def test_rebuild_drops_records_without_sets(self) -> None:
+        """Test a rebuild removes records whose sets are gone."""
+        self.log_set("100", 10).delete()
+
+        self.assertEqual(rebuild_personal_records([self.user.pk]), 0)
+        self.assertFalse(PersonalRecord.objects.exists())
+
+    def test_command(self) -> None:
+        """Test the command rebuilds records in chunks of users."""
+        self.log_set("100", 10)
+        User.objects.create_user(email="other@example.com")
+        PersonalRecord.objects.all().delete()
+        out = StringIO()
+
+        call_command("rebuild_personal_records", chunk_size=1, stdout=out)
+
+        self.assertIn("Rebuilt 1 personal records for 2 users", out.getvalue())
+        self.assertEqual(self.record(), (Decimal("133.33"), Decimal("100"), 10))
+
+
+@override_settings(
+    # Use a simple secret key for testing
+    SECRET_KEY="test-secret-key-for-testing-only",
+    # Disable secure cookies for testing
+    JWT_COOKIE_SECURE=False,
+)
+class PersonalRecordsAPITests(PersonalRecordTestCase):
+    """Tests for GET /api/personal-records/."""
+
+    url = "/api/personal-records/"
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.client = APIClient()
+        self.client.cookies[settings.JWT_ACCESS_COOKIE_NAME] = str(
+            AccessToken.for_user(self.user)
+        )
+
+    def test_lists_records(self) -> None:
+        """Test the user's records are returned with exercise names."""
+        self.log_set("100", 10)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(
+            dict(response.data["results"][0]),
+            {
+                "exercise": self.squat.pk,
+                "exercise_name": "Squat",
+                "best_e1rm_lbs": "133.33",
+                "heaviest_weight_lbs": "100.00",
+                "most_reps": 10,
+                "updated_at": response.data["results"][0]["updated_at"],
+            },
+        )
+
+    def test_single_query(self) -> None:
+        """Test records are read with one query once the user is cached."""
+        self.log_set("100", 10)
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+
+        self.assertEqual(len(queries), 1)
+
+    def test_requires_authentication(self) -> None:
+        """Test the endpoint requires authentication."""
+        response = APIClient().get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,244 @@
+"""
+Tests for progressive overload targets.
+
+These tests verify:
+- Estimates use the most recent sets of each (user, exercise) pair
+- Pairs are grouped and looked up correctly for ids beyond 32 bits
+- Targets progress, hold or deload and round to the weight step
+- History loads as arrays, newest sets first
+- Scheduled sets are refreshed in bulk, leaving others untouched
+- The refresh_progression_targets command
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from catalog.models import Equipment, Exercise
+from gym.models import Gym, GymEquipment
+from training.enums import EquipmentModality, EquipmentType, WorkoutStatus
+from training.models import Workout, WorkoutExercise, WorkoutSet
+from training.progression import (
+    DELOAD,
+    HOLD,
+    PROGRESS,
+    WINDOW_SETS,
+    SetHistory,
+    estimate,
+    load_history,
+    refresh_scheduled_targets,
+)
+
+User = get_user_model()
+
+
+def history(*rows: tuple[int, int, float, int, int]) -> SetHistory:
+    """Build a SetHistory from (user, exercise, weight, reps, target) rows."""
+    users, exercises, weights, reps, targets = zip(*rows)
+    return SetHistory(
+        np.array(users, dtype=np.int64),
+        np.array(exercises, dtype=np.int64),
+        np.array(weights, dtype=np.float64),
+        np.array(reps, dtype=np.int16),
+        np.array(targets, dtype=np.int16),
+    )
+
+
+class EstimateTests(SimpleTestCase):
+    """Tests for estimate and Estimates.target_weights."""
+
+    def test_groups_and_decisions(self) -> None:
+        """Test each pair gets its best recent e1RM and a decision."""
+        estimates = estimate(
+            history(
+                (1, 1, 100, 10, 10),
+                (1, 1, 90, 12, 10),
+                (1, 2, 50, 6, 10),
+                (1, 2, 50, 6, 10),
+                (2, 1, 60, 10, 10),
+                (2, 1, 60, 8, 10),
+            )
+        )
+
+        self.assertEqual(estimates.user_ids.tolist(), [1, 1, 2])
+        self.assertEqual(estimates.exercise_ids.tolist(), [1, 2, 1])
+        self.assertAlmostEqual(estimates.one_rep_max[0], 100 * (1 + 10 / 30))
+        self.assertEqual(estimates.last_weight.tolist(), [100, 50, 60])
+        self.assertEqual(estimates.decision.tolist(), [PROGRESS, DELOAD, HOLD])
+
+    def test_only_recent_sets_count(self) -> None:
+        """Test sets beyond the window don't affect the estimate."""
+        rows = [(1, 1, 50, 10, 10)] * WINDOW_SETS + [(1, 1, 200, 2, 10)]
+
+        estimates = estimate(history(*rows))
+
+        self.assertAlmostEqual(estimates.one_rep_max[0], 50 * (1 + 10 / 30))
+        self.assertEqual(estimates.decision.tolist(), [PROGRESS])
+
+    def test_target_weights(self) -> None:
+        """Test targets step up, hold or deload and round to 2.5 lbs."""
+        estimates = estimate(
+            history(
+                (1, 1, 100, 10, 10),
+                (1, 2, 100, 9, 10),
+                (1, 2, 100, 10, 10),
+                (1, 3, 100, 5, 10),
+                (1, 4, 0, 10, 10),
+            )
+        )
+
+        weights = estimates.target_weights(np.arange(4), np.array([10, 10, 10, 10]))
+
+        # Progress a step; hold at 100 x 10's e1RM; deload to 90% of 87.5
+        self.assertEqual(weights.tolist(), [102.5, 100, 80, 0])
+
+    def test_lookup(self) -> None:
+        """Test pairs without history are -1."""
+        estimates = estimate(history((1, 1, 100, 10, 10), (2, 5, 10, 10, 10)))
+
+        rows = estimates.lookup(np.array([2, 1, 3]), np.array([5, 2, 1]))
+
+        self.assertEqual(rows.tolist(), [1, -1, -1])
+
+    def test_large_ids(self) -> None:
+        """Test ids of 2**32 and above don't merge or reorder pairs."""
+        big = 2**32
+        estimates = estimate(
+            history(
+                (1, 1, 100, 10, 10),
+                (1, big + 1, 50, 6, 10),
+                (big + 1, 1, 60, 10, 10),
+                (big + 1, big, 70, 10, 10),
+            )
+        )
+
+        self.assertEqual(estimates.user_ids.tolist(), [1, 1, big + 1, big + 1])
+        self.assertEqual(estimates.exercise_ids.tolist(), [1, big + 1, 1, big])
+        rows = estimates.lookup(
+            np.array([big + 1, 1, 2, big + 1]), np.array([big, big + 1, 1, 2])
+        )
+        self.assertEqual(rows.tolist(), [3, 1, -1, -1])
+
+    def test_empty_history(self) -> None:
+        """Test an empty history has no estimates."""
+        estimates = estimate(SetHistory(*(np.empty(0) for _ in range(5))))
+
+        self.assertEqual(len(estimates), 0)
+        self.assertEqual(estimates.lookup(np.array([1]), np.array([1])).tolist(), [-1])
+
+
+class ProgressionDatabaseTests(TestCase):
+    """Tests for load_history and refresh_scheduled_targets."""
+
+    def setUp(self) -> None:
+        gym = Gym.objects.create(
+            name="Gym A",
+            street_address="1 Main St",
+            city="Portland",
+            state_province="OR",
+            postal_code="97201",
+            country="US",
+        )
+        equipment = Equipment.objects.create(
+            name="Barbell",
+            brand="Acme",
+            modality=EquipmentModality.FREE_WEIGHTS,
+            equipment_type=EquipmentType.PLATE_LOADED,
+        )
+        self.gym_equipment = GymEquipment.objects.create(
+            gym=gym, equipment=equipment, equipment_display_number="1"
+        )
+        self.squat = Exercise.objects.create(name="Squat")
+        self.user = User.objects.create_user(email="test@example.com", gym=gym)
+        self.other = User.objects.create_user(email="other@example.com", gym=gym)
+
+    def add_sets(
+        self,
+        user: User,
+        status: str,
+        sets: list[tuple[str, int, str | None, int | None]],
+    ) -> list[WorkoutSet]:
+        """Add a workout of `sets` as (target weight, reps, actual weight, reps)."""
+        number = user.workouts.count() + 1
+        workout = Workout.objects.create(
+            user=user, workout_number=number, status=status
+        )
+        workout_exercise = WorkoutExercise.objects.create(
+            workout=workout, exercise=self.squat, gym_equipment=self.gym_equipment
+        )
+        completed_at = timezone.now() + timedelta(minutes=number)
+        return [
+            WorkoutSet.objects.create(
+                workout_exercise=workout_exercise,
+                set_number=n,
+                target_weight_lbs=Decimal(target_weight),
+                target_reps=target_reps,
+                actual_weight_lbs=None if weight is None else Decimal(weight),
+                actual_reps=reps,
+                is_completed=weight is not None,
+                completed_at=completed_at if weight is not None else None,
+            )
+            for n, (target_weight, target_reps, weight, reps) in enumerate(sets, 1)
+        ]
+
+    def test_load_history(self) -> None:
+        """Test completed sets load newest first, per user and exercise."""
+        self.add_sets(self.user, WorkoutStatus.COMPLETED, [("100", 5, "100", 5)])
+        self.add_sets(self.user, WorkoutStatus.COMPLETED, [("105", 5, "105", 4)])
+        self.add_sets(self.other, WorkoutStatus.COMPLETED, [("50", 5, "50", 5)])
+        self.add_sets(self.user, WorkoutStatus.SCHEDULED, [("110", 5, None, None)])
+
+        loaded = load_history([self.user.pk])
+
+        self.assertEqual(loaded.weights.tolist(), [105, 100])
+        self.assertEqual(loaded.reps.tolist(), [4, 5])
+        self.assertEqual(loaded.user_ids.tolist(), [self.user.pk] * 2)
+
+    def test_refresh_scheduled_targets(self) -> None:
+        """Test scheduled sets get new targets; completed ones are kept."""
+        done = self.add_sets(
+            self.user,
+            WorkoutStatus.COMPLETED,
+            [("100", 10, "100", 10), ("100", 10, "100", 10)],
+        )
+        scheduled = self.add_sets(
+            self.user,
+            WorkoutStatus.SCHEDULED,
+            [("100", 10, None, None), ("100", 10, None, None)],
+        )
+        untouched = self.add_sets(
+            self.other, WorkoutStatus.SCHEDULED, [("40", 10, None, None)]
+        )
+
+        self.assertEqual(refresh_scheduled_targets(), 2)
+
+        for workout_set in scheduled:
+            workout_set.refresh_from_db()
+            self.assertEqual(workout_set.target_weight_lbs, Decimal("102.5"))
+        for workout_set in done + untouched:
+            before = workout_set.target_weight_lbs
+            workout_set.refresh_from_db()
+            self.assertEqual(workout_set.target_weight_lbs, before)
+        # Targets are already up to date
+        self.assertEqual(refresh_scheduled_targets([self.user.pk]), 0)
+
+    def test_command(self) -> None:
+        """Test the command refreshes every user's scheduled sets."""
+        self.add_sets(self.user, WorkoutStatus.COMPLETED, [("100", 10, "100", 6)])
+        (scheduled,) = self.add_sets(
+            self.user, WorkoutStatus.SCHEDULED, [("100", 10, None, None)]
+        )
+        out = StringIO()
+
+        call_command("refresh_progression_targets", chunk_size=1, stdout=out)
+
+        scheduled.refresh_from_db()
+        # 100 x 6 of 10 deloads to 90% of 90 lbs
+        self.assertEqual(scheduled.target_weight_lbs, Decimal("80"))
+        self.assertIn("Updated 1 sets for 2 users", out.getvalue())
@@ -4,7 +4,7 @@ Tests for the training preferences API endpoints.
 These tests verify:
 - Preferences are auto-created on user creation
 - GET returns correct defaults
-- GET auto-creates if missing
+- GET serves defaults without writing if missing; PUT creates the row
 - PUT updates fields correctly
 - Validation works for all fields
 - Unauthorized users cannot access endpoints
@@ -106,8 +106,8 @@ class GETTests(TrainingPreferencesAPITestCase):
         self.assertEqual(response.data["excluded_exercise_attributes"], [])
         self.assertIn("updated_at", response.data)
 
-    def test_get_auto_creates_if_missing(self) -> None:
-        """Test GET auto-creates preferences if they don't exist."""
+    def test_get_serves_defaults_without_creating(self) -> None:
+        """Test GET serves defaults without creating a missing row."""
         user = self.create_test_user()
         # Delete preferences if they exist (from signal)
         UserTrainingPreferences.objects.filter(user=user).delete()
@@ -116,7 +116,27 @@ class GETTests(TrainingPreferencesAPITestCase):
         response = self.client.get(self.preferences_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertTrue(UserTrainingPreferences.objects.filter(user=user).exists())
+        self.assertEqual(response.data["sessions_per_week"], 3)
+        self.assertIsNone(response.data["updated_at"])
+        self.assertFalse(UserTrainingPreferences.objects.filter(user=user).exists())
+
+    def test_put_creates_if_missing(self) -> None:
+        """Test PUT creates preferences if they don't exist."""
+        user = self.create_test_user()
+        UserTrainingPreferences.objects.filter(user=user).delete()
+        self.login_user(user)
+        data = dict(self.client.get(self.preferences_url).data)
+        data["sessions_per_week"] = 4
+
+        response = self.client.put(self.preferences_url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            UserTrainingPreferences.objects.get(user=user).sessions_per_week, 4
+        )
+        self.assertEqual(
+            self.client.get(self.preferences_url).data["sessions_per_week"], 4
+        )
 
     def test_get_requires_authentication(self) -> None:
         """Test GET endpoint requires authentication."""
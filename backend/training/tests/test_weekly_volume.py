@@ -0,0 +1,287 @@
+"""
+Tests for weekly muscle volume rollups.
+
+These tests verify:
+- Saving a completed set adds its volume to its week's muscle groups
+- Edits, un-completing and deleting a set move or remove its volume
+- Rebuilding from history gives the same rows
+- Reads roll up to major groups and regions
+- The weekly volume endpoint and rebuild_weekly_volume command
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from catalog.enums import MuscleGroup
+from catalog.models import Equipment, Exercise
+from gym.models import Gym, GymEquipment
+from training.enums import EquipmentModality, EquipmentType
+from training.models import WeeklyMuscleVolume, Workout, WorkoutExercise, WorkoutSet
+from training.volume import rebuild_weekly_volume, week_of, weekly_volume
+
+User = get_user_model()
+
+
+class WeeklyVolumeTestCase(TestCase):
+    """Base test case with a user and a bench press workout to log."""
+
+    def setUp(self) -> None:
+        gym = Gym.objects.create(
+            name="Gym A",
+            street_address="1 Main St",
+            city="Portland",
+            state_province="OR",
+            postal_code="97201",
+            country="US",
+        )
+        equipment = Equipment.objects.create(
+            name="Barbell",
+            brand="Acme",
+            modality=EquipmentModality.FREE_WEIGHTS,
+            equipment_type=EquipmentType.PLATE_LOADED,
+        )
+        gym_equipment = GymEquipment.objects.create(
+            gym=gym, equipment=equipment, equipment_display_number="1"
+        )
+        bench_press = Exercise.objects.create(
+            name="Bench Press",
+            primary_muscles=[MuscleGroup.CHEST],
+            secondary_muscles=[
+                MuscleGroup.TRICEPS,
+                MuscleGroup.FRONT_DELTS,
+                MuscleGroup.CHEST,
+            ],
+        )
+        self.user = User.objects.create_user(email="test@example.com", gym=gym)
+        workout = Workout.objects.create(user=self.user, workout_number=1)
+        self.workout_exercise = WorkoutExercise.objects.create(
+            workout=workout, exercise=bench_press, gym_equipment=gym_equipment
+        )
+        self.week = week_of(timezone.now())
+
+    def log_set(self, weight: str, reps: int, days_ago: int = 0) -> WorkoutSet:
+        """Save a completed set, as the set logging flow does."""
+        workout_set = WorkoutSet.objects.create(
+            workout_exercise=self.workout_exercise,
+            set_number=self.workout_exercise.sets.count() + 1,
+            target_weight_lbs=Decimal(weight),
+            target_reps=reps,
+        )
+        workout_set.actual_weight_lbs = Decimal(weight)
+        workout_set.actual_reps = reps
+        workout_set.is_completed = True
+        workout_set.completed_at = timezone.now() - timedelta(days=days_ago)
+        workout_set.save()
+        return workout_set
+
+    def rows(self) -> dict[tuple, tuple[Decimal, Decimal]]:
+        return {
+            (week, muscle): (volume_lbs, sets)
+            for week, muscle, volume_lbs, sets in WeeklyMuscleVolume.objects.filter(
+                user=self.user
+            ).values_list("week", "muscle_group", "volume_lbs", "sets")
+            if sets
+        }
+
+
+class IncrementalVolumeTests(WeeklyVolumeTestCase):
+    """Tests for maintaining the rollups as sets are saved and deleted."""
+
+    def test_completed_set_adds_weighted_volume(self) -> None:
+        """Test primary muscles count fully and secondary ones half."""
+        self.log_set("100", 10)
+
+        self.assertEqual(
+            self.rows(),
+            {
+                (self.week, MuscleGroup.CHEST): (Decimal("1000"), Decimal("1")),
+                (self.week, MuscleGroup.TRICEPS): (Decimal("500"), Decimal("0.5")),
+                (self.week, MuscleGroup.FRONT_DELTS): (
+                    Decimal("500"),
+                    Decimal("0.5"),
+                ),
+            },
+        )
+
+    def test_sets_land_in_their_week(self) -> None:
+        """Test sets from earlier weeks go to their own rows."""
+        self.log_set("100", 10)
+        self.log_set("100", 10, days_ago=7)
+        self.log_set("50", 10)
+
+        rows = self.rows()
+        last_week = self.week - timedelta(weeks=1)
+        self.assertEqual(
+            rows[self.week, MuscleGroup.CHEST], (Decimal("1500"), Decimal("2"))
+        )
+        self.assertEqual(
+            rows[last_week, MuscleGroup.CHEST], (Decimal("1000"), Decimal("1"))
+        )
+
+    def test_saves_move_the_contribution(self) -> None:
+        """Test re-saving, editing and un-completing adjust by the change."""
+        workout_set = self.log_set("100", 10)
+        workout_set.save()
+        self.assertEqual(
+            self.rows()[self.week, MuscleGroup.CHEST],
+            (Decimal("1000"), Decimal("1")),
+        )
+
+        workout_set = WorkoutSet.objects.get(pk=workout_set.pk)
+        workout_set.actual_reps = 8
+        workout_set.save()
+        self.assertEqual(
+            self.rows()[self.week, MuscleGroup.CHEST],
+            (Decimal("800"), Decimal("1")),
+        )
+
+        workout_set.is_completed = False
+        workout_set.save()
+        self.assertEqual(self.rows(), {})
+
+    def test_delete_removes_the_contribution(self) -> None:
+        """Test deleting a set, directly or with its workout, removes it."""
+        self.log_set("100", 10)
+        self.log_set("50", 10).delete()
+        self.assertEqual(
+            self.rows()[self.week, MuscleGroup.CHEST],
+            (Decimal("1000"), Decimal("1")),
+        )
+
+        self.workout_exercise.workout.delete()
+
+        self.assertEqual(self.rows(), {})
+
+    def test_rebuild_matches_incremental_rows(self) -> None:
+        """Test rebuilding from history gives the same rows."""
+        self.log_set("100", 10)
+        self.log_set("100", 10, days_ago=7)
+        self.log_set("60", 12).delete()
+        incremental = self.rows()
+
+        rebuild_weekly_volume([self.user.pk])
+
+        self.assertEqual(self.rows(), incremental)
+
+    def test_command(self) -> None:
+        """Test the command rebuilds rows in chunks of users."""
+        self.log_set("100", 10)
+        User.objects.create_user(email="other@example.com")
+        WeeklyMuscleVolume.objects.all().delete()
+        out = StringIO()
+
+        call_command("rebuild_weekly_volume", chunk_size=1, stdout=out)
+
+        self.assertIn("Rebuilt 3 weekly volume rows for 2 users", out.getvalue())
+        self.assertEqual(len(self.rows()), 3)
+
+
+class WeeklyVolumeReadTests(WeeklyVolumeTestCase):
+    """Tests for weekly_volume."""
+
+    def test_levels(self) -> None:
+        """Test muscle rows roll up to major groups and regions."""
+        self.log_set("100", 10)
+
+        major = weekly_volume(self.user.pk, "major_group", 1)
+        region = weekly_volume(self.user.pk, "region", 1)
+
+        self.assertEqual(
+            [(row["group"], row["volume_lbs"], row["sets"]) for row in major],
+            [
+                ("arms", Decimal("500"), Decimal("0.5")),
+                ("chest", Decimal("1000"), Decimal("1")),
+                ("shoulders", Decimal("500"), Decimal("0.5")),
+            ],
+        )
+        self.assertEqual(
+            [(row["group"], row["volume_lbs"], row["sets"]) for row in region],
+            [("upper_body", Decimal("2000"), Decimal("2"))],
+        )
+
+    def test_weeks_window(self) -> None:
+        """Test only the requested number of weeks is returned."""
+        self.log_set("100", 10)
+        self.log_set("100", 10, days_ago=14)
+
+        self.assertEqual(
+            {row["week"] for row in weekly_volume(self.user.pk, "region", 2)},
+            {self.week},
+        )
+        self.assertEqual(len(weekly_volume(self.user.pk, "region", 3)), 2)
+
+
+@override_settings(
+    # Use a simple secret key for testing
+    SECRET_KEY="test-secret-key-for-testing-only",
+    # Disable secure cookies for testing
+    JWT_COOKIE_SECURE=False,
+)
+class WeeklyVolumeAPITests(WeeklyVolumeTestCase):
+    """Tests for GET /api/volume/weekly/."""
+
+    url = "/api/volume/weekly/"
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.client = APIClient()
+        self.client.cookies[settings.JWT_ACCESS_COOKIE_NAME] = str(
+            AccessToken.for_user(self.user)
+        )
+
+    def test_returns_volume(self) -> None:
+        """Test the volume is returned at the requested level."""
+        self.log_set("100", 10)
+
+        response = self.client.get(self.url, {"level": "region", "weeks": 4})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["level"], "region")
+        self.assertEqual(response.data["weeks"], 4)
+        self.assertEqual(
+            [dict(row) for row in response.data["results"]],
+            [
+                {
+                    "week": self.week.isoformat(),
+                    "group": "upper_body",
+                    "volume_lbs": "2000.00",
+                    "sets": "2.00",
+                }
+            ],
+        )
+
+    def test_single_query(self) -> None:
+        """Test the volume is read with one query once the user is cached."""
+        self.log_set("100", 10)
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+
+        self.assertEqual(len(queries), 1)
+
+    def test_invalid_parameters(self) -> None:
+        """Test unknown levels and out of range weeks are a 400."""
+        for params in ({"level": "organ"}, {"weeks": 0}, {"weeks": "many"}):
+            response = self.client.get(self.url, params)
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(list(response.data), list(params))
+
+    def test_requires_authentication(self) -> None:
+        """Test the endpoint requires authentication."""
+        response = APIClient().get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,141 @@
+"""
+Tests for equipment checks while building workouts.
+
+These tests verify:
+- Suggestions list the gym's equipment compatible with an exercise
+- Validation rejects incompatible equipment and equipment from other gyms
+- Validation of a whole workout runs without a query per exercise
+- WorkoutExercise.clean() rejects incompatible equipment
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from catalog.compatibility import compatibility
+from catalog.models import Equipment, Exercise
+from gym.inventory import inventory_cache
+from gym.models import Gym, GymEquipment
+from training.enums import EquipmentModality, EquipmentType
+from training.models import Workout, WorkoutExercise
+from training.workouts import suggest_gym_equipment, validate_workout_exercises
+
+User = get_user_model()
+
+
+def create_gym(name: str) -> Gym:
+    return Gym.objects.create(
+        name=name,
+        street_address="1 Main St",
+        city="Portland",
+        state_province="OR",
+        postal_code="97201",
+        country="US",
+    )
+
+
+class WorkoutEquipmentTests(TestCase):
+    """Tests for training.workouts."""
+
+    def setUp(self) -> None:
+        compatibility.invalidate()
+        inventory_cache.clear()
+        rack = Equipment.objects.create(
+            name="Power Rack",
+            brand="Acme",
+            modality=EquipmentModality.FREE_WEIGHTS,
+            equipment_type=EquipmentType.PLATE_LOADED,
+        )
+        smith = Equipment.objects.create(
+            name="Smith Machine",
+            brand="Acme",
+            modality=EquipmentModality.MACHINES,
+            equipment_type=EquipmentType.SMITH,
+        )
+        self.squat = Exercise.objects.create(name="Back Squat")
+        self.squat.equipment.set([rack, smith])
+        self.press = Exercise.objects.create(name="Machine Press")
+        self.press.equipment.set([smith])
+        self.plank = Exercise.objects.create(name="Plank")
+
+        self.gym = create_gym("Gym A")
+        self.rack_1 = GymEquipment.objects.create(
+            gym=self.gym, equipment=rack, equipment_display_number="1"
+        )
+        self.rack_2 = GymEquipment.objects.create(
+            gym=self.gym, equipment=rack, equipment_display_number="2"
+        )
+        self.other_smith = GymEquipment.objects.create(
+            gym=create_gym("Gym B"), equipment=smith, equipment_display_number="1"
+        )
+
+        user = User.objects.create_user(email="test@example.com", gym=self.gym)
+        self.workout = Workout.objects.create(user=user, workout_number=1)
+
+    def test_suggest_gym_equipment(self) -> None:
+        """Test suggestions are the gym's compatible equipment."""
+        self.assertEqual(
+            suggest_gym_equipment(self.gym.pk, self.squat.pk),
+            (self.rack_1.pk, self.rack_2.pk),
+        )
+        self.assertEqual(suggest_gym_equipment(self.gym.pk, self.press.pk), ())
+        self.assertEqual(
+            suggest_gym_equipment(self.gym.pk, self.plank.pk),
+            (self.rack_1.pk, self.rack_2.pk),
+        )
+
+    def test_inventory_changes_are_reflected(self) -> None:
+        """Test new gym equipment shows up in suggestions."""
+        self.assertEqual(suggest_gym_equipment(self.gym.pk, self.press.pk), ())
+
+        smith = GymEquipment.objects.create(
+            gym=self.gym,
+            equipment=self.other_smith.equipment,
+            equipment_display_number="3",
+        )
+
+        self.assertEqual(suggest_gym_equipment(self.gym.pk, self.press.pk), (smith.pk,))
+
+    def test_validate_workout_exercises(self) -> None:
+        """Test every invalid pairing is reported by position."""
+        exercises = [
+            WorkoutExercise(exercise=self.squat, gym_equipment=self.rack_1),
+            WorkoutExercise(exercise=self.press, gym_equipment=self.rack_2),
+            WorkoutExercise(exercise=self.plank, gym_equipment=self.rack_2),
+            WorkoutExercise(exercise=self.squat, gym_equipment=self.other_smith),
+        ]
+
+        with self.assertRaises(ValidationError) as context:
+            validate_workout_exercises(self.gym.pk, exercises)
+
+        self.assertEqual(
+            context.exception.messages,
+            [
+                "Exercise 2: This exercise can't be performed with this equipment.",
+                "Exercise 4: This equipment is not at the gym.",
+            ],
+        )
+
+    def test_validation_is_constant_time_per_exercise(self) -> None:
+        """Test warm validation issues no queries."""
+        exercises = [
+            WorkoutExercise(exercise_id=self.squat.pk, gym_equipment_id=self.rack_1.pk)
+        ] * 20
+        validate_workout_exercises(self.gym.pk, exercises)
+
+        with self.assertNumQueries(0):
+            validate_workout_exercises(self.gym.pk, exercises)
+
+    def test_clean_rejects_incompatible_equipment(self) -> None:
+        """Test model validation uses the compatibility index."""
+        valid = WorkoutExercise(
+            workout=self.workout, exercise=self.squat, gym_equipment=self.rack_1
+        )
+        invalid = WorkoutExercise(
+            workout=self.workout, exercise=self.press, gym_equipment=self.rack_1
+        )
+
+        valid.full_clean()
+        with self.assertRaises(ValidationError) as context:
+            invalid.full_clean()
+        self.assertIn("gym_equipment", context.exception.message_dict)
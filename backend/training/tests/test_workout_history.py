@@ -0,0 +1,267 @@
+"""
+Tests for batch workout labels and the workout history endpoint.
+
+These tests verify:
+- label_workouts gives the labels derive_workout_label gives
+- Muscles are read with one query and each combination is labeled once
+- Muscles are read from the shared catalog map when it is built
+- The workout history endpoint pages and labels workouts in O(1) queries
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from catalog.enums import MuscleGroup
+from catalog.mapped import build_catalog_map, catalog_map
+from catalog.models import Equipment, Exercise
+from gym.models import Gym, GymEquipment
+from training import labels
+from training.enums import EquipmentModality, EquipmentType, MovementPattern
+from training.labels import label_workouts
+from training.mappings import derive_workout_label
+from training.models import Workout, WorkoutExercise
+
+User = get_user_model()
+
+
+class WorkoutHistoryTestCase(TestCase):
+    """Base test case with a user and exercises to build workouts from."""
+
+    def setUp(self) -> None:
+        gym = Gym.objects.create(
+            name="Gym A",
+            street_address="1 Main St",
+            city="Portland",
+            state_province="OR",
+            postal_code="97201",
+            country="US",
+        )
+        equipment = Equipment.objects.create(
+            name="Barbell",
+            brand="Acme",
+            modality=EquipmentModality.FREE_WEIGHTS,
+            equipment_type=EquipmentType.PLATE_LOADED,
+        )
+        self.gym_equipment = GymEquipment.objects.create(
+            gym=gym, equipment=equipment, equipment_display_number="1"
+        )
+        self.bench_press = Exercise.objects.create(
+            name="Bench Press",
+            primary_muscles=[MuscleGroup.CHEST],
+            secondary_muscles=[MuscleGroup.TRICEPS],
+        )
+        self.pushdown = Exercise.objects.create(
+            name="Triceps Pushdown", primary_muscles=[MuscleGroup.TRICEPS]
+        )
+        self.squat = Exercise.objects.create(
+            name="Squat",
+            primary_muscles=[MuscleGroup.QUADS, MuscleGroup.HAMSTRINGS],
+        )
+        self.user = User.objects.create_user(email="test@example.com", gym=gym)
+
+    def create_workout(self, *exercises: Exercise) -> Workout:
+        """Create the user's next workout with `exercises`."""
+        workout = Workout.objects.create(
+            user=self.user, workout_number=self.user.workouts.count() + 1
+        )
+        for order, exercise in enumerate(exercises):
+            WorkoutExercise.objects.create(
+                workout=workout,
+                exercise=exercise,
+                gym_equipment=self.gym_equipment,
+                order=order,
+            )
+        return workout
+
+
+class LabelWorkoutsTests(WorkoutHistoryTestCase):
+    """Tests for label_workouts."""
+
+    def test_matches_derive_workout_label(self) -> None:
+        """Test each workout gets the label of its primary muscles."""
+        workouts = [
+            self.create_workout(self.bench_press, self.pushdown),
+            self.create_workout(self.bench_press),
+            self.create_workout(self.bench_press, self.squat),
+            self.create_workout(),
+        ]
+
+        result = label_workouts(workout.pk for workout in workouts)
+
+        for workout in workouts:
+            muscles = [
+                muscle
+                for exercise in workout.exercises.all()
+                for muscle in exercise.exercise.primary_muscles
+            ]
+            self.assertEqual(result[workout.pk], derive_workout_label(muscles))
+        self.assertEqual(
+            [result[workout.pk] for workout in workouts],
+            ["Chest & Triceps", "Chest", "Full Body", None],
+        )
+
+    def test_movement_patterns(self) -> None:
+        """Test movement patterns are applied per workout."""
+        pushing = self.create_workout(self.bench_press, self.pushdown)
+        plain = self.create_workout(self.bench_press, self.pushdown)
+
+        result = label_workouts(
+            [pushing.pk, plain.pk], {pushing.pk: [MovementPattern.PUSH]}
+        )
+
+        self.assertEqual(result, {pushing.pk: "Push", plain.pk: "Chest & Triceps"})
+
+    def test_one_query_and_one_label_per_combination(self) -> None:
+        """Test muscles are read once and repeated splits labeled once."""
+        workouts = [self.create_workout(self.bench_press) for _ in range(5)]
+        workouts += [self.create_workout(self.squat) for _ in range(5)]
+
+        with (
+            CaptureQueriesContext(connection) as queries,
+            mock.patch.object(
+                labels,
+                "workout_label_for_mask",
+                wraps=labels.workout_label_for_mask,
+            ) as label_for_mask,
+        ):
+            result = label_workouts(workout.pk for workout in workouts)
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(label_for_mask.call_count, 2)
+        self.assertEqual(set(result.values()), {"Chest", "Legs"})
+
+    def test_no_workouts(self) -> None:
+        """Test an empty batch doesn't query."""
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(label_workouts([]), {})
+
+        self.assertEqual(len(queries), 0)
+
+
+class MappedLabelWorkoutsTests(WorkoutHistoryTestCase):
+    """Tests for label_workouts with a shared catalog map (catalog.mapped)."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = Path(directory) / "catalog.map"
+        settings_override = override_settings(
+            CATALOG_MAP={
+                **settings.CATALOG_MAP, "PATH": path, "BACKGROUND_REBUILD": False
+            }
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(catalog_map.clear)
+        build_catalog_map()
+        # As if the fixture had been committed
+        catalog_map.refresh()
+
+    def test_masks_read_from_map(self) -> None:
+        """Test muscles come from the map, without joining the exercises."""
+        workouts = [
+            self.create_workout(self.bench_press, self.pushdown),
+            self.create_workout(self.squat),
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            result = label_workouts(workout.pk for workout in workouts)
+
+        self.assertEqual(
+            [result[workout.pk] for workout in workouts], ["Chest & Triceps", "Legs"]
+        )
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn(Exercise._meta.db_table, queries[0]["sql"])
+
+    def test_exercises_missing_from_map(self) -> None:
+        """Test exercises added since the map was built are read from the DB."""
+        # bulk_create sends no signals, so the map isn't rebuilt
+        [lunge] = Exercise.objects.bulk_create(
+            [Exercise(name="Lunge", primary_muscles=[MuscleGroup.GLUTES])]
+        )
+        workout = self.create_workout(self.bench_press, lunge)
+
+        with CaptureQueriesContext(connection) as queries:
+            result = label_workouts([workout.pk])
+
+        self.assertEqual(
+            result[workout.pk],
+            derive_workout_label([MuscleGroup.CHEST, MuscleGroup.GLUTES]),
+        )
+        self.assertEqual(len(queries), 2)
+
+
+@override_settings(
+    # Use a simple secret key for testing
+    SECRET_KEY="test-secret-key-for-testing-only",
+    # Disable secure cookies for testing
+    JWT_COOKIE_SECURE=False,
+)
+class WorkoutHistoryAPITests(WorkoutHistoryTestCase):
+    """Tests for GET /api/workouts/."""
+
+    url = "/api/workouts/"
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.client = APIClient()
+        self.client.cookies[settings.JWT_ACCESS_COOKIE_NAME] = str(
+            AccessToken.for_user(self.user)
+        )
+
+    def test_lists_labeled_workouts_newest_first(self) -> None:
+        """Test the history is paged newest first, with labels."""
+        first = self.create_workout(self.bench_press, self.pushdown)
+        second = self.create_workout(self.squat)
+        self.create_workout(self.bench_press)
+
+        response = self.client.get(self.url, {"limit": 2, "offset": 1})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(
+            [(row["id"], row["label"]) for row in response.data["results"]],
+            [(second.pk, "Legs"), (first.pk, "Chest & Triceps")],
+        )
+
+    def test_constant_queries(self) -> None:
+        """Test a page costs the same queries however many workouts it has."""
+        self.create_workout(self.bench_press)
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as one:
+            self.client.get(self.url)
+
+        for _ in range(10):
+            self.create_workout(self.bench_press, self.squat)
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(response.data["results"]), 11)
+        self.assertEqual(len(many), len(one))
+        self.assertEqual(len(many), 3)
+
+    def test_invalid_parameters(self) -> None:
+        """Test out of range or non-numeric limits and offsets are a 400."""
+        for params in ({"limit": 0}, {"limit": 101}, {"offset": -1}, {"limit": "x"}):
+            response = self.client.get(self.url, params)
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(list(response.data), list(params))
+
+    def test_requires_authentication(self) -> None:
+        """Test the endpoint requires authentication."""
+        response = APIClient().get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
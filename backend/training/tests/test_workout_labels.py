@@ -0,0 +1,93 @@
+"""
+Tests for compiled workout labels.
+
+These tests verify:
+- workout_label matches derive_workout_label for every combination of up to
+  three muscle groups, and for larger ones, with each pattern combination
+- The cases of test_movement_pattern give the same labels
+- Pattern flags accept enum members and plain values
+"""
+
+import random
+from itertools import combinations
+
+from django.test import SimpleTestCase
+
+from catalog.enums import MuscleGroup
+from training.enums import MovementPattern
+from training.mappings import (
+    PULL,
+    PUSH,
+    derive_workout_label,
+    pattern_flags,
+    workout_label,
+)
+
+PATTERN_CASES = [
+    None,
+    [],
+    [MovementPattern.PUSH],
+    [MovementPattern.PULL],
+    [MovementPattern.PUSH, MovementPattern.PULL],
+    [MovementPattern.SQUAT, "pull"],
+]
+
+
+class WorkoutLabelParityTests(SimpleTestCase):
+    """Tests workout_label against derive_workout_label."""
+
+    def test_label_parity(self) -> None:
+        """Test every combination gets the same label."""
+        muscles = list(MuscleGroup)
+        combos = [
+            combo for size in range(4) for combo in combinations(muscles, size)
+        ]
+        rng = random.Random(0)
+        combos += [
+            tuple(rng.sample(muscles, rng.randint(4, len(muscles))))
+            for _ in range(1_000)
+        ]
+
+        for combo in combos:
+            for patterns in PATTERN_CASES:
+                self.assertEqual(
+                    workout_label(combo, patterns),
+                    derive_workout_label(combo, patterns),
+                    (combo, patterns),
+                )
+
+    def test_movement_pattern_cases(self) -> None:
+        """Test the cases of test_movement_pattern."""
+        cases = [
+            ([MuscleGroup.CHEST, MuscleGroup.TRICEPS], None, "Chest & Triceps"),
+            ([MuscleGroup.LATS, MuscleGroup.BICEPS], None, "Back & Biceps"),
+            ([MuscleGroup.CHEST, MuscleGroup.QUADS], None, "Full Body"),
+            ([MuscleGroup.CHEST], [MovementPattern.PUSH], "Push"),
+            (
+                [MuscleGroup.LATS, MuscleGroup.UPPER_BACK],
+                [MovementPattern.PULL],
+                "Pull",
+            ),
+            ([MuscleGroup.CHEST], None, "Chest"),
+            ([MuscleGroup.LATS, MuscleGroup.UPPER_BACK], None, "Back"),
+            ([MuscleGroup.QUADS], [MovementPattern.PUSH], "Legs"),
+            ([], [MovementPattern.PUSH], None),
+            (
+                [
+                    MuscleGroup.CHEST,
+                    MuscleGroup.LATS,
+                    MuscleGroup.QUADS,
+                    MuscleGroup.ABS,
+                ],
+                None,
+                "Full Body",
+            ),
+        ]
+        for groups, patterns, label in cases:
+            self.assertEqual(workout_label(groups, patterns), label)
+
+    def test_pattern_flags(self) -> None:
+        """Test members and plain values set the same flags."""
+        self.assertEqual(pattern_flags(None), 0)
+        self.assertEqual(pattern_flags([MovementPattern.PUSH, "pull"]), PUSH | PULL)
+        self.assertEqual(pattern_flags(["squat", MovementPattern.HINGE]), 0)
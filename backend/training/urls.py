@@ -1,9 +1,21 @@
 from django.urls import path
 
-from training.views import TrainingPreferencesView
+from training.views import (
+    EligibleExercisesView,
+    GenerateWorkoutView,
+    PersonalRecordsView,
+    TrainingPreferencesView,
+    WeeklyVolumeView,
+    WorkoutHistoryView,
+)
 
 urlpatterns = [
     path("preferences/training/", TrainingPreferencesView.as_view(), name="training_preferences"),
+    path("exercises/eligible/", EligibleExercisesView.as_view(), name="eligible_exercises"),
+    path("workouts/", WorkoutHistoryView.as_view(), name="workout_history"),
+    path("workouts/generate/", GenerateWorkoutView.as_view(), name="generate_workout"),
+    path("personal-records/", PersonalRecordsView.as_view(), name="personal_records"),
+    path("volume/weekly/", WeeklyVolumeView.as_view(), name="weekly_volume"),
 ]
 
 
@@ -2,34 +2,68 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from django.db.models import Prefetch
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from training.models import UserTrainingPreferences
-from training.serializers import TrainingPreferencesSerializer
+from core.conditional import conditional_get
+from training.caches import get_preferences, get_preferences_version
+from training.eligibility import eligibility, user_exclusion_mask
+from training.generator import WorkoutGenerationError, generate_workout
+from training.labels import label_workouts
+from training.models import (
+    PersonalRecord,
+    UserTrainingPreferences,
+    Workout,
+    WorkoutExercise,
+)
+from training.serializers import (
+    PersonalRecordSerializer,
+    TrainingPreferencesSerializer,
+    WeeklyVolumeQuerySerializer,
+    WeeklyVolumeSerializer,
+    WorkoutHistoryQuerySerializer,
+    WorkoutSerializer,
+    WorkoutSummarySerializer,
+)
+from training.volume import weekly_volume
 
 if TYPE_CHECKING:
     from rest_framework.request import Request
 
 
+def preferences_version(request: Request) -> tuple[int, str] | None:
+    """
+    Return the ETag version of the user's training preferences.
+
+    None (no conditional handling) if the user has no preferences row and is
+    served the defaults.
+    """
+    version = get_preferences_version(request.user.pk)
+    if version is None:
+        return None
+    return request.user.pk, version.isoformat()
+
+
 class TrainingPreferencesView(APIView):
     """
     GET /api/preferences/training/
     PUT /api/preferences/training/
 
     Get or update the authenticated user's training preferences.
-    Auto-creates preferences if they don't exist.
+    GET never writes: users without a preferences row are served the model
+    defaults from the per-user preferences cache, and the row is created on
+    the first PUT. GET supports conditional requests via ETag / If-None-Match.
     """
 
     permission_classes = [IsAuthenticated]
 
+    @conditional_get(preferences_version)
     def get(self, request: Request) -> Response:
         """Return the authenticated user's training preferences."""
-        preferences, created = UserTrainingPreferences.objects.get_or_create(
-            user=request.user
-        )
+        preferences = get_preferences(request.user.pk)
         serializer = TrainingPreferencesSerializer(preferences)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -46,3 +80,139 @@ class TrainingPreferencesView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+class EligibleExercisesView(APIView):
+    """
+    GET /api/exercises/eligible/
+
+    List the catalog exercises the authenticated user can do at their gym,
+    given their training preferences. Users without a gym get the exercises
+    that need no equipment.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request) -> Response:
+        """Return the eligible exercises, in id order."""
+        gym_id = request.user.gym_id
+        exercises = eligibility.eligible_exercises(
+            gym_id, user_exclusion_mask(request.user)
+        )
+        results = [{"id": id_, "name": name} for id_, name in exercises]
+        return Response(
+            {"gym": gym_id, "count": len(results), "results": results},
+            status=status.HTTP_200_OK,
+        )
+
+
+class GenerateWorkoutView(APIView):
+    """
+    POST /api/workouts/generate/
+
+    Generate the authenticated user's next workout from their gym inventory
+    and training preferences, and return it with its exercises and sets.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request: Request) -> Response:
+        """Create and return the next workout."""
+        try:
+            workout = generate_workout(request.user)
+        except WorkoutGenerationError as error:
+            return Response(
+                {"detail": str(error)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        workout = Workout.objects.prefetch_related(
+            Prefetch(
+                "exercises",
+                queryset=WorkoutExercise.objects.select_related("exercise"),
+            ),
+            "exercises__sets",
+        ).get(pk=workout.pk)
+        return Response(
+            WorkoutSerializer(workout).data, status=status.HTTP_201_CREATED
+        )
+
+
+class WorkoutHistoryView(APIView):
+    """
+    GET /api/workouts/?limit=20&offset=0
+
+    List the authenticated user's workouts, newest first, with their labels.
+    The page's labels are computed together (see training.labels), so a page
+    is three queries however many workouts it holds.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request) -> Response:
+        """Return one page of the workout history."""
+        query = WorkoutHistoryQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        offset, limit = query.validated_data["offset"], query.validated_data["limit"]
+
+        workouts = Workout.objects.filter(user_id=request.user.pk)
+        count = workouts.count()
+        page = list(workouts.order_by("-created_at", "-id")[offset : offset + limit])
+        labels = label_workouts(workout.pk for workout in page)
+        results = WorkoutSummarySerializer(
+            page, many=True, context={"labels": labels}
+        ).data
+        return Response(
+            {"count": count, "results": results}, status=status.HTTP_200_OK
+        )
+
+
+class PersonalRecordsView(APIView):
+    """
+    GET /api/personal-records/
+
+    List the authenticated user's personal records, one per exercise.
+    Records are maintained as sets are completed (see training.records), so
+    this is one query on the (user, exercise) index.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request) -> Response:
+        """Return the personal records, in exercise id order."""
+        records = (
+            PersonalRecord.objects.filter(user_id=request.user.pk)
+            .select_related("exercise")
+            .order_by("exercise_id")
+        )
+        results = PersonalRecordSerializer(records, many=True).data
+        return Response(
+            {"count": len(results), "results": results}, status=status.HTTP_200_OK
+        )
+
+
+class WeeklyVolumeView(APIView):
+    """
+    GET /api/volume/weekly/?level=major_group&weeks=12
+
+    Return the authenticated user's training volume per ISO week and group.
+    `level` is one of muscle, major_group or region (default major_group);
+    `weeks` counts back from the current week (default 12; see
+    WeeklyVolumeQuerySerializer). Reads the weekly rollups (see
+    training.volume), never the set history.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request) -> Response:
+        """Return the volume rolled up to the requested level."""
+        query = WeeklyVolumeQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        level, weeks = query.validated_data["level"], query.validated_data["weeks"]
+
+        results = weekly_volume(request.user.pk, level, weeks)
+        return Response(
+            {
+                "level": level,
+                "weeks": weeks,
+                "results": WeeklyVolumeSerializer(results, many=True).data,
+            },
+            status=status.HTTP_200_OK,
+        )
@@ -0,0 +1,243 @@
+"""
+Weekly training volume per muscle group.
+
+WeeklyMuscleVolume holds, per user, ISO week and MuscleGroup, the volume
+(weight x reps) and the number of sets of completed sets. A set counts fully
+towards its exercise's primary muscles and SECONDARY_WEIGHT towards its
+secondary muscles. Coarser levels of the taxonomy (MajorMuscleGroup,
+WorkoutRegion) are rolled up from those rows when read, so a dashboard reads
+O(weeks x muscle groups) rows instead of joining every set it covers.
+
+Rows are maintained incrementally: when a set is saved or deleted, what it
+contributed before (WorkoutSet keeps the values it was loaded with) is
+subtracted and what it contributes now is added, in one statement each.
+Changes that bypass save() and delete(), such as queryset updates or
+re-tagging an exercise's muscles, are picked up by rebuild_weekly_volume()
+(the rebuild_weekly_volume command).
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from catalog.enums import MAJOR_GROUP_TO_REGION, MUSCLE_GROUP_TO_MAJOR_GROUP
+from catalog.models import Exercise
+from training.models import (
+    WeeklyMuscleVolume,
+    Workout,
+    WorkoutExercise,
+    WorkoutSet,
+)
+
+PRIMARY_WEIGHT = Decimal("1")
+SECONDARY_WEIGHT = Decimal("0.5")
+
+# Taxonomy level -> muscle group -> group reported at that level
+LEVELS: dict[str, dict[str, str]] = {
+    "muscle": {muscle: muscle for muscle in MUSCLE_GROUP_TO_MAJOR_GROUP},
+    "major_group": dict(MUSCLE_GROUP_TO_MAJOR_GROUP),
+    "region": {
+        muscle: MAJOR_GROUP_TO_REGION[major]
+        for muscle, major in MUSCLE_GROUP_TO_MAJOR_GROUP.items()
+    },
+}
+
+# Fields of WorkoutSet that determine its contribution
+CONTRIBUTION_FIELDS = (
+    "workout_exercise_id",
+    "actual_weight_lbs",
+    "actual_reps",
+    "is_completed",
+    "completed_at",
+)
+
+# Muscles of exercise `e` with their weighting, primary muscles first
+_MUSCLES_SQL = """
+    CROSS JOIN LATERAL (
+        SELECT muscle, %(primary)s::numeric
+        FROM unnest(e.primary_muscles) AS muscle
+        UNION ALL
+        SELECT muscle, %(secondary)s::numeric
+        FROM unnest(e.secondary_muscles) AS muscle
+        WHERE NOT muscle = ANY(e.primary_muscles)
+    ) AS m(muscle, weight)
+"""
+
+# Per (user, week, muscle) volume and sets of contributions `c`
+_DELTAS_SQL = f"""
+    SELECT w.user_id, c.week, m.muscle,
+           sum(c.volume * m.weight) AS volume_lbs,
+           sum(m.weight) AS sets
+    FROM unnest(%(workout_exercises)s::bigint[], %(weeks)s::date[],
+                %(volumes)s::numeric[]) AS c(workout_exercise_id, week, volume)
+    JOIN {WorkoutExercise._meta.db_table} AS we ON we.id = c.workout_exercise_id
+    JOIN {Workout._meta.db_table} AS w ON w.id = we.workout_id
+    JOIN {Exercise._meta.db_table} AS e ON e.id = we.exercise_id
+    {_MUSCLES_SQL}
+    GROUP BY w.user_id, c.week, m.muscle
+"""
+
+
+@dataclass(frozen=True)
+class Contribution:
+    """What one completed set adds to the rollups."""
+
+    workout_exercise_id: int
+    week: date
+    volume_lbs: Decimal
+
+
+def week_of(moment: datetime) -> date:
+    """Return the Monday of the ISO week of `moment` (in TIME_ZONE)."""
+    day = timezone.localdate(moment)
+    return day - timedelta(days=day.weekday())
+
+
+def contribution(values: Mapping[str, Any]) -> Contribution | None:
+    """Return the contribution of a set's `values` (None if not completed)."""
+    weight = values["actual_weight_lbs"]
+    reps = values["actual_reps"]
+    completed_at = values["completed_at"]
+    if not values["is_completed"] or None in (weight, reps, completed_at):
+        return None
+    return Contribution(
+        values["workout_exercise_id"],
+        week_of(completed_at),
+        Decimal(str(weight)) * reps,
+    )
+
+
+def current_values(workout_set: WorkoutSet) -> dict[str, Any]:
+    """Return the set's contribution fields as they are now."""
+    return {name: getattr(workout_set, name) for name in CONTRIBUTION_FIELDS}
+
+
+def loaded_values(workout_set: WorkoutSet) -> dict[str, Any] | None:
+    """Return the set's contribution fields as loaded (None if never loaded)."""
+    loaded = getattr(workout_set, "_loaded_values", None)
+    if loaded is None:
+        return None
+    # Deferred fields weren't saved, so what they hold now is what was stored
+    return {
+        name: loaded[name] if name in loaded else getattr(workout_set, name)
+        for name in CONTRIBUTION_FIELDS
+    }
+
+
+def apply_contributions(
+    added: Iterable[Contribution] = (), removed: Iterable[Contribution] = ()
+) -> None:
+    """Add and subtract contributions with one statement each."""
+    added, removed = list(added), list(removed)
+    table = WeeklyMuscleVolume._meta.db_table
+    with connection.cursor() as cursor:
+        if removed:
+            # Rows of removed contributions exist; never insert for them
+            cursor.execute(
+                f"""
+                UPDATE {table} AS v
+                SET volume_lbs = v.volume_lbs - d.volume_lbs,
+                    sets = v.sets - d.sets
+                FROM ({_DELTAS_SQL}) AS d
+                WHERE v.user_id = d.user_id
+                  AND v.week = d.week
+                  AND v.muscle_group = d.muscle
+                """,
+                _delta_params(removed),
+            )
+        if added:
+            cursor.execute(
+                f"""
+                INSERT INTO {table} (user_id, week, muscle_group, volume_lbs, sets)
+                {_DELTAS_SQL}
+                ON CONFLICT (user_id, week, muscle_group) DO UPDATE SET
+                    volume_lbs = {table}.volume_lbs + EXCLUDED.volume_lbs,
+                    sets = {table}.sets + EXCLUDED.sets
+                """,
+                _delta_params(added),
+            )
+
+
+def _delta_params(contributions: list[Contribution]) -> dict[str, Any]:
+    return {
+        "workout_exercises": [c.workout_exercise_id for c in contributions],
+        "weeks": [c.week for c in contributions],
+        "volumes": [c.volume_lbs for c in contributions],
+        "primary": PRIMARY_WEIGHT,
+        "secondary": SECONDARY_WEIGHT,
+    }
+
+
+@transaction.atomic
+def rebuild_weekly_volume(user_ids: Iterable[int]) -> int:
+    """Recompute the users' rollups from their history; return the row count."""
+    user_ids = list(user_ids)
+    WeeklyMuscleVolume.objects.filter(user_id__in=user_ids).delete()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {WeeklyMuscleVolume._meta.db_table}
+                (user_id, week, muscle_group, volume_lbs, sets)
+            SELECT w.user_id,
+                   date_trunc('week', s.completed_at AT TIME ZONE %(tz)s)::date,
+                   m.muscle,
+                   sum(s.actual_weight_lbs * s.actual_reps * m.weight),
+                   sum(m.weight)
+            FROM {WorkoutSet._meta.db_table} AS s
+            JOIN {WorkoutExercise._meta.db_table} AS we
+                ON we.id = s.workout_exercise_id
+            JOIN {Workout._meta.db_table} AS w ON w.id = we.workout_id
+            JOIN {Exercise._meta.db_table} AS e ON e.id = we.exercise_id
+            {_MUSCLES_SQL}
+            WHERE w.user_id = ANY(%(users)s)
+              AND s.is_completed
+              AND s.actual_weight_lbs IS NOT NULL
+              AND s.actual_reps IS NOT NULL
+              AND s.completed_at IS NOT NULL
+            GROUP BY 1, 2, 3
+            """,
+            {
+                "users": user_ids,
+                "tz": settings.TIME_ZONE,
+                "primary": PRIMARY_WEIGHT,
+                "secondary": SECONDARY_WEIGHT,
+            },
+        )
+        return cursor.rowcount
+
+
+def weekly_volume(user_id: int, level: str, weeks: int) -> list[dict[str, Any]]:
+    """
+    Return the user's volume for the last `weeks` weeks at a taxonomy level.
+
+    `level` is a key of LEVELS. Rows are sorted by week, then group; weeks
+    and groups without volume are left out.
+    """
+    groups = LEVELS[level]
+    since = week_of(timezone.now()) - timedelta(weeks=weeks - 1)
+    rows = WeeklyMuscleVolume.objects.filter(
+        user_id=user_id, week__gte=since
+    ).values_list("week", "muscle_group", "volume_lbs", "sets")
+
+    totals: dict[tuple[date, str], list[Decimal]] = defaultdict(
+        lambda: [Decimal("0"), Decimal("0")]
+    )
+    for week, muscle, volume_lbs, sets in rows:
+        if not sets:
+            continue
+        total = totals[week, groups.get(muscle, muscle)]
+        total[0] += volume_lbs
+        total[1] += sets
+    return [
+        {"week": week, "group": group, "volume_lbs": volume_lbs, "sets": sets}
+        for (week, group), (volume_lbs, sets) in sorted(totals.items())
+    ]
@@ -0,0 +1,70 @@
+"""
+Equipment checks for building workouts.
+
+A WorkoutExercise pairs an exercise with a piece of equipment at a gym. The
+pairing is valid when the equipment is at the gym and the exercise can be
+performed with it (see catalog.compatibility). Both checks are dict lookups
+in per-process indexes, so a whole workout is validated, and equipment
+suggested for each exercise, without a query per exercise.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from django.core.exceptions import ValidationError
+
+from catalog.compatibility import INCOMPATIBLE_EQUIPMENT_MESSAGE, compatibility
+from gym.inventory import get_inventory
+
+if TYPE_CHECKING:
+    from training.models import WorkoutExercise
+
+EQUIPMENT_NOT_AT_GYM_MESSAGE = "This equipment is not at the gym."
+
+
+def suggest_gym_equipment(gym_id: int, exercise_id: int) -> tuple[int, ...]:
+    """
+    Return the ids of the gym equipment an exercise can be performed with.
+
+    Exercises that need no equipment can use anything at the gym.
+    """
+    inventory = get_inventory(gym_id)
+    index = compatibility.index()
+    if not index.needs_equipment(exercise_id):
+        return tuple(inventory.equipment_of)
+
+    options: list[int] = []
+    for equipment_id in index.equipment_for(exercise_id):
+        options.extend(inventory.by_equipment.get(equipment_id, ()))
+    return tuple(sorted(options))
+
+
+def equipment_error(gym_id: int, exercise_id: int, gym_equipment_id: int) -> str | None:
+    """Return why the pairing is invalid at the gym, or None if it is valid."""
+    equipment_id = get_inventory(gym_id).equipment_of.get(gym_equipment_id)
+    if equipment_id is None:
+        return EQUIPMENT_NOT_AT_GYM_MESSAGE
+    if not compatibility.index().is_compatible(exercise_id, equipment_id):
+        return INCOMPATIBLE_EQUIPMENT_MESSAGE
+    return None
+
+
+def validate_workout_exercises(
+    gym_id: int, workout_exercises: Iterable[WorkoutExercise]
+) -> None:
+    """
+    Raise ValidationError if any exercise is paired with unusable equipment.
+
+    Reports every invalid pairing, numbered by position in the workout.
+    """
+    errors = []
+    for position, workout_exercise in enumerate(workout_exercises, start=1):
+        error = equipment_error(
+            gym_id, workout_exercise.exercise_id, workout_exercise.gym_equipment_id
+        )
+        if error:
+            errors.append(f"Exercise {position}: {error}")
+    if errors:
+        raise ValidationError(errors)